@@ -1,3 +1,11 @@
-from .ui.cloth_ui import ClothUi
+try:
+    from maya import cmds
+    interactive: bool = not cmds.about(batch = True)
+except (ImportError, AttributeError):
+    # outside Maya or in a mayapy session not initialized yet
+    interactive = False
 
-ClothUi()
+if interactive:
+    from .ui.cloth_ui import ClothUi
+
+    ClothUi()
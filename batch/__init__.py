@@ -0,0 +1,10 @@
+from .manifest import (
+    load_shots,
+    validate_shot
+)
+
+from .runner import (
+    run_jobs,
+    run_shots,
+    format_summary
+)
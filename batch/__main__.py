@@ -0,0 +1,48 @@
+# Batch command line
+#
+#     python -m cloth_setup.batch shots/*.json --workers 8 --timeout 7200 --retries 1 --report report.json
+
+import argparse
+import json
+import sys
+
+from .manifest import load_shots
+from .runner import format_summary, run_shots
+
+
+def parse_args(argv: list = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog = 'cloth_setup.batch', description = 'Build and simulate cloth setups of many shots.')
+    parser.add_argument('manifests', nargs = '+', help = 'JSON or YAML shot manifests.')
+    parser.add_argument('--workers', type = int, default = 4, help = 'Maximum number of mayapy processes at once.')
+    parser.add_argument('--timeout', type = float, default = 4 * 3600.0, help = 'Seconds before a shot attempt is killed.')
+    parser.add_argument('--retries', type = int, default = 1, help = 'Times a failed shot is run again.')
+    parser.add_argument('--mayapy', default = None, help = 'Worker executable, MAYAPY or mayapy by default.')
+    parser.add_argument('--python-path', action = 'append', default = [], help = 'Path put first on the workers PYTHONPATH.')
+    parser.add_argument('--report', default = None, help = 'Write the JSON summary to this file.')
+
+    return parser.parse_args(argv)
+
+
+def main(argv: list = None) -> int:
+    args = parse_args(argv)
+    shots: list = load_shots(args.manifests)
+
+    summary: dict = run_shots(
+        shots,
+        workers = args.workers,
+        timeout = args.timeout,
+        retries = args.retries,
+        executable = args.mayapy,
+        python_path = args.python_path
+    )
+
+    print(format_summary(summary))
+    if args.report:
+        with open(args.report, 'w') as report_file:
+            json.dump(summary, report_file, indent = 4)
+
+    return 0 if set(summary['counts']) <= {'ok'} else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,72 @@
+# Cache compare command line
+#
+#     python -m cloth_setup.batch.compare reference.cspc sh010_cloth.cspc --threshold 0.01 --report compare.json
+#
+# Exits with 1 when a mesh differs by more than the threshold, is missing from one of the caches,
+# or when the caches do not cover the same frames.
+
+import argparse
+import json
+import sys
+
+from ..core.cache_compare import DEFAULT_PERCENTILES, DEFAULT_THRESHOLD, compare_caches, summarize_comparison
+
+
+def parse_args(argv: list = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog = 'cloth_setup.batch.compare', description = 'Compare two point caches of the same meshes.')
+    parser.add_argument('reference', help = 'The reference point cache.')
+    parser.add_argument('candidate', help = 'The point cache compared to the reference.')
+    parser.add_argument('--mesh', action = 'append', default = None, help = 'Mesh to compare, all of them by default.')
+    parser.add_argument('--threshold', type = float, default = DEFAULT_THRESHOLD, help = 'Deviation over which a frame or a vertex differs.')
+    parser.add_argument('--chunk-frames', type = int, default = 16, help = 'Number of frames read at once.')
+    parser.add_argument('--percentiles', type = float, nargs = '+', default = list(DEFAULT_PERCENTILES), help = 'Deviation percentiles.')
+    parser.add_argument('--region-size', type = float, default = None, help = 'Cell size grouping differing vertices into regions.')
+    parser.add_argument('--report', default = None, help = 'Write the JSON report to this file.')
+
+    return parser.parse_args(argv)
+
+
+def format_report(report: dict) -> str:
+    lines = [f'frames {report["frames"][0]:g} - {report["frames"][1]:g}']
+    if report['frame_mismatch']:
+        reference, candidate = report['reference_frames'], report['candidate_frames']
+        lines.append(f'{"FRAMES":<8} reference {reference[0]:g} - {reference[1]:g}, candidate {candidate[0]:g} - {candidate[1]:g}')
+    for name, result in report['meshes'].items():
+        percentiles: str = ' '.join(f'{key} {value:.4g}' for key, value in result['percentiles'].items())
+        lines.append(f'{"DIFFERS" if result["differs"] else "ok":<8} {name} : max {result["max"]:.4g} rms {result["rms"]:.4g} {percentiles}')
+        for frame_range in result['frame_ranges']:
+            lines.append(f'         frames {frame_range["first"]:g} - {frame_range["last"]:g} : max {frame_range["max"]:.4g}')
+        for region in result['regions']:
+            center: str = ', '.join(f'{value:.3g}' for value in region['center'])
+            lines.append(f'         {region["vertex_count"]} vertices around ({center}) : max {region["max"]:.4g}')
+
+    for name in report['missing']:
+        lines.append(f'{"MISSING":<8} {name}')
+
+    return '\n'.join(lines)
+
+
+def main(argv: list = None) -> int:
+    args = parse_args(argv)
+
+    comparison: dict = compare_caches(
+        args.reference,
+        args.candidate,
+        meshes = args.mesh,
+        threshold = args.threshold,
+        chunk_frames = args.chunk_frames,
+        percentiles = tuple(args.percentiles),
+        region_size = args.region_size
+    )
+    report: dict = summarize_comparison(comparison, tuple(args.percentiles))
+
+    print(format_report(report))
+    if args.report:
+        with open(args.report, 'w') as report_file:
+            json.dump(report, report_file, indent = 4)
+
+    return 1 if report['differs'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
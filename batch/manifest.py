@@ -0,0 +1,102 @@
+# Manifest
+#
+# Shot manifests for the batch runner, as JSON or YAML (YAML needs PyYAML).
+#
+# A manifest file holds one shot, or several under a "shots" key :
+#
+#     {
+#         "name": "sh010",
+#         "scene": "/shots/sh010/anim.ma",
+#         "output": "/shots/sh010/cloth.ma",
+#         "wrap_node": "cvwrap",
+#         "lean_graph": true,
+#         "output_mode": "transform",
+#         "setups": [
+#             {"setup_prefix": "shirt", "low_mesh": "shirt_low", "high_mesh": "shirt_hi", "colliders": {"body_geo": "body"}}
+#         ],
+#         "share_nucleus": {"max_vertices": 40000},
+#         "preroll": {"controlers": ["CTRL_root"], "values": [1001.0, -25.0, -125.0, -150.0]},
+#         "substeps": {"keyed": true},
+#         "collider_activation": {"padding": 5},
+#         "watchdog": {"max_stretch": 3.0},
+#         "checkpoints": {"directory": "/shots/sh010/checkpoints", "every": 50, "max_bytes": 2000000000},
+#         "resume_frame": 1900,
+#         "cache": "/shots/sh010/cloth.cspc",
+#         "compare": {"reference": "/shots/sh010/cloth_approved.cspc", "threshold": 0.01, "report": "/shots/sh010/compare.json"},
+#         "health": "/shots/sh010/cloth_health.json",
+#         "profile": "/shots/sh010/build_trace.json"
+#     }
+
+import json
+import os
+
+
+REQUIRED_SHOT_KEYS = ('name', 'scene', 'setups')
+REQUIRED_SETUP_KEYS = ('setup_prefix', 'low_mesh', 'high_mesh')
+
+
+def read_manifest_file(path: str) -> dict:
+    """
+    Read a JSON or YAML manifest file.
+
+    Parameters:
+        path (str): The path of the manifest.
+
+    Returns:
+        dict: The manifest content.
+    """
+
+    with open(path, 'r') as manifest_file:
+        if os.path.splitext(path)[1].lower() in ('.yaml', '.yml'):
+            import yaml
+            return yaml.safe_load(manifest_file)
+
+        return json.load(manifest_file)
+
+
+def validate_shot(shot: dict) -> dict:
+    """
+    Check a shot has the keys the worker needs.
+
+    Parameters:
+        shot (dict): The shot description.
+
+    Returns:
+        dict: The shot.
+    """
+
+    for key in REQUIRED_SHOT_KEYS:
+        if key not in shot:
+            raise ValueError(f'Shot {shot.get("name", "?")} has no "{key}".')
+
+    for setup in shot['setups']:
+        for key in REQUIRED_SETUP_KEYS:
+            if key not in setup:
+                raise ValueError(f'A setup of shot {shot["name"]} has no "{key}".')
+
+    return shot
+
+
+def load_shots(paths: list) -> list:
+    """
+    Load the shots of several manifest files.
+
+    Parameters:
+        paths (list): The paths of the manifests.
+
+    Returns:
+        list: The shot descriptions.
+    """
+
+    shots = []
+    for path in paths:
+        manifest: dict = read_manifest_file(path)
+        for shot in manifest.get('shots', [manifest]):
+            shots.append(validate_shot(shot))
+
+    names = [shot['name'] for shot in shots]
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    if duplicates:
+        raise ValueError(f'Duplicate shot names : {", ".join(duplicates)}')
+
+    return shots
@@ -0,0 +1,61 @@
+# nCache worker
+#
+# Cache the nCloth shapes of one nucleus system in a mayapy process :
+#     mayapy -m cloth_setup.batch.ncache_worker job.json
+#
+# The job holds the scene, the nucleus to solve, its nCloth shapes, the cache directory and the frame range.
+
+import json
+import sys
+
+from .worker import initialize_maya
+
+
+def cache_nucleus_system(job: dict) -> dict:
+    """
+    Open the scene, disable every other nucleus and cache the nCloth shapes of the job nucleus,
+    all of them in a single cache file so the system is simulated once. The cache has one channel per nCloth shape.
+
+    Parameters:
+        job (dict): The job description (see funcs.ncache_funcs.create_ncaches_parallel).
+
+    Returns:
+        dict: The nucleus and the cache file name.
+    """
+
+    from maya import cmds
+
+    cmds.file(job['scene'], open = True, force = True)
+
+    for nucleus_node in cmds.ls(type = 'nucleus'):
+        cmds.setAttr(f'{nucleus_node}.enable', nucleus_node == job['nucleus'])
+
+    file_name: str = job['nucleus'].replace(':', '_')
+    cmds.cacheFile(
+        fileName = file_name,
+        directory = job['directory'],
+        cacheableNode = job['ncloths'],
+        singleCache = True,
+        startTime = job['start_frame'],
+        endTime = job['end_frame'],
+        format = 'OneFile',
+        doubleToFloat = True
+    )
+
+    return {'nucleus': job['nucleus'], 'cache': file_name}
+
+
+def main(argv: list = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+
+    with open(argv[0], 'r') as job_file:
+        job: dict = json.load(job_file)
+
+    initialize_maya()
+    print(json.dumps(cache_nucleus_system(job), default = str))
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,182 @@
+# Runner
+#
+# Spread jobs (shots, nucleus caches) over a pool of mayapy worker processes,
+# with a concurrency limit, a timeout and retries per job, and a summary report.
+
+from concurrent.futures import ThreadPoolExecutor
+import json
+import os
+import subprocess
+import tempfile
+import time
+
+
+PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PACKAGE_NAME = __name__.split('.')[0]
+WORKER_MODULE = f'{PACKAGE_NAME}.batch.worker'
+LOG_TAIL = 40
+# worker exit codes of the runs that would end the same way if run again, they are not retried
+EXIT_ABORTED = 10
+EXIT_DIFFERS = 11
+EXIT_STATUSES = {0: 'ok', EXIT_ABORTED: 'aborted', EXIT_DIFFERS: 'differs'}
+
+
+def default_executable() -> str:
+    """
+    Get the python executable of the workers, the MAYAPY environment variable or mayapy.
+
+    Returns:
+        str: The executable.
+    """
+
+    return os.environ.get('MAYAPY', 'mayapy')
+
+
+def worker_environment(python_path: list = None) -> dict:
+    """
+    Get the environment of the workers, with the package (and extra paths, a stand-in maya for instance) importable.
+
+    Parameters:
+        python_path (list, optional): Paths put first on the workers PYTHONPATH.
+
+    Returns:
+        dict: The environment.
+    """
+
+    env = dict(os.environ)
+    paths = list(python_path or []) + [os.path.dirname(PACKAGE_DIR)]
+    if env.get('PYTHONPATH'):
+        paths.append(env['PYTHONPATH'])
+    env['PYTHONPATH'] = os.pathsep.join(paths)
+
+    return env
+
+
+def run_worker(job: dict, module: str, executable: str, env: dict, timeout: float) -> dict:
+    """
+    Run one attempt of a job in a worker process: python -m module job.json.
+
+    Returns:
+        dict: The status ('ok', 'aborted' by a watchdog, 'differs' from the reference cache, 'failed' or 'timeout'),
+            return code, duration and log tail of the attempt.
+    """
+
+    with tempfile.NamedTemporaryFile('w', suffix = '.json', delete = False) as job_file:
+        json.dump(job, job_file)
+
+    start: float = time.perf_counter()
+    try:
+        process = subprocess.run(
+            [executable, '-m', module, job_file.name],
+            env = env,
+            stdout = subprocess.PIPE,
+            stderr = subprocess.STDOUT,
+            universal_newlines = True,
+            timeout = timeout
+        )
+        status: str = EXIT_STATUSES.get(process.returncode, 'failed')
+        return_code = process.returncode
+        log: str = process.stdout or ''
+
+    except subprocess.TimeoutExpired as error:
+        status = 'timeout'
+        return_code = None
+        log = error.stdout or ''
+        if isinstance(log, bytes):
+            log = log.decode('utf-8', 'replace')
+
+    finally:
+        os.remove(job_file.name)
+
+    return {
+        'status': status,
+        'return_code': return_code,
+        'duration': time.perf_counter() - start,
+        'log': '\n'.join(log.splitlines()[-LOG_TAIL:])
+    }
+
+
+def run_job_with_retries(job: dict, module: str, executable: str, env: dict, timeout: float, retries: int) -> dict:
+    attempts = []
+    for _ in range(retries + 1):
+        attempts.append(run_worker(job, module, executable, env, timeout))
+        if attempts[-1]['status'] in EXIT_STATUSES.values():
+            break
+
+    return {
+        'name': job['name'],
+        'status': attempts[-1]['status'],
+        'attempts': len(attempts),
+        'duration': sum(attempt['duration'] for attempt in attempts),
+        'log': attempts[-1]['log']
+    }
+
+
+def run_jobs(
+    jobs: list,
+    module: str,
+    workers: int = 4,
+    timeout: float = 4 * 3600.0,
+    retries: int = 1,
+    executable: str = None,
+    python_path: list = None
+) -> dict:
+    """
+    Run jobs in parallel worker processes.
+
+    Parameters:
+        jobs (list): The job descriptions, JSON serializable dicts with a unique 'name'.
+        module (str): The module the workers run, with the path of a job JSON file as argument.
+        workers (int): The maximum number of worker processes running at once.
+        timeout (float): The time in seconds after which a job attempt is killed.
+        retries (int): The number of times a failed or timed out job is run again, an aborted job is not.
+        executable (str, optional): The python executable of the workers, see default_executable.
+        python_path (list, optional): Paths put first on the workers PYTHONPATH.
+
+    Returns:
+        dict: The summary: counts per status, total duration and the report of each job.
+    """
+
+    executable = executable or default_executable()
+    env: dict = worker_environment(python_path)
+
+    start: float = time.perf_counter()
+    with ThreadPoolExecutor(max_workers = max(1, workers)) as pool:
+        futures = [pool.submit(run_job_with_retries, job, module, executable, env, timeout, retries) for job in jobs]
+        reports = [future.result() for future in futures]
+
+    counts = {}
+    for report in reports:
+        counts[report['status']] = counts.get(report['status'], 0) + 1
+
+    return {
+        'counts': counts,
+        'duration': time.perf_counter() - start,
+        'jobs': reports
+    }
+
+
+def run_shots(shots: list, **kwargs) -> dict:
+    """
+    Build and simulate shots in parallel worker processes.
+
+    Parameters:
+        shots (list): The shot descriptions (see batch.manifest).
+        kwargs: The run_jobs options (workers, timeout, retries, executable, python_path).
+
+    Returns:
+        dict: The summary, see run_jobs.
+    """
+
+    return run_jobs(shots, WORKER_MODULE, **kwargs)
+
+
+def format_summary(summary: dict) -> str:
+    lines = [f'{"name":<24} {"status":<8} {"attempts":>8} {"time (s)":>10}']
+    for report in summary['jobs']:
+        lines.append(f'{report["name"]:<24} {report["status"]:<8} {report["attempts"]:>8} {report["duration"]:>10.1f}')
+
+    counts: str = ', '.join(f'{count} {status}' for status, count in sorted(summary['counts'].items()))
+    lines.append(f'{len(summary["jobs"])} jobs in {summary["duration"]:.1f} s : {counts}')
+
+    return '\n'.join(lines)
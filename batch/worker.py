@@ -0,0 +1,156 @@
+# Worker
+#
+# Build and simulate one shot in a mayapy process :
+#     mayapy -m cloth_setup.batch.worker shot.json
+
+import json
+import sys
+
+
+def initialize_maya() -> None:
+    """
+    Initialize maya.standalone when running outside an interactive session.
+    A stand-in maya package found first on the path is used as is.
+    """
+
+    try:
+        import maya.standalone
+    except ImportError:
+        return
+
+    try:
+        maya.standalone.initialize(name = 'python')
+    except RuntimeError:
+        # already initialized
+        pass
+
+
+def run_shot(shot: dict) -> dict:
+    """
+    Open the shot scene, build its setups, set its preroll, substeps and collider activation,
+    resume it from a checkpoint, write its cache, compare it to a reference cache and save it.
+
+    Parameters:
+        shot (dict): The shot description (see batch.manifest).
+
+    Returns:
+        dict: The names of the built nodes, per setup.
+    """
+
+    from maya import cmds
+
+    from ..funcs import build_setups, set_preroll
+    from ..funcs.cache_funcs import write_point_cache
+
+    cmds.file(shot['scene'], open = True, force = True)
+
+    nucleus_groups: list = shot.get('nucleus_groups')
+    share_nucleus = shot.get('share_nucleus')
+    if share_nucleus and nucleus_groups is None:
+        from ..funcs.nucleus_funcs import plan_nucleus_groups
+        nucleus_groups = plan_nucleus_groups(shot['setups'], **(share_nucleus if isinstance(share_nucleus, dict) else {}))
+
+    results: list = build_setups(
+        shot['setups'],
+        wrap_node = shot.get('wrap_node', 'cvwrap'),
+        lean_graph = shot.get('lean_graph', False),
+        output_mode = shot.get('output_mode', 'skin'),
+        nucleus_groups = nucleus_groups
+    )
+
+    preroll: dict = shot.get('preroll')
+    if preroll:
+        set_preroll(preroll['controlers'], preroll['values'])
+
+    substeps = shot.get('substeps')
+    if substeps:
+        from ..funcs.nucleus_funcs import estimate_nucleus_substeps
+        estimate_nucleus_substeps(**(substeps if isinstance(substeps, dict) else {}))
+
+    collider_activation = shot.get('collider_activation')
+    if collider_activation:
+        from ..funcs.collider_funcs import set_collider_activation
+        set_collider_activation(**(collider_activation if isinstance(collider_activation, dict) else {}))
+
+    watchdog = shot.get('watchdog')
+    watchdogs = []
+    if watchdog:
+        from ..funcs.watchdog_funcs import attach_watchdogs
+        watchdogs = attach_watchdogs(stop_playback = False, **(watchdog if isinstance(watchdog, dict) else {}))
+
+    checkpoints: dict = shot.get('checkpoints')
+    start_frame: float = None
+    if checkpoints and shot.get('resume_frame') is not None:
+        from ..funcs.checkpoint_funcs import resume_from_checkpoint
+        start_frame = resume_from_checkpoint(checkpoints['directory'], shot['resume_frame'])
+
+    recorder = None
+    if checkpoints:
+        from ..funcs.checkpoint_funcs import attach_checkpoint_recorder
+        recorder = attach_checkpoint_recorder(**checkpoints)
+
+    try:
+        if shot.get('cache'):
+            write_point_cache(shot['cache'], start_frame = start_frame, watchdogs = watchdogs)
+
+    finally:
+        if recorder is not None:
+            recorder.detach()
+        for mesh_watchdog in watchdogs:
+            mesh_watchdog.detach()
+        if watchdog and shot.get('health'):
+            with open(shot['health'], 'w') as health_file:
+                json.dump([mesh_watchdog.to_dict() for mesh_watchdog in watchdogs], health_file, indent = 4)
+
+    compare: dict = shot.get('compare')
+    comparison: dict = None
+    if compare and shot.get('cache'):
+        from ..core.cache_compare import DEFAULT_PERCENTILES, compare_caches, summarize_comparison
+        options = {key: value for key, value in compare.items() if key not in ('reference', 'report')}
+        comparison = summarize_comparison(
+            compare_caches(compare['reference'], shot['cache'], **options),
+            tuple(options.get('percentiles', DEFAULT_PERCENTILES))
+        )
+        if compare.get('report'):
+            with open(compare['report'], 'w') as report_file:
+                json.dump(comparison, report_file, indent = 4)
+
+    if shot.get('profile'):
+        from ..funcs.profile_funcs import get_profiler
+        get_profiler().export_chrome_trace(shot['profile'])
+
+    if shot.get('output'):
+        cmds.file(rename = shot['output'])
+        cmds.file(save = True, force = True)
+
+    result = {'shot': shot['name'], 'setups': results}
+    if comparison is not None:
+        result['differs'] = comparison['differs']
+
+    return result
+
+
+def main(argv: list = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+
+    with open(argv[0], 'r') as shot_file:
+        shot: dict = json.load(shot_file)
+
+    initialize_maya()
+
+    from ..core.watchdog import WatchdogAbort
+    from .runner import EXIT_ABORTED, EXIT_DIFFERS
+
+    try:
+        result: dict = run_shot(shot)
+    except WatchdogAbort as error:
+        print(error)
+        return EXIT_ABORTED
+
+    print(json.dumps(result, default = str))
+
+    return EXIT_DIFFERS if result.get('differs') else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,58 @@
+# Benchmark duplicate_mesh
+#
+# Run with mayapy from the folder containing cloth_setup :
+#     mayapy -m cloth_setup.benchmarks.bench_duplicate_mesh
+
+import time
+
+try:
+    import maya.standalone
+    maya.standalone.initialize()
+except RuntimeError:
+    pass
+
+from maya import cmds
+
+from ..funcs.cloth_funcs import duplicate_mesh
+
+
+SUBDIVISIONS = (50, 100, 250, 500, 700)
+REPEAT = 3
+
+
+def create_deformed_mesh(subdivisions: int) -> str:
+    """
+    Create a sphere with history and a deformer, like a rigged mesh.
+    """
+
+    mesh: str = cmds.polySphere(subdivisionsAxis = subdivisions, subdivisionsHeight = subdivisions, name = f'bench_{subdivisions}')[0]
+    cmds.nonLinear(mesh, type = 'bend', curvature = 45.0)
+
+    return mesh
+
+
+def time_duplicate(mesh: str, fast: bool) -> float:
+    best: float = float('inf')
+    for i in range(REPEAT):
+        start: float = time.perf_counter()
+        duplicate: str = duplicate_mesh(mesh, f'{mesh}_dup_{int(fast)}_{i}', fast = fast)
+        best = min(best, time.perf_counter() - start)
+        cmds.delete(duplicate)
+
+    return best
+
+
+def main() -> None:
+    cmds.file(new = True, force = True)
+    print(f'{"vertices":>10} {"cmds (s)":>10} {"fast (s)":>10} {"speedup":>8}')
+
+    for subdivisions in SUBDIVISIONS:
+        mesh: str = create_deformed_mesh(subdivisions)
+        vertices: int = cmds.polyEvaluate(mesh, vertex = True)
+        legacy: float = time_duplicate(mesh, fast = False)
+        fast: float = time_duplicate(mesh, fast = True)
+        print(f'{vertices:>10} {legacy:>10.4f} {fast:>10.4f} {legacy / fast:>8.1f}')
+
+
+if __name__ == '__main__':
+    main()
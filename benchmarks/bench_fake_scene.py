@@ -0,0 +1,232 @@
+# Benchmark the setup pipeline on synthetic scenes
+#
+# Runs the real funcs on the in-memory fake maya, without a Maya licence,
+# from the folder containing cloth_setup :
+#     python -m cloth_setup.benchmarks.bench_fake_scene --setups 4 --colliders 3 --controlers 200
+#
+# Results are saved as benchmarks/results/<commit>.json, compare them with :
+#     python -m cloth_setup.benchmarks.bench_fake_scene --compare <commit>
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+from .fake_maya import RECORDER, SCENE, install, new_scene
+from .fake_maya.generators import create_rig_scene, create_setup_scene
+
+install()
+
+from ..core.profiling import PROFILER
+from ..funcs.build_funcs import build_setups
+from ..funcs.cloth_funcs import create_cloth, create_collider_mesh, create_full_setup, duplicate_mesh, ensure_init_mesh
+from ..funcs.preroll_funcs import set_preroll, set_preroll_poses
+
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), 'results')
+PREROLL_VALUES = [1001.0, -25.0, -125.0, -150.0]
+POSES = [
+    {'offset': -150.0, 'pose': 'default', 'easing': 'smoothstep'},
+    {'offset': -100.0, 'pose': 'default', 'easing': 'ease_in_out'},
+    {'offset': -25.0, 'pose': 'anim'},
+]
+
+
+def full_setup_scenario(options) -> tuple:
+    specs: list = create_setup_scene(options.setups, options.colliders, options.low_resolution, options.high_resolution)
+
+    def run():
+        for spec in specs:
+            create_full_setup(**spec)
+
+    return run, {'setups': options.setups, 'colliders': options.colliders}
+
+
+def build_setups_scenario(options, fast_duplicate: bool = False) -> tuple:
+    specs: list = create_setup_scene(options.setups, options.colliders, options.low_resolution, options.high_resolution)
+
+    def run():
+        build_setups(specs, fast_duplicate = fast_duplicate)
+
+    return run, {'setups': options.setups, 'colliders': options.colliders, 'fast_duplicate': fast_duplicate}
+
+
+def collider_mesh_scenario(options) -> tuple:
+    specs: list = create_setup_scene(1, options.colliders, options.low_resolution, options.high_resolution)
+    simu_nmesh: str = duplicate_mesh(specs[0]['low_mesh'], 'garment0_simu_nmesh')
+    _, nucleus_node = create_cloth(simu_nmesh, 'garment0')
+
+    def run():
+        for collider, collider_suffix in specs[0]['colliders'].items():
+            init_mesh: str = ensure_init_mesh(collider)
+            create_collider_mesh(init_mesh, nucleus_node, 'garment0', collider_suffix)
+
+    return run, {'colliders': options.colliders}
+
+
+def preroll_scenario(options, bulk: bool) -> tuple:
+    controlers: list = create_rig_scene(options.controlers, options.extra_attributes)
+
+    def run():
+        set_preroll(controlers, PREROLL_VALUES, update_nucleus = False, bulk = bulk)
+
+    return run, {'controlers': options.controlers, 'extra_attributes': options.extra_attributes, 'bulk': bulk}
+
+
+def preroll_poses_scenario(options) -> tuple:
+    controlers: list = create_rig_scene(options.controlers, options.extra_attributes)
+
+    def run():
+        set_preroll_poses(controlers, PREROLL_VALUES[0], POSES, sample_step = 5.0, update_nucleus = False)
+
+    return run, {'controlers': options.controlers, 'extra_attributes': options.extra_attributes}
+
+
+SCENARIOS = {
+    'create_full_setup': full_setup_scenario,
+    'build_setups': build_setups_scenario,
+    'build_setups_fast': lambda options: build_setups_scenario(options, fast_duplicate = True),
+    'create_collider_mesh': collider_mesh_scenario,
+    'set_preroll_scrub': lambda options: preroll_scenario(options, bulk = False),
+    'set_preroll_bulk': lambda options: preroll_scenario(options, bulk = True),
+    'set_preroll_poses': preroll_poses_scenario
+}
+
+
+def run_scenario(name: str, options) -> dict:
+    """
+    Run a scenario on a new synthetic scene for each repeat.
+
+    Returns:
+        dict: The parameters, wall times, created nodes, Maya command calls and profiled steps of the scenario.
+    """
+
+    durations = []
+    for _ in range(options.repeat):
+        new_scene()
+        run, parameters = SCENARIOS[name](options)
+        node_count: int = len(SCENE.nodes)
+        RECORDER.reset()
+        PROFILER.reset()
+
+        start: float = time.perf_counter()
+        run()
+        durations.append(time.perf_counter() - start)
+
+    commands: dict = RECORDER.to_dict()
+
+    return {
+        'parameters': parameters,
+        'best': min(durations),
+        'median': statistics.median(durations),
+        'nodes_created': len(SCENE.nodes) - node_count,
+        'command_calls': sum(command['calls'] for command in commands.values()),
+        'commands': commands,
+        'steps': PROFILER.summary()
+    }
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd = os.path.dirname(__file__),
+            capture_output = True,
+            text = True,
+            check = True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'local'
+
+
+def load_results(reference: str) -> dict:
+    path: str = reference if os.path.isfile(reference) else os.path.join(RESULTS_DIR, f'{reference}.json')
+    with open(path, 'r') as results_file:
+        return json.load(results_file)
+
+
+def format_comparison(previous: dict, current: dict) -> str:
+    """
+    Format the wall time and command count changes of every scenario, then the commands whose count changed.
+    """
+
+    lines = [
+        f'{previous["commit"]} -> {current["commit"]}',
+        f'{"scenario":<22} {"before (s)":>11} {"after (s)":>10} {"ratio":>6} {"calls before":>13} {"calls after":>12}'
+    ]
+    for name, result in current['scenarios'].items():
+        before: dict = previous['scenarios'].get(name)
+        if before is None:
+            lines.append(f'{name:<22} {"-":>11} {result["best"]:>10.4f} {"-":>6} {"-":>13} {result["command_calls"]:>12}')
+            continue
+
+        ratio: float = result['best'] / before['best'] if before['best'] else float('inf')
+        lines.append(
+            f'{name:<22} {before["best"]:>11.4f} {result["best"]:>10.4f} {ratio:>6.2f} '
+            f'{before["command_calls"]:>13} {result["command_calls"]:>12}'
+        )
+
+        for command, calls in result['commands'].items():
+            before_calls: int = before['commands'].get(command, {}).get('calls', 0)
+            if before_calls != calls['calls']:
+                lines.append(f'    {command:<34} {before_calls:>8} -> {calls["calls"]}')
+
+    return '\n'.join(lines)
+
+
+def parse_args(argv: list = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog = 'bench_fake_scene', description = 'Benchmark the cloth setup funcs on synthetic scenes.')
+    parser.add_argument('scenarios', nargs = '*', help = f'Scenarios to run, all if none: {", ".join(SCENARIOS)}.')
+    parser.add_argument('--setups', type = int, default = 4)
+    parser.add_argument('--colliders', type = int, default = 3)
+    parser.add_argument('--low-resolution', type = int, default = 30, help = 'Grid resolution of the low and collider meshes.')
+    parser.add_argument('--high-resolution', type = int, default = 90, help = 'Grid resolution of the high meshes.')
+    parser.add_argument('--controlers', type = int, default = 200)
+    parser.add_argument('--extra-attributes', type = int, default = 10)
+    parser.add_argument('--repeat', type = int, default = 3)
+    parser.add_argument('--output', help = 'Results file, benchmarks/results/<commit>.json by default.')
+    parser.add_argument('--compare', help = 'Commit or results file to compare with.')
+
+    options: argparse.Namespace = parser.parse_args(argv)
+    for name in options.scenarios:
+        if name not in SCENARIOS:
+            parser.error(f'Unknown scenario {name}.')
+
+    return options
+
+
+def main(argv: list = None) -> int:
+    options: argparse.Namespace = parse_args(argv)
+
+    results = {
+        'commit': git_commit(),
+        'date': datetime.datetime.now().isoformat(timespec = 'seconds'),
+        'python': platform.python_version(),
+        'scenarios': {}
+    }
+
+    print(f'{"scenario":<22} {"best (s)":>10} {"median (s)":>11} {"nodes":>7} {"calls":>8}')
+    for name in options.scenarios or SCENARIOS:
+        result: dict = run_scenario(name, options)
+        results['scenarios'][name] = result
+        print(f'{name:<22} {result["best"]:>10.4f} {result["median"]:>11.4f} {result["nodes_created"]:>7} {result["command_calls"]:>8}')
+
+    output: str = options.output or os.path.join(RESULTS_DIR, f'{results["commit"]}.json')
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok = True)
+    with open(output, 'w') as results_file:
+        json.dump(results, results_file, indent = 4)
+    print(f'Results saved to {output}')
+
+    if options.compare:
+        print(format_comparison(load_results(options.compare), results))
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,55 @@
+# Benchmark the mesh point reads
+#
+# Time of mesh_funcs.get_points, copied from the float buffer of the API 1.0, against the conversion
+# of the API 2.0 MPointArray point by point (mesh_funcs.get_point_array), in object and world space.
+# Run with mayapy from the folder containing cloth_setup :
+#     mayapy -m cloth_setup.benchmarks.bench_get_points
+
+import time
+
+try:
+    import maya.standalone
+    maya.standalone.initialize()
+except RuntimeError:
+    pass
+
+from maya.api import OpenMaya as om
+from maya import cmds
+import numpy as np
+
+from ..funcs.mesh_funcs import get_mesh_fn, get_point_array, get_points
+
+
+# sphere subdivisions of about 100k, 250k, 500k and 1M vertices
+SUBDIVISIONS = (317, 500, 708, 1000)
+REPEAT = 3
+
+
+def best_time(func, *args) -> float:
+    best: float = float('inf')
+    for _ in range(REPEAT):
+        start: float = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+
+    return best
+
+
+def main() -> None:
+    print(f'{"vertices":>10} {"space":>7} {"buffer (ms)":>12} {"MPointArray (ms)":>17} {"speedup":>8}')
+
+    for subdivisions in SUBDIVISIONS:
+        cmds.file(new = True, force = True)
+        mesh: str = cmds.polySphere(subdivisionsAxis = subdivisions, subdivisionsHeight = subdivisions)[0]
+        cmds.move(1.0, 2.0, 3.0, mesh)
+        vertices: int = cmds.polyEvaluate(mesh, vertex = True)
+
+        for space, space_name in ((om.MSpace.kObject, 'object'), (om.MSpace.kWorld, 'world')):
+            assert np.allclose(get_points(mesh, space), get_point_array(get_mesh_fn(mesh), space), atol = 1e-5)
+            buffer: float = best_time(get_points, mesh, space)
+            point_array: float = best_time(get_point_array, get_mesh_fn(mesh), space)
+            print(f'{vertices:>10} {space_name:>7} {1000.0 * buffer:>12.1f} {1000.0 * point_array:>17.1f} {point_array / buffer:>8.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+# Benchmark the NumPy wrap engine
+#
+# Pure NumPy, runs without Maya from the folder containing cloth_setup :
+#     python -m cloth_setup.benchmarks.bench_np_wrap
+
+import time
+
+import numpy as np
+
+from ..core.topology import triangulate
+from ..core.wrap import apply, bind
+
+
+# (driver grid resolution, driven grid resolution)
+SIZES = ((20, 100), (40, 300), (60, 700))
+REPEAT = 5
+
+
+def grid_mesh(resolution: int, height: float = 0.0) -> tuple:
+    """
+    Create a flat quad grid as raw arrays.
+
+    Returns:
+        tuple: The points, polygon counts and polygon connects.
+    """
+
+    xs, ys = np.meshgrid(np.linspace(0.0, 1.0, resolution), np.linspace(0.0, 1.0, resolution))
+    points = np.stack([xs.ravel(), ys.ravel(), np.full(resolution * resolution, height)], axis = 1)
+
+    rows, columns = np.meshgrid(np.arange(resolution - 1), np.arange(resolution - 1), indexing = 'ij')
+    first = (rows * resolution + columns).ravel()
+    polygon_connects = np.stack([first, first + 1, first + resolution + 1, first + resolution], axis = 1).ravel()
+
+    return points, np.full(len(first), 4), polygon_connects
+
+
+def main() -> None:
+    print(f'{"driver":>8} {"driven":>8} {"bind (s)":>10} {"apply (ms)":>11}')
+
+    for driver_resolution, driven_resolution in SIZES:
+        driver_points, driver_counts, driver_connects = grid_mesh(driver_resolution)
+        driven_points, _, _ = grid_mesh(driven_resolution, height = 0.01)
+        driver_triangles, _ = triangulate(driver_counts, driver_connects)
+
+        start: float = time.perf_counter()
+        binding: dict = bind(driven_points, driver_points, driver_triangles)
+        bind_time: float = time.perf_counter() - start
+
+        posed_points = driver_points + np.sin(driver_points[:, [1, 2, 0]] * 6.0) * 0.05
+        apply_time: float = float('inf')
+        for _ in range(REPEAT):
+            start = time.perf_counter()
+            apply(posed_points, binding)
+            apply_time = min(apply_time, time.perf_counter() - start)
+
+        print(f'{len(driver_points):>8} {len(driven_points):>8} {bind_time:>10.3f} {apply_time * 1000.0:>11.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+# Benchmark the output stage
+#
+# Per frame cost of the 'skin' output stage (blendShape and skinCluster on the output mesh)
+# against the 'transform' one (direct connection and offsetParentMatrix), see cloth_funcs.drive_output_mesh.
+# Run with mayapy from the folder containing cloth_setup :
+#     mayapy -m cloth_setup.benchmarks.bench_output_stage
+
+import time
+
+try:
+    import maya.standalone
+    maya.standalone.initialize()
+except RuntimeError:
+    pass
+
+from maya.api import OpenMaya as om
+from maya import cmds
+
+from ..funcs.api_funcs import get_dag_path
+from ..funcs.cloth_funcs import OUTPUT_GRP, drive_output_mesh, duplicate_mesh, ensure_cloth_groups, ensure_control_joint_output
+
+
+# sphere subdivisions of about 100k, 250k, 500k and 1M vertices
+SUBDIVISIONS = (317, 500, 708, 1000)
+FRAMES = 20
+REPEAT = 3
+
+
+def create_high_mesh(subdivisions: int) -> str:
+    """
+    Create a sphere with an animated bend deformer, so every frame evaluates new points like a wrapped high mesh.
+    """
+
+    mesh: str = cmds.polySphere(subdivisionsAxis = subdivisions, subdivisionsHeight = subdivisions, name = f'bench_{subdivisions}')[0]
+    bend: str = cmds.nonLinear(mesh, type = 'bend')[0]
+    cmds.setKeyframe(bend, attribute = 'curvature', time = 1, value = 0.0)
+    cmds.setKeyframe(bend, attribute = 'curvature', time = FRAMES, value = 90.0)
+
+    return mesh
+
+
+def time_frames(mesh: str) -> float:
+    """
+    Get the best mean time per frame to step time and pull the world points of a mesh.
+    """
+
+    mesh_fn = om.MFnMesh(get_dag_path(mesh).extendToShape())
+    best: float = float('inf')
+    for _ in range(REPEAT):
+        start: float = time.perf_counter()
+        for frame in range(1, FRAMES + 1):
+            cmds.currentTime(frame)
+            mesh_fn.getPoints(om.MSpace.kWorld)
+        best = min(best, (time.perf_counter() - start) / FRAMES)
+
+    return best
+
+
+def main() -> None:
+    print(f'{"vertices":>10} {"high (ms)":>10} {"skin (ms)":>10} {"transform (ms)":>15} {"saved (ms)":>11}')
+
+    for subdivisions in SUBDIVISIONS:
+        cmds.file(new = True, force = True)
+        cmds.playbackOptions(minTime = 1, maxTime = FRAMES)
+        groups: dict = ensure_cloth_groups()
+        jnt: str = ensure_control_joint_output()
+
+        high_mesh: str = create_high_mesh(subdivisions)
+        vertices: int = cmds.polyEvaluate(high_mesh, vertex = True)
+
+        timings = {'high': time_frames(high_mesh)}
+        for output_mode in ('skin', 'transform'):
+            output_mesh: str = duplicate_mesh(high_mesh, f'outputMesh_{output_mode}')
+            cmds.parent(output_mesh, groups[OUTPUT_GRP])
+            drive_output_mesh(high_mesh, output_mesh, jnt, output_mode = output_mode)
+            timings[output_mode] = time_frames(output_mesh)
+
+        # the output stage cost is what pulling the output mesh adds to the high mesh evaluation
+        skin: float = 1000.0 * (timings['skin'] - timings['high'])
+        transform: float = 1000.0 * (timings['transform'] - timings['high'])
+        print(f'{vertices:>10} {1000.0 * timings["high"]:>10.2f} {skin:>10.2f} {transform:>15.2f} {skin - transform:>11.2f}')
+
+
+if __name__ == '__main__':
+    main()
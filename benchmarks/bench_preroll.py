@@ -0,0 +1,63 @@
+# Benchmark set_preroll
+#
+# Run with mayapy from the folder containing cloth_setup :
+#     mayapy -m cloth_setup.benchmarks.bench_preroll
+
+import time
+
+try:
+    import maya.standalone
+    maya.standalone.initialize()
+except RuntimeError:
+    pass
+
+from maya import cmds
+
+from ..funcs.preroll_funcs import set_preroll
+
+
+CONTROLER_COUNTS = (10, 100, 300)
+EXTRA_ATTRIBUTES = 10
+PREROLL_VALUES = [1001.0, -25.0, -125.0, -150.0]
+
+
+def create_rig(controler_count: int) -> list:
+    """
+    Create animated controlers with the TRS channels and some extra keyable attributes.
+    """
+
+    cmds.file(new = True, force = True)
+    cmds.playbackOptions(minTime = 1001, maxTime = 1100)
+
+    controlers = []
+    for i in range(controler_count):
+        ctrl: str = cmds.circle(name = f'CTRL_{i}', constructionHistory = False)[0]
+        for j in range(EXTRA_ATTRIBUTES):
+            cmds.addAttr(ctrl, longName = f'extra{j}', keyable = True)
+
+        cmds.setKeyframe(ctrl, time = 1001, value = 1.0)
+        cmds.setKeyframe(ctrl, time = 1100, value = 2.0)
+        controlers.append(ctrl)
+
+    return controlers
+
+
+def time_preroll(controler_count: int, bulk: bool) -> float:
+    controlers: list = create_rig(controler_count)
+    start: float = time.perf_counter()
+    set_preroll(controlers, PREROLL_VALUES, update_nucleus = False, bulk = bulk)
+
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    print(f'{"controlers":>10} {"scrub (s)":>10} {"bulk (s)":>10} {"speedup":>8}')
+
+    for controler_count in CONTROLER_COUNTS:
+        legacy: float = time_preroll(controler_count, bulk = False)
+        bulk: float = time_preroll(controler_count, bulk = True)
+        print(f'{controler_count:>10} {legacy:>10.3f} {bulk:>10.3f} {legacy / bulk:>8.1f}')
+
+
+if __name__ == '__main__':
+    main()
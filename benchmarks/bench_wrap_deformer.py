@@ -0,0 +1,82 @@
+# Benchmark the wrap deformers
+#
+# Per frame cost of the clothSetupWrap deformer ('npwrap') against cvWrap and the Maya wrap, see cloth_funcs.apply_wrap,
+# with the cost of the MPointArray / NumPy copies the Python deformer pays on every frame.
+# Run with mayapy from the folder containing cloth_setup :
+#     mayapy -m cloth_setup.benchmarks.bench_wrap_deformer
+
+import time
+
+try:
+    import maya.standalone
+    maya.standalone.initialize()
+except RuntimeError:
+    pass
+
+from maya.api import OpenMaya as om
+from maya import cmds
+import numpy as np
+
+from ..funcs.cloth_funcs import apply_wrap
+from .bench_output_stage import FRAMES, create_high_mesh, time_frames
+
+
+# driven sphere subdivisions of about 10k, 100k and 250k vertices, wrapped on a 2.5k vertex driver
+SUBDIVISIONS = (100, 317, 500)
+DRIVER_SUBDIVISIONS = 50
+WRAP_NODES = ('npwrap', 'cvwrap', 'wrap')
+REPEAT = 3
+
+
+def time_copies(point_count: int) -> float:
+    """
+    Get the best time of one MPointArray to NumPy read and one NumPy to MPointArray write of point_count points.
+    """
+
+    point_array = om.MPointArray(np.random.default_rng(0).random((point_count, 3)).tolist())
+    best: float = float('inf')
+    for _ in range(REPEAT):
+        start: float = time.perf_counter()
+        points = np.array(point_array)[:, :3]
+        om.MPointArray(points.tolist())
+        best = min(best, time.perf_counter() - start)
+
+    return best
+
+
+def wrap_available(wrap_node: str) -> bool:
+    if wrap_node != 'cvwrap':
+        return True
+
+    try:
+        cmds.loadPlugin('cvwrap', quiet = True)
+    except RuntimeError:
+        return False
+
+    return True
+
+
+def main() -> None:
+    wrap_nodes = [wrap_node for wrap_node in WRAP_NODES if wrap_available(wrap_node)]
+    print(f'{"vertices":>10} {"copies (ms)":>12} ' + ' '.join(f'{wrap_node + " (ms)":>13}' for wrap_node in wrap_nodes))
+
+    for subdivisions in SUBDIVISIONS:
+        timings = {}
+        for wrap_node in wrap_nodes:
+            cmds.file(new = True, force = True)
+            cmds.playbackOptions(minTime = 1, maxTime = FRAMES)
+
+            low_mesh: str = create_high_mesh(DRIVER_SUBDIVISIONS)
+            high_mesh: str = cmds.polySphere(subdivisionsAxis = subdivisions, subdivisionsHeight = subdivisions, radius = 1.01)[0]
+            vertices: int = cmds.polyEvaluate(high_mesh, vertex = True)
+            apply_wrap(high_mesh, low_mesh, wrap_node)
+
+            # the wrap cost is what pulling the wrapped mesh adds to the driver evaluation
+            timings[wrap_node] = time_frames(high_mesh) - time_frames(low_mesh)
+
+        copies: float = 1000.0 * time_copies(vertices)
+        print(f'{vertices:>10} {copies:>12.2f} ' + ' '.join(f'{1000.0 * timings[wrap_node]:>13.2f}' for wrap_node in wrap_nodes))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,616 @@
+# Fake maya.api.OpenMaya
+#
+# The subset of OpenMaya API 2.0 used by cloth_setup, on top of the fake scene.
+
+from .scene import ANIM_CURVE_TYPES, GEOMETRY_FILTER_TYPES, RECORDER, SCENE, SHAPE_TYPES, TRANSFORM_TYPES, Node, normalize_attribute
+
+
+class MFn:
+    kDependencyNode = 'dependNode'
+    kDagNode = 'dagNode'
+    kTransform = 'transform'
+    kMesh = 'mesh'
+    kAnimCurve = 'animCurve'
+    kGeometryFilt = 'geometryFilter'
+    kUnitAttribute = 'unitAttribute'
+    kNumericAttribute = 'numericAttribute'
+
+
+def node_has_fn(node: Node, fn: str) -> bool:
+    if node is None:
+        return False
+
+    if fn == MFn.kDependencyNode:
+        return True
+    if fn == MFn.kDagNode:
+        return node.is_dag
+    if fn == MFn.kTransform:
+        return node.type in TRANSFORM_TYPES
+    if fn == MFn.kMesh:
+        return node.type == 'mesh'
+    if fn == MFn.kAnimCurve:
+        return node.type in ANIM_CURVE_TYPES
+    if fn == MFn.kGeometryFilt:
+        return node.type in GEOMETRY_FILTER_TYPES
+
+    return node.type == fn
+
+
+class MSpace:
+    kInvalid = 0
+    kTransform = 1
+    kPreTransform = 2
+    kPostTransform = 3
+    kWorld = 4
+    kObject = kPreTransform
+
+
+class MObject:
+    kNullObj = None
+
+    def __init__(self, node: Node = None):
+        self.node = node
+
+    def isNull(self) -> bool:
+        return self.node is None
+
+    def hasFn(self, fn) -> bool:
+        return node_has_fn(self.node, fn)
+
+    def apiTypeStr(self) -> str:
+        return self.node.type if self.node is not None else 'kInvalid'
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, MObject) and other.node is self.node
+
+    def __hash__(self) -> int:
+        return id(self.node)
+
+
+MObject.kNullObj = MObject()
+
+
+class MObjectHandle:
+
+    def __init__(self, obj: MObject):
+        self.obj = obj
+
+    def isValid(self) -> bool:
+        return not self.obj.isNull()
+
+    def isAlive(self) -> bool:
+        return self.obj.node is not None and self.obj.node.alive
+
+    def hashCode(self) -> int:
+        return id(self.obj.node)
+
+    def object(self) -> MObject:
+        return self.obj
+
+
+class MAttribute(MObject):
+
+    def __init__(self, node: Node, attribute: str):
+        super().__init__(node)
+        self.spec = node.attribute(attribute)
+
+    def hasFn(self, fn) -> bool:
+        if fn == MFn.kUnitAttribute:
+            return self.spec is not None and self.spec.unit is not None
+
+        return fn == MFn.kNumericAttribute and self.spec is not None and self.spec.kind in ('double', 'bool', 'long')
+
+
+class MFnUnitAttribute:
+    kInvalid = 0
+    kAngle = 1
+    kDistance = 2
+    kTime = 3
+
+    def __init__(self, attribute: MAttribute):
+        self.spec = attribute.spec
+
+    def unitType(self) -> int:
+        return {'angle': self.kAngle, 'distance': self.kDistance}.get(self.spec.unit, self.kInvalid)
+
+
+class MAngle:
+    kInvalid = 0
+    kRadians = 1
+    kDegrees = 2
+
+    def __init__(self, value: float = 0.0, unit: int = kRadians):
+        self.value = value
+        self.unit = unit
+
+    @staticmethod
+    def uiUnit() -> int:
+        return MAngle.kDegrees
+
+    def asRadians(self) -> float:
+        return self.value * 0.017453292519943295 if self.unit == self.kDegrees else self.value
+
+    def asDegrees(self) -> float:
+        return self.value if self.unit == self.kDegrees else self.value * 57.29577951308232
+
+
+class MTime:
+    kSeconds = 2
+    kFilm = 6
+    k24FPS = 6
+
+    def __init__(self, value: float = 0.0, unit: int = kFilm):
+        self.value = float(value)
+        self.unit = unit
+
+    @staticmethod
+    def uiUnit() -> int:
+        return MTime.kFilm
+
+    def asUnits(self, unit: int) -> float:
+        if unit == self.unit:
+            return self.value
+        # seconds and 24 fps frames only
+        return self.value * 24.0 if self.unit == MTime.kSeconds else self.value / 24.0
+
+
+class MTimeArray(list):
+    pass
+
+
+class MDGContext:
+    kNormal = None
+
+    def __init__(self, time: MTime = None):
+        self.time = time
+
+    def getTime(self) -> MTime:
+        return self.time
+
+
+class MPoint(tuple):
+
+    def __new__(cls, x: float = 0.0, y: float = 0.0, z: float = 0.0, w: float = 1.0):
+        return super().__new__(cls, (float(x), float(y), float(z), float(w)))
+
+
+class MPointArray(list):
+    pass
+
+
+class MIntArray(list):
+    pass
+
+
+class MVectorArray(list):
+    pass
+
+
+class MMatrix(tuple):
+    pass
+
+
+class MTransformationMatrix:
+
+    def __init__(self, values: dict = None):
+        self.values = dict(values or {})
+
+
+class MPlug:
+
+    def __init__(self, node: Node = None, attribute: str = None):
+        self.node_ = node
+        self.attribute_ = normalize_attribute(attribute) if attribute else None
+
+    @property
+    def isNull(self) -> bool:
+        return self.node_ is None
+
+    @property
+    def isArray(self) -> bool:
+        spec = self.node_.attribute(self.attribute_)
+        return spec is not None and spec.multi and '[' not in self.attribute_
+
+    @property
+    def isCompound(self) -> bool:
+        spec = self.node_.attribute(self.attribute_)
+        return spec is not None and spec.kind == 'compound'
+
+    @property
+    def isElement(self) -> bool:
+        return '[' in self.attribute_
+
+    @property
+    def isLocked(self) -> bool:
+        return self.attribute_ in self.node_.locked
+
+    @property
+    def isConnected(self) -> bool:
+        key: tuple = (self.node_, self.attribute_)
+        return key in SCENE.sources or key in SCENE.destinations
+
+    @property
+    def isDestination(self) -> bool:
+        return (self.node_, self.attribute_) in SCENE.sources
+
+    @property
+    def isSource(self) -> bool:
+        return (self.node_, self.attribute_) in SCENE.destinations
+
+    def name(self) -> str:
+        return f'{self.node_.name}.{self.attribute_}'
+
+    def partialName(self, *args, **kwargs) -> str:
+        return self.attribute_
+
+    def node(self) -> MObject:
+        return MObject(self.node_)
+
+    def attribute(self) -> MAttribute:
+        return MAttribute(self.node_, self.attribute_)
+
+    def source(self) -> 'MPlug':
+        source: tuple = SCENE.sources.get((self.node_, self.attribute_))
+        return MPlug(*source) if source is not None else MPlug()
+
+    def destinations(self) -> list:
+        return [MPlug(*destination) for destination in SCENE.destinations.get((self.node_, self.attribute_), [])]
+
+    def elementByLogicalIndex(self, index: int) -> 'MPlug':
+        return MPlug(self.node_, f'{self.attribute_}[{index}]')
+
+    def getExistingArrayAttributeIndices(self) -> list:
+        return SCENE.element_indices(self.node_, self.attribute_)
+
+    def asDouble(self, context: MDGContext = None) -> float:
+        frame: float = context.time.value if context is not None and context.time is not None else None
+        return float(SCENE.get_value(self.node_, self.attribute_, frame))
+
+    def asFloat(self, context: MDGContext = None) -> float:
+        return self.asDouble(context)
+
+    def asInt(self, context: MDGContext = None) -> int:
+        return int(self.asDouble(context))
+
+    def asBool(self, context: MDGContext = None) -> bool:
+        return bool(self.asDouble(context))
+
+    def asString(self, context: MDGContext = None) -> str:
+        return str(SCENE.get_value(self.node_, self.attribute_))
+
+    def setDouble(self, value: float) -> None:
+        SCENE.set_value(self.node_, self.attribute_, float(value))
+
+    def setString(self, value: str) -> None:
+        SCENE.set_value(self.node_, self.attribute_, value)
+
+    def setMObject(self, data) -> None:
+        SCENE.set_value(self.node_, self.attribute_, data.value)
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, MPlug) and other.node_ is self.node_ and other.attribute_ == self.attribute_
+
+    def __hash__(self) -> int:
+        return hash((id(self.node_), self.attribute_))
+
+
+class MDagPath:
+
+    def __init__(self, node: Node = None):
+        self.node_ = node
+
+    def node(self) -> MObject:
+        return MObject(self.node_)
+
+    def transform(self) -> MObject:
+        return MObject(self.node_ if not self.node_.is_shape else self.node_.parent)
+
+    def hasFn(self, fn) -> bool:
+        return node_has_fn(self.node_, fn)
+
+    def extendToShape(self) -> 'MDagPath':
+        shapes: list = self.node_.shapes(intermediate = False)
+        if not shapes:
+            raise RuntimeError(f'{self.node_.name} has no shape.')
+
+        self.node_ = shapes[0]
+
+        return self
+
+    def partialPathName(self) -> str:
+        return self.node_.name
+
+    def fullPathName(self) -> str:
+        return self.node_.full_path()
+
+    def inclusiveMatrix(self) -> MMatrix:
+        return MMatrix((1.0, 0.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 0.0, 1.0))
+
+
+class MSelectionList:
+
+    def __init__(self):
+        self.items = []
+
+    def add(self, name: str) -> 'MSelectionList':
+        if isinstance(name, str) and '.' in name:
+            node_name, attribute = name.split('.', 1)
+            node: Node = SCENE.find(node_name)
+            if node is None or node.attribute(attribute) is None:
+                raise RuntimeError('(kInvalidParameter): Object does not exist')
+            self.items.append(MPlug(node, attribute))
+            return self
+
+        node: Node = SCENE.find(name)
+        if node is None:
+            raise RuntimeError('(kInvalidParameter): Object does not exist')
+
+        self.items.append(node)
+
+        return self
+
+    def length(self) -> int:
+        return len(self.items)
+
+    def getDependNode(self, index: int) -> MObject:
+        item = self.items[index]
+        return item.node() if isinstance(item, MPlug) else MObject(item)
+
+    def getDagPath(self, index: int) -> MDagPath:
+        item = self.items[index]
+        if not isinstance(item, Node) or not item.is_dag:
+            raise TypeError('(kInvalidParameter): Object is not a DAG node')
+
+        return MDagPath(item)
+
+    def getPlug(self, index: int) -> MPlug:
+        return self.items[index]
+
+
+class MFnBase:
+
+    def __init__(self, obj = None):
+        self.node_ = None
+        if obj is not None:
+            self.setObject(obj)
+
+    def setObject(self, obj) -> None:
+        self.node_ = obj.node_ if isinstance(obj, MDagPath) else obj.node
+
+    def object(self) -> MObject:
+        return MObject(self.node_)
+
+
+class MFnDependencyNode(MFnBase):
+
+    def name(self) -> str:
+        return self.node_.name
+
+    def typeName(self) -> str:
+        return self.node_.type
+
+    def hasAttribute(self, attribute: str) -> bool:
+        return self.node_.attribute(attribute) is not None
+
+    def findPlug(self, attribute: str, want_networked_plug: bool = False) -> MPlug:
+        if self.node_.attribute(attribute) is None:
+            raise RuntimeError(f'(kInvalidParameter): No attribute {attribute} on {self.node_.name}')
+
+        return MPlug(self.node_, attribute)
+
+
+class MFnDagNode(MFnDependencyNode):
+
+    def partialPathName(self) -> str:
+        return self.node_.name
+
+    def fullPathName(self) -> str:
+        return self.node_.full_path()
+
+    def getPath(self) -> MDagPath:
+        return MDagPath(self.node_)
+
+    def parent(self, index: int = 0) -> MObject:
+        return MObject(self.node_.parent)
+
+    def childCount(self) -> int:
+        return len(self.node_.children)
+
+    def child(self, index: int) -> MObject:
+        return MObject(self.node_.children[index])
+
+
+class MFnTransform(MFnDagNode):
+
+    def transformation(self) -> MTransformationMatrix:
+        return MTransformationMatrix({key: value for key, value in self.node_.values.items() if key[:-1] in ('translate', 'rotate', 'scale')})
+
+    def setTransformation(self, transformation: MTransformationMatrix) -> None:
+        self.node_.values.update(transformation.values)
+
+
+class MFnMesh(MFnDagNode):
+
+    def create(self, points, polygon_counts, polygon_connects, uValues = None, vValues = None, parent: MObject = MObject.kNullObj) -> MObject:
+        parent_node: Node = parent.node if parent is not None else None
+        transform: Node = parent_node or SCENE.create_node('transform', 'polySurface1')
+        self.node_ = SCENE.create_mesh(transform.name, points, polygon_counts, polygon_connects, parent = transform)
+
+        return MObject(transform if parent_node is None else self.node_)
+
+    def setName(self, name: str) -> str:
+        return SCENE.rename(self.node_, name)
+
+    @property
+    def numVertices(self) -> int:
+        return len(self.node_.points)
+
+    @property
+    def numPolygons(self) -> int:
+        return len(self.node_.counts)
+
+    def getPoints(self, space: int = MSpace.kObject) -> MPointArray:
+        RECORDER.add('api:MFnMesh.getPoints', 0.0)
+        import numpy as np
+        points = self.node_.points
+        return MPointArray(map(tuple, np.hstack([points, np.ones((len(points), 1))]).tolist()))
+
+    def setPoints(self, points, space: int = MSpace.kObject) -> None:
+        import numpy as np
+        self.node_.points = np.array([point[:3] for point in points], dtype = np.float64)
+
+    def getVertices(self) -> tuple:
+        return MIntArray(self.node_.counts.tolist()), MIntArray(self.node_.connects.tolist())
+
+    def numUVs(self, uv_set: str = None) -> int:
+        return 0
+
+    def currentUVSetName(self, instance: int = -1) -> str:
+        return 'map1'
+
+    def getUVs(self, uv_set: str = None) -> tuple:
+        return [], []
+
+    def getAssignedUVs(self, uv_set: str = None) -> tuple:
+        return [], []
+
+    def setUVs(self, u_values, v_values, uv_set: str = None) -> None:
+        pass
+
+    def assignUVs(self, uv_counts, uv_ids, uv_set: str = None) -> None:
+        pass
+
+
+class MFnVectorArrayData:
+
+    def create(self, vectors) -> 'MFnVectorArrayData':
+        self.value = [tuple(vector) for vector in vectors]
+        return self
+
+
+class MDGModifier:
+    """
+    Operations are queued and run on doIt. Nodes are created right away, like the
+    pending nodes of a real modifier, and deleted again by undoIt.
+    """
+
+    def __init__(self):
+        self.operations = []
+        self.undo_operations = []
+        self.created = []
+
+    def createNode(self, node_type: str, parent: MObject = None) -> MObject:
+        node: Node = SCENE.create_node(node_type, parent = parent.node if parent is not None else None)
+        self.created.append(node)
+
+        return MObject(node)
+
+    def renameNode(self, obj: MObject, name: str) -> None:
+        node: Node = obj.node
+        self.operations.append(lambda: self.undo_operations.append((SCENE.rename, node, node.name)) or SCENE.rename(node, name))
+
+    def reparentNode(self, obj: MObject, parent: MObject = None) -> None:
+        node: Node = obj.node
+        parent_node: Node = parent.node if parent is not None else None
+        self.operations.append(lambda: self.undo_operations.append((SCENE.reparent, node, node.parent)) or SCENE.reparent(node, parent_node))
+
+    def connect(self, source: MPlug, destination: MPlug) -> None:
+        source_key: tuple = (source.node_, source.attribute_)
+        destination_key: tuple = (destination.node_, destination.attribute_)
+        self.operations.append(lambda: self.undo_operations.append((SCENE.disconnect, source_key, destination_key)) or SCENE.connect(source_key, destination_key))
+
+    def disconnect(self, source: MPlug, destination: MPlug) -> None:
+        source_key: tuple = (source.node_, source.attribute_)
+        destination_key: tuple = (destination.node_, destination.attribute_)
+        self.operations.append(lambda: self.undo_operations.append((SCENE.connect, source_key, destination_key)) or SCENE.disconnect(source_key, destination_key))
+
+    def newPlugValueDouble(self, plug: MPlug, value: float) -> None:
+        self.operations.append(lambda: plug.setDouble(value))
+
+    def newPlugValueString(self, plug: MPlug, value: str) -> None:
+        self.operations.append(lambda: plug.setString(value))
+
+    def deleteNode(self, obj: MObject) -> None:
+        node: Node = obj.node
+        self.operations.append(lambda: SCENE.delete(node))
+
+    def doIt(self) -> None:
+        for operation in self.operations:
+            operation()
+
+    def undoIt(self) -> None:
+        for func, *args in reversed(self.undo_operations):
+            func(*args)
+
+        self.undo_operations = []
+        for node in reversed(self.created):
+            SCENE.delete(node)
+
+
+class MDagModifier(MDGModifier):
+    pass
+
+
+class MGlobal:
+    kInteractive = 0
+    kBatch = 1
+    kLibraryApp = 2
+
+    messages = []
+
+    @staticmethod
+    def displayInfo(message: str) -> None:
+        RECORDER.add('api:MGlobal.displayInfo', 0.0)
+
+    @staticmethod
+    def displayWarning(message: str) -> None:
+        MGlobal.messages.append(('warning', message))
+
+    @staticmethod
+    def displayError(message: str) -> None:
+        MGlobal.messages.append(('error', message))
+
+    @staticmethod
+    def mayaState() -> int:
+        return MGlobal.kLibraryApp
+
+
+class MMessage:
+
+    @staticmethod
+    def removeCallback(callback_id: int) -> None:
+        SCENE.remove_callback(callback_id)
+
+    @staticmethod
+    def removeCallbacks(callback_ids) -> None:
+        for callback_id in callback_ids:
+            SCENE.remove_callback(callback_id)
+
+
+class MDGMessage(MMessage):
+
+    @staticmethod
+    def addNodeAddedCallback(func, node_type: str = 'dependNode', client_data = None) -> int:
+        return SCENE.add_callback('node_added', func)
+
+    @staticmethod
+    def addNodeRemovedCallback(func, node_type: str = 'dependNode', client_data = None) -> int:
+        return SCENE.add_callback('node_removed', func)
+
+    @staticmethod
+    def addTimeChangeCallback(func, client_data = None) -> int:
+        return SCENE.add_callback('time_changed', func)
+
+
+class MSceneMessage(MMessage):
+    kAfterNew = 'afterNew'
+    kAfterOpen = 'afterOpen'
+    kAfterImport = 'afterImport'
+    kAfterCreateReference = 'afterCreateReference'
+    kAfterLoadReference = 'afterLoadReference'
+    kBeforeSave = 'beforeSave'
+
+    @staticmethod
+    def addCallback(message: str, func, client_data = None) -> int:
+        return SCENE.add_callback('scene', func, message)
+
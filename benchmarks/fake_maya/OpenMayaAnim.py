@@ -0,0 +1,109 @@
+# Fake maya.api.OpenMayaAnim
+
+from .OpenMaya import MObject, MPlug
+from .scene import RECORDER, SCENE, Node
+
+
+def curve_type(plug: MPlug) -> str:
+    spec = plug.node_.attribute(plug.attribute_)
+    if spec is not None and spec.unit == 'angle':
+        return 'animCurveTA'
+    if plug.attribute_.startswith('translate'):
+        return 'animCurveTL'
+
+    return 'animCurveTU'
+
+
+class MAnimCurveChange:
+    """
+    Keep the previous keys of the edited curves so undoIt can restore them.
+    """
+
+    def __init__(self):
+        self.previous = []
+        self.edited = []
+
+    def undoIt(self) -> None:
+        for node, keys in self.previous:
+            self.edited.append((node, dict(node.keys)))
+            node.keys = keys
+
+    def redoIt(self) -> None:
+        for node, keys in self.edited:
+            node.keys = keys
+
+        self.edited = []
+
+
+class MFnAnimCurve:
+    kTangentGlobal = 0
+    kTangentFixed = 1
+    kTangentLinear = 2
+    kTangentFlat = 3
+    kTangentSmooth = 4
+    kTangentStep = 5
+    kTangentAuto = 18
+
+    def __init__(self, obj: MObject = None):
+        self.node_ = obj.node if obj is not None else None
+
+    def setObject(self, obj: MObject) -> None:
+        self.node_ = obj.node
+
+    def create(self, plug: MPlug, animCurveType: int = None, modifier = None) -> MObject:
+        name: str = f'{plug.node_.name}_{plug.attribute_}'
+        if modifier is not None:
+            obj: MObject = modifier.createNode(curve_type(plug))
+            modifier.renameNode(obj, name)
+            modifier.connect(MPlug(obj.node, 'output'), plug)
+        else:
+            obj = MObject(SCENE.create_node(curve_type(plug), name))
+            SCENE.connect((obj.node, 'output'), (plug.node_, plug.attribute_))
+
+        self.node_ = obj.node
+
+        return obj
+
+    @property
+    def numKeys(self) -> int:
+        return len(self.node_.keys)
+
+    def addKey(self, time, value: float, tangentInType: int = kTangentGlobal, tangentOutType: int = kTangentGlobal, change: MAnimCurveChange = None) -> int:
+        self.addKeys([time], [value], change = change)
+
+        return len(self.node_.keys) - 1
+
+    def addKeys(
+        self,
+        times: list,
+        values: list,
+        tangentInType: int = kTangentGlobal,
+        tangentOutType: int = kTangentGlobal,
+        keepExistingKeys: bool = False,
+        change: MAnimCurveChange = None
+    ) -> None:
+        RECORDER.add('api:MFnAnimCurve.addKeys', 0.0)
+        node: Node = self.node_
+        if change is not None:
+            change.previous.append((node, dict(node.keys)))
+
+        if not keepExistingKeys:
+            node.keys = {}
+
+        for time, value in zip(times, values):
+            node.keys[time.value] = float(value)
+
+
+class MAnimUtil:
+
+    @staticmethod
+    def findAnimation(plug: MPlug) -> list:
+        source: tuple = SCENE.sources.get((plug.node_, plug.attribute_))
+        if source is not None and source[0].keys is not None:
+            return [MObject(source[0])]
+
+        return []
+
+    @staticmethod
+    def isAnimated(obj, check_parent: bool = False) -> bool:
+        return any(node.keys is not None for node in SCENE.connected_nodes(obj.node, destination = False))
@@ -0,0 +1,86 @@
+# Fake maya
+#
+# In-memory stand-in for maya.cmds, maya.mel and maya.api.OpenMaya / OpenMayaAnim,
+# faithful enough to run the cloth_setup funcs outside Maya. Call install() before
+# importing cloth_setup.funcs. Timings measure the Python side of the funcs and the
+# call counts show how many Maya commands they issue, not how long Maya would take.
+
+import sys
+import types
+
+from .scene import RECORDER, SCENE, Recorder, Scene
+
+
+def install() -> types.ModuleType:
+    """
+    Register the fake modules as the maya package.
+
+    Returns:
+        types.ModuleType: The fake maya package.
+    """
+
+    from . import OpenMaya, OpenMayaAnim, cmds, mel
+
+    api = types.ModuleType('maya.api')
+    api.OpenMaya = OpenMaya
+    api.OpenMayaAnim = OpenMayaAnim
+
+    utils = types.ModuleType('maya.utils')
+    utils.deferred = []
+    utils.executeDeferred = lambda func, *args, **kwargs: utils.deferred.append((func, args, kwargs))
+
+    standalone = types.ModuleType('maya.standalone')
+    standalone.initialize = lambda *args, **kwargs: None
+    standalone.uninitialize = lambda *args, **kwargs: None
+
+    maya = types.ModuleType('maya')
+    maya.__path__ = []
+    maya.cmds = cmds
+    maya.mel = mel
+    maya.api = api
+    maya.standalone = standalone
+    maya.utils = utils
+
+    sys.modules.update({
+        'maya': maya,
+        'maya.cmds': cmds,
+        'maya.mel': mel,
+        'maya.api': api,
+        'maya.api.OpenMaya': OpenMaya,
+        'maya.api.OpenMayaAnim': OpenMayaAnim,
+        'maya.standalone': standalone,
+        'maya.utils': utils
+    })
+
+    return maya
+
+
+def new_scene() -> Scene:
+    """
+    Empty the fake scene and the recorded calls.
+    """
+
+    from . import cmds
+
+    cmds.file(new = True, force = True)
+    RECORDER.reset()
+
+    return SCENE
+
+
+def run_deferred() -> int:
+    """
+    Run the functions queued with maya.utils.executeDeferred, like Maya does on idle.
+
+    Returns:
+        int: The number of functions run.
+    """
+
+    deferred: list = sys.modules['maya.utils'].deferred
+    count: int = 0
+    while deferred:
+        func, args, kwargs = deferred.pop(0)
+        func(*args, **kwargs)
+        count += 1
+
+    return count
@@ -0,0 +1,653 @@
+# Fake maya.cmds
+#
+# The commands used by cloth_setup on top of the fake scene. Every public command
+# is wrapped by the recorder, which counts its calls and times them.
+
+import fnmatch
+import sys
+import tempfile
+
+import numpy as np
+
+from .scene import ANIM_CURVE_TYPES, RECORDER, SCENE, Attribute, Node, attribute_base, normalize_attribute, split_plug
+
+
+PLUGIN_COMMANDS = {
+    'cloth_setup_plugin': {'nodes': ('clothSetupPointCopy', 'clothSetupWrap')},
+    'cvwrap': {'nodes': ('cvWrap',)}
+}
+
+ATTRIBUTE_KINDS = {
+    'double': 'double', 'float': 'double', 'long': 'long', 'short': 'long', 'bool': 'bool', 'enum': 'long',
+    'doubleAngle': 'double', 'doubleLinear': 'double', 'message': 'message'
+}
+
+
+def _as_list(items) -> list:
+    if items is None:
+        return []
+    if isinstance(items, (list, tuple)):
+        return [item for sub_items in items for item in _as_list(sub_items)]
+
+    return [items]
+
+
+def _result(items: list):
+    # list commands return None when nothing matches, as in Maya
+    return items or None
+
+
+def _name(node: Node, full_path: bool = False) -> str:
+    return node.full_path() if full_path else node.name
+
+
+def _plug(plug: str) -> tuple:
+    node_name, attribute = split_plug(plug)
+    node: Node = SCENE.get(node_name)
+    if node.attribute(attribute) is None and not node.is_shape and node.shapes(intermediate = False):
+        # commands redirect the shape attributes of a transform to its shape
+        node = node.shapes(intermediate = False)[0]
+    if node.attribute(attribute) is None:
+        raise ValueError(f'No object matches name: {plug}')
+
+    return node, normalize_attribute(attribute)
+
+
+def _shape(node: Node) -> Node:
+    if node.is_shape:
+        return node
+
+    shapes: list = node.shapes(intermediate = False)
+    if not shapes:
+        raise RuntimeError(f'{node.name} has no shape.')
+
+    return shapes[0]
+
+
+def _grid(resolution_x: int, resolution_y: int, width: float, height: float) -> tuple:
+    xs, zs = np.meshgrid(np.linspace(-width / 2.0, width / 2.0, resolution_x + 1), np.linspace(-height / 2.0, height / 2.0, resolution_y + 1))
+    points = np.stack([xs.ravel(), np.zeros(xs.size), zs.ravel()], axis = 1)
+
+    rows, columns = np.meshgrid(np.arange(resolution_y), np.arange(resolution_x), indexing = 'ij')
+    first = (rows * (resolution_x + 1) + columns).ravel()
+    connects = np.stack([first, first + 1, first + resolution_x + 2, first + resolution_x + 1], axis = 1).ravel()
+
+    return points, np.full(resolution_x * resolution_y, 4), connects
+
+
+# scene
+
+def about(batch: bool = False, version: bool = False, **kwargs):
+    if version:
+        return '2024'
+
+    return True
+
+
+def file(*args, new: bool = False, force: bool = False, open: bool = False, rename: str = None, save: bool = False, query: bool = False, **kwargs):
+    if new or open:
+        SCENE.new()
+        SCENE.emit('scene', key = 'afterNew' if new else 'afterOpen')
+
+    if rename:
+        return rename
+
+    return args[0] if args else ''
+
+
+def workspace(*args, query: bool = False, rootDirectory: bool = False, **kwargs) -> str:
+    return tempfile.gettempdir()
+
+
+def undoInfo(
+    *args,
+    query: bool = False,
+    state: bool = None,
+    openChunk: bool = False,
+    closeChunk: bool = False,
+    chunkName: str = None,
+    undoName: bool = False,
+    **kwargs
+):
+    if query:
+        if undoName:
+            return SCENE.undo_queue[-1] if SCENE.undo_queue else ''
+        return True
+
+    if openChunk:
+        SCENE.open_chunks.append(chunkName or '')
+    elif closeChunk and SCENE.open_chunks:
+        name: str = SCENE.open_chunks.pop()
+        if not SCENE.open_chunks:
+            SCENE.undo_queue.append(name)
+
+
+def undo(*args, **kwargs) -> None:
+    if SCENE.undo_queue:
+        SCENE.undo_queue.pop()
+
+
+def redo(*args, **kwargs) -> None:
+    pass
+
+
+def refresh(*args, **kwargs) -> None:
+    pass
+
+
+def pluginInfo(name: str, query: bool = False, loaded: bool = False, **kwargs) -> bool:
+    return name in SCENE.plugins
+
+
+def loadPlugin(path: str, quiet: bool = False, **kwargs) -> list:
+    name: str = path.replace('\\', '/').rsplit('/', 1)[-1].rsplit('.', 1)[0]
+    SCENE.plugins.add(name)
+
+    return [name]
+
+
+def clothSetupApplyModifier() -> None:
+    """
+    Apply the next pending modifier, like the command of plugins/cloth_setup_plugin.py.
+    """
+
+    if 'cloth_setup_plugin' not in SCENE.plugins:
+        raise RuntimeError('Unknown command clothSetupApplyModifier, the plugin is not loaded.')
+
+    queue: list = sys.modules['cloth_setup_modifier_queue'].pending
+    if not queue:
+        raise RuntimeError('No pending modifier to apply.')
+
+    queue.pop(0).doIt()
+
+
+# nodes
+
+def createNode(node_type: str, name: str = None, parent: str = None, skipSelect: bool = False, **kwargs) -> str:
+    for plugin, plugin_info in PLUGIN_COMMANDS.items():
+        if node_type in plugin_info['nodes'] and plugin not in SCENE.plugins and plugin != 'cvwrap':
+            raise RuntimeError(f'Unknown node type {node_type}.')
+
+    parent_node: Node = SCENE.get(parent) if parent else None
+
+    return SCENE.create_node(node_type, name, parent_node).name
+
+
+def group(*nodes, empty: bool = False, world: bool = False, name: str = None, parent: str = None, **kwargs) -> str:
+    group_node: Node = SCENE.create_node('transform', name or 'group1', SCENE.get(parent) if parent else None)
+    for node_name in _as_list(nodes):
+        SCENE.reparent(SCENE.get(node_name), group_node)
+
+    return group_node.name
+
+
+def parent(*args, world: bool = False, relative: bool = False, absolute: bool = False, shape: bool = False, **kwargs) -> list:
+    names: list = _as_list(args)
+    if world:
+        children, parent_node = names, None
+    else:
+        children, parent_node = names[:-1], SCENE.get(names[-1])
+
+    for child in children:
+        SCENE.reparent(SCENE.get(child), parent_node)
+
+    return [SCENE.get(child).name for child in children]
+
+
+def rename(node: str, new_name: str, **kwargs) -> str:
+    return SCENE.rename(SCENE.get(node), new_name)
+
+
+def delete(*nodes, **kwargs) -> None:
+    for node_name in _as_list(nodes):
+        node: Node = SCENE.find(node_name)
+        if node is None:
+            raise ValueError(f'No object matches name: {node_name}')
+        SCENE.delete(node)
+
+
+def duplicate(node: str, name: str = None, **kwargs) -> list:
+    source: Node = SCENE.get(node)
+    duplicated: Node = SCENE.duplicate(source, name or source.name, source.parent)
+
+    return [duplicated.name]
+
+
+def objExists(name: str) -> bool:
+    if '.' in name:
+        node_name, attribute = name.split('.', 1)
+        node: Node = SCENE.find(node_name)
+        return node is not None and node.attribute(attribute) is not None
+
+    return SCENE.find(name) is not None
+
+
+def nodeType(node: str, **kwargs) -> str:
+    return SCENE.get(node).type
+
+
+def select(*nodes, clear: bool = False, add: bool = False, replace: bool = True, deselect: bool = False, **kwargs) -> None:
+    if clear:
+        SCENE.selection = []
+        return
+
+    selected: list = [SCENE.get(node_name) for node_name in _as_list(nodes)]
+    if deselect:
+        SCENE.selection = [node for node in SCENE.selection if node not in selected]
+    elif add:
+        SCENE.selection += [node for node in selected if node not in SCENE.selection]
+    else:
+        SCENE.selection = selected
+
+
+def ls(*patterns, selection: bool = False, type = None, long: bool = False, objectsOnly: bool = False, recursive: bool = False, dag: bool = False, transforms: bool = False, shapes: bool = False, **kwargs) -> list:
+    if selection:
+        nodes: list = [node for node in SCENE.selection if node.alive]
+    elif patterns:
+        nodes = []
+        for pattern in _as_list(patterns):
+            node_pattern, _, attribute = pattern.partition('.')
+            matches: list = (
+                [SCENE.nodes[node_pattern]] if node_pattern in SCENE.nodes
+                else [node for name, node in SCENE.nodes.items() if fnmatch.fnmatchcase(name, node_pattern)]
+            )
+            if attribute:
+                matches = [node for node in matches if node.attribute(attribute) is not None]
+            nodes += matches
+    else:
+        nodes = list(SCENE.nodes.values())
+
+    types: list = _as_list(type)
+    if types:
+        nodes = [node for node in nodes if node.type in types]
+    if dag:
+        nodes = [node for node in nodes if node.is_dag]
+    if transforms:
+        nodes = [node for node in nodes if node.is_dag and not node.is_shape]
+    if shapes:
+        nodes = [node for node in nodes if node.is_shape]
+
+    return [_name(node, long) for node in nodes]
+
+
+def listRelatives(
+    node: str = None,
+    shapes: bool = False,
+    parent: bool = False,
+    children: bool = False,
+    fullPath: bool = False,
+    path: bool = False,
+    noIntermediate: bool = False,
+    type = None,
+    allDescendents: bool = False,
+    **kwargs
+) -> list:
+    dag_node: Node = SCENE.get(node) if node else SCENE.selection[0]
+
+    if parent:
+        relatives: list = [dag_node.parent] if dag_node.parent is not None else []
+    elif allDescendents:
+        relatives = []
+        stack: list = list(dag_node.children)
+        while stack:
+            child: Node = stack.pop()
+            relatives.append(child)
+            stack += child.children
+    else:
+        relatives = list(dag_node.children)
+
+    if shapes:
+        relatives = [relative for relative in relatives if relative.is_shape]
+    if noIntermediate:
+        relatives = [relative for relative in relatives if not relative.values.get('intermediateObject', False)]
+
+    types: list = _as_list(type)
+    if types:
+        relatives = [relative for relative in relatives if relative.type in types]
+
+    return _result([_name(relative, fullPath or path) for relative in relatives])
+
+
+def listConnections(
+    node: str,
+    type: str = None,
+    source: bool = True,
+    destination: bool = True,
+    plugs: bool = False,
+    connections: bool = False,
+    shapes: bool = False,
+    skipConversionNodes: bool = False,
+    **kwargs
+) -> list:
+    if '.' in node:
+        dag_node, attribute = _plug(node)
+        keys: list = []
+        if source and (dag_node, attribute) in SCENE.sources:
+            keys.append(SCENE.sources[(dag_node, attribute)])
+        if destination:
+            keys += SCENE.destinations.get((dag_node, attribute), [])
+    else:
+        dag_node = SCENE.get(node)
+        keys = []
+        if source:
+            keys += [source_key for destination_key, source_key in SCENE.sources.items() if destination_key[0] is dag_node]
+        if destination:
+            for source_key, destination_keys in SCENE.destinations.items():
+                if source_key[0] is dag_node:
+                    keys += destination_keys
+
+    if type:
+        keys = [key for key in keys if key[0].type == type]
+
+    if plugs:
+        return _result([f'{key[0].name}.{key[1]}' for key in keys])
+
+    names = []
+    for key in keys:
+        if key[0].name not in names:
+            names.append(key[0].name)
+
+    return _result(names)
+
+
+def connectAttr(source: str, destination: str, force: bool = False, **kwargs) -> None:
+    destination_key: tuple = _plug(destination)
+    if destination_key in SCENE.sources and not force:
+        raise RuntimeError(f'{destination} is already connected.')
+
+    SCENE.connect(_plug(source), destination_key)
+
+
+def disconnectAttr(source: str, destination: str, **kwargs) -> None:
+    SCENE.disconnect(_plug(source), _plug(destination))
+
+
+# attributes
+
+def listAttr(node: str, keyable: bool = False, userDefined: bool = False, **kwargs) -> list:
+    dag_node: Node = SCENE.get(node)
+    names: list = list(dag_node.dynamic) if userDefined else dag_node.attribute_names()
+    if keyable:
+        names = [name for name in names if dag_node.attribute(name).keyable]
+
+    return _result(names)
+
+
+def attributeQuery(attribute: str, node: str, exists: bool = False, keyable: bool = False, listDefault: bool = False, multi: bool = False, **kwargs):
+    spec: Attribute = SCENE.get(node).attribute(attribute)
+    if exists:
+        return spec is not None
+    if spec is None:
+        raise RuntimeError(f'No attribute {attribute} on {node}.')
+    if keyable:
+        return spec.keyable
+    if multi:
+        return spec.multi
+    if listDefault:
+        return [spec.default] if isinstance(spec.default, (int, float)) else None
+
+    return None
+
+
+def addAttr(
+    node: str,
+    longName: str = None,
+    shortName: str = None,
+    dataType: str = None,
+    attributeType: str = 'double',
+    keyable: bool = False,
+    defaultValue: float = 0.0,
+    multi: bool = False,
+    **kwargs
+) -> None:
+    dag_node: Node = SCENE.get(node)
+    if dag_node.attribute(longName) is not None:
+        raise RuntimeError(f'{node} already has an attribute {longName}.')
+
+    kind: str = dataType or ATTRIBUTE_KINDS.get(attributeType, 'double')
+    default = '' if dataType == 'string' else (None if dataType else defaultValue)
+    unit: str = 'angle' if attributeType == 'doubleAngle' else None
+    dag_node.dynamic[longName] = Attribute(longName, kind, default, keyable = keyable, multi = multi, unit = unit)
+
+
+def deleteAttr(node: str, attribute: str = None, **kwargs) -> None:
+    if attribute is None:
+        node, attribute = split_plug(node)
+
+    dag_node: Node = SCENE.get(node)
+    if attribute not in dag_node.dynamic:
+        raise RuntimeError(f'{node}.{attribute} is not a dynamic attribute.')
+
+    del dag_node.dynamic[attribute]
+    dag_node.values.pop(attribute, None)
+
+
+def getAttr(plug: str, time: float = None, **kwargs):
+    node, attribute = _plug(plug)
+    value = SCENE.get_value(node, attribute, time)
+
+    if node.attribute(attribute).kind == 'bool' and value is not None:
+        return bool(value)
+
+    return value
+
+
+def setAttr(plug: str, *values, type: str = None, lock: bool = None, keyable: bool = None, **kwargs) -> None:
+    node, attribute = _plug(plug)
+
+    if lock is not None:
+        if lock:
+            node.locked.add(attribute)
+        else:
+            node.locked.discard(attribute)
+
+    if keyable is not None and attribute_base(attribute) in node.dynamic:
+        node.dynamic[attribute_base(attribute)].keyable = keyable
+
+    if not values:
+        return
+
+    SCENE.set_value(node, attribute, values[0] if len(values) == 1 else list(values))
+
+
+# sets
+
+def sets(*items, empty: bool = False, name: str = None, add: str = None, edit: bool = False, forceElement: str = None, query: bool = False, **kwargs):
+    if query:
+        return _result([member.name for member in SCENE.get(items[0]).members if member.alive])
+
+    if forceElement or add:
+        set_node: Node = SCENE.get(forceElement or add)
+        for item in _as_list(items):
+            member: Node = SCENE.get(item)
+            if member not in set_node.members:
+                set_node.members.append(member)
+        return None
+
+    set_node = SCENE.create_node('objectSet', name or 'set1')
+    set_node.members = [] if empty else [SCENE.get(item) for item in _as_list(items) or SCENE.selection]
+
+    return set_node.name
+
+
+# deformers
+
+def blendShape(*meshes, name: str = None, **kwargs) -> list:
+    meshes = _as_list(meshes)
+    targets, base = [SCENE.get(mesh) for mesh in meshes[:-1]], SCENE.get(meshes[-1])
+    blend_shape: Node = SCENE.add_deformer('blendShape', name or 'blendShape1', base)
+
+    for index, target in enumerate(targets):
+        alias: str = target.name.split(':')[-1]
+        blend_shape.dynamic[alias] = Attribute(alias, 'double', 0.0, keyable = True)
+        SCENE.connect((_shape(target), 'worldMesh[0]'), (blend_shape, f'input[{index + 1}]'))
+
+    return [blend_shape.name]
+
+
+def deformer(*meshes, type: str = None, name: str = None, **kwargs) -> list:
+    if type in PLUGIN_COMMANDS['cloth_setup_plugin']['nodes'] and 'cloth_setup_plugin' not in SCENE.plugins:
+        raise RuntimeError(f'Unknown deformer type {type}.')
+
+    deformer_node: Node = None
+    for mesh in _as_list(meshes):
+        deformer_node = SCENE.add_deformer(type, name or f'{type}1', SCENE.get(mesh))
+
+    return [deformer_node.name]
+
+
+def skinCluster(*args, maximumInfluences: int = 5, name: str = None, toSelectedBones: bool = False, **kwargs) -> list:
+    args = _as_list(args)
+    joints, mesh = [SCENE.get(joint) for joint in args[:-1]], SCENE.get(args[-1])
+    skin_cluster: Node = SCENE.add_deformer('skinCluster', name or 'skinCluster1', mesh)
+
+    for index, joint in enumerate(joints):
+        SCENE.connect((joint, 'worldMatrix[0]'), (skin_cluster, f'matrix[{index}]'))
+
+    return [skin_cluster.name]
+
+
+def cvWrap(*meshes, name: str = None, radius: float = 0.1, **kwargs) -> str:
+    meshes = _as_list(meshes)
+    wrap_node: Node = SCENE.add_deformer('cvWrap', name or 'cvWrap1', SCENE.get(meshes[0]))
+    wrap_node.values['radius'] = radius
+    SCENE.connect((_shape(SCENE.get(meshes[-1])), 'worldMesh[0]'), (wrap_node, 'driver'))
+
+    return wrap_node.name
+
+
+def nonLinear(*meshes, type: str = 'bend', **kwargs) -> list:
+    meshes = _as_list(meshes) or [node.name for node in SCENE.selection]
+    deformer_node: Node = None
+    for mesh in meshes:
+        deformer_node = SCENE.add_deformer('nonLinear', f'{type}1', SCENE.get(mesh))
+
+    handle: Node = SCENE.create_node('transform', f'{type}Handle1')
+
+    return [deformer_node.name, handle.name]
+
+
+# creation
+
+def joint(*args, name: str = None, position = None, **kwargs) -> str:
+    parent_node: Node = SCENE.selection[0] if SCENE.selection and SCENE.selection[0].type == 'joint' else None
+    joint_node: Node = SCENE.create_node('joint', name or 'joint1', parent_node)
+    SCENE.selection = [joint_node]
+
+    return joint_node.name
+
+
+def circle(*args, name: str = None, radius: float = 1.0, normal = None, constructionHistory: bool = True, **kwargs) -> list:
+    transform: Node = SCENE.create_node('transform', name or 'nurbsCircle1')
+    SCENE.create_node('nurbsCurve', f'{transform.name}Shape', transform)
+    SCENE.selection = [transform]
+
+    if constructionHistory:
+        return [transform.name, SCENE.create_node('makeNurbCircle').name]
+
+    return [transform.name]
+
+
+def polyPlane(*args, name: str = None, width: float = 1.0, height: float = 1.0, subdivisionsX: int = 10, subdivisionsY: int = 10, constructionHistory: bool = True, **kwargs) -> list:
+    transform: Node = SCENE.create_node('transform', name or 'pPlane1')
+    SCENE.create_mesh(transform.name, *_grid(subdivisionsX, subdivisionsY, width, height), parent = transform)
+    SCENE.selection = [transform]
+
+    if constructionHistory:
+        return [transform.name, SCENE.create_node('polyPlane').name]
+
+    return [transform.name]
+
+
+def polyEvaluate(mesh: str, vertex: bool = False, face: bool = False, triangle: bool = False, **kwargs) -> int:
+    shape: Node = _shape(SCENE.get(mesh))
+    if vertex:
+        return len(shape.points)
+    if triangle:
+        return int(np.sum(shape.counts - 2))
+
+    return len(shape.counts)
+
+
+# time and animation
+
+def playbackOptions(query: bool = False, minTime: float = None, maxTime: float = None, animationStartTime = None, animationEndTime = None, **kwargs):
+    if query:
+        return SCENE.min_time if minTime else SCENE.max_time
+
+    if minTime is not None:
+        SCENE.min_time = float(minTime)
+    if maxTime is not None:
+        SCENE.max_time = float(maxTime)
+
+    return None
+
+
+def currentTime(*args, query: bool = False, edit: bool = False, update: bool = True, **kwargs) -> float:
+    if args and not query:
+        SCENE.current_time = float(args[0])
+        if update:
+            from .OpenMaya import MTime
+            SCENE.emit('time_changed', key = MTime(SCENE.current_time))
+
+    return SCENE.current_time
+
+
+def play(query: bool = False, state: bool = None, **kwargs):
+    return False if query else None
+
+
+def setKeyframe(*targets, time: float = None, value: float = None, attribute: str = None, **kwargs) -> int:
+    frame: float = SCENE.current_time if time is None else float(time)
+    plugs = []
+    for target in _as_list(targets) or [node.name for node in SCENE.selection]:
+        if '.' in target:
+            plugs.append(_plug(target))
+        else:
+            node: Node = SCENE.get(target)
+            names: list = _as_list(attribute) or [name for name in node.attribute_names() if node.attribute(name).keyable]
+            plugs += [(node, normalize_attribute(name)) for name in names]
+
+    for node, attribute in plugs:
+        source: tuple = SCENE.sources.get((node, attribute))
+        if source is not None and source[0].keys is not None:
+            curve: Node = source[0]
+        else:
+            spec: Attribute = node.attribute(attribute)
+            curve_type: str = 'animCurveTA' if spec.unit == 'angle' else ('animCurveTL' if attribute.startswith('translate') else 'animCurveTU')
+            key_value: float = float(SCENE.get_value(node, attribute) if value is None else value)
+            curve = SCENE.create_node(curve_type, f'{node.name}_{attribute}')
+            curve.keys[frame] = key_value
+            SCENE.connect((curve, 'output'), (node, attribute))
+            continue
+
+        curve.keys[frame] = float(SCENE.get_value(node, attribute) if value is None else value)
+
+    return len(plugs)
+
+
+def cutKey(*targets, clear: bool = False, **kwargs) -> int:
+    count: int = 0
+    for target in _as_list(targets):
+        source: tuple = SCENE.sources.get(_plug(target))
+        if source is not None and source[0].keys is not None:
+            count += len(source[0].keys)
+            SCENE.delete(source[0])
+
+    return count
+
+
+def nBase(node: str, edit: bool = False, stuffStart: bool = False, clearStart: bool = False, **kwargs) -> None:
+    shape: Node = _shape(SCENE.get(node))
+    if stuffStart:
+        SCENE.set_value(shape, 'startState', SCENE.get_value(shape, 'positions'))
+    elif clearStart:
+        SCENE.set_value(shape, 'startState', None)
+
+
+_commands: dict = {
+    name: function for name, function in list(globals().items())
+    if callable(function) and not name.startswith('_') and getattr(function, '__module__', None) == __name__
+}
+for _command_name, _command in _commands.items():
+    globals()[_command_name] = RECORDER.wrap(_command_name, _command)
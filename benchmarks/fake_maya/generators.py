@@ -0,0 +1,111 @@
+# Synthetic scenes
+#
+# Garments, colliders and animated controlers built directly in the fake scene,
+# so generating them is not counted as Maya commands.
+
+import numpy as np
+
+from .scene import SCENE, Attribute, Node
+
+
+def grid_arrays(resolution: int, size: float = 1.0, height: float = 0.0) -> tuple:
+    """
+    Create a quad grid as raw arrays.
+
+    Returns:
+        tuple: The (N, 3) points, polygon counts and polygon connects.
+    """
+
+    xs, zs = np.meshgrid(np.linspace(-size / 2.0, size / 2.0, resolution + 1), np.linspace(-size / 2.0, size / 2.0, resolution + 1))
+    points = np.stack([xs.ravel(), np.full(xs.size, height), zs.ravel()], axis = 1)
+
+    rows, columns = np.meshgrid(np.arange(resolution), np.arange(resolution), indexing = 'ij')
+    first = (rows * (resolution + 1) + columns).ravel()
+    connects = np.stack([first, first + 1, first + resolution + 2, first + resolution + 1], axis = 1).ravel()
+
+    return points, np.full(resolution * resolution, 4), connects
+
+
+def create_rigged_mesh(name: str, resolution: int, size: float = 1.0, height: float = 0.0) -> str:
+    """
+    Create a grid mesh deformed by a skinCluster, with its Orig intermediate shape, like a rigged asset.
+    """
+
+    transform: Node = SCENE.create_node('transform', name)
+    shape: Node = SCENE.create_mesh(transform.name, *grid_arrays(resolution, size, height), parent = transform)
+    SCENE.add_deformer('skinCluster', f'skinCluster_{transform.name}', shape)
+
+    return transform.name
+
+
+def create_setup_scene(
+    setup_count: int,
+    collider_count: int,
+    low_resolution: int = 30,
+    high_resolution: int = 90,
+    start_frame: float = 1001.0,
+    end_frame: float = 1100.0
+) -> list:
+    """
+    Create garments (a low and a high mesh each) and collider meshes shared by all the setups.
+
+    Returns:
+        list: The setup specs (see funcs.build_funcs.SetupBuilder.build).
+    """
+
+    SCENE.min_time, SCENE.max_time, SCENE.current_time = start_frame, end_frame, start_frame
+
+    colliders = {
+        create_rigged_mesh(f'body{i}_geo', low_resolution, size = 1.2, height = -0.1 * (i + 1)): f'body{i}'
+        for i in range(collider_count)
+    }
+
+    specs = []
+    for i in range(setup_count):
+        specs.append({
+            'setup_prefix': f'garment{i}',
+            'low_mesh': create_rigged_mesh(f'garment{i}_low', low_resolution, height = 0.1 * i),
+            'high_mesh': create_rigged_mesh(f'garment{i}_hi', high_resolution, height = 0.1 * i),
+            'colliders': dict(colliders)
+        })
+
+    return specs
+
+
+def create_rig_scene(
+    controler_count: int,
+    extra_attributes: int = 10,
+    start_frame: float = 1001.0,
+    end_frame: float = 1100.0,
+    seed: int = 0
+) -> list:
+    """
+    Create animated controlers: TRS channels plus extra keyable attributes, all keyed at the start and end frames.
+
+    Returns:
+        list: The names of the controlers.
+    """
+
+    SCENE.min_time, SCENE.max_time, SCENE.current_time = start_frame, end_frame, start_frame
+    random = np.random.default_rng(seed)
+
+    controlers = []
+    for i in range(controler_count):
+        ctrl: Node = SCENE.create_node('transform', f'CTRL_{i}')
+        SCENE.create_node('nurbsCurve', f'{ctrl.name}Shape', ctrl)
+        for j in range(extra_attributes):
+            ctrl.dynamic[f'extra{j}'] = Attribute(f'extra{j}', 'double', 0.0, keyable = True)
+
+        for attribute in ctrl.attribute_names():
+            spec: Attribute = ctrl.attribute(attribute)
+            if not spec.keyable:
+                continue
+
+            curve_type: str = 'animCurveTA' if spec.unit == 'angle' else ('animCurveTL' if attribute.startswith('translate') else 'animCurveTU')
+            curve: Node = SCENE.create_node(curve_type, f'{ctrl.name}_{attribute}')
+            curve.keys = {start_frame: float(random.normal()), end_frame: float(random.normal())}
+            SCENE.connect((curve, 'output'), (ctrl, attribute))
+
+        controlers.append(ctrl.name)
+
+    return controlers
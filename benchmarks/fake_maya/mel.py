@@ -0,0 +1,89 @@
+# Fake maya.mel
+#
+# Only the MEL procedures called by cloth_setup are emulated, the others are
+# counted and ignored.
+
+from .scene import RECORDER, SCENE, Node
+
+
+def create_ncloth() -> None:
+    """
+    createNCloth: an nCloth and a new nucleus per selected mesh, the input shape becomes
+    intermediate and an outputCloth shape is added under the mesh transform.
+    """
+
+    ncloth_shapes = []
+    for transform in list(SCENE.selection):
+        input_shape: Node = transform.shapes(intermediate = False)[0]
+        input_shape.values['intermediateObject'] = True
+
+        output_shape: Node = SCENE.create_node('mesh', 'outputCloth1', transform)
+        output_shape.points = input_shape.points.copy()
+        output_shape.counts = input_shape.counts
+        output_shape.connects = input_shape.connects
+
+        nucleus: Node = SCENE.create_node('nucleus', 'nucleus1')
+        ncloth_shape: Node = SCENE.create_node('nCloth', 'nClothShape1', SCENE.create_node('transform', 'nCloth1'))
+
+        time: Node = SCENE.get('time1')
+        index: int = len(SCENE.element_indices(nucleus, 'inputActive'))
+        SCENE.connect((input_shape, 'worldMesh[0]'), (ncloth_shape, 'inputMesh'))
+        SCENE.connect((ncloth_shape, 'outputMesh'), (output_shape, 'inMesh'))
+        SCENE.connect((time, 'outTime'), (ncloth_shape, 'currentTime'))
+        SCENE.connect((time, 'outTime'), (nucleus, 'currentTime'))
+        SCENE.connect((nucleus, 'startFrame'), (ncloth_shape, 'startFrame'))
+        SCENE.connect((ncloth_shape, 'currentState'), (nucleus, f'inputActive[{index}]'))
+        SCENE.connect((ncloth_shape, 'startState'), (nucleus, f'inputActiveStart[{index}]'))
+        SCENE.connect((nucleus, f'outputObjects[{index}]'), (ncloth_shape, 'nextState'))
+        ncloth_shapes.append(ncloth_shape)
+
+    SCENE.selection = ncloth_shapes
+
+
+def do_wrap() -> None:
+    """
+    doWrapArgList: wrap the first selected mesh on the second one.
+    """
+
+    high_mesh, low_mesh = SCENE.selection[:2]
+    wrap_node: Node = SCENE.add_deformer('wrap', 'wrap1', high_mesh)
+    SCENE.connect((low_mesh.shapes(intermediate = False)[0], 'worldMesh[0]'), (wrap_node, 'driverPoints[0]'))
+
+
+def force_element(command: str) -> None:
+    set_node: Node = SCENE.get(command.split('-forceElement', 1)[1].split(';', 1)[0].strip())
+    for node in SCENE.selection:
+        if node not in set_node.members:
+            set_node.members.append(node)
+
+
+PROCEDURES = {
+    'createNCloth': create_ncloth,
+    'doWrapArgList': do_wrap
+}
+
+
+def eval(command: str):
+    for statement in command.split(';'):
+        statement = statement.strip()
+        if not statement:
+            continue
+
+        procedure: str = statement.split()[0]
+        RECORDER.add(f'mel:{procedure}', 0.0)
+
+        if procedure in PROCEDURES:
+            PROCEDURES[procedure]()
+        elif procedure == 'sets' and '-forceElement' in statement:
+            force_element(statement)
+        elif procedure == 'select':
+            arguments: list = statement.split()[1:]
+            if '-cl' in arguments:
+                SCENE.selection = []
+            elif '-r' in arguments:
+                SCENE.selection = [SCENE.get(arguments[-1])]
+            elif '-add' in arguments:
+                SCENE.selection.append(SCENE.get(arguments[-1]))
+
+
+eval = RECORDER.wrap('mel.eval', eval)
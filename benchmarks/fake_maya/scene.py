@@ -0,0 +1,565 @@
+# Fake scene
+#
+# In-memory dependency graph behind the fake maya modules: nodes, DAG hierarchy,
+# attributes, connections, mesh data and anim curves. It only models what the
+# cloth_setup funcs need, node evaluation is limited to anim curves.
+
+import re
+import time
+
+import numpy as np
+
+
+SHAPE_TYPES = {'mesh', 'nurbsCurve', 'nCloth', 'nRigid'}
+TRANSFORM_TYPES = {'transform', 'joint', 'nucleus'}
+ANIM_CURVE_TYPES = {'animCurveTL', 'animCurveTA', 'animCurveTU'}
+GEOMETRY_FILTER_TYPES = {'blendShape', 'skinCluster', 'wrap', 'cvWrap', 'clothSetupPointCopy', 'clothSetupWrap', 'nonLinear'}
+
+SHORT_NAMES = {
+    'v': 'visibility',
+    'tx': 'translateX', 'ty': 'translateY', 'tz': 'translateZ',
+    'rx': 'rotateX', 'ry': 'rotateY', 'rz': 'rotateZ',
+    'sx': 'scaleX', 'sy': 'scaleY', 'sz': 'scaleZ',
+    'io': 'intermediateObject'
+}
+
+
+class Attribute:
+    """
+    Static or dynamic attribute description.
+    """
+
+    __slots__ = ('name', 'kind', 'default', 'keyable', 'multi', 'unit')
+
+    def __init__(self, name: str, kind: str = 'double', default = 0.0, keyable: bool = False, multi: bool = False, unit: str = None):
+        self.name = name
+        self.kind = kind
+        self.default = default
+        self.keyable = keyable
+        self.multi = multi
+        self.unit = unit
+
+
+IDENTITY = [1.0, 0.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 0.0, 1.0]
+
+
+def attributes(*specs) -> dict:
+    return {spec.name: spec for spec in specs}
+
+
+DAG_ATTRIBUTES = attributes(
+    Attribute('visibility', 'bool', True),
+    Attribute('intermediateObject', 'bool', False),
+    Attribute('worldMatrix', 'matrix', None, multi = True),
+    Attribute('worldInverseMatrix', 'matrix', IDENTITY, multi = True)
+)
+
+TRANSFORM_ATTRIBUTES = {
+    **DAG_ATTRIBUTES,
+    'visibility': Attribute('visibility', 'bool', True, keyable = True),
+    **attributes(*(
+        Attribute(f'{channel}{axis}', 'double', 1.0 if channel == 'scale' else 0.0, keyable = True, unit = 'angle' if channel == 'rotate' else None)
+        for channel in ('translate', 'rotate', 'scale') for axis in 'XYZ'
+    )),
+    **attributes(Attribute('offsetParentMatrix', 'matrix', IDENTITY))
+}
+
+GEOMETRY_FILTER_ATTRIBUTES = attributes(
+    Attribute('envelope', 'double', 1.0),
+    Attribute('input', 'compound', None, multi = True),
+    Attribute('outputGeometry', 'mesh', None, multi = True)
+)
+
+NODE_ATTRIBUTES = {
+    'transform': TRANSFORM_ATTRIBUTES,
+    'joint': TRANSFORM_ATTRIBUTES,
+    'nucleus': {
+        **TRANSFORM_ATTRIBUTES,
+        **attributes(
+            Attribute('startFrame', 'double', 1.0),
+            Attribute('subSteps', 'long', 3),
+            Attribute('maxCollisionIterations', 'long', 4),
+            Attribute('spaceScale', 'double', 1.0),
+            Attribute('currentTime', 'time', 0.0),
+            Attribute('enable', 'bool', True),
+            Attribute('inputActive', 'nData', None, multi = True),
+            Attribute('inputActiveStart', 'nData', None, multi = True),
+            Attribute('inputPassive', 'nData', None, multi = True),
+            Attribute('inputPassiveStart', 'nData', None, multi = True),
+            Attribute('outputObjects', 'nData', None, multi = True)
+        )
+    },
+    'mesh': {
+        **DAG_ATTRIBUTES,
+        **attributes(Attribute('inMesh', 'mesh', None), Attribute('outMesh', 'mesh', None), Attribute('worldMesh', 'mesh', None, multi = True))
+    },
+    'nurbsCurve': {**DAG_ATTRIBUTES, **attributes(Attribute('worldSpace', 'nurbsCurve', None, multi = True))},
+    'nCloth': {
+        **DAG_ATTRIBUTES,
+        **attributes(
+            Attribute('inputMesh', 'mesh', None),
+            Attribute('outputMesh', 'mesh', None),
+            Attribute('currentState', 'nData', None),
+            Attribute('startState', 'nData', None),
+            Attribute('nextState', 'nData', None),
+            Attribute('currentTime', 'time', 0.0),
+            Attribute('startFrame', 'double', 1.0),
+            Attribute('thickness', 'double', 0.1),
+            Attribute('isDynamic', 'bool', True),
+            Attribute('playFromCache', 'bool', False),
+            Attribute('positions', 'vectorArray', None),
+            Attribute('velocities', 'vectorArray', None)
+        )
+    },
+    'nRigid': {
+        **DAG_ATTRIBUTES,
+        **attributes(
+            Attribute('inputMesh', 'mesh', None),
+            Attribute('currentState', 'nData', None),
+            Attribute('startState', 'nData', None),
+            Attribute('currentTime', 'time', 0.0),
+            Attribute('startFrame', 'double', 1.0),
+            Attribute('thickness', 'double', 0.1),
+            Attribute('isDynamic', 'bool', True),
+            Attribute('collide', 'bool', True)
+        )
+    },
+    'time': attributes(Attribute('outTime', 'time', 1.0)),
+    'multMatrix': attributes(Attribute('matrixIn', 'matrix', IDENTITY, multi = True), Attribute('matrixSum', 'matrix', IDENTITY)),
+    'objectSet': attributes(Attribute('dagSetMembers', 'message', None, multi = True)),
+    'shadingEngine': attributes(Attribute('dagSetMembers', 'message', None, multi = True)),
+    'blendShape': GEOMETRY_FILTER_ATTRIBUTES,
+    'nonLinear': GEOMETRY_FILTER_ATTRIBUTES,
+    'skinCluster': {**GEOMETRY_FILTER_ATTRIBUTES, **attributes(Attribute('matrix', 'matrix', None, multi = True))},
+    'wrap': {**GEOMETRY_FILTER_ATTRIBUTES, **attributes(Attribute('driverPoints', 'mesh', None, multi = True))},
+    'cvWrap': {**GEOMETRY_FILTER_ATTRIBUTES, **attributes(Attribute('driver', 'mesh', None), Attribute('radius', 'double', 0.1))},
+    'clothSetupPointCopy': {
+        **GEOMETRY_FILTER_ATTRIBUTES,
+        **attributes(Attribute('driverMesh', 'mesh', None), Attribute('pointIndices', 'Int32Array', None))
+    },
+    'clothSetupWrap': {
+        **GEOMETRY_FILTER_ATTRIBUTES,
+        **attributes(Attribute('driverMesh', 'mesh', None), Attribute('driverMatrix', 'matrix', None), Attribute('bindingPath', 'string', ''))
+    },
+    'cacheFile': attributes(Attribute('inRange', 'bool', True), Attribute('outCacheData', 'vectorArray', None, multi = True))
+}
+
+for curve_type in ANIM_CURVE_TYPES:
+    NODE_ATTRIBUTES[curve_type] = attributes(Attribute('input', 'time', 0.0), Attribute('output', 'double', 0.0))
+
+
+def split_plug(plug: str) -> tuple:
+    """
+    Split 'node.attr[index]' into the node name and the attribute with its index.
+    """
+
+    node, _, attribute = plug.partition('.')
+    if not attribute:
+        raise ValueError(f'{plug} is not a plug.')
+
+    return node, attribute
+
+
+def attribute_base(attribute: str) -> str:
+    base: str = attribute.split('[', 1)[0]
+    return SHORT_NAMES.get(base, base)
+
+
+def normalize_attribute(attribute: str) -> str:
+    base, bracket, rest = attribute.partition('[')
+    return SHORT_NAMES.get(base, base) + bracket + rest
+
+
+class Node:
+    """
+    A node of the fake scene.
+    """
+
+    def __init__(self, name: str, node_type: str):
+        self.name = name
+        self.type = node_type
+        self.parent = None
+        self.children = []
+        self.dynamic = {}
+        self.values = {}
+        self.locked = set()
+        self.alive = True
+        self.points = None
+        self.counts = None
+        self.connects = None
+        self.keys = None
+        self.members = None
+
+    @property
+    def is_dag(self) -> bool:
+        return self.type in SHAPE_TYPES or self.type in TRANSFORM_TYPES
+
+    @property
+    def is_shape(self) -> bool:
+        return self.type in SHAPE_TYPES
+
+    def attribute(self, attribute: str) -> Attribute:
+        base: str = attribute_base(attribute)
+        found: Attribute = self.dynamic.get(base)
+        if found is None:
+            found = NODE_ATTRIBUTES.get(self.type, {}).get(base)
+
+        return found
+
+    def attribute_names(self) -> list:
+        return list(NODE_ATTRIBUTES.get(self.type, {})) + list(self.dynamic)
+
+    def full_path(self) -> str:
+        names = []
+        node: Node = self
+        while node is not None:
+            names.append(node.name)
+            node = node.parent
+
+        return '|' + '|'.join(reversed(names))
+
+    def shapes(self, intermediate: bool = True) -> list:
+        return [
+            child for child in self.children
+            if child.is_shape and (intermediate or not child.values.get('intermediateObject', False))
+        ]
+
+    def __repr__(self) -> str:
+        return f'Node({self.name!r}, {self.type!r})'
+
+
+class Recorder:
+    """
+    Call counts and cumulated time of the fake Maya commands.
+    """
+
+    def __init__(self):
+        self.calls = {}
+
+    def reset(self) -> None:
+        self.calls = {}
+
+    def add(self, name: str, duration: float) -> None:
+        entry: list = self.calls.get(name)
+        if entry is None:
+            self.calls[name] = [1, duration]
+        else:
+            entry[0] += 1
+            entry[1] += duration
+
+    def wrap(self, name: str, func):
+        def recorded(*args, **kwargs):
+            start: float = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.add(name, time.perf_counter() - start)
+
+        recorded.__name__ = func.__name__
+        recorded.__doc__ = func.__doc__
+
+        return recorded
+
+    def to_dict(self) -> dict:
+        return {name: {'calls': calls, 'time': duration} for name, (calls, duration) in sorted(self.calls.items())}
+
+
+class Scene:
+    """
+    The fake scene: nodes by unique name, connections by destination plug.
+    Names are kept unique in the whole scene, which is enough for the cloth setups.
+    """
+
+    def __init__(self):
+        self.callbacks = {'node_added': {}, 'node_removed': {}, 'scene': {}, 'time_changed': {}}
+        self.next_callback_id: int = 1
+        self.new()
+
+    def new(self) -> None:
+        self.nodes = {}
+        self.sources = {}
+        self.destinations = {}
+        self.selection = []
+        self.current_time: float = 1.0
+        self.min_time: float = 1.0
+        self.max_time: float = 120.0
+        self.plugins = set()
+        # names of the closed undo chunks, the open ones nested from the outermost
+        self.undo_queue = []
+        self.open_chunks = []
+
+        self.create_node('time', 'time1')
+        self.create_node('shadingEngine', 'initialShadingGroup').members = []
+
+    # callbacks
+
+    def add_callback(self, kind: str, func, key = None) -> int:
+        callback_id: int = self.next_callback_id
+        self.next_callback_id += 1
+        self.callbacks[kind][callback_id] = (func, key)
+
+        return callback_id
+
+    def remove_callback(self, callback_id: int) -> None:
+        for callbacks in self.callbacks.values():
+            callbacks.pop(callback_id, None)
+
+    def emit(self, kind: str, node: Node = None, key = None) -> None:
+        if not self.callbacks[kind]:
+            return
+
+        from .OpenMaya import MObject
+
+        for func, callback_key in list(self.callbacks[kind].values()):
+            if kind == 'scene':
+                if callback_key == key:
+                    func(None)
+            elif kind == 'time_changed':
+                func(key, None)
+            else:
+                func(MObject(node), None)
+
+    # nodes
+
+    def unique_name(self, name: str) -> str:
+        name = name.replace('#', '')
+        if name not in self.nodes:
+            return name
+
+        base: str = re.sub(r'\d+$', '', name)
+        index: int = 1
+        while f'{base}{index}' in self.nodes:
+            index += 1
+
+        return f'{base}{index}'
+
+    def find(self, name: str) -> Node:
+        if isinstance(name, Node):
+            return name
+
+        return self.nodes.get(name.rsplit('|', 1)[-1])
+
+    def get(self, name: str) -> Node:
+        node: Node = self.find(name)
+        if node is None:
+            raise ValueError(f'No object matches name: {name}')
+
+        return node
+
+    def create_node(self, node_type: str, name: str = None, parent: Node = None) -> Node:
+        """
+        Create a node. Shapes created without parent get a transform, as in Maya.
+        """
+
+        if node_type in SHAPE_TYPES and parent is None:
+            parent = self.create_node('transform', self.unique_name(f'{node_type}1'))
+
+        node = Node(self.unique_name(name or f'{node_type}1'), node_type)
+        self.nodes[node.name] = node
+        if node.is_dag and parent is not None:
+            self.reparent(node, parent)
+
+        if node_type in ANIM_CURVE_TYPES:
+            node.keys = {}
+
+        self.emit('node_added', node)
+
+        return node
+
+    def rename(self, node: Node, name: str) -> str:
+        if name == node.name:
+            return name
+
+        del self.nodes[node.name]
+        node.name = self.unique_name(name)
+        self.nodes[node.name] = node
+
+        return node.name
+
+    def reparent(self, node: Node, parent: Node = None) -> None:
+        if node.parent is not None:
+            node.parent.children.remove(node)
+
+        node.parent = parent
+        if parent is not None:
+            parent.children.append(node)
+
+    def delete(self, node: Node) -> None:
+        if not node.alive:
+            return
+
+        for child in list(node.children):
+            self.delete(child)
+
+        # like Maya, the deformers of a deleted mesh go with it once they deform nothing else
+        deformers = {source[0] for destination, source in self.sources.items() if destination[0] is node and source[1].startswith('outputGeometry')}
+        for destination in [key for key in self.sources if key[0] is node]:
+            self.disconnect(self.sources[destination], destination)
+
+        for source in [key for key in self.destinations if key[0] is node]:
+            for destination in list(self.destinations.get(source, [])):
+                self.disconnect(source, destination)
+
+        self.reparent(node, None)
+        del self.nodes[node.name]
+        node.alive = False
+        self.emit('node_removed', node)
+
+        for deformer in deformers:
+            if not any(source[0] is deformer and destinations for source, destinations in self.destinations.items()):
+                self.delete(deformer)
+
+    def duplicate(self, node: Node, name: str, parent: Node = None) -> Node:
+        """
+        Duplicate a node and its DAG children, without connections.
+        """
+
+        duplicate: Node = self.create_node(node.type, name, parent)
+        duplicate.dynamic = dict(node.dynamic)
+        duplicate.values = dict(node.values)
+        duplicate.locked = set(node.locked)
+        if node.points is not None:
+            duplicate.points = node.points.copy()
+            duplicate.counts = node.counts
+            duplicate.connects = node.connects
+
+        for child in list(node.children):
+            self.duplicate(child, child.name, duplicate)
+
+        return duplicate
+
+    def world_nodes(self) -> list:
+        return [node for node in self.nodes.values() if node.is_dag and node.parent is None]
+
+    # connections
+
+    def connect(self, source: tuple, destination: tuple) -> None:
+        previous: tuple = self.sources.get(destination)
+        if previous is not None:
+            self.disconnect(previous, destination)
+
+        self.sources[destination] = source
+        self.destinations.setdefault(source, []).append(destination)
+
+    def disconnect(self, source: tuple, destination: tuple) -> None:
+        if self.sources.get(destination) != source:
+            return
+
+        del self.sources[destination]
+        destinations: list = self.destinations[source]
+        destinations.remove(destination)
+        if not destinations:
+            del self.destinations[source]
+
+    def connected_nodes(self, node: Node, source: bool = True, destination: bool = True) -> list:
+        nodes = []
+        if source:
+            nodes += [source_plug[0] for destination_plug, source_plug in self.sources.items() if destination_plug[0] is node]
+        if destination:
+            for source_plug, destination_plugs in self.destinations.items():
+                if source_plug[0] is node:
+                    nodes += [destination_plug[0] for destination_plug in destination_plugs]
+
+        return nodes
+
+    def element_indices(self, node: Node, attribute: str) -> list:
+        indices = set()
+        prefix: str = f'{attribute}['
+        for key in list(node.values) + [plug[1] for plug in self.sources if plug[0] is node] + [plug[1] for plug in self.destinations if plug[0] is node]:
+            if key.startswith(prefix):
+                indices.add(int(key[len(prefix):].split(']', 1)[0]))
+
+        return sorted(indices)
+
+    # values
+
+    def get_value(self, node: Node, attribute: str, frame: float = None):
+        attribute = normalize_attribute(attribute)
+        source: tuple = self.sources.get((node, attribute))
+        if source is not None and source[0].keys is not None:
+            return evaluate_curve(source[0].keys, self.current_time if frame is None else frame)
+
+        if attribute in node.values:
+            return node.values[attribute]
+
+        spec: Attribute = node.attribute(attribute)
+        if spec is None:
+            raise ValueError(f'No attribute {node.name}.{attribute}')
+
+        return spec.default
+
+    def set_value(self, node: Node, attribute: str, value) -> None:
+        attribute = normalize_attribute(attribute)
+        if node.attribute(attribute) is None:
+            raise RuntimeError(f'No attribute {node.name}.{attribute}')
+
+        if attribute in node.locked:
+            raise RuntimeError(f'The attribute {node.name}.{attribute} is locked.')
+
+        source: tuple = self.sources.get((node, attribute))
+        if source is not None and source[0].keys is not None:
+            # like Maya, setting a keyed attribute only changes its value until the time changes
+            return
+
+        node.values[attribute] = value
+
+    # meshes
+
+    def create_mesh(self, name: str, points, counts, connects, parent: Node = None) -> Node:
+        transform: Node = parent or self.create_node('transform', name)
+        shape: Node = self.create_node('mesh', f'{transform.name}Shape', transform)
+        shape.points = np.asarray(points, dtype = np.float64)[:, :3].copy()
+        shape.counts = np.asarray(counts, dtype = np.int64)
+        shape.connects = np.asarray(connects, dtype = np.int64)
+
+        return shape
+
+    def add_deformer(self, node_type: str, name: str, mesh: Node) -> Node:
+        """
+        Create a geometry filter on a mesh with the Orig intermediate shape Maya adds to it.
+        """
+
+        transform: Node = mesh if not mesh.is_shape else mesh.parent
+        shapes: list = transform.shapes(intermediate = False)
+        if not shapes:
+            raise RuntimeError(f'{transform.name} has no shape to deform.')
+
+        shape: Node = shapes[0]
+        deformer: Node = self.create_node(node_type, name)
+
+        if not any(child.values.get('intermediateObject') for child in transform.children):
+            orig: Node = self.create_node('mesh', f'{shape.name}Orig', transform)
+            orig.values['intermediateObject'] = True
+            orig.points = shape.points.copy()
+            orig.counts = shape.counts
+            orig.connects = shape.connects
+            self.connect((orig, 'worldMesh[0]'), (deformer, 'input[0]'))
+
+        self.connect((deformer, 'outputGeometry[0]'), (shape, 'inMesh'))
+
+        return deformer
+
+
+def evaluate_curve(keys: dict, frame: float) -> float:
+    """
+    Evaluate anim curve keys with linear interpolation, flat outside the keys.
+    """
+
+    if not keys:
+        return 0.0
+
+    times = sorted(keys)
+    if frame <= times[0]:
+        return keys[times[0]]
+    if frame >= times[-1]:
+        return keys[times[-1]]
+
+    index: int = int(np.searchsorted(times, frame))
+    t0, t1 = times[index - 1], times[index]
+    weight: float = (frame - t0) / (t1 - t0)
+
+    return keys[t0] * (1.0 - weight) + keys[t1] * weight
+
+
+SCENE = Scene()
+RECORDER = Recorder()
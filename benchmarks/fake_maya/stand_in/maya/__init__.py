@@ -0,0 +1,13 @@
+# Stand-in maya package
+#
+# Put benchmarks/fake_maya/stand_in first on the path of a python process to import the fake maya as maya,
+# a batch worker for instance (see batch.runner.run_jobs python_path). The package containing the fake maya
+# must be importable, the folder containing cloth_setup on the path.
+
+import importlib
+import os
+
+PACKAGE_NAME = os.path.basename(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))))
+
+# replaces this module in sys.modules, import maya then gives the fake package
+importlib.import_module(f'{PACKAGE_NAME}.benchmarks.fake_maya').install()
@@ -0,0 +1,93 @@
+from .topology import (
+    triangulate,
+    following_face_vertices,
+    polygon_edges,
+    vertex_faces_mask,
+    grow_faces_mask,
+    submesh
+)
+
+from .decimate import (
+    cluster_vertices,
+    decimate_clusters,
+    decimate
+)
+
+
+from .wrap import (
+    topology_hash,
+    points_hash,
+    save_binding,
+    load_binding,
+    cached_bind
+)
+
+from .point_cache import (
+    PointCacheWriter,
+    PointCacheReader
+)
+
+from .easing import (
+    EASINGS,
+    preroll_curves
+)
+
+from .profiling import (
+    PROFILER,
+    Profiler,
+    profiling_enabled,
+    set_profiling
+)
+
+from .substeps import (
+    edge_lengths,
+    peak_displacement,
+    frame_displacements,
+    estimate_substeps,
+    frame_ranges
+)
+
+from .proximity import (
+    UniformGrid,
+    bounding_box,
+    boxes_overlap,
+    near_points,
+    active_intervals
+)
+
+from .validation import (
+    edge_use_counts,
+    face_areas,
+    coincident_points,
+    validate_mesh
+)
+
+from .watchdog import (
+    edge_stretch,
+    frame_health,
+    WatchdogAbort,
+    Watchdog
+)
+
+from .grouping import (
+    interacting_pairs,
+    plan_groups
+)
+
+from .checkpoint import (
+    CheckpointStore
+)
+
+from .setup_diff import (
+    group_colliders,
+    diff_colliders,
+    diff_setups
+)
+
+from .cache_compare import (
+    point_deviations,
+    deviation_regions,
+    compare_blocks,
+    compare_caches,
+    summarize_comparison
+)
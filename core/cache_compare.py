@@ -0,0 +1,339 @@
+# Cache compare
+#
+# Deviation between two point caches of the same meshes, read by chunks of frames so memory stays bounded:
+# per frame and per vertex statistics, the frame ranges and the regions over a threshold.
+
+import numpy as np
+
+from .point_cache import PointCacheReader
+from .proximity import NEIGHBOURS, cell_keys
+
+
+DEFAULT_THRESHOLD = 0.01
+DEFAULT_PERCENTILES = (50.0, 95.0, 99.0)
+# the deviations of all the frames and vertices are counted on log spaced bins, for the overall percentiles
+HISTOGRAM_EDGES = np.concatenate([[0.0], np.geomspace(1e-7, 1e4, 551)])
+REGION_RATIO = 0.05
+
+
+def point_deviations(reference, candidate) -> np.ndarray:
+    """
+    Get the distance between the points of two caches.
+
+    Parameters:
+        reference (array_like): The (F, V, 3) reference points.
+        candidate (array_like): The (F, V, 3) compared points.
+
+    Returns:
+        np.ndarray: The (F, V) distances, infinite where a point is not finite.
+    """
+
+    delta = np.asarray(candidate, dtype = np.float64) - np.asarray(reference, dtype = np.float64)
+    distances = np.sqrt(np.einsum('fvi,fvi->fv', delta, delta))
+
+    return np.where(np.isfinite(distances), distances, np.inf)
+
+
+def histogram_percentiles(counts: np.ndarray, percentiles) -> np.ndarray:
+    """
+    Get percentiles from the counts of HISTOGRAM_EDGES bins, as the upper edge of the bin they fall in,
+    0.0 in the first bin, below the histogram resolution.
+    """
+
+    cumulative = np.cumsum(counts)
+    if not cumulative[-1]:
+        return np.zeros(len(percentiles))
+
+    ranks = np.asarray(percentiles, dtype = np.float64) / 100.0 * cumulative[-1]
+    bins = np.minimum(np.searchsorted(cumulative, ranks, side = 'left'), len(counts) - 1)
+
+    return np.where(bins == 0, 0.0, HISTOGRAM_EDGES[bins + 1])
+
+
+def threshold_ranges(values, threshold: float) -> list:
+    """
+    Find the runs of consecutive values over a threshold.
+
+    Parameters:
+        values (array_like): The (F,) values.
+        threshold (float): The threshold.
+
+    Returns:
+        list: (first index, last index) tuples.
+    """
+
+    over = np.concatenate([[False], np.asarray(values) > threshold, [False]])
+    changes = np.flatnonzero(over[1:] != over[:-1])
+
+    return [(int(first), int(last) - 1) for first, last in zip(changes[::2], changes[1::2])]
+
+
+def deviation_regions(points, deviations, threshold: float, size: float) -> list:
+    """
+    Group the vertices over a threshold into regions: vertices fall in cubic cells, touching occupied cells make a region.
+
+    Parameters:
+        points (array_like): The (V, 3) points locating the vertices.
+        deviations (array_like): The (V,) deviation of each vertex.
+        threshold (float): The deviation over which a vertex belongs to a region.
+        size (float): The size of the cells.
+
+    Returns:
+        list: The regions, largest deviation first, dictionaries with the vertices indices,
+            their center and their max deviation.
+    """
+
+    deviations = np.asarray(deviations)
+    vertices = np.flatnonzero(deviations > threshold)
+    if not len(vertices):
+        return []
+
+    points = np.asarray(points, dtype = np.float64)[vertices, :3]
+    keys = cell_keys(np.floor(points / size).astype(np.int64))
+    cell_values, firsts, inverse = np.unique(keys, return_index = True, return_inverse = True)
+    cells = np.floor(points[firsts] / size).astype(np.int64)
+
+    firsts, seconds = [], []
+    for offset in NEIGHBOURS:
+        neighbours = cell_keys(cells + offset)
+        indices = np.minimum(np.searchsorted(cell_values, neighbours), len(cell_values) - 1)
+        found = cell_values[indices] == neighbours
+        firsts.append(np.flatnonzero(found))
+        seconds.append(indices[found])
+    firsts, seconds = np.concatenate(firsts), np.concatenate(seconds)
+
+    # every cell takes the smallest label of its neighbours until none changes, the lowest cell index of its region,
+    # jumping to the label of its label to cross long regions in few passes
+    cell_labels = np.arange(len(cell_values))
+    while True:
+        new_labels = cell_labels.copy()
+        np.minimum.at(new_labels, firsts, cell_labels[seconds])
+        np.minimum.at(new_labels, seconds, cell_labels[firsts])
+        new_labels = new_labels[new_labels]
+        if np.array_equal(new_labels, cell_labels):
+            break
+        cell_labels = new_labels
+
+    # the vertices sorted by region, in their order inside each region
+    labels = cell_labels[inverse.ravel()]
+    order = np.argsort(labels, kind = 'stable')
+    _, starts = np.unique(labels[order], return_index = True)
+    regions = []
+    for members in np.split(order, starts[1:]):
+        regions.append({
+            'vertices': vertices[members],
+            'center': points[members].mean(axis = 0),
+            'max': float(deviations[vertices[members]].max())
+        })
+
+    return sorted(regions, key = lambda region: -region['max'])
+
+
+def compare_blocks(
+    reference,
+    candidate,
+    threshold: float = DEFAULT_THRESHOLD,
+    chunk_frames: int = 16,
+    percentiles: tuple = DEFAULT_PERCENTILES,
+    region_size: float = None
+) -> dict:
+    """
+    Compare the points of a mesh in two caches, chunk_frames frames at a time: the blocks can be memory maps
+    (see PointCacheReader.frames_block), only a chunk is read at once.
+
+    Parameters:
+        reference (array_like): The (F, V, 3) reference points.
+        candidate (array_like): The (F, V, 3) compared points.
+        threshold (float): The deviation over which a frame or a vertex differs.
+        chunk_frames (int): The number of frames read at once.
+        percentiles (tuple): The percentiles computed per frame and over the whole cache.
+        region_size (float, optional): The cell size grouping the vertices into regions (see deviation_regions),
+            a fraction of the reference bounding box diagonal if None.
+
+    Returns:
+        dict: frame_max, frame_rms and frame_percentiles (P, F) over the vertices of each frame,
+            vertex_max, vertex_rms and vertex_max_frame (frame index of the max) over the frames of each vertex,
+            max, rms and percentiles (P,) over the whole cache, the latter from a log spaced histogram,
+            frame_ranges ((first index, last index) of the frames over the threshold),
+            regions (see deviation_regions, located on the first reference frame) and differs.
+    """
+
+    frame_count, vertex_count = reference.shape[:2]
+    if candidate.shape != reference.shape:
+        raise ValueError(f'Can not compare caches of shapes {reference.shape} and {candidate.shape}.')
+
+    frame_max = np.zeros(frame_count)
+    frame_rms = np.zeros(frame_count)
+    frame_percentiles = np.zeros((len(percentiles), frame_count))
+    vertex_max = np.zeros(vertex_count)
+    vertex_squares = np.zeros(vertex_count)
+    vertex_max_frame = np.zeros(vertex_count, dtype = np.int64)
+    counts = np.zeros(len(HISTOGRAM_EDGES) - 1, dtype = np.int64)
+
+    for first in range(0, frame_count, chunk_frames):
+        last: int = min(first + chunk_frames, frame_count)
+        deviations: np.ndarray = point_deviations(reference[first:last], candidate[first:last])
+        if not vertex_count:
+            continue
+
+        frame_max[first:last] = deviations.max(axis = 1)
+        frame_rms[first:last] = np.sqrt(np.mean(deviations * deviations, axis = 1))
+        if len(percentiles):
+            # interpolating next to an infinite deviation warns
+            with np.errstate(invalid = 'ignore'):
+                frame_percentiles[:, first:last] = np.percentile(deviations, percentiles, axis = 1)
+
+        chunk_max_frame = deviations.argmax(axis = 0)
+        chunk_max = deviations[chunk_max_frame, np.arange(vertex_count)]
+        larger = chunk_max > vertex_max
+        vertex_max[larger] = chunk_max[larger]
+        vertex_max_frame[larger] = chunk_max_frame[larger] + first
+        vertex_squares += np.einsum('fv,fv->v', deviations, deviations)
+
+        counts += np.histogram(np.clip(deviations, 0.0, HISTOGRAM_EDGES[-1]), bins = HISTOGRAM_EDGES)[0]
+
+    regions = []
+    if frame_count and vertex_count:
+        rest = np.asarray(reference[0], dtype = np.float64)
+        if region_size is None:
+            region_size = REGION_RATIO * float(np.linalg.norm(rest.max(axis = 0) - rest.min(axis = 0))) or 1.0
+        regions = deviation_regions(rest, vertex_max, threshold, region_size)
+
+    total: int = max(frame_count * vertex_count, 1)
+
+    return {
+        'frame_max': frame_max,
+        'frame_rms': frame_rms,
+        'frame_percentiles': frame_percentiles,
+        'vertex_max': vertex_max,
+        'vertex_rms': np.sqrt(vertex_squares / max(frame_count, 1)),
+        'vertex_max_frame': vertex_max_frame,
+        'max': float(frame_max.max()) if frame_count else 0.0,
+        'rms': float(np.sqrt(vertex_squares.sum() / total)),
+        'percentiles': histogram_percentiles(counts, percentiles),
+        'frame_ranges': threshold_ranges(frame_max, threshold),
+        'regions': regions,
+        'differs': bool(frame_count) and bool(frame_max.max() > threshold)
+    }
+
+
+def compare_caches(
+    reference_path: str,
+    candidate_path: str,
+    meshes: list = None,
+    threshold: float = DEFAULT_THRESHOLD,
+    chunk_frames: int = 16,
+    percentiles: tuple = DEFAULT_PERCENTILES,
+    region_size: float = None
+) -> dict:
+    """
+    Compare two point caches over the frames they share, mesh by mesh (see compare_blocks).
+    Caches of different frame ranges differ, as caches of different meshes do.
+
+    Parameters:
+        reference_path (str): The path of the reference cache.
+        candidate_path (str): The path of the compared cache.
+        meshes (list, optional): The meshes to compare, all the meshes of both caches if None.
+        threshold (float): The deviation over which a frame or a vertex differs.
+        chunk_frames (int): The number of frames read at once.
+        percentiles (tuple): The percentiles computed per frame and over the whole cache.
+        region_size (float, optional): The cell size grouping the vertices into regions.
+
+    Returns:
+        dict: frames (the (F,) compared frames), reference_frames and candidate_frames (first and last frame of each cache),
+            frame_mismatch (the caches do not cover the same frames), meshes (the compare_blocks result of each mesh),
+            missing (the meshes of only one cache) and differs.
+    """
+
+    reference = PointCacheReader(reference_path)
+    candidate = PointCacheReader(candidate_path)
+    if reference.frame_step != candidate.frame_step:
+        raise ValueError(f'The caches have different frame steps, {reference.frame_step} and {candidate.frame_step}.')
+
+    frames: np.ndarray = np.intersect1d(reference.frames, candidate.frames)
+    if not len(frames):
+        raise ValueError(f'{reference_path} and {candidate_path} have no frame in common.')
+
+    names: list = meshes or sorted(set(reference.meshes) | set(candidate.meshes))
+    missing = [name for name in names if name not in reference.blocks or name not in candidate.blocks]
+
+    frame_mismatch: bool = len(frames) != reference.frame_count or len(frames) != candidate.frame_count
+
+    reference_first: int = reference.frame_index(frames[0])
+    candidate_first: int = candidate.frame_index(frames[0])
+    results = {}
+    for name in names:
+        if name in missing:
+            continue
+
+        results[name] = compare_blocks(
+            reference.frames_block(name, reference_first, reference_first + len(frames)),
+            candidate.frames_block(name, candidate_first, candidate_first + len(frames)),
+            threshold,
+            chunk_frames,
+            percentiles,
+            region_size
+        )
+
+    return {
+        'frames': frames,
+        'reference_frames': (float(reference.frames[0]), float(reference.frames[-1])),
+        'candidate_frames': (float(candidate.frames[0]), float(candidate.frames[-1])),
+        'frame_mismatch': frame_mismatch,
+        'meshes': results,
+        'missing': missing,
+        'differs': frame_mismatch or bool(missing) or any(result['differs'] for result in results.values())
+    }
+
+
+def summarize_comparison(comparison: dict, percentiles: tuple = DEFAULT_PERCENTILES, max_regions: int = 10) -> dict:
+    """
+    Turn a compare_caches result into plain lists and numbers for a JSON report: the per vertex arrays are left out,
+    frame ranges are given in frames and regions by vertex count.
+
+    Parameters:
+        comparison (dict): The compare_caches result.
+        percentiles (tuple): The percentiles the comparison was computed with.
+        max_regions (int): The number of regions kept per mesh, largest deviation first.
+
+    Returns:
+        dict: The report.
+    """
+
+    frames: np.ndarray = comparison['frames']
+    meshes = {}
+    for name, result in comparison['meshes'].items():
+        meshes[name] = {
+            'differs': result['differs'],
+            'max': result['max'],
+            'rms': result['rms'],
+            'percentiles': {f'p{percentile:g}': float(value) for percentile, value in zip(percentiles, result['percentiles'])},
+            'frame_max': result['frame_max'].tolist(),
+            'frame_rms': result['frame_rms'].tolist(),
+            'frame_percentiles': {
+                f'p{percentile:g}': values.tolist() for percentile, values in zip(percentiles, result['frame_percentiles'])
+            },
+            'frame_ranges': [
+                {'first': float(frames[first]), 'last': float(frames[last]), 'max': float(result['frame_max'][first:last + 1].max())}
+                for first, last in result['frame_ranges']
+            ],
+            'regions': [
+                {
+                    'vertex_count': len(region['vertices']),
+                    'center': region['center'].tolist(),
+                    'max': region['max'],
+                    'vertices': region['vertices'].tolist()
+                }
+                for region in result['regions'][:max_regions]
+            ]
+        }
+
+    return {
+        'frames': [float(frames[0]), float(frames[-1])],
+        'reference_frames': list(comparison['reference_frames']),
+        'candidate_frames': list(comparison['candidate_frames']),
+        'frame_mismatch': comparison['frame_mismatch'],
+        'differs': comparison['differs'],
+        'missing': comparison['missing'],
+        'meshes': meshes
+    }
@@ -0,0 +1,145 @@
+# Checkpoint
+#
+# Snapshots of simulation states on disk, one compressed .npz file per frame holding
+# the positions and velocities of each cloth and the solver settings, kept under a disk budget.
+
+import glob
+import json
+import os
+
+import numpy as np
+
+
+EXTENSION = '.npz'
+
+
+class CheckpointStore:
+    """
+    A directory of checkpoints. Beyond the budget, checkpoints are thinned out: the one closest
+    to its previous checkpoint is dropped, never the first nor the last, so the remaining ones stay spread over the shot.
+    """
+
+    def __init__(self, directory: str, max_count: int = None, max_bytes: int = None):
+        """
+        Parameters:
+            directory (str): The directory of the checkpoint files.
+            max_count (int, optional): The maximum number of checkpoints.
+            max_bytes (int, optional): The maximum size of all the checkpoints on disk.
+        """
+
+        self.directory = directory
+        self.max_count = max_count
+        self.max_bytes = max_bytes
+
+    def path(self, frame: float) -> str:
+        return os.path.join(self.directory, f'checkpoint_{frame:010.3f}{EXTENSION}')
+
+    def frames(self) -> list:
+        """
+        Returns:
+            list: The frames of the checkpoints, sorted.
+        """
+
+        frames = []
+        for path in glob.glob(os.path.join(self.directory, f'checkpoint_*{EXTENSION}')):
+            try:
+                frames.append(float(os.path.basename(path)[len('checkpoint_'):-len(EXTENSION)]))
+            except ValueError:
+                continue
+
+        return sorted(frames)
+
+    def nearest(self, frame: float) -> float:
+        """
+        Get the last checkpoint at or before a frame.
+
+        Returns:
+            float: The frame of the checkpoint, None if there is none.
+        """
+
+        frames = [checkpoint for checkpoint in self.frames() if checkpoint <= frame]
+
+        return frames[-1] if frames else None
+
+    def save(self, frame: float, states: dict, settings: dict = None) -> str:
+        """
+        Save a checkpoint, then drop checkpoints over the budget.
+
+        Parameters:
+            frame (float): The frame of the state.
+            states (dict): Per cloth name, a dictionary with its (N, 3) positions and (N, 3) velocities.
+            settings (dict, optional): JSON serializable solver settings.
+
+        Returns:
+            str: The path of the checkpoint file.
+        """
+
+        os.makedirs(self.directory, exist_ok = True)
+
+        arrays = {
+            'frame': np.array(frame, dtype = np.float64),
+            'names': np.array(list(states), dtype = str),
+            'settings': np.array(json.dumps(settings or {}))
+        }
+        for index, state in enumerate(states.values()):
+            arrays[f'positions_{index}'] = np.asarray(state['positions'], dtype = np.float64)[:, :3]
+            arrays[f'velocities_{index}'] = np.asarray(state['velocities'], dtype = np.float64)[:, :3]
+
+        path: str = self.path(frame)
+        # written aside then renamed, an interrupted run never leaves a truncated checkpoint
+        temporary_path: str = f'{path[:-len(EXTENSION)]}_tmp{EXTENSION}'
+        np.savez_compressed(temporary_path, **arrays)
+        os.replace(temporary_path, path)
+
+        self.enforce_budget()
+
+        return path
+
+    def load(self, frame: float) -> tuple:
+        """
+        Load a checkpoint.
+
+        Returns:
+            tuple: The states by cloth name and the settings.
+        """
+
+        with np.load(self.path(frame)) as arrays:
+            states = {
+                str(name): {'positions': arrays[f'positions_{index}'], 'velocities': arrays[f'velocities_{index}']}
+                for index, name in enumerate(arrays['names'])
+            }
+            settings: dict = json.loads(str(arrays['settings']))
+
+        return states, settings
+
+    def size(self) -> int:
+        return sum(os.path.getsize(self.path(frame)) for frame in self.frames())
+
+    def enforce_budget(self) -> list:
+        """
+        Drop checkpoints until the count and size fit the budget.
+
+        Returns:
+            list: The frames of the dropped checkpoints.
+        """
+
+        frames: list = self.frames()
+        sizes: dict = {frame: os.path.getsize(self.path(frame)) for frame in frames}
+        dropped = []
+
+        while len(frames) > 2 and (
+            (self.max_count is not None and len(frames) > self.max_count)
+            or (self.max_bytes is not None and sum(sizes.values()) > self.max_bytes)
+        ):
+            gaps = np.diff(frames)[:-1]
+            frame: float = frames[int(np.argmin(gaps)) + 1]
+            os.remove(self.path(frame))
+            frames.remove(frame)
+            del sizes[frame]
+            dropped.append(frame)
+
+        return dropped
+
+    def clear(self) -> None:
+        for frame in self.frames():
+            os.remove(self.path(frame))
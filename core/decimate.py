@@ -0,0 +1,126 @@
+# Decimate
+#
+# Vertex clustering decimation on raw point / face arrays.
+
+import numpy as np
+
+from .topology import triangulate
+
+
+def cluster_vertices(points: np.ndarray, cell_size: float) -> tuple:
+    """
+    Group points by cells of a uniform grid and pick one representative point per cell,
+    the one closest to the mean of its cell.
+
+    Parameters:
+        points (np.ndarray): The (N, 3) points.
+        cell_size (float): The size of the grid cells.
+
+    Returns:
+        tuple: The (N,) cluster of each point and the (C,) index of the representative point of each cluster.
+    """
+
+    cells = np.floor((points - points.min(axis = 0)) / cell_size).astype(np.int64)
+    _, clusters = np.unique(cells, axis = 0, return_inverse = True)
+    clusters = clusters.reshape(-1)
+    cluster_count: int = int(clusters.max()) + 1
+
+    sizes = np.bincount(clusters, minlength = cluster_count).astype(np.float64)
+    means = np.stack([np.bincount(clusters, weights = points[:, axis], minlength = cluster_count) for axis in range(3)], axis = 1)
+    means /= sizes[:, None]
+
+    distances = np.einsum('ij,ij->i', points - means[clusters], points - means[clusters])
+    order = np.lexsort((distances, clusters))
+    first = np.ones(len(order), dtype = bool)
+    first[1:] = clusters[order][1:] != clusters[order][:-1]
+
+    return clusters, order[first]
+
+
+def decimate_clusters(points: np.ndarray, triangles: np.ndarray, cell_size: float) -> tuple:
+    """
+    Decimate a triangle mesh by vertex clustering.
+
+    Parameters:
+        points (np.ndarray): The (N, 3) points.
+        triangles (np.ndarray): The (T, 3) triangle vertex indices.
+        cell_size (float): The size of the grid cells, the maximum error is about cell_size * sqrt(3).
+
+    Returns:
+        tuple: The (C,) representative point indices and the (F, 3) decimated triangles indexing them.
+    """
+
+    clusters, representatives = cluster_vertices(points, cell_size)
+    faces = clusters[triangles]
+
+    degenerate = (faces[:, 0] == faces[:, 1]) | (faces[:, 1] == faces[:, 2]) | (faces[:, 0] == faces[:, 2])
+    faces = faces[~degenerate]
+
+    # the same cluster triangle can come from several original triangles, keep the first one and its winding
+    _, unique_ids = np.unique(np.sort(faces, axis = 1), axis = 0, return_index = True)
+    faces = faces[np.sort(unique_ids)]
+
+    # drop the clusters no face uses anymore
+    used = np.zeros(len(representatives), dtype = bool)
+    used[faces.ravel()] = True
+    remap = np.cumsum(used) - 1
+
+    return representatives[used], remap[faces]
+
+
+def decimate(
+    points,
+    polygon_counts,
+    polygon_connects,
+    target_faces: int = None,
+    max_error: float = None,
+    iterations: int = 16
+) -> tuple:
+    """
+    Decimate a polygon mesh by vertex clustering, to a target face count or a maximum error.
+    Every proxy point is an original point, so the proxy can follow the original through a point index mapping.
+
+    Parameters:
+        points (array_like): The (N, 3) points.
+        polygon_counts (array_like): Number of vertices of each polygon.
+        polygon_connects (array_like): Vertex indices of all the polygons, one after the other.
+        target_faces (int, optional): The wanted number of triangles, reached as close as possible from below.
+        max_error (float, optional): The maximum distance a point can move, used when target_faces is None.
+        iterations (int): Number of bisection steps on the cell size for target_faces.
+
+    Returns:
+        tuple: The (M, 3) proxy points, the (F, 3) proxy triangles and the (M,) original index of each proxy point.
+    """
+
+    points = np.asarray(points, dtype = np.float64)[:, :3]
+    triangles, _ = triangulate(polygon_counts, polygon_connects)
+
+    if target_faces is None and max_error is None:
+        raise ValueError('Give a target face count or a maximum error.')
+
+    if target_faces is None:
+        cell_size: float = max_error / np.sqrt(3.0)
+        representatives, faces = decimate_clusters(points, triangles, cell_size)
+        return points[representatives], faces, representatives
+
+    if target_faces >= len(triangles):
+        representatives = np.arange(len(points))
+        return points, triangles, representatives
+
+    diagonal: float = float(np.linalg.norm(points.max(axis = 0) - points.min(axis = 0)))
+    low: float = diagonal * 1e-4
+    high: float = diagonal
+    best = decimate_clusters(points, triangles, high)
+
+    for _ in range(iterations):
+        middle: float = np.sqrt(low * high)
+        result = decimate_clusters(points, triangles, middle)
+        if len(result[1]) > target_faces:
+            low = middle
+        else:
+            high = middle
+            best = result
+
+    representatives, faces = best
+
+    return points[representatives], faces, representatives
@@ -0,0 +1,83 @@
+# Easing
+#
+# Multi-pose preroll curves computed for every attribute at once.
+
+import numpy as np
+
+
+EASINGS = {
+    'step': lambda t: np.where(t < 1.0, 0.0, 1.0),
+    'linear': lambda t: t,
+    'ease_in': lambda t: t * t,
+    'ease_out': lambda t: t * (2.0 - t),
+    'ease_in_out': lambda t: np.where(t < 0.5, 4.0 * t ** 3, 1.0 - (-2.0 * t + 2.0) ** 3 / 2.0),
+    'sine': lambda t: 0.5 - 0.5 * np.cos(np.pi * t),
+    'smoothstep': lambda t: t * t * (3.0 - 2.0 * t),
+    'smootherstep': lambda t: t ** 3 * (t * (6.0 * t - 15.0) + 10.0)
+}
+
+
+def ease(t: np.ndarray, easing_ids: np.ndarray, easings: list) -> np.ndarray:
+    """
+    Apply a different easing to each normalized time.
+
+    Parameters:
+        t (np.ndarray): The (F,) normalized times, between 0 and 1.
+        easing_ids (np.ndarray): The (F,) index in easings of the easing of each time.
+        easings (list): The easing names, keys of EASINGS.
+
+    Returns:
+        np.ndarray: The (F,) eased times.
+    """
+
+    eased = np.empty_like(t)
+    for easing_id in np.unique(easing_ids):
+        mask = easing_ids == easing_id
+        eased[mask] = EASINGS[easings[easing_id]](t[mask])
+
+    return eased
+
+
+def preroll_curves(pose_frames, pose_values, easings: list, sample_frames) -> np.ndarray:
+    """
+    Interpolate key poses for every attribute at once.
+
+    Parameters:
+        pose_frames (array_like): The (P,) increasing frames of the poses.
+        pose_values (array_like): The (A, P) value of every attribute at every pose.
+        easings (list): The P - 1 easing names, one per segment between two poses.
+        sample_frames (array_like): The (F,) frames to evaluate.
+
+    Returns:
+        np.ndarray: The (A, F) values, constant before the first and after the last pose.
+    """
+
+    pose_frames = np.asarray(pose_frames, dtype = np.float64)
+    pose_values = np.atleast_2d(np.asarray(pose_values, dtype = np.float64))
+    sample_frames = np.asarray(sample_frames, dtype = np.float64)
+
+    if len(pose_frames) == 1:
+        return np.repeat(pose_values, len(sample_frames), axis = 1)
+
+    if np.any(np.diff(pose_frames) <= 0.0):
+        raise ValueError('Pose frames must be strictly increasing.')
+
+    if len(easings) != len(pose_frames) - 1:
+        raise ValueError(f'{len(pose_frames) - 1} easings expected, got {len(easings)}.')
+
+    unknown = set(easings) - set(EASINGS)
+    if unknown:
+        raise ValueError(f'Unknown easings : {", ".join(sorted(unknown))}')
+
+    segments = np.clip(np.searchsorted(pose_frames, sample_frames, side = 'right') - 1, 0, len(pose_frames) - 2)
+    start_frames = pose_frames[segments]
+    t = np.clip((sample_frames - start_frames) / (pose_frames[segments + 1] - start_frames), 0.0, 1.0)
+
+    unique_easings = sorted(set(easings))
+    easing_ids = np.array([unique_easings.index(easing) for easing in easings])[segments]
+    weights = ease(t, easing_ids, unique_easings)
+
+    start_values = pose_values[:, segments]
+    end_values = pose_values[:, segments + 1]
+
+    return start_values + (end_values - start_values) * weights[None, :]
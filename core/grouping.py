@@ -0,0 +1,91 @@
+# Grouping
+#
+# Plan which garments share a nucleus: garments close enough to collide must be solved together,
+# garments sharing colliders are merged when it fits the size budget, so each shared collider
+# gets a single nRigid per nucleus.
+
+import numpy as np
+
+
+def interacting_pairs(boxes, distance: float) -> np.ndarray:
+    """
+    Find the pairs of bounding boxes within a distance of each other.
+
+    Parameters:
+        boxes (array_like): The (N, 2, 3) minimum and maximum corners.
+        distance (float): The distance under which two boxes interact.
+
+    Returns:
+        np.ndarray: The (K, 2) index pairs, first index lower.
+    """
+
+    boxes = np.asarray(boxes, dtype = np.float64).reshape(-1, 2, 3)
+    overlap = np.all(
+        (boxes[:, None, 0] <= boxes[None, :, 1] + distance) & (boxes[None, :, 0] <= boxes[:, None, 1] + distance),
+        axis = 2
+    )
+
+    return np.argwhere(np.triu(overlap, k = 1))
+
+
+def find_root(parents: np.ndarray, index: int) -> int:
+    while parents[index] != index:
+        parents[index] = parents[parents[index]]
+        index = parents[index]
+
+    return index
+
+
+def plan_groups(boxes, vertex_counts, colliders: list, distance: float, max_vertices: int = None) -> list:
+    """
+    Group garments into nucleus systems.
+    Interacting garments are always grouped. The groups sharing the most colliders are then merged
+    one pair at a time, as long as the merged group stays under the vertex budget.
+
+    Parameters:
+        boxes (array_like): The (N, 2, 3) bounding boxes of the garments.
+        vertex_counts (array_like): The (N,) number of simulated vertices of the garments.
+        colliders (list): The set of collider names of each garment.
+        distance (float): The distance under which two garments interact.
+        max_vertices (int, optional): The largest number of vertices of a merged group, only for the merges
+            on shared colliders. No limit if None.
+
+    Returns:
+        list: The groups, lists of garment indices, sorted.
+    """
+
+    count: int = len(colliders)
+    parents = np.arange(count)
+    for first, second in interacting_pairs(boxes, distance):
+        parents[find_root(parents, first)] = find_root(parents, second)
+
+    vertex_counts = np.asarray(vertex_counts, dtype = np.int64)
+    groups = {}
+    for index in range(count):
+        groups.setdefault(find_root(parents, index), []).append(index)
+    groups = list(groups.values())
+
+    group_colliders = [set().union(*(colliders[index] for index in group)) for group in groups]
+    group_vertices = [int(vertex_counts[group].sum()) for group in groups]
+
+    while True:
+        best = None
+        for first in range(len(groups)):
+            for second in range(first + 1, len(groups)):
+                shared: int = len(group_colliders[first] & group_colliders[second])
+                if not shared:
+                    continue
+                if max_vertices is not None and group_vertices[first] + group_vertices[second] > max_vertices:
+                    continue
+                if best is None or shared > best[0]:
+                    best = (shared, first, second)
+
+        if best is None:
+            break
+
+        _, first, second = best
+        groups[first] += groups.pop(second)
+        group_colliders[first] |= group_colliders.pop(second)
+        group_vertices[first] += group_vertices.pop(second)
+
+    return sorted(sorted(group) for group in groups)
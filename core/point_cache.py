@@ -0,0 +1,236 @@
+# Point cache
+#
+# Compact binary point cache: a fixed header, a mesh table, then for each mesh
+# all its frames as contiguous float32 (frame, vertex, xyz) blocks.
+
+import os
+
+import numpy as np
+
+
+MAGIC = b'CSPCACHE'
+VERSION = 1
+ALIGNMENT = 64
+
+HEADER_DTYPE = np.dtype([
+    ('magic', 'S8'),
+    ('version', '<u4'),
+    ('mesh_count', '<u4'),
+    ('frame_count', '<u4'),
+    ('reserved', '<u4'),
+    ('start_frame', '<f8'),
+    ('frame_step', '<f8')
+])
+
+MESH_DTYPE = np.dtype([
+    ('name', 'S256'),
+    ('vertex_count', '<u8'),
+    ('offset', '<u8')
+])
+
+POINT_DTYPE = np.dtype('<f4')
+
+
+def aligned(offset: int) -> int:
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+class PointCache:
+    """
+    Frame range shared by the point cache writer and reader.
+    """
+
+    start_frame: float = 0.0
+    frame_step: float = 1.0
+    frame_count: int = 0
+
+    def frame_index(self, frame: float) -> int:
+        index: int = int(round((frame - self.start_frame) / self.frame_step))
+        if not 0 <= index < self.frame_count:
+            raise IndexError(f'Frame {frame} is outside the cache.')
+
+        return index
+
+
+class PointCacheWriter(PointCache):
+    """
+    Write a point cache frame by frame. The file is allocated once, each frame is
+    written in place so memory does not grow with the frame count.
+    A cache closed before all its frames are written (close(complete = False), or an exception
+    leaving the with block) only keeps its first frames written in a row: its header frame count is lowered,
+    so the frames never written are not read back as zeros.
+    """
+
+    def __init__(self, path: str, vertex_counts: dict, start_frame: float, frame_count: int, frame_step: float = 1.0):
+        """
+        Parameters:
+            path (str): The path of the cache file.
+            vertex_counts (dict): The vertex count of each mesh, by mesh name.
+            start_frame (float): The first frame of the cache.
+            frame_count (int): The number of frames.
+            frame_step (float): The time between two frames.
+        """
+
+        self.path = path
+        self.start_frame = float(start_frame)
+        self.frame_count = int(frame_count)
+        self.frame_step = float(frame_step)
+
+        header = np.zeros(1, dtype = HEADER_DTYPE)
+        header[0] = (MAGIC, VERSION, len(vertex_counts), frame_count, 0, start_frame, frame_step)
+
+        table = np.zeros(len(vertex_counts), dtype = MESH_DTYPE)
+        offset: int = aligned(HEADER_DTYPE.itemsize + MESH_DTYPE.itemsize * len(vertex_counts))
+        for i, (name, vertex_count) in enumerate(vertex_counts.items()):
+            table[i] = (name.encode('utf-8'), vertex_count, offset)
+            offset = aligned(offset + frame_count * vertex_count * 3 * POINT_DTYPE.itemsize)
+
+        directory: str = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok = True)
+
+        with open(path, 'wb') as cache_file:
+            cache_file.write(header.tobytes())
+            cache_file.write(table.tobytes())
+            cache_file.truncate(offset)
+
+        self.blocks = {
+            row['name'].decode('utf-8'): np.memmap(
+                path,
+                dtype = POINT_DTYPE,
+                mode = 'r+',
+                offset = int(row['offset']),
+                shape = (self.frame_count, int(row['vertex_count']), 3)
+            )
+            for row in table
+        }
+        self.written = np.zeros(self.frame_count, dtype = bool)
+
+    def write_frame(self, frame: float, points: dict) -> None:
+        """
+        Write the points of some or all meshes at a frame.
+
+        Parameters:
+            frame (float): The frame.
+            points (dict): The (V, 3) points of each mesh, by mesh name.
+        """
+
+        index: int = self.frame_index(frame)
+        for name, mesh_points in points.items():
+            self.blocks[name][index] = np.asarray(mesh_points)[:, :3]
+        self.written[index] = True
+
+    @property
+    def written_count(self) -> int:
+        """
+        The number of frames written in a row from the first one.
+        """
+
+        return int(np.argmin(self.written)) if not self.written.all() else self.frame_count
+
+    def set_frame_count(self, frame_count: int) -> None:
+        """
+        Rewrite the frame count of the header, the mesh blocks keep their offsets.
+        """
+
+        with open(self.path, 'r+b') as cache_file:
+            cache_file.seek(HEADER_DTYPE.fields['frame_count'][1])
+            cache_file.write(np.array(frame_count, dtype = '<u4').tobytes())
+
+        self.frame_count = int(frame_count)
+
+    def close(self, complete: bool = True) -> None:
+        """
+        Flush the frames to the file.
+
+        Parameters:
+            complete (bool): False when the writing stopped early, the cache is cut after its first frames written in a row.
+        """
+
+        for block in self.blocks.values():
+            block.flush()
+
+        self.blocks = {}
+        if not complete and self.written_count < self.frame_count:
+            self.set_frame_count(self.written_count)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *args):
+        self.close(complete = exc_type is None)
+
+
+class PointCacheReader(PointCache):
+    """
+    Read a point cache through memory maps: any frame of any mesh is available
+    without loading the file.
+    """
+
+    def __init__(self, path: str):
+        """
+        Parameters:
+            path (str): The path of the cache file.
+        """
+
+        self.path = path
+
+        header = np.fromfile(path, dtype = HEADER_DTYPE, count = 1)
+        if len(header) != 1 or header[0]['magic'] != MAGIC:
+            raise ValueError(f'{path} is not a point cache.')
+
+        if header[0]['version'] != VERSION:
+            raise ValueError(f'Unsupported point cache version {header[0]["version"]}.')
+
+        self.frame_count = int(header[0]['frame_count'])
+        self.start_frame = float(header[0]['start_frame'])
+        self.frame_step = float(header[0]['frame_step'])
+
+        table = np.fromfile(path, dtype = MESH_DTYPE, count = int(header[0]['mesh_count']), offset = HEADER_DTYPE.itemsize)
+        self.blocks = {
+            row['name'].decode('utf-8'): np.memmap(
+                path,
+                dtype = POINT_DTYPE,
+                mode = 'r',
+                offset = int(row['offset']),
+                shape = (self.frame_count, int(row['vertex_count']), 3)
+            )
+            for row in table
+        }
+
+    @property
+    def meshes(self) -> list:
+        return list(self.blocks)
+
+    @property
+    def frames(self) -> np.ndarray:
+        return self.start_frame + np.arange(self.frame_count) * self.frame_step
+
+    def points(self, mesh: str, frame: float) -> np.ndarray:
+        """
+        Get the points of a mesh at a frame.
+
+        Parameters:
+            mesh (str): The name of the mesh.
+            frame (float): The frame.
+
+        Returns:
+            np.ndarray: The (V, 3) float32 points, a view on the file.
+        """
+
+        return self.blocks[mesh][self.frame_index(frame)]
+
+    def frames_block(self, mesh: str, first: int = 0, last: int = None) -> np.ndarray:
+        """
+        Get the points of a mesh for a range of frame indices.
+
+        Parameters:
+            mesh (str): The name of the mesh.
+            first (int): The first frame index.
+            last (int, optional): The frame index after the last one, the end of the cache if None.
+
+        Returns:
+            np.ndarray: The (F, V, 3) float32 points, a view on the file.
+        """
+
+        return self.blocks[mesh][first:last]
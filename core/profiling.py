@@ -0,0 +1,185 @@
+# Profiling
+#
+# Nested timing spans with counters, exported as JSON or Chrome trace events.
+# Set the CLOTH_SETUP_PROFILE environment variable to 0 to turn it off.
+
+from contextlib import contextmanager
+import json
+import os
+import threading
+import time
+
+
+ENV_VAR = "CLOTH_SETUP_PROFILE"
+
+
+class Span:
+    """
+    One timed step, with its tags, counter deltas, values and child spans.
+    """
+
+    __slots__ = ('name', 'tags', 'start', 'duration', 'thread', 'counters', 'values', 'children')
+
+    def __init__(self, name: str, tags: dict, start: float):
+        self.name = name
+        self.tags = tags
+        self.start = start
+        self.thread: int = threading.get_ident()
+        self.duration: float = 0.0
+        self.counters = {}
+        self.values = {}
+        self.children = []
+
+    def to_dict(self) -> dict:
+        return {
+            'name': self.name,
+            'tags': self.tags,
+            'start': self.start,
+            'duration': self.duration,
+            'thread': self.thread,
+            'counters': self.counters,
+            'values': self.values,
+            'children': [child.to_dict() for child in self.children]
+        }
+
+
+class Profiler:
+    """
+    Record nested spans. Counters are callables sampled when a span starts and ends,
+    the span keeps their difference (DG nodes created for instance).
+    Only the last max_root_spans top level spans are kept, so it can stay on in a long session.
+    """
+
+    def __init__(self, enabled: bool = True, max_root_spans: int = 1000):
+        self.enabled = enabled
+        self.max_root_spans = max_root_spans
+        self.counters = {}
+        self.spans = []
+        self.origin: float = time.perf_counter()
+        self.local = threading.local()
+
+    def stack(self) -> list:
+        if not hasattr(self.local, 'stack'):
+            self.local.stack = []
+
+        return self.local.stack
+
+    def add_counter(self, name: str, counter) -> None:
+        self.counters[name] = counter
+
+    def reset(self) -> None:
+        self.spans = []
+        self.origin = time.perf_counter()
+        self.local = threading.local()
+
+    @contextmanager
+    def span(self, name: str, **tags):
+        """
+        Time a block of code as a span, nested in the current span if any.
+
+        Parameters:
+            name (str): The name of the step.
+            tags: Values describing the span, the setup prefix for instance.
+        """
+
+        if not self.enabled:
+            yield None
+            return
+
+        stack: list = self.stack()
+        span = Span(name, tags, time.perf_counter() - self.origin)
+        if stack:
+            stack[-1].children.append(span)
+        else:
+            self.spans.append(span)
+            del self.spans[:-self.max_root_spans]
+        counters_start = {counter_name: counter() for counter_name, counter in self.counters.items()}
+        stack.append(span)
+
+        try:
+            yield span
+        finally:
+            stack.pop()
+            span.duration = time.perf_counter() - self.origin - span.start
+            for counter_name, counter in self.counters.items():
+                span.counters[counter_name] = counter() - counters_start[counter_name]
+
+    def record(self, key: str, value) -> None:
+        """
+        Store a value (a vertex count for instance) on the current span.
+        """
+
+        stack: list = self.stack()
+        if self.enabled and stack:
+            stack[-1].values[key] = value
+
+    def walk(self, spans: list = None, depth: int = 0):
+        for span in self.spans if spans is None else spans:
+            yield span, depth
+            yield from self.walk(span.children, depth + 1)
+
+    def summary(self) -> dict:
+        """
+        Get the call count and total time of every step name.
+
+        Returns:
+            dict: {name: {'calls': int, 'total': float}}.
+        """
+
+        steps = {}
+        for span, _ in self.walk():
+            step = steps.setdefault(span.name, {'calls': 0, 'total': 0.0})
+            step['calls'] += 1
+            step['total'] += span.duration
+
+        return steps
+
+    def to_dict(self) -> dict:
+        return {'spans': [span.to_dict() for span in self.spans], 'summary': self.summary()}
+
+    def to_chrome_trace(self) -> dict:
+        """
+        Get the spans as Chrome trace complete events (chrome://tracing, Perfetto).
+        """
+
+        events = []
+        for span, _ in self.walk():
+            events.append({
+                'name': span.name,
+                'cat': 'cloth_setup',
+                'ph': 'X',
+                'ts': span.start * 1e6,
+                'dur': span.duration * 1e6,
+                'pid': os.getpid(),
+                'tid': span.thread,
+                'args': {**span.tags, **span.counters, **span.values}
+            })
+
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def export_json(self, path: str) -> str:
+        with open(path, 'w') as json_file:
+            json.dump(self.to_dict(), json_file, indent = 4, default = str)
+
+        return path
+
+    def export_chrome_trace(self, path: str) -> str:
+        with open(path, 'w') as json_file:
+            json.dump(self.to_chrome_trace(), json_file, default = str)
+
+        return path
+
+
+def profiling_enabled() -> bool:
+    """
+    Get whether the CLOTH_SETUP_PROFILE environment variable leaves the profiling on.
+    """
+
+    return os.environ.get(ENV_VAR, '1') != '0'
+
+
+PROFILER = Profiler(enabled = profiling_enabled())
+
+
+def set_profiling(enabled: bool) -> None:
+    PROFILER.enabled = enabled
@@ -0,0 +1,212 @@
+# Proximity
+#
+# Uniform grid queries finding the points of a mesh that come within a distance of another one.
+# Plain queries are conservative: every point within the distance is found, some farther points may be too.
+
+import numpy as np
+
+
+# 21 bits per axis packed in an int64 key
+CELL_OFFSET = 1 << 20
+NEIGHBOURS = np.stack(np.meshgrid([-1, 0, 1], [-1, 0, 1], [-1, 0, 1], indexing = 'ij'), axis = -1).reshape(-1, 3)
+# the cell itself then the 13 neighbours after it, each pair of neighbouring cells is one of them apart
+HALF_NEIGHBOURS = NEIGHBOURS[13:]
+
+
+def cell_keys(cells: np.ndarray) -> np.ndarray:
+    """
+    Pack (N, 3) integer cell coordinates into int64 keys.
+    """
+
+    cells = np.clip(cells + CELL_OFFSET, 0, 2 * CELL_OFFSET - 1)
+
+    return (cells[:, 0] << 42) | (cells[:, 1] << 21) | cells[:, 2]
+
+
+def expand_ranges(starts: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """
+    Concatenate the index ranges [start, start + count).
+    """
+
+    return np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts - starts, counts)
+
+
+class UniformGrid:
+    """
+    A set of points sorted by the cubic cell they fall in, the occupied cells queried with binary searches.
+    """
+
+    def __init__(self, points, cell_size: float):
+        """
+        Parameters:
+            points (array_like): The (N, 3) points to hash.
+            cell_size (float): The size of the cells, the query distance.
+        """
+
+        self.cell_size = float(cell_size)
+        points = np.asarray(points, dtype = np.float64)[:, :3]
+        keys = cell_keys(np.floor(points / self.cell_size).astype(np.int64))
+
+        order = np.argsort(keys, kind = 'stable')
+        self.indices: np.ndarray = order
+        self.points: np.ndarray = points[order]
+        self.keys, self.starts, counts = np.unique(keys[order], return_index = True, return_counts = True)
+        self.ends: np.ndarray = self.starts + counts
+
+    def near(self, points, exact: bool = False) -> np.ndarray:
+        """
+        Find the points in a cell occupied by the grid points or next to one.
+
+        Parameters:
+            points (array_like): The (M, 3) points to query.
+            exact (bool): Only keep the points within a cell size of a grid point,
+                measuring the distances to the points of the neighbouring cells.
+
+        Returns:
+            np.ndarray: The (M,) boolean mask of the points near the grid points.
+        """
+
+        points = np.asarray(points, dtype = np.float64)[:, :3]
+        mask = np.zeros(len(points), dtype = bool)
+        if not len(self.keys) or not len(points):
+            return mask
+
+        cells = np.floor(points / self.cell_size).astype(np.int64)
+        for offset in NEIGHBOURS:
+            keys = cell_keys(cells + offset)
+            indices = np.minimum(np.searchsorted(self.keys, keys), len(self.keys) - 1)
+            found = self.keys[indices] == keys
+            if not exact:
+                mask |= found
+                continue
+
+            # one pair per query point and grid point of the neighbouring cell
+            queries = np.flatnonzero(found & ~mask)
+            if not len(queries):
+                continue
+            starts = self.starts[indices[queries]]
+            counts = self.ends[indices[queries]] - starts
+            pair_queries = np.repeat(queries, counts)
+            pair_points = expand_ranges(starts, counts)
+
+            delta = points[pair_queries] - self.points[pair_points]
+            close = np.einsum('ij,ij->i', delta, delta) <= self.cell_size * self.cell_size
+            mask[pair_queries[close]] = True
+
+        return mask
+
+    def pairs(self) -> np.ndarray:
+        """
+        Find the pairs of grid points within a cell size of each other, measured between the points
+        of each occupied cell and of its 26 neighbours.
+
+        Returns:
+            np.ndarray: The (K, 2) sorted index pairs, indices of the points given to the grid, lower first.
+        """
+
+        if not len(self.keys):
+            return np.zeros((0, 2), dtype = np.int64)
+
+        counts = self.ends - self.starts
+        pairs = []
+        for offset in HALF_NEIGHBOURS:
+            # the packed keys add up, the offset coordinates being small
+            keys = self.keys + ((int(offset[0]) << 42) + (int(offset[1]) << 21) + int(offset[2]))
+            neighbours = np.minimum(np.searchsorted(self.keys, keys), len(self.keys) - 1)
+            first_cells = np.flatnonzero(self.keys[neighbours] == keys)
+            if not len(first_cells):
+                continue
+            second_cells = neighbours[first_cells]
+
+            # one pair per point of the first cell and point of the second cell
+            first_points = expand_ranges(self.starts[first_cells], counts[first_cells])
+            second_cells = np.repeat(second_cells, counts[first_cells])
+            first_points = np.repeat(first_points, counts[second_cells])
+            second_points = expand_ranges(self.starts[second_cells], counts[second_cells])
+
+            if not offset.any():
+                keep = first_points < second_points
+                first_points, second_points = first_points[keep], second_points[keep]
+            delta = self.points[first_points] - self.points[second_points]
+            close = np.einsum('ij,ij->i', delta, delta) <= self.cell_size * self.cell_size
+            pairs.append(np.stack([self.indices[first_points[close]], self.indices[second_points[close]]], axis = 1))
+
+        if not pairs:
+            return np.zeros((0, 2), dtype = np.int64)
+
+        return np.unique(np.sort(np.concatenate(pairs), axis = 1), axis = 0)
+
+
+def bounding_box(points) -> np.ndarray:
+    """
+    Get the (2, 3) minimum and maximum corners of points.
+    """
+
+    points = np.asarray(points, dtype = np.float64)[:, :3]
+
+    return np.stack([points.min(axis = 0), points.max(axis = 0)])
+
+
+def boxes_overlap(box, other, distance: float = 0.0) -> bool:
+    """
+    Check two (2, 3) bounding boxes are within a distance of each other.
+    """
+
+    return bool(np.all(box[0] <= other[1] + distance) and np.all(other[0] <= box[1] + distance))
+
+
+def near_points(points, targets, distance: float, grid: UniformGrid = None, exact: bool = False) -> np.ndarray:
+    """
+    Find the points within a distance of target points.
+    Points outside the target bounding box grown by the distance are rejected first, the others are queried on a grid.
+
+    Parameters:
+        points (array_like): The (M, 3) points to test.
+        targets (array_like): The (N, 3) target points.
+        distance (float): The distance.
+        grid (UniformGrid, optional): A grid of the targets with the distance as cell size, to share between queries.
+        exact (bool): Measure the distances instead of keeping every point in a neighbouring cell (see UniformGrid.near).
+
+    Returns:
+        np.ndarray: The (M,) boolean mask of the points near the targets.
+    """
+
+    points = np.asarray(points, dtype = np.float64)[:, :3]
+    targets = np.asarray(targets, dtype = np.float64)[:, :3]
+    mask = np.zeros(len(points), dtype = bool)
+    if not len(points) or not len(targets):
+        return mask
+
+    box: np.ndarray = bounding_box(targets)
+    inside = np.all((points >= box[0] - distance) & (points <= box[1] + distance), axis = 1)
+    if not inside.any():
+        return mask
+
+    grid = grid or UniformGrid(targets, distance)
+    mask[inside] = grid.near(points[inside], exact)
+
+    return mask
+
+
+def active_intervals(active, padding: int = 0) -> list:
+    """
+    Get the runs of True values of a per frame mask, each grown by padding frames.
+
+    Parameters:
+        active (array_like): The (F,) boolean mask.
+        padding (int): The number of frames added before and after each run.
+
+    Returns:
+        list: (first index, last index) tuples, sorted and not overlapping.
+    """
+
+    active = np.asarray(active, dtype = bool)
+    if padding > 0 and active.any():
+        padded = np.pad(active, padding)
+        active = np.lib.stride_tricks.sliding_window_view(padded, 2 * padding + 1).any(axis = 1)
+
+    changes = np.diff(np.concatenate([[0], active.astype(np.int8), [0]]))
+    starts = np.flatnonzero(changes == 1)
+    ends = np.flatnonzero(changes == -1) - 1
+
+    return [(int(start), int(end)) for start, end in zip(starts, ends)]
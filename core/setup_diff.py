@@ -0,0 +1,143 @@
+# Setup diff
+#
+# Compare two lists of setup specs (see funcs.build_funcs.SetupBuilder.build) and plan the smallest edits
+# turning one into the other: whole setups, the high mesh part, single colliders and nucleus settings.
+# Setups sharing a nucleus name its lead in 'nucleus_lead': the lead owns the nucleus and builds
+# the colliders of the whole group, so collider and nucleus edits are planned per lead.
+
+# keys changing the simulated mesh or its nucleus, the whole setup is rebuilt
+SETUP_KEYS = ('low_mesh', 'nucleus_lead')
+# keys changing the high mesh, wrap and output part
+HIGH_KEYS = ('high_mesh', 'wrap_node', 'lean_graph', 'output_mode')
+# keys of the lead changing how every collider of its nucleus is built
+COLLIDER_KEYS = ('proxy_faces', 'proxy_error', 'trim_distance', 'trim_frames', 'lean_graph')
+
+
+def changed_keys(current: dict, target: dict, keys: tuple) -> list:
+    return [key for key in keys if current.get(key) != target.get(key)]
+
+
+def get_lead(spec: dict) -> str:
+    """
+    Get the prefix of the setup owning the nucleus of a setup, its own prefix if it does not share one.
+    """
+
+    return spec.get('nucleus_lead') or spec['setup_prefix']
+
+
+def group_colliders(specs: list) -> dict:
+    """
+    Get the colliders built by each lead: the colliders of all the setups of its nucleus, lead first,
+    the first suffix given to a collider mesh kept (see funcs.build_funcs.SetupBuilder.build).
+
+    Parameters:
+        specs (list): The setup specs.
+
+    Returns:
+        dict: The collider suffixes by collider mesh, per lead prefix.
+    """
+
+    colliders = {}
+    for spec in sorted(specs, key = lambda spec: get_lead(spec) != spec['setup_prefix']):
+        lead_colliders: dict = colliders.setdefault(get_lead(spec), {})
+        for collider, collider_suffix in (spec.get('colliders') or {}).items():
+            lead_colliders.setdefault(collider, collider_suffix)
+
+    return colliders
+
+
+def diff_colliders(current: dict, target: dict) -> tuple:
+    """
+    Get the colliders to add and to remove, a collider given a new suffix is removed then added.
+
+    Parameters:
+        current (dict): The current collider suffixes by collider mesh.
+        target (dict): The target collider suffixes by collider mesh.
+
+    Returns:
+        tuple: The colliders to add and the colliders to remove, as collider suffixes by collider mesh.
+    """
+
+    current = current or {}
+    target = target or {}
+    added = {collider: suffix for collider, suffix in target.items() if current.get(collider) != suffix}
+    removed = {collider: suffix for collider, suffix in current.items() if target.get(collider) != suffix}
+
+    return added, removed
+
+
+def diff_setups(current: list, target: list) -> dict:
+    """
+    Plan the edits turning the current setups into the target ones.
+    Removing or rebuilding a lead deletes its nucleus, the other setups of its nucleus are rebuilt with it.
+
+    Parameters:
+        current (list): The current setup specs, with their 'nucleus' settings.
+        target (list): The target setup specs, optionally with 'nucleus' settings, only read on leads.
+
+    Returns:
+        dict: create (specs of the new setups and of the setups rebuilt from scratch), remove (prefixes of the setups
+            to delete, including the rebuilt ones), high (specs of the setups to rebuild the high part of),
+            colliders (per lead prefix, the 'add' and 'remove' colliders of its nucleus), nucleus (per lead prefix,
+            the settings to set), update (specs of the kept setups whose stored spec changes)
+            and unchanged (prefixes of the setups left as they are).
+    """
+
+    current_specs = {spec['setup_prefix']: spec for spec in current}
+    target_specs = {spec['setup_prefix']: spec for spec in target}
+    plan = {'create': [], 'remove': [], 'high': [], 'colliders': {}, 'nucleus': {}, 'update': [], 'unchanged': []}
+
+    removed = [setup_prefix for setup_prefix in current_specs if setup_prefix not in target_specs]
+    rebuilt = {
+        setup_prefix for setup_prefix, spec in target_specs.items()
+        if setup_prefix in current_specs and changed_keys(current_specs[setup_prefix], spec, SETUP_KEYS)
+    }
+    # leads do not share another nucleus, one pass finds every setup losing its nucleus
+    deleted = set(removed) | rebuilt
+    rebuilt |= {
+        setup_prefix for setup_prefix, spec in current_specs.items()
+        if setup_prefix in target_specs and get_lead(spec) != setup_prefix and get_lead(spec) in deleted
+    }
+
+    plan['remove'] = removed + [setup_prefix for setup_prefix in current_specs if setup_prefix in rebuilt]
+    plan['create'] = [spec for setup_prefix, spec in target_specs.items() if setup_prefix not in current_specs or setup_prefix in rebuilt]
+
+    current_colliders: dict = group_colliders(current)
+    target_colliders: dict = group_colliders(target)
+
+    for setup_prefix, spec in target_specs.items():
+        existing: dict = current_specs.get(setup_prefix)
+        if existing is None or setup_prefix in rebuilt:
+            continue
+
+        edited: bool = False
+        if changed_keys(existing, spec, HIGH_KEYS):
+            plan['high'].append(spec)
+            edited = True
+
+        if any(existing.get(key) != value for key, value in spec.items() if key != 'nucleus'):
+            plan['update'].append(spec)
+            edited = True
+
+        if get_lead(spec) == setup_prefix:
+            if changed_keys(existing, spec, COLLIDER_KEYS):
+                added, dropped = target_colliders.get(setup_prefix, {}), current_colliders.get(setup_prefix, {})
+            else:
+                added, dropped = diff_colliders(current_colliders.get(setup_prefix), target_colliders.get(setup_prefix))
+            if added or dropped:
+                plan['colliders'][setup_prefix] = {'add': added, 'remove': dropped}
+                edited = True
+
+            current_settings: dict = existing.get('nucleus') or {}
+            settings = {
+                attribute: value for attribute, value in (spec.get('nucleus') or {}).items()
+                if current_settings.get(attribute) != value
+            }
+            if settings:
+                plan['nucleus'][setup_prefix] = settings
+                edited = True
+
+        if not edited:
+            plan['unchanged'].append(setup_prefix)
+
+    return plan
@@ -0,0 +1,157 @@
+# Substeps
+#
+# Estimate the nucleus substeps and collision iterations a shot needs from how fast
+# its meshes move, compared to the edge length and thickness of the cloth.
+
+import numpy as np
+
+from .topology import polygon_edges
+
+
+def edge_lengths(points, polygon_counts, polygon_connects) -> np.ndarray:
+    """
+    Get the length of the edges of every polygon.
+
+    Parameters:
+        points (array_like): The (N, 3) points.
+        polygon_counts (array_like): Number of vertices of each polygon.
+        polygon_connects (array_like): Vertex indices of all the polygons, one after the other.
+
+    Returns:
+        np.ndarray: The (E,) lengths, one per face-vertex, so shared edges appear several times.
+    """
+
+    points = np.asarray(points, dtype = np.float64)[:, :3]
+    edges: np.ndarray = polygon_edges(polygon_counts, polygon_connects)
+    vectors = points[edges[:, 1]] - points[edges[:, 0]]
+
+    return np.sqrt(np.einsum('ij,ij->i', vectors, vectors))
+
+
+def peak_displacement(previous, current) -> float:
+    """
+    Get the largest distance a vertex travelled between two samples of the same mesh.
+
+    Parameters:
+        previous (array_like): The (N, 3) points at the previous sample.
+        current (array_like): The (N, 3) points at the current sample.
+
+    Returns:
+        float: The largest vertex displacement.
+    """
+
+    delta = np.asarray(current, dtype = np.float64)[:, :3] - np.asarray(previous, dtype = np.float64)[:, :3]
+    if not len(delta):
+        return 0.0
+
+    return float(np.sqrt(np.einsum('ij,ij->i', delta, delta).max()))
+
+
+def frame_displacements(positions) -> np.ndarray:
+    """
+    Get the largest vertex displacement of each frame of a sampled mesh.
+
+    Parameters:
+        positions (array_like): The (F, N, 3) points of each frame.
+
+    Returns:
+        np.ndarray: The (F,) displacements from the previous frame, 0.0 for the first one.
+    """
+
+    positions = np.asarray(positions, dtype = np.float64)[..., :3]
+    displacements = np.zeros(len(positions))
+    if len(positions) > 1 and positions.shape[1]:
+        delta = np.diff(positions, axis = 0)
+        displacements[1:] = np.sqrt(np.einsum('fij,fij->fi', delta, delta).max(axis = 1))
+
+    return displacements
+
+
+def estimate_substeps(
+    displacements,
+    edge_length: float,
+    thickness: float,
+    safety: float = 0.5,
+    substeps_range: tuple = (2, 64),
+    iterations_range: tuple = (4, 40)
+) -> tuple:
+    """
+    Get the minimum substeps and collision iterations of each frame.
+    A vertex moving less than the collision thickness plus half an edge per substep is still caught
+    by the collisions, the substeps keep the displacement per substep under a safety fraction of that distance.
+    The iterations grow with the displacement per substep measured in thicknesses.
+
+    Parameters:
+        displacements (array_like): The (F,) largest vertex displacement of each frame.
+        edge_length (float): The length of the short edges of the cloth.
+        thickness (float): The collision thickness, cloth and collider thickness together.
+        safety (float): The fraction of the reach a vertex may travel in one substep.
+        substeps_range (tuple): The minimum and maximum substeps.
+        iterations_range (tuple): The minimum and maximum collision iterations.
+
+    Returns:
+        tuple: The (F,) substeps and the (F,) collision iterations.
+    """
+
+    displacements = np.asarray(displacements, dtype = np.float64)
+    thickness = max(float(thickness), 1e-6)
+    reach: float = max(thickness + 0.5 * float(edge_length), 1e-6)
+
+    substeps = np.clip(np.ceil(displacements / (safety * reach)), *substeps_range).astype(np.int64)
+    per_substep = displacements / substeps
+    iterations = np.clip(np.ceil(iterations_range[0] * (1.0 + per_substep / thickness)), *iterations_range).astype(np.int64)
+
+    return substeps, iterations
+
+
+def frame_ranges(values, padding: int = 2, min_length: int = 10) -> list:
+    """
+    Split per frame values into ranges of constant value to key.
+    Each value is first raised to the largest value within padding frames, so settings go up
+    before a fast motion, then ranges shorter than min_length are merged into a neighbour, keeping the largest value.
+
+    Parameters:
+        values (array_like): The (F,) values.
+        padding (int): The number of frames to look around each frame.
+        min_length (int): The minimum number of frames of a range.
+
+    Returns:
+        list: (first index, last index, value) tuples covering all the frames.
+    """
+
+    values = np.asarray(values)
+    if not len(values):
+        return []
+
+    if padding > 0:
+        padded = np.pad(values, padding, mode = 'edge')
+        values = np.lib.stride_tricks.sliding_window_view(padded, 2 * padding + 1).max(axis = 1)
+
+    starts = np.flatnonzero(np.concatenate([[True], values[1:] != values[:-1]]))
+    ends = np.append(starts[1:], len(values)) - 1
+    ranges = [[int(start), int(end), values[start].item()] for start, end in zip(starts, ends)]
+
+    while len(ranges) > 1:
+        lengths = [end - start + 1 for start, end, _ in ranges]
+        index: int = int(np.argmin(lengths))
+        if lengths[index] >= min_length:
+            break
+
+        # merge the short range into its neighbour with the larger value
+        if index == 0:
+            neighbour = 1
+        elif index == len(ranges) - 1:
+            neighbour = index - 1
+        else:
+            neighbour = index - 1 if ranges[index - 1][2] >= ranges[index + 1][2] else index + 1
+
+        first, second = sorted((index, neighbour))
+        ranges[first] = [ranges[first][0], ranges[second][1], max(ranges[first][2], ranges[second][2])]
+        del ranges[second]
+
+        # neighbours may now share the same value
+        if first > 0 and ranges[first - 1][2] == ranges[first][2]:
+            ranges[first - 1][1] = ranges[first][1]
+            del ranges[first]
+
+    return [tuple(frame_range) for frame_range in ranges]
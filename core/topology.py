@@ -0,0 +1,144 @@
+# Topology
+#
+# Pure NumPy helpers on raw mesh arrays, usable without Maya.
+
+import numpy as np
+
+
+def triangulate(polygon_counts, polygon_connects) -> tuple:
+    """
+    Fan triangulate polygons given as Maya style counts / connects arrays.
+
+    Parameters:
+        polygon_counts (array_like): Number of vertices of each polygon.
+        polygon_connects (array_like): Vertex indices of all the polygons, one after the other.
+
+    Returns:
+        tuple: The (T, 3) triangle vertex indices and the (T,) index of the polygon of each triangle.
+    """
+
+    counts = np.asarray(polygon_counts, dtype = np.int64)
+    connects = np.asarray(polygon_connects, dtype = np.int64)
+
+    starts = np.cumsum(counts) - counts
+    triangle_counts = np.maximum(counts - 2, 0)
+    polygon_ids = np.repeat(np.arange(len(counts)), triangle_counts)
+    local = np.arange(triangle_counts.sum()) - np.repeat(np.cumsum(triangle_counts) - triangle_counts, triangle_counts)
+
+    first = starts[polygon_ids]
+    triangles = np.stack([
+        connects[first],
+        connects[first + local + 1],
+        connects[first + local + 2]
+    ], axis = 1)
+
+    return triangles, polygon_ids
+
+
+def following_face_vertices(polygon_counts) -> np.ndarray:
+    """
+    Get the index of the next face-vertex of each face-vertex, wrapping around each polygon.
+
+    Parameters:
+        polygon_counts (array_like): Number of vertices of each polygon.
+
+    Returns:
+        np.ndarray: The (F,) face-vertex indices into the connects array.
+    """
+
+    counts = np.asarray(polygon_counts, dtype = np.int64)
+
+    ends = np.cumsum(counts)
+    following = np.arange(1, int(ends[-1]) + 1 if len(ends) else 1)
+    # the last face-vertex of each polygon loops back to the first one
+    following[ends[counts > 0] - 1] = (ends - counts)[counts > 0]
+
+    return following
+
+
+def polygon_edges(polygon_counts, polygon_connects) -> np.ndarray:
+    """
+    Get the edges of every polygon, with the vertex indices of each edge sorted.
+
+    Parameters:
+        polygon_counts (array_like): Number of vertices of each polygon.
+        polygon_connects (array_like): Vertex indices of all the polygons, one after the other.
+
+    Returns:
+        np.ndarray: The (E, 2) edges, one per face-vertex, so shared edges appear several times.
+    """
+
+    connects = np.asarray(polygon_connects, dtype = np.int64)
+    next_connects = connects[following_face_vertices(polygon_counts)]
+
+    return np.stack([np.minimum(connects, next_connects), np.maximum(connects, next_connects)], axis = 1)
+
+
+def vertex_faces_mask(polygon_counts, polygon_connects, vertex_mask) -> np.ndarray:
+    """
+    Get the polygons using at least one of the masked vertices.
+
+    Parameters:
+        polygon_counts (array_like): Number of vertices of each polygon.
+        polygon_connects (array_like): Vertex indices of all the polygons, one after the other.
+        vertex_mask (array_like): The (N,) boolean mask of the vertices.
+
+    Returns:
+        np.ndarray: The (P,) boolean mask of the polygons.
+    """
+
+    counts = np.asarray(polygon_counts, dtype = np.int64)
+    connects = np.asarray(polygon_connects, dtype = np.int64)
+    polygon_ids = np.repeat(np.arange(len(counts)), counts)
+
+    return np.bincount(polygon_ids, weights = np.asarray(vertex_mask, dtype = bool)[connects], minlength = len(counts)) > 0
+
+
+def grow_faces_mask(polygon_counts, polygon_connects, faces_mask, rings: int = 1) -> np.ndarray:
+    """
+    Grow a polygon selection by rings of polygons sharing a vertex with it.
+
+    Parameters:
+        polygon_counts (array_like): Number of vertices of each polygon.
+        polygon_connects (array_like): Vertex indices of all the polygons, one after the other.
+        faces_mask (array_like): The (P,) boolean mask of the selected polygons.
+        rings (int): The number of rings to add.
+
+    Returns:
+        np.ndarray: The (P,) boolean mask of the grown selection.
+    """
+
+    counts = np.asarray(polygon_counts, dtype = np.int64)
+    connects = np.asarray(polygon_connects, dtype = np.int64)
+    faces_mask = np.asarray(faces_mask, dtype = bool)
+    vertex_count: int = int(connects.max()) + 1 if len(connects) else 0
+
+    for _ in range(rings):
+        vertex_mask = np.zeros(vertex_count, dtype = bool)
+        vertex_mask[connects[np.repeat(faces_mask, counts)]] = True
+        faces_mask = vertex_faces_mask(counts, connects, vertex_mask)
+
+    return faces_mask
+
+
+def submesh(polygon_counts, polygon_connects, faces_mask) -> tuple:
+    """
+    Extract polygons as a new mesh with its own compact vertex indices.
+
+    Parameters:
+        polygon_counts (array_like): Number of vertices of each polygon.
+        polygon_connects (array_like): Vertex indices of all the polygons, one after the other.
+        faces_mask (array_like): The (P,) boolean mask of the polygons to keep.
+
+    Returns:
+        tuple: The polygon counts, the polygon connects and the (M,) original index of each new vertex.
+    """
+
+    counts = np.asarray(polygon_counts, dtype = np.int64)
+    connects = np.asarray(polygon_connects, dtype = np.int64)
+    faces_mask = np.asarray(faces_mask, dtype = bool)
+
+    kept_connects = connects[np.repeat(faces_mask, counts)]
+    point_indices, new_connects = np.unique(kept_connects, return_inverse = True)
+
+    return counts[faces_mask], new_connects.ravel(), point_indices
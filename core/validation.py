@@ -0,0 +1,149 @@
+# Validation
+#
+# Vectorized checks of a mesh before it becomes an nCloth: non-manifold edges,
+# zero-area faces, coincident points and a size that does not fit the nucleus space scale.
+
+import numpy as np
+
+from .proximity import UniformGrid
+from .topology import following_face_vertices, polygon_edges
+
+
+# size of a garment in meters, once scaled by the nucleus space scale
+SIZE_RANGE = (0.05, 10.0)
+
+
+def edge_use_counts(polygon_counts, polygon_connects) -> tuple:
+    """
+    Count the faces using each edge.
+
+    Parameters:
+        polygon_counts (array_like): Number of vertices of each polygon.
+        polygon_connects (array_like): Vertex indices of all the polygons, one after the other.
+
+    Returns:
+        tuple: The (E, 2) unique edges and the (E,) number of faces using them.
+    """
+
+    edges: np.ndarray = polygon_edges(polygon_counts, polygon_connects)
+    if not len(edges):
+        return edges, np.zeros(0, dtype = np.int64)
+
+    # one int64 key per edge sorts much faster than unique rows
+    vertex_count: int = int(edges[:, 1].max()) + 1
+    keys = edges[:, 0] * vertex_count + edges[:, 1]
+    keys.sort()
+    starts = np.flatnonzero(np.concatenate([[True], keys[1:] != keys[:-1]]))
+    use_counts = np.diff(np.append(starts, len(keys)))
+
+    return np.stack(np.divmod(keys[starts], vertex_count), axis = 1), use_counts
+
+
+def face_areas(points, polygon_counts, polygon_connects) -> np.ndarray:
+    """
+    Get the area of each polygon with Newell's method, half the norm of the summed
+    cross products of its consecutive vertices, also right for non planar polygons.
+
+    Returns:
+        np.ndarray: The (P,) areas.
+    """
+
+    points = np.asarray(points, dtype = np.float64)[:, :3]
+    counts = np.asarray(polygon_counts, dtype = np.int64)
+    connects = np.asarray(polygon_connects, dtype = np.int64)
+
+    # one contiguous row per axis, gathering rows of 3 floats is much slower
+    coordinates = np.ascontiguousarray((points - points.mean(axis = 0)).T)
+    current = coordinates[:, connects]
+    following = current[:, following_face_vertices(counts)]
+    polygon_ids = np.repeat(np.arange(len(counts)), counts)
+
+    normals = np.empty((len(counts), 3))
+    for axis in range(3):
+        first, second = (axis + 1) % 3, (axis + 2) % 3
+        cross = current[first] * following[second] - current[second] * following[first]
+        normals[:, axis] = np.bincount(polygon_ids, weights = cross, minlength = len(counts))
+
+    return 0.5 * np.sqrt(np.einsum('ij,ij->i', normals, normals))
+
+
+def coincident_points(points, tolerance: float) -> np.ndarray:
+    """
+    Find points closer than tolerance to another point, on a uniform grid of the tolerance size
+    (see proximity.UniformGrid.pairs): every point is measured against the points of its cell and of the 26 around it.
+
+    Parameters:
+        points (array_like): The (N, 3) points.
+        tolerance (float): The distance under which two points are coincident.
+
+    Returns:
+        np.ndarray: The (K, 2) sorted index pairs of coincident points.
+    """
+
+    points = np.asarray(points, dtype = np.float64)[:, :3]
+    if len(points) < 2 or tolerance <= 0.0:
+        return np.zeros((0, 2), dtype = np.int64)
+
+    # cell coordinates from the bounding box corner, far from the origin they would overflow the grid keys
+    return UniformGrid(points - points.min(axis = 0), tolerance).pairs()
+
+
+def validate_mesh(
+    points,
+    polygon_counts,
+    polygon_connects,
+    space_scale: float = 0.1,
+    area_tolerance: float = 1e-6,
+    point_tolerance: float = 1e-4,
+    size_range: tuple = SIZE_RANGE
+) -> dict:
+    """
+    Check a mesh can be simulated as an nCloth.
+
+    Parameters:
+        points (array_like): The (N, 3) points.
+        polygon_counts (array_like): Number of vertices of each polygon.
+        polygon_connects (array_like): Vertex indices of all the polygons, one after the other.
+        space_scale (float): The nucleus space scale, meters per scene unit.
+        area_tolerance (float): Faces smaller than this fraction of the mean face area are zero-area faces.
+        point_tolerance (float): Points closer than this fraction of the bounding box diagonal are coincident.
+        size_range (tuple): The accepted bounding box diagonal in meters.
+
+    Returns:
+        dict: The non_manifold_edges, zero_area_faces and coincident_points arrays, the size in meters,
+            and the errors (the mesh must not be simulated) and warnings messages.
+    """
+
+    points = np.asarray(points, dtype = np.float64)[:, :3]
+    polygon_counts = np.asarray(polygon_counts, dtype = np.int64)
+    polygon_connects = np.asarray(polygon_connects, dtype = np.int64)
+
+    edges, use_counts = edge_use_counts(polygon_counts, polygon_connects)
+    non_manifold_edges = edges[use_counts > 2]
+
+    areas: np.ndarray = face_areas(points, polygon_counts, polygon_connects)
+    zero_area_faces = np.flatnonzero(areas <= area_tolerance * (areas.mean() if len(areas) else 0.0))
+
+    diagonal: float = float(np.linalg.norm(points.max(axis = 0) - points.min(axis = 0))) if len(points) else 0.0
+    coincident = coincident_points(points, point_tolerance * diagonal)
+    size: float = diagonal * space_scale
+
+    errors = []
+    warnings = []
+    if len(non_manifold_edges):
+        errors.append(f'{len(non_manifold_edges)} non-manifold edges')
+    if len(zero_area_faces):
+        errors.append(f'{len(zero_area_faces)} zero-area faces')
+    if len(coincident):
+        warnings.append(f'{len(coincident)} pairs of coincident points')
+    if not size_range[0] <= size <= size_range[1]:
+        warnings.append(f'size of {size:.3g} m with a space scale of {space_scale}, outside {size_range[0]}-{size_range[1]} m')
+
+    return {
+        'non_manifold_edges': non_manifold_edges,
+        'zero_area_faces': zero_area_faces,
+        'coincident_points': coincident,
+        'size': size,
+        'errors': errors,
+        'warnings': warnings
+    }
@@ -0,0 +1,150 @@
+# Watchdog
+#
+# Health of simulated frames from plain arrays: non finite points, edge stretch against
+# the rest lengths and vertex displacement from the previous frame.
+
+import numpy as np
+
+
+def edge_stretch(points, edges: np.ndarray, rest_lengths: np.ndarray) -> np.ndarray:
+    """
+    Get the length of edges divided by their rest length.
+
+    Parameters:
+        points (array_like): The (N, 3) points.
+        edges (np.ndarray): The (E, 2) edge vertex indices.
+        rest_lengths (np.ndarray): The (E,) rest lengths.
+
+    Returns:
+        np.ndarray: The (E,) stretch ratios, 1.0 at rest.
+    """
+
+    points = np.asarray(points, dtype = np.float64)[:, :3]
+    vectors = points[edges[:, 1]] - points[edges[:, 0]]
+
+    return np.sqrt(np.einsum('ij,ij->i', vectors, vectors)) / np.maximum(rest_lengths, 1e-12)
+
+
+def frame_health(points, previous, edges: np.ndarray, rest_lengths: np.ndarray, max_stretch: float, max_displacement: float) -> dict:
+    """
+    Measure the health of a simulated frame.
+
+    Parameters:
+        points (array_like): The (N, 3) points of the frame.
+        previous (array_like): The (N, 3) points of the previous frame, None for the first frame.
+        edges (np.ndarray): The (E, 2) edge vertex indices.
+        rest_lengths (np.ndarray): The (E,) rest lengths.
+        max_stretch (float): The largest accepted stretch ratio.
+        max_displacement (float): The largest accepted vertex displacement from the previous frame.
+
+    Returns:
+        dict: finite (every point is finite), stretch (largest stretch ratio), displacement (largest displacement)
+            and health, the largest of stretch / max_stretch and displacement / max_displacement:
+            over 1.0 the frame exceeds a limit, infinite when a point is not finite.
+    """
+
+    points = np.asarray(points, dtype = np.float64)[:, :3]
+    finite: bool = bool(np.isfinite(points).all())
+    if not finite:
+        return {'finite': False, 'stretch': float('inf'), 'displacement': float('inf'), 'health': float('inf')}
+
+    stretch: float = float(edge_stretch(points, edges, rest_lengths).max()) if len(edges) else 1.0
+
+    displacement: float = 0.0
+    if previous is not None and len(points):
+        delta = points - np.asarray(previous, dtype = np.float64)[:, :3]
+        displacement = float(np.sqrt(np.einsum('ij,ij->i', delta, delta).max()))
+
+    return {
+        'finite': True,
+        'stretch': stretch,
+        'displacement': displacement,
+        'health': max(stretch / max_stretch, displacement / max_displacement if max_displacement else 0.0)
+    }
+
+
+class WatchdogAbort(RuntimeError):
+    """
+    Raised to abort a run on a frame over the watchdog limits, running it again gives the same frame.
+    """
+
+
+class Watchdog:
+    """
+    Check the frames of a simulated mesh as they are evaluated and keep a per frame health report.
+    The limits are exceeded when a frame has a health over 1.0.
+    """
+
+    def __init__(self, rest_points, edges: np.ndarray, max_stretch: float = 3.0, max_displacement: float = None, displacement_ratio: float = 0.25):
+        """
+        Parameters:
+            rest_points (array_like): The (N, 3) rest points.
+            edges (np.ndarray): The (E, 2) unique edge vertex indices.
+            max_stretch (float): The largest accepted edge stretch ratio.
+            max_displacement (float, optional): The largest accepted vertex displacement per frame,
+                displacement_ratio times the rest bounding box diagonal if None.
+            displacement_ratio (float): The default displacement limit, as a fraction of the rest bounding box diagonal.
+        """
+
+        rest_points = np.asarray(rest_points, dtype = np.float64)[:, :3]
+        self.edges: np.ndarray = np.asarray(edges, dtype = np.int64)
+        vectors = rest_points[self.edges[:, 1]] - rest_points[self.edges[:, 0]]
+        self.rest_lengths: np.ndarray = np.sqrt(np.einsum('ij,ij->i', vectors, vectors))
+
+        if max_displacement is None and len(rest_points):
+            max_displacement = displacement_ratio * float(np.linalg.norm(rest_points.max(axis = 0) - rest_points.min(axis = 0)))
+
+        self.max_stretch = max_stretch
+        self.max_displacement = max_displacement
+        self.previous: np.ndarray = None
+        self.previous_frame: float = None
+        self.frames = {}
+
+    def reset(self) -> None:
+        self.previous = None
+        self.previous_frame = None
+        self.frames = {}
+
+    def check(self, frame: float, points) -> dict:
+        """
+        Measure a frame. The displacement is only measured when the frame follows the previous checked one.
+
+        Parameters:
+            frame (float): The frame.
+            points (array_like): The (N, 3) points of the frame.
+
+        Returns:
+            dict: The health of the frame (see frame_health).
+        """
+
+        points = np.asarray(points, dtype = np.float64)[:, :3]
+        previous = self.previous if self.previous_frame is not None and frame - self.previous_frame == 1.0 else None
+        health: dict = frame_health(points, previous, self.edges, self.rest_lengths, self.max_stretch, self.max_displacement)
+
+        self.frames[frame] = health
+        self.previous = points
+        self.previous_frame = frame
+
+        return health
+
+    @property
+    def exceeded(self) -> bool:
+        return any(health['health'] > 1.0 for health in self.frames.values())
+
+    def first_exceeded(self) -> float:
+        """
+        Returns:
+            float: The first frame over the limits, None if there is none.
+        """
+
+        frames = [frame for frame, health in self.frames.items() if health['health'] > 1.0]
+
+        return min(frames) if frames else None
+
+    def to_dict(self) -> dict:
+        return {
+            'max_stretch': self.max_stretch,
+            'max_displacement': self.max_displacement,
+            'first_exceeded': self.first_exceeded(),
+            'frames': {str(frame): health for frame, health in sorted(self.frames.items())}
+        }
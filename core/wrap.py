@@ -0,0 +1,301 @@
+# Wrap
+#
+# Wrap binding computed once (closest triangle, barycentric weights and offset in the
+# triangle tangent frame) and applied each frame as one vectorized gather and transform.
+
+import hashlib
+import os
+
+import numpy as np
+
+from .topology import triangulate
+
+
+EPSILON = 1e-12
+# decimals the rest points are rounded to before hashing, so float noise reuses a binding
+POINT_DECIMALS = 5
+
+
+def closest_barycentric(points: np.ndarray, a: np.ndarray, b: np.ndarray, c: np.ndarray) -> np.ndarray:
+    """
+    Get the barycentric weights of the closest point on triangles, one triangle per point.
+
+    Parameters:
+        points (np.ndarray): The (M, 3) query points.
+        a (np.ndarray): The (M, 3) first vertices of the triangles.
+        b (np.ndarray): The (M, 3) second vertices of the triangles.
+        c (np.ndarray): The (M, 3) third vertices of the triangles.
+
+    Returns:
+        np.ndarray: The (M, 3) barycentric weights of the closest points.
+    """
+
+    ab = b - a
+    ac = c - a
+    ap = points - a
+    bp = points - b
+    cp = points - c
+
+    d1 = np.einsum('ij,ij->i', ab, ap)
+    d2 = np.einsum('ij,ij->i', ac, ap)
+    d3 = np.einsum('ij,ij->i', ab, bp)
+    d4 = np.einsum('ij,ij->i', ac, bp)
+    d5 = np.einsum('ij,ij->i', ab, cp)
+    d6 = np.einsum('ij,ij->i', ac, cp)
+
+    va = d3 * d6 - d5 * d4
+    vb = d5 * d2 - d1 * d6
+    vc = d1 * d4 - d3 * d2
+
+    with np.errstate(divide = 'ignore', invalid = 'ignore'):
+        # inside the triangle
+        denominator = va + vb + vc
+        denominator = np.where(np.abs(denominator) < EPSILON, EPSILON, denominator)
+        v = vb / denominator
+        w = vc / denominator
+        weights = np.stack([1.0 - v - w, v, w], axis = 1)
+
+        # regions tested from the lowest to the highest priority so the highest one wins
+        t_bc = (d4 - d3) / np.maximum((d4 - d3) + (d5 - d6), EPSILON)
+        t_ac = d2 / np.where(np.abs(d2 - d6) < EPSILON, EPSILON, d2 - d6)
+        t_ab = d1 / np.where(np.abs(d1 - d3) < EPSILON, EPSILON, d1 - d3)
+        zeros = np.zeros_like(d1)
+        ones = np.ones_like(d1)
+
+        regions = (
+            ((va <= 0) & (d4 - d3 >= 0) & (d5 - d6 >= 0), (zeros, 1.0 - t_bc, t_bc)),
+            ((vb <= 0) & (d2 >= 0) & (d6 <= 0), (1.0 - t_ac, zeros, t_ac)),
+            ((d6 >= 0) & (d5 <= d6), (zeros, zeros, ones)),
+            ((vc <= 0) & (d1 >= 0) & (d3 <= 0), (1.0 - t_ab, t_ab, zeros)),
+            ((d3 >= 0) & (d4 <= d3), (zeros, ones, zeros)),
+            ((d1 <= 0) & (d2 <= 0), (ones, zeros, zeros))
+        )
+
+        for mask, region_weights in regions:
+            weights = np.where(mask[:, None], np.stack(region_weights, axis = 1), weights)
+
+    return weights
+
+
+def triangle_frames(a: np.ndarray, b: np.ndarray, c: np.ndarray) -> np.ndarray:
+    """
+    Get an orthonormal tangent frame per triangle: first edge, bitangent and normal.
+
+    Parameters:
+        a (np.ndarray): The (M, 3) first vertices of the triangles.
+        b (np.ndarray): The (M, 3) second vertices of the triangles.
+        c (np.ndarray): The (M, 3) third vertices of the triangles.
+
+    Returns:
+        np.ndarray: The (M, 3, 3) frames, one axis per row.
+    """
+
+    tangent = b - a
+    tangent /= np.maximum(np.linalg.norm(tangent, axis = 1), EPSILON)[:, None]
+    normal = np.cross(b - a, c - a)
+    normal /= np.maximum(np.linalg.norm(normal, axis = 1), EPSILON)[:, None]
+    bitangent = np.cross(normal, tangent)
+
+    return np.stack([tangent, bitangent, normal], axis = 1)
+
+
+def bind(
+    driven_points,
+    driver_points,
+    driver_triangles,
+    candidates: int = 8,
+    chunk_elements: int = 2 ** 24
+) -> dict:
+    """
+    Bind points to the closest triangle of a driver mesh.
+    The closest triangle is searched among the triangles with the nearest centroids.
+
+    Parameters:
+        driven_points (array_like): The (N, 3) points to bind.
+        driver_points (array_like): The (V, 3) points of the driver mesh.
+        driver_triangles (array_like): The (T, 3) triangles of the driver mesh.
+        candidates (int): Number of nearest triangle centroids tested exactly per point.
+        chunk_elements (int): Size of the point / centroid distance blocks, bounds the memory used.
+
+    Returns:
+        dict: The binding arrays: triangles (N,), weights (N, 3), offsets (N, 3), driver_triangles (T, 3)
+            and the used triangles with the (N,) index of each point in them.
+    """
+
+    driven_points = np.asarray(driven_points, dtype = np.float64)[:, :3]
+    driver_points = np.asarray(driver_points, dtype = np.float64)[:, :3]
+    driver_triangles = np.asarray(driver_triangles, dtype = np.int64)
+
+    corners = driver_points[driver_triangles]
+
+    # candidates are only preselected with the centroids, float32 is enough and twice as fast
+    origin = driver_points.mean(axis = 0)
+    centroids = (corners.mean(axis = 1) - origin).astype(np.float32)
+    centroid_norms = np.einsum('ij,ij->i', centroids, centroids)
+    candidate_count: int = min(candidates, len(driver_triangles))
+    chunk_size: int = max(1, chunk_elements // len(driver_triangles))
+
+    triangles = np.empty(len(driven_points), dtype = np.int64)
+    weights = np.empty((len(driven_points), 3), dtype = np.float64)
+
+    for start in range(0, len(driven_points), chunk_size):
+        points = driven_points[start:start + chunk_size]
+        local_points = (points - origin).astype(np.float32)
+        distances = np.einsum('ij,ij->i', local_points, local_points)[:, None] - 2.0 * local_points @ centroids.T + centroid_norms[None, :]
+
+        if candidate_count < len(driver_triangles):
+            candidate_ids = np.argpartition(distances, candidate_count - 1, axis = 1)[:, :candidate_count]
+        else:
+            candidate_ids = np.broadcast_to(np.arange(candidate_count), (len(points), candidate_count))
+
+        flat_ids = candidate_ids.reshape(-1)
+        flat_points = np.repeat(points, candidate_count, axis = 0)
+        flat_weights = closest_barycentric(flat_points, corners[flat_ids, 0], corners[flat_ids, 1], corners[flat_ids, 2])
+        closest = np.einsum('ij,ijk->ik', flat_weights, corners[flat_ids])
+        closest_distances = np.einsum('ij,ij->i', flat_points - closest, flat_points - closest).reshape(len(points), candidate_count)
+
+        best = np.argmin(closest_distances, axis = 1)
+        rows = np.arange(len(points))
+        triangles[start:start + chunk_size] = candidate_ids[rows, best]
+        weights[start:start + chunk_size] = flat_weights.reshape(len(points), candidate_count, 3)[rows, best]
+
+    bound_corners = corners[triangles]
+    base = np.einsum('ij,ijk->ik', weights, bound_corners)
+    frames = triangle_frames(bound_corners[:, 0], bound_corners[:, 1], bound_corners[:, 2])
+    offsets = np.einsum('nij,nj->ni', frames, driven_points - base)
+
+    used_triangles, used_ids = np.unique(triangles, return_inverse = True)
+
+    return {
+        'triangles': triangles,
+        'weights': weights,
+        'offsets': offsets,
+        'driver_triangles': driver_triangles,
+        'used_triangles': used_triangles,
+        'used_ids': used_ids.reshape(-1)
+    }
+
+
+def apply(driver_points, binding: dict) -> np.ndarray:
+    """
+    Get the wrapped points for a pose of the driver mesh.
+
+    Parameters:
+        driver_points (array_like): The (V, 3) points of the driver mesh.
+        binding (dict): The binding returned by bind.
+
+    Returns:
+        np.ndarray: The (N, 3) wrapped points.
+    """
+
+    driver_points = np.asarray(driver_points, dtype = np.float64)[:, :3]
+
+    # frames are computed once per used triangle, not once per point
+    used_ids = binding['used_ids']
+    used_corners = driver_points[binding['driver_triangles'][binding['used_triangles']]]
+    frames = triangle_frames(used_corners[:, 0], used_corners[:, 1], used_corners[:, 2])[used_ids]
+
+    base = np.einsum('ij,ijk->ik', binding['weights'], used_corners[used_ids])
+
+    return base + np.einsum('ni,nij->nj', binding['offsets'], frames)
+
+
+def topology_hash(*topologies) -> str:
+    """
+    Hash mesh topologies given as (point count, polygon counts, polygon connects) tuples.
+
+    Returns:
+        str: The hexadecimal digest.
+    """
+
+    digest = hashlib.sha1()
+    for point_count, polygon_counts, polygon_connects in topologies:
+        digest.update(np.int64(point_count).tobytes())
+        digest.update(np.ascontiguousarray(polygon_counts, dtype = np.int64).tobytes())
+        digest.update(np.ascontiguousarray(polygon_connects, dtype = np.int64).tobytes())
+
+    return digest.hexdigest()
+
+
+def points_hash(*point_arrays) -> str:
+    """
+    Hash point positions given as (N, 3) arrays, rounded to POINT_DECIMALS.
+
+    Returns:
+        str: The hexadecimal digest.
+    """
+
+    digest = hashlib.sha1()
+    for points in point_arrays:
+        # + 0.0 turns the -0.0 of rounding into 0.0
+        digest.update(np.ascontiguousarray(np.round(np.asarray(points, dtype = np.float64), POINT_DECIMALS) + 0.0).tobytes())
+
+    return digest.hexdigest()
+
+
+def save_binding(path: str, binding: dict) -> str:
+    """
+    Save a binding as an npz file.
+
+    Returns:
+        str: The path of the file.
+    """
+
+    directory: str = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok = True)
+
+    np.savez(path, **binding)
+
+    return path
+
+
+def load_binding(path: str) -> dict:
+    """
+    Load a binding saved with save_binding.
+
+    Returns:
+        dict: The binding arrays.
+    """
+
+    with np.load(path) as data:
+        return {key: data[key] for key in data.files}
+
+
+def cached_bind(
+    cache_dir: str,
+    driven_points,
+    driven_topology: tuple,
+    driver_points,
+    driver_topology: tuple,
+    candidates: int = 8
+) -> tuple:
+    """
+    Bind points to a driver mesh, reusing the binding saved for the same pair of topologies and rest points.
+
+    Parameters:
+        cache_dir (str): The folder of the npz bindings.
+        driven_points (array_like): The (N, 3) points to bind.
+        driven_topology (tuple): The polygon counts and connects of the driven mesh.
+        driver_points (array_like): The (V, 3) points of the driver mesh.
+        driver_topology (tuple): The polygon counts and connects of the driver mesh.
+        candidates (int): Number of nearest triangle centroids tested exactly per point.
+
+    Returns:
+        tuple: The binding and the path of its npz file.
+    """
+
+    topology_key: str = topology_hash(
+        (len(driven_points), *driven_topology),
+        (len(driver_points), *driver_topology)
+    )
+    points_key: str = points_hash(driven_points, driver_points)
+    path: str = os.path.join(cache_dir, f'wrap_{topology_key[:16]}_{points_key[:16]}.npz')
+
+    if os.path.exists(path):
+        return load_binding(path), path
+
+    driver_triangles, _ = triangulate(*driver_topology)
+    binding: dict = bind(driven_points, driver_points, driver_triangles, candidates = candidates)
+
+    return binding, save_binding(path, binding)
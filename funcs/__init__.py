@@ -1,13 +1,26 @@
 from .cloth_funcs import (
+    get_free_passive_indices,
     create_passive_collider,
+    join_nucleus,
+    create_passive_colliders,
     duplicate_mesh,
+    link_mesh,
     ensure_cloth_groups,
     ensure_nsystem_group,
     ensure_colliders_group,
     ensure_init_mesh,
+    validate_cloth_mesh,
+    create_ncloth_nodes,
     create_cloth,
+    create_collider_proxy,
     create_collider_mesh,
+    np_wrap,
+    apply_wrap,
     create_hi_setup,
+    drive_output_transform,
+    drive_output_mesh,
+    create_output_setup,
+    full_setup_steps,
     create_full_setup
 )
 
@@ -17,5 +30,90 @@ from .preroll_funcs import (
     set_key_frame,
     set_attributes_to_defaults,
     set_preroll_keys,
-    set_preroll
-)
\ No newline at end of file
+    get_keyable_plugs,
+    set_preroll_keys_bulk,
+    get_plug_values,
+    get_default_values,
+    capture_rest_pose,
+    set_preroll_poses,
+    set_preroll,
+    preroll_steps
+)
+
+from .build_funcs import (
+    SetupBuilder,
+    build_setups
+)
+
+from .cache_funcs import (
+    get_cache_meshes,
+    write_point_cache,
+    read_point_cache,
+    apply_point_cache_frame
+)
+
+from .index_funcs import (
+    SceneIndex,
+    get_scene_index,
+    find_role,
+    normalize_setup_spec,
+    store_setup_spec,
+    read_setup_spec
+)
+
+from .ncache_funcs import (
+    find_nucleus_systems,
+    attach_ncloth_cache,
+    create_ncaches_parallel
+)
+
+from .profile_funcs import (
+    get_profiler,
+    profile_step
+)
+
+from .job_funcs import (
+    StepJob
+)
+from .nucleus_funcs import (
+    get_nucleus_inputs,
+    get_output_meshes,
+    iter_frames,
+    sample_peak_displacements,
+    estimate_nucleus_substeps,
+    plan_nucleus_groups
+)
+
+from .collider_funcs import (
+    get_collider_systems,
+    key_collider_activation,
+    set_collider_activation,
+    sample_trim_frames,
+    find_collider_faces
+)
+
+from .watchdog_funcs import (
+    MeshWatchdog,
+    attach_watchdogs,
+    check_watchdogs
+)
+
+from .checkpoint_funcs import (
+    CheckpointRecorder,
+    attach_checkpoint_recorder,
+    resume_from_checkpoint,
+    clear_resume
+)
+
+from .graph_funcs import (
+    find_collapsible_blendshapes,
+    collapse_blendshape,
+    measure_evaluation_time,
+    migrate_lean_graph
+)
+
+from .manifest_funcs import (
+    get_live_setups,
+    export_setups,
+    rebuild_from_manifest
+)
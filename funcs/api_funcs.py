@@ -0,0 +1,57 @@
+# OpenMaya api funcs
+
+from maya.api import OpenMaya as om
+
+
+def get_mobject(node: str) -> om.MObject:
+    """
+    Get the MObject of a node.
+
+    Parameters:
+        node (str): The name of the node.
+
+    Returns:
+        om.MObject: The MObject of the node.
+    """
+
+    selection = om.MSelectionList()
+    selection.add(node)
+
+    return selection.getDependNode(0)
+
+
+def get_dag_path(node: str) -> om.MDagPath:
+    """
+    Get the dag path of a node.
+
+    Parameters:
+        node (str): The name of the dag node.
+
+    Returns:
+        om.MDagPath: The dag path of the node.
+    """
+
+    selection = om.MSelectionList()
+    selection.add(node)
+
+    return selection.getDagPath(0)
+
+
+def get_plug(node: str, attribute: str, index: int = None) -> om.MPlug:
+    """
+    Get a plug of a node, optionally the element of a multi attribute.
+
+    Parameters:
+        node (str): The name of the node.
+        attribute (str): The name of the attribute.
+        index (int, optional): The logical index of the element for multi attributes.
+
+    Returns:
+        om.MPlug: The plug.
+    """
+
+    plug: om.MPlug = om.MFnDependencyNode(get_mobject(node)).findPlug(attribute, False)
+    if index is not None:
+        plug = plug.elementByLogicalIndex(index)
+
+    return plug
@@ -0,0 +1,339 @@
+# Build funcs
+
+from maya.api import OpenMaya as om
+from maya import cmds
+from typing import Literal
+
+from .cloth_funcs import (
+    HI_GRP,
+    OUTPUT_GRP,
+    CLOTH_GRP,
+    CLOTH_SET,
+    create_collider_proxy,
+    duplicate_mesh,
+    ensure_cloth_groups,
+    ensure_init_mesh,
+    ensure_control_joint_output,
+    create_ncloth_nodes,
+    get_free_passive_indices,
+    link_mesh,
+    drive_output_mesh,
+    apply_wrap,
+    validate_cloth_mesh
+)
+from .collider_funcs import find_collider_faces
+from .api_funcs import get_mobject, get_plug
+from .index_funcs import find_role, get_scene_index, node_name, store_setup_spec
+from .plugin_funcs import apply_modifier, ensure_plugin
+from .profile_funcs import get_profiler, profile_step
+
+
+UNDO_CHUNK = "clothSetupBuild"
+
+
+class SetupBuilder:
+    """
+    Collect the groups, parents, renames and connections of one or several cloth setups
+    into OpenMaya modifiers. Each flushed modifier goes through the undoable clothSetupApplyModifier command.
+    """
+
+    def __init__(
+        self,
+        wrap_node: Literal['wrap', 'cvwrap', 'npwrap'] = 'cvwrap',
+        fast_duplicate: bool = False,
+        lean_graph: bool = False,
+        output_mode: Literal['skin', 'transform'] = 'skin'
+    ):
+        self.wrap_node = wrap_node
+        self.fast_duplicate = fast_duplicate
+        self.lean_graph = lean_graph
+        self.output_mode = output_mode
+        self.modifier = om.MDagModifier()
+        self.pending: int = 0
+
+    @profile_step(name = 'flush_modifier')
+    def flush(self) -> None:
+        """
+        Apply the current modifier and start a new one.
+        """
+
+        if not self.pending:
+            return
+
+        apply_modifier(self.modifier)
+        self.modifier = om.MDagModifier()
+        self.pending = 0
+
+    def create_group(self, name: str, parent = None) -> om.MObject:
+        """
+        Queue the creation of an empty transform.
+
+        Parameters:
+            name (str): The name of the group.
+            parent (str | om.MObject, optional): The parent of the group, the world if None.
+
+        Returns:
+            om.MObject: The queued transform.
+        """
+
+        if parent is None:
+            parent = om.MObject.kNullObj
+        elif isinstance(parent, str):
+            parent = get_mobject(parent)
+
+        group: om.MObject = self.modifier.createNode('transform', parent)
+        self.modifier.renameNode(group, name)
+        self.pending += 1
+
+        return group
+
+    def parent(self, node: str, parent: str) -> None:
+        self.modifier.reparentNode(get_mobject(node), get_mobject(parent))
+        self.pending += 1
+
+    def connect(self, source_plug: om.MPlug, destination_plug: om.MPlug) -> None:
+        self.modifier.connect(source_plug, destination_plug)
+        self.pending += 1
+
+    def set_attr(self, node: str, attribute: str, value: float) -> None:
+        self.modifier.newPlugValueDouble(get_plug(node, attribute), value)
+        self.pending += 1
+
+    def build(self, setup_specs: list, nucleus_groups: list = None) -> list:
+        """
+        Build several cloth setups in one pass.
+
+        Parameters:
+            setup_specs (list): Dictionaries with the create_full_setup arguments
+                (setup_prefix, low_mesh, high_mesh and optionally colliders, proxy_faces, proxy_error, trim_distance, trim_frames).
+            nucleus_groups (list, optional): Lists of setup prefixes sharing a nucleus (see nucleus_funcs.plan_nucleus_groups).
+                The first setup of a group owns the nucleus and one collider per collider mesh of the group,
+                built with its proxy and trim settings. Setups in no group get their own nucleus.
+                A lead missing from setup_specs must already be built: its nucleus is joined and its colliders are kept,
+                the colliders of the joining setups are not built.
+
+        Returns:
+            list: One dictionary per setup with the names of the main created nodes.
+        """
+
+        groups: dict = ensure_cloth_groups()
+        jnt: str = ensure_control_joint_output()
+
+        leads = {setup_prefix: group[0] for group in nucleus_groups or [] for setup_prefix in group}
+        for spec in setup_specs:
+            leads.setdefault(spec['setup_prefix'], spec['setup_prefix'])
+
+        # leads first, their nucleus is joined by the other setups of their group
+        specs_by_prefix = {spec['setup_prefix']: spec for spec in setup_specs}
+        setup_specs = sorted(setup_specs, key = lambda spec: leads[spec['setup_prefix']] != spec['setup_prefix'])
+
+        group_colliders = {}
+        for spec in setup_specs:
+            lead: str = leads[spec['setup_prefix']]
+            if lead not in specs_by_prefix:
+                continue
+            for collider, collider_suffix in (spec.get('colliders') or {}).items():
+                group_colliders.setdefault(lead, {}).setdefault(collider, collider_suffix)
+
+        # groups
+        created_roles = []
+        nsystem_groups = {}
+        for spec in setup_specs:
+            setup_prefix: str = spec['setup_prefix']
+
+            nsystem = find_role('nsystem_grp', setup_prefix, name = f'{setup_prefix}_nsystem_grp')
+            if nsystem is None:
+                nsystem = self.create_group(f'{setup_prefix}_nsystem_grp', groups[CLOTH_GRP])
+                self.create_group(f'{setup_prefix}_nConstraint_grp', nsystem)
+                created_roles.append((nsystem, 'nsystem_grp', setup_prefix))
+            nsystem_groups[setup_prefix] = nsystem
+
+            colliders = find_role('colliders_grp', setup_prefix, name = f'{setup_prefix}_colliders_grp')
+            if colliders is None:
+                colliders = self.create_group(f'{setup_prefix}_colliders_grp', nsystem)
+                created_roles.append((colliders, 'colliders_grp', setup_prefix))
+
+            self.create_group(f'{setup_prefix}_hi_grp', groups[HI_GRP])
+            for collider_suffix in group_colliders.get(setup_prefix, {}).values():
+                self.create_group(f'{setup_prefix}_collider_{collider_suffix}_grp', colliders)
+
+        self.flush()
+
+        scene_index = get_scene_index()
+        for group, role, setup_prefix in created_roles:
+            scene_index.register(node_name(group), role, setup_prefix)
+
+        for setup_prefix, nsystem in nsystem_groups.items():
+            if not isinstance(nsystem, str):
+                nsystem_groups[setup_prefix] = node_name(nsystem)
+
+        settings = {'wrap_node': self.wrap_node, 'lean_graph': self.lean_graph, 'output_mode': self.output_mode}
+        for spec in setup_specs:
+            lead: str = leads[spec['setup_prefix']]
+            nucleus_lead: str = lead if lead != spec['setup_prefix'] else None
+            store_setup_spec(nsystem_groups[spec['setup_prefix']], {**spec, **settings, 'nucleus_lead': nucleus_lead})
+
+        # meshes and deformers
+        results = {}
+        for spec in setup_specs:
+            setup_prefix: str = spec['setup_prefix']
+            lead: str = leads[setup_prefix]
+
+            with get_profiler().span('build_setup', setup_prefix = setup_prefix):
+                simu_nmesh: str = duplicate_mesh(spec['low_mesh'], new_name = f'{setup_prefix}_simu_nmesh', fast = self.fast_duplicate)
+                shared_nucleus: str = None
+                if lead in results:
+                    shared_nucleus = results[lead]['nucleus']
+                elif lead != setup_prefix:
+                    shared_nucleus = find_role('nucleus', lead, name = f'{lead}_nucleus')
+                    if shared_nucleus is None:
+                        raise ValueError(f'The nucleus of {lead} shared by {setup_prefix} is not in the scene.')
+                ncloth_shape, ncloth_transform, nucleus_node = create_ncloth_nodes(simu_nmesh, setup_prefix, shared_nucleus)
+
+                himesh: str = duplicate_mesh(spec['high_mesh'], new_name = f'{setup_prefix}_hiMesh', fast = self.fast_duplicate)
+                simu_driver_mesh: str = duplicate_mesh(simu_nmesh, new_name = f'{setup_prefix}_simu_driver', fast = self.fast_duplicate)
+                link_mesh(simu_nmesh, simu_driver_mesh, self.lean_graph)
+
+                apply_wrap(himesh, simu_driver_mesh, self.wrap_node)
+
+                output_mesh: str = duplicate_mesh(himesh, f'outputMesh_{setup_prefix}', fast = self.fast_duplicate)
+                cmds.sets(output_mesh, add = CLOTH_SET)
+                drive_output_mesh(himesh, output_mesh, jnt, self.lean_graph, self.output_mode)
+
+                results[setup_prefix] = {
+                    'setup_prefix': setup_prefix,
+                    'simu_nmesh': simu_nmesh,
+                    'ncloth': ncloth_shape,
+                    'ncloth_transform': ncloth_transform,
+                    'nucleus': nucleus_node,
+                    'shared_nucleus': shared_nucleus is not None,
+                    'hi_mesh': himesh,
+                    'simu_driver': simu_driver_mesh,
+                    'output_mesh': output_mesh,
+                    'colliders': []
+                }
+
+        # colliders, once per nucleus, trimmed against every cloth of the nucleus
+        for setup_prefix, colliders in group_colliders.items():
+            spec: dict = specs_by_prefix[setup_prefix]
+            cloth_meshes = [result['simu_nmesh'] for result in results.values() if leads[result['setup_prefix']] == setup_prefix]
+
+            with get_profiler().span('build_colliders', setup_prefix = setup_prefix):
+                for collider, collider_suffix in colliders.items():
+                    init_mesh: str = ensure_init_mesh(deformed_mesh = collider, lean_graph = self.lean_graph)
+                    collider_name: str = f'{setup_prefix}_collider_{collider_suffix}'
+
+                    faces_mask = None
+                    if spec.get('trim_distance'):
+                        faces_mask = find_collider_faces(init_mesh, cloth_meshes, spec['trim_distance'], spec.get('trim_frames'))
+
+                    if spec.get('proxy_faces') or spec.get('proxy_error') or faces_mask is not None:
+                        collider_mesh: str = create_collider_proxy(
+                            init_mesh, collider_name, spec.get('proxy_faces'), spec.get('proxy_error'), faces_mask
+                        )
+                    else:
+                        collider_mesh: str = duplicate_mesh(init_mesh, new_name = collider_name, fast = self.fast_duplicate)
+                        link_mesh(init_mesh, collider_mesh, self.lean_graph)
+                    results[setup_prefix]['colliders'].append((collider_mesh, f'{setup_prefix}_collider_{collider_suffix}_grp'))
+
+        cmds.select(clear = True)
+        results = [results[setup_prefix] for setup_prefix in specs_by_prefix]
+
+        # parents and nRigid nodes
+        for result in results:
+            setup_prefix: str = result['setup_prefix']
+            nsystem_grp: str = nsystem_groups[setup_prefix]
+            hi_grp: str = f'{setup_prefix}_hi_grp'
+
+            self.parent(result['simu_nmesh'], nsystem_grp)
+            self.parent(result['ncloth_transform'], nsystem_grp)
+            if not result['shared_nucleus']:
+                self.parent(result['nucleus'], nsystem_grp)
+            self.parent(result['hi_mesh'], hi_grp)
+            self.parent(result['simu_driver'], hi_grp)
+            self.parent(result['output_mesh'], groups[OUTPUT_GRP])
+
+            for collider_mesh, collider_grp in result['colliders']:
+                self.parent(collider_mesh, collider_grp)
+                nrigid_node = self.create_group(f'{collider_mesh}_nRigid', collider_grp)
+                nrigid_shape = self.modifier.createNode('nRigid', nrigid_node)
+                self.modifier.renameNode(nrigid_shape, f'{collider_mesh}_nRigidShape')
+
+        self.flush()
+
+        # connections, with the passive indices allocated once per nucleus
+        nucleus_colliders = {}
+        for result in results:
+            for collider_mesh, _ in result['colliders']:
+                nucleus_colliders.setdefault(result['nucleus'], []).append(collider_mesh)
+
+        for nucleus_node, collider_meshes in nucleus_colliders.items():
+            passive_indices: list = get_free_passive_indices(nucleus_node, count = len(collider_meshes))
+
+            for index, collider_mesh in zip(passive_indices, collider_meshes):
+                nrigid_shape: str = f'{collider_mesh}_nRigidShape'
+                self.set_attr(nrigid_shape, 'thickness', 0.0)
+                collider_shape: str = cmds.listRelatives(collider_mesh, shapes = True, noIntermediate = True, fullPath = True)[0]
+                self.connect(get_plug(collider_shape, 'worldMesh', 0), get_plug(nrigid_shape, 'inputMesh'))
+                self.connect(get_plug('time1', 'outTime'), get_plug(nrigid_shape, 'currentTime'))
+                self.connect(get_plug(nucleus_node, 'startFrame'), get_plug(nrigid_shape, 'startFrame'))
+                self.connect(get_plug(nrigid_shape, 'currentState'), get_plug(nucleus_node, 'inputPassive', index))
+                self.connect(get_plug(nrigid_shape, 'startState'), get_plug(nucleus_node, 'inputPassiveStart', index))
+
+        self.flush()
+
+        return results
+
+
+@profile_step()
+def build_setups(
+    setup_specs: list,
+    wrap_node: Literal['wrap', 'cvwrap', 'npwrap'] = 'cvwrap',
+    fast_duplicate: bool = False,
+    validate: bool = True,
+    lean_graph: bool = False,
+    output_mode: Literal['skin', 'transform'] = 'skin',
+    nucleus_groups: list = None
+) -> list:
+    """
+    Build several cloth setups as a single undo chunk.
+    If anything fails, everything already built by this call is undone.
+
+    Parameters:
+        setup_specs (list): Dictionaries with the create_full_setup arguments
+            (setup_prefix, low_mesh, high_mesh and optionally colliders).
+        wrap_node (str): The wrap deformer to use, 'cvwrap', 'wrap' or 'npwrap'.
+        fast_duplicate (bool): Duplicate the meshes from their evaluated data (see duplicate_mesh).
+        validate (bool): Check all the low meshes before creating anything (see validate_cloth_mesh).
+        lean_graph (bool): Connect the meshes that copy another one directly instead of through blendShapes (see link_mesh).
+        output_mode (str): Offset the output meshes with a 'skin' cluster or their 'transform' (see drive_output_mesh).
+        nucleus_groups (list, optional): Lists of setup prefixes sharing a nucleus (see nucleus_funcs.plan_nucleus_groups).
+
+    Returns:
+        list: One dictionary per setup with the names of the main created nodes.
+    """
+
+    if validate:
+        for spec in setup_specs:
+            validate_cloth_mesh(spec['low_mesh'])
+
+    ensure_plugin()
+
+    undo_state: bool = cmds.undoInfo(query = True, state = True)
+    cmds.undoInfo(state = True)
+    cmds.undoInfo(openChunk = True, chunkName = UNDO_CHUNK)
+
+    try:
+        results: list = SetupBuilder(wrap_node, fast_duplicate, lean_graph, output_mode).build(setup_specs, nucleus_groups)
+
+    except Exception:
+        cmds.undoInfo(closeChunk = True)
+        cmds.undo()
+        cmds.undoInfo(state = undo_state)
+        om.MGlobal.displayError('Cloth setup build failed, the scene has been rolled back.')
+        raise
+
+    cmds.undoInfo(closeChunk = True)
+    cmds.undoInfo(state = undo_state)
+
+    return results
@@ -0,0 +1,100 @@
+# Cache funcs
+
+from maya.api import OpenMaya as om
+from maya import cmds
+import numpy as np
+
+from .cloth_funcs import CLOTH_SET, ignore_namespace
+from .mesh_funcs import get_mesh_fn, get_points
+from .profile_funcs import profile_step
+from .watchdog_funcs import check_watchdogs
+from ..core.point_cache import PointCacheReader, PointCacheWriter
+
+
+def get_cache_meshes() -> list:
+    """
+    Get the meshes of the CLOTH_ABC set.
+
+    Returns:
+        list: The names of the output meshes.
+    """
+
+    if not cmds.objExists(CLOTH_SET):
+        return []
+
+    return cmds.sets(CLOTH_SET, query = True) or []
+
+
+@profile_step()
+def write_point_cache(path: str, meshes: list = None, start_frame: float = None, end_frame: float = None, watchdogs: list = None) -> str:
+    """
+    Write the world space points of meshes to a point cache, streaming one frame at a time.
+    Time is stepped forward frame by frame so simulations evaluate in order.
+    With watchdogs, the cache is aborted on the first frame over their limits (core.watchdog.WatchdogAbort),
+    keeping the frames already written: the cache header only counts them (see PointCacheWriter).
+
+    Parameters:
+        path (str): The path of the cache file.
+        meshes (list, optional): The meshes to cache, the CLOTH_ABC set members if None.
+        start_frame (float, optional): The first frame, the playback start if None.
+        end_frame (float, optional): The last frame, the playback end if None.
+        watchdogs (list, optional): MeshWatchdog checked on every frame (see watchdog_funcs).
+
+    Returns:
+        str: The path of the cache file.
+    """
+
+    meshes = meshes or get_cache_meshes()
+    if start_frame is None:
+        start_frame = cmds.playbackOptions(query = True, minTime = True)
+    if end_frame is None:
+        end_frame = cmds.playbackOptions(query = True, maxTime = True)
+
+    frame_count: int = int(round(end_frame - start_frame)) + 1
+    vertex_counts: dict = {ignore_namespace(mesh): get_mesh_fn(mesh).numVertices for mesh in meshes}
+
+    for watchdog in watchdogs or []:
+        watchdog.watchdog.reset()
+
+    with PointCacheWriter(path, vertex_counts, start_frame, frame_count) as writer:
+        for index in range(frame_count):
+            frame: float = start_frame + index
+            cmds.currentTime(frame)
+            check_watchdogs(watchdogs or [], frame)
+            writer.write_frame(frame, {ignore_namespace(mesh): get_points(mesh, om.MSpace.kWorld) for mesh in meshes})
+
+    om.MGlobal.displayInfo(f'Point cache written : {path}')
+
+    return path
+
+
+def read_point_cache(path: str) -> PointCacheReader:
+    """
+    Open a point cache.
+
+    Parameters:
+        path (str): The path of the cache file.
+
+    Returns:
+        PointCacheReader: The memory mapped cache.
+    """
+
+    return PointCacheReader(path)
+
+
+def apply_point_cache_frame(reader: PointCacheReader, frame: float, meshes: list = None) -> None:
+    """
+    Set meshes to their cached world space points at a frame.
+
+    Parameters:
+        reader (PointCacheReader): The cache.
+        frame (float): The frame to show.
+        meshes (list, optional): The meshes to set, every cached mesh found in the scene if None.
+    """
+
+    if meshes is None:
+        meshes = [mesh for mesh in reader.meshes if cmds.objExists(mesh)]
+
+    for mesh in meshes:
+        points = np.asarray(reader.points(ignore_namespace(mesh), frame), dtype = np.float64)
+        get_mesh_fn(mesh).setPoints(om.MPointArray(points.tolist()), om.MSpace.kWorld)
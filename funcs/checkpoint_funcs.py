@@ -0,0 +1,222 @@
+# Checkpoint funcs
+
+from maya.api import OpenMaya as om
+from maya import cmds
+import numpy as np
+
+from .api_funcs import get_plug
+from .mesh_funcs import get_points
+from .nucleus_funcs import get_nucleus_inputs, get_output_meshes
+from .profile_funcs import profile_step
+from ..core.checkpoint import CheckpointStore
+
+
+NUCLEUS_ATTRIBUTES = ('startFrame', 'subSteps', 'maxCollisionIterations', 'spaceScale')
+
+
+def get_frame_rate() -> float:
+    """
+    Get the number of frames per second of the scene time unit.
+    """
+
+    return om.MTime(1.0, om.MTime.kSeconds).asUnits(om.MTime.uiUnit())
+
+
+def get_ncloth_meshes(nucleus_nodes: list) -> dict:
+    """
+    Get the simulated mesh of each nCloth shape of nucleus nodes.
+
+    Returns:
+        dict: The output mesh shape per nCloth shape.
+    """
+
+    meshes = {}
+    for nucleus_node in nucleus_nodes:
+        ncloth_shapes, _ = get_nucleus_inputs(nucleus_node, 'nCloth')
+        for ncloth_shape in ncloth_shapes:
+            output_meshes: list = get_output_meshes([ncloth_shape])
+            if output_meshes:
+                meshes[ncloth_shape] = output_meshes[0]
+
+    return meshes
+
+
+def get_nucleus_settings(nucleus_nodes: list) -> dict:
+    return {
+        nucleus_node: {attribute: cmds.getAttr(f'{nucleus_node}.{attribute}') for attribute in NUCLEUS_ATTRIBUTES}
+        for nucleus_node in nucleus_nodes
+    }
+
+
+class CheckpointRecorder:
+    """
+    Save the state of the nCloth shapes of nucleus nodes to a core.checkpoint.CheckpointStore every few frames.
+    Once attached, every time change records the simulated meshes: the velocities are the finite difference
+    with the previous frame, so a checkpoint is only saved when the frame follows the previous evaluated one.
+    """
+
+    def __init__(self, store: CheckpointStore, every: int = 50, nucleus_nodes: list = None):
+        """
+        Parameters:
+            store (CheckpointStore): The checkpoints on disk.
+            every (int): The number of frames between two checkpoints, counted from the nucleus start frame.
+            nucleus_nodes (list, optional): The nucleus nodes, all of them if None.
+        """
+
+        self.store = store
+        self.every = every
+        self.nucleus_nodes: list = nucleus_nodes or cmds.ls(type = 'nucleus')
+        self.meshes: dict = get_ncloth_meshes(self.nucleus_nodes)
+        self.start_frame: float = min(cmds.getAttr(f'{nucleus_node}.startFrame') for nucleus_node in self.nucleus_nodes)
+        self.frame_rate: float = get_frame_rate()
+        self.previous: dict = None
+        self.previous_frame: float = None
+        self.callback_id: int = None
+
+    def attach(self) -> None:
+        if self.callback_id is None:
+            self.callback_id = om.MDGMessage.addTimeChangeCallback(self.time_changed)
+
+    def detach(self) -> None:
+        if self.callback_id is not None:
+            om.MMessage.removeCallback(self.callback_id)
+            self.callback_id = None
+
+    def time_changed(self, time: om.MTime, *args) -> None:
+        self.record(time.asUnits(om.MTime.uiUnit()))
+
+    def record(self, frame: float = None) -> str:
+        """
+        Read the simulated meshes at the current time and save a checkpoint on the frames due.
+
+        Parameters:
+            frame (float, optional): The current frame, queried if None.
+
+        Returns:
+            str: The path of the saved checkpoint, None if the frame is not saved.
+        """
+
+        if frame is None:
+            frame = cmds.currentTime(query = True)
+
+        points: dict = {ncloth_shape: get_points(mesh, om.MSpace.kWorld) for ncloth_shape, mesh in self.meshes.items()}
+        previous: dict = self.previous if self.previous_frame is not None and frame - self.previous_frame == 1.0 else None
+        self.previous = points
+        self.previous_frame = frame
+
+        offset: float = frame - self.start_frame
+        if previous is None or offset <= 0 or offset % self.every:
+            return None
+
+        states = {
+            ncloth_shape: {'positions': positions, 'velocities': (positions - previous[ncloth_shape]) * self.frame_rate}
+            for ncloth_shape, positions in points.items()
+        }
+
+        return self.store.save(frame, states, get_nucleus_settings(self.nucleus_nodes))
+
+
+def attach_checkpoint_recorder(directory: str, every: int = 50, max_count: int = None, max_bytes: int = None, nucleus_nodes: list = None) -> CheckpointRecorder:
+    """
+    Attach a checkpoint recorder, checkpoints are then saved as the simulation plays or caches.
+
+    Parameters:
+        directory (str): The directory of the checkpoint files.
+        every (int): The number of frames between two checkpoints.
+        max_count (int, optional): The maximum number of checkpoints kept on disk.
+        max_bytes (int, optional): The maximum size of the checkpoints kept on disk.
+        nucleus_nodes (list, optional): The nucleus nodes, all of them if None.
+
+    Returns:
+        CheckpointRecorder: The attached recorder, detach it when done.
+    """
+
+    recorder = CheckpointRecorder(CheckpointStore(directory, max_count, max_bytes), every, nucleus_nodes)
+    recorder.attach()
+
+    return recorder
+
+
+def set_vector_array(node: str, attribute: str, vectors: np.ndarray) -> None:
+    data: om.MObject = om.MFnVectorArrayData().create(om.MVectorArray(np.asarray(vectors, dtype = np.float64).tolist()))
+    get_plug(node, attribute).setMObject(data)
+
+
+@profile_step()
+def resume_from_checkpoint(directory: str, frame: float) -> float:
+    """
+    Restore the nearest checkpoint at or before a frame as the start state of its nCloth shapes
+    and start their nucleus on its frame, so the simulation only runs from there.
+    Each nCloth plays the checkpoint positions and velocities from its cache inputs on the checkpoint frame,
+    which are then set as its initial state. Call clear_resume to simulate from the original start frame again.
+
+    Parameters:
+        directory (str): The directory of the checkpoint files.
+        frame (float): The frame to resume from.
+
+    Returns:
+        float: The frame of the restored checkpoint.
+    """
+
+    store = CheckpointStore(directory)
+    checkpoint_frame: float = store.nearest(frame)
+    if checkpoint_frame is None:
+        raise ValueError(f'No checkpoint at or before frame {frame} in {directory}.')
+
+    states, settings = store.load(checkpoint_frame)
+    for ncloth_shape in states:
+        if not cmds.objExists(ncloth_shape):
+            raise ValueError(f'The nCloth {ncloth_shape} of the checkpoint is not in the scene.')
+        if cmds.listConnections(f'{ncloth_shape}.playFromCache', source = True, destination = False):
+            raise RuntimeError(f'{ncloth_shape} plays from a cache, detach it before resuming.')
+    for nucleus_node in settings:
+        if not cmds.objExists(nucleus_node):
+            raise ValueError(f'The nucleus {nucleus_node} of the checkpoint is not in the scene.')
+
+    current_time: float = cmds.currentTime(query = True)
+    try:
+        for nucleus_node in settings:
+            cmds.setAttr(f'{nucleus_node}.startFrame', checkpoint_frame)
+
+        for ncloth_shape, state in states.items():
+            set_vector_array(ncloth_shape, 'positions', state['positions'])
+            set_vector_array(ncloth_shape, 'velocities', state['velocities'])
+            cmds.setAttr(f'{ncloth_shape}.playFromCache', True)
+
+        cmds.currentTime(checkpoint_frame)
+        for ncloth_shape in states:
+            cmds.nBase(ncloth_shape, edit = True, stuffStart = True)
+
+    finally:
+        for ncloth_shape in states:
+            cmds.setAttr(f'{ncloth_shape}.playFromCache', False)
+        cmds.currentTime(current_time)
+
+    om.MGlobal.displayInfo(f'Resumed {len(states)} nCloth from the checkpoint of frame {checkpoint_frame}.')
+
+    return checkpoint_frame
+
+
+def clear_resume(directory: str) -> None:
+    """
+    Undo resume_from_checkpoint: clear the initial state of the checkpoint nCloth shapes
+    and restore the start frame their nucleus had when the checkpoints were recorded.
+
+    Parameters:
+        directory (str): The directory of the checkpoint files.
+    """
+
+    store = CheckpointStore(directory)
+    frames: list = store.frames()
+    if not frames:
+        return
+
+    # resumed runs only save checkpoints after the one they resume from, the first one has the original start frames
+    states, settings = store.load(frames[0])
+    for ncloth_shape in states:
+        if cmds.objExists(ncloth_shape):
+            cmds.nBase(ncloth_shape, edit = True, clearStart = True)
+
+    for nucleus_node, nucleus_settings in settings.items():
+        if cmds.objExists(nucleus_node):
+            cmds.setAttr(f'{nucleus_node}.startFrame', nucleus_settings['startFrame'])
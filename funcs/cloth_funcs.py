@@ -3,6 +3,20 @@
 from maya.api import OpenMaya as om
 from maya import cmds, mel
 from typing import Literal
+import numpy as np
+import os
+
+from .api_funcs import get_dag_path, get_mobject
+from .collider_funcs import find_collider_faces
+from .index_funcs import ROLE_ATTR, find_role, get_scene_index, store_setup_spec
+from .mesh_funcs import create_mesh, create_mesh_from, get_points, get_topology
+from .nucleus_funcs import get_nucleus_inputs
+from .plugin_funcs import ensure_plugin
+from .profile_funcs import profile_step
+from ..core import decimate
+from ..core.topology import submesh
+from ..core.validation import validate_mesh
+from ..core.wrap import cached_bind
 
 
 ALL_GRP = "ALL"
@@ -11,6 +25,8 @@ CLOTH_GRP = "cloth_grp"
 HI_GRP = "hi_grp"
 OUTPUT_GRP = "output_grp"
 CLOTH_SET = "CLOTH_ABC"
+WRAP_CACHE_DIR = "cloth_setup_wrap"
+SPACE_SCALE = 0.1
 
 
 def ignore_namespace(node: str) -> str:
@@ -22,6 +38,7 @@ def ignore_namespace(node: str) -> str:
     return node
 
 
+@profile_step(meshes = ('deformed_mesh',))
 def blendshape(driver_mesh: str, deformed_mesh: str) -> str:
     """
     """
@@ -34,18 +51,81 @@ def blendshape(driver_mesh: str, deformed_mesh: str) -> str:
     return blendshape_node
 
 
-def create_passive_collider(mesh: str, nucleus_node: str) -> tuple:
+def link_mesh(driver_mesh: str, deformed_mesh: str, lean_graph: bool = False) -> str:
+    """
+    Make a mesh follow another mesh of the same topology.
+    In a lean graph the driver outMesh is connected straight to the inMesh of the deformed mesh,
+    instead of a full weight blendShape evaluating the whole point array again every frame.
+
+    Parameters:
+        driver_mesh (str): The name of the driver mesh.
+        deformed_mesh (str): The name of the mesh to drive, without history in a lean graph.
+        lean_graph (bool): Connect the meshes directly.
+
+    Returns:
+        str: The name of the blendShape node, None in a lean graph.
+    """
+
+    if not lean_graph:
+        return blendshape(driver_mesh, deformed_mesh)
+
+    driver_shape: str = cmds.listRelatives(driver_mesh, shapes = True, noIntermediate = True, fullPath = True)[0]
+    deformed_shape: str = cmds.listRelatives(deformed_mesh, shapes = True, noIntermediate = True, fullPath = True)[0]
+    cmds.connectAttr(f'{driver_shape}.outMesh', f'{deformed_shape}.inMesh', force = True)
+
+    return None
+
+
+def get_free_passive_indices(nucleus_node: str, count: int = 1, attributes: tuple = ('inputPassive', 'inputPassiveStart')) -> list:
+    """
+    Get free logical indices of a nucleus shared by its inputPassive and inputPassiveStart multi attributes.
+    The used indices are read once, so many colliders can be given an index in one call.
+
+    Parameters:
+        nucleus_node (str): The name of the nucleus node.
+        count (int): The number of indices to allocate.
+        attributes (tuple): The multi attributes sharing the indices, ('inputActive', 'inputActiveStart') for nCloth.
+
+    Returns:
+        list: The free indices, in increasing order.
+    """
+
+    nucleus_fn = om.MFnDependencyNode(get_mobject(nucleus_node))
+    used_indices: set = set()
+
+    for attribute in attributes:
+        plug: om.MPlug = nucleus_fn.findPlug(attribute, False)
+        for index in plug.getExistingArrayAttributeIndices():
+            if plug.elementByLogicalIndex(index).isConnected:
+                used_indices.add(index)
+
+    free_indices = []
+    index: int = 0
+    while len(free_indices) < count:
+        if index not in used_indices:
+            free_indices.append(index)
+        index += 1
+
+    return free_indices
+
+
+@profile_step(meshes = ('mesh',))
+def create_passive_collider(mesh: str, nucleus_node: str, passive_index: int = None) -> tuple:
     """
     Create a passive collider for the specified mesh.
 
     Parameters:
         mesh (str): The name of the mesh to create the collider for.
         nucleus_node (str): The name of the nucleus node to connect the collider to.
+        passive_index (int, optional): The inputPassive / inputPassiveStart index to use, the first free one if None.
 
     Returns:
         tuple: A tuple containing the names of the created nRigid node and nRigidShape node.
     """
 
+    if passive_index is None:
+        passive_index = get_free_passive_indices(nucleus_node)[0]
+
     nrigid_shape = f'{mesh}_nRigidShape'
     cmds.createNode('nRigid', name = nrigid_shape)
     nrigid_node: str = cmds.listRelatives(nrigid_shape, parent = True)[0]
@@ -56,32 +136,85 @@ def create_passive_collider(mesh: str, nucleus_node: str) -> tuple:
     cmds.connectAttr(f'{mesh}.worldMesh[0]', f'{nrigid_shape}.inputMesh')
     cmds.connectAttr('time1.outTime', f'{nrigid_shape}.currentTime')
     cmds.connectAttr(f'{nucleus_node}.startFrame', f'{nrigid_shape}.startFrame')
-    
-    for i in range(10):
-        try:
-            cmds.connectAttr(f'{nrigid_shape}.currentState', f'{nucleus_node}.inputPassive[{i}]')
-            cmds.connectAttr(f'{nrigid_shape}.startState', f'{nucleus_node}.inputPassiveStart[{i}]')
-            break
-        except RuntimeError:
-            continue
+    cmds.connectAttr(f'{nrigid_shape}.currentState', f'{nucleus_node}.inputPassive[{passive_index}]')
+    cmds.connectAttr(f'{nrigid_shape}.startState', f'{nucleus_node}.inputPassiveStart[{passive_index}]')
 
     return nrigid_node, nrigid_shape
 
 
-def duplicate_mesh(mesh: str, new_name: str) -> str:
+def join_nucleus(ncloth_shape: str, nucleus_node: str) -> None:
+    """
+    Move an nCloth to another nucleus, so it is solved with the nCloth shapes of that nucleus and collides with them.
+    Its previous nucleus is deleted when it has no nCloth left.
+
+    Parameters:
+        ncloth_shape (str): The name of the nCloth shape.
+        nucleus_node (str): The name of the nucleus node to join.
+    """
+
+    previous_nodes: list = cmds.listConnections(f'{ncloth_shape}.currentState', source = False, destination = True, type = 'nucleus') or []
+    if nucleus_node in previous_nodes:
+        return
+
+    for attribute in ('currentState', 'startState'):
+        for destination in cmds.listConnections(f'{ncloth_shape}.{attribute}', source = False, destination = True, plugs = True) or []:
+            cmds.disconnectAttr(f'{ncloth_shape}.{attribute}', destination)
+
+    active_index: int = get_free_passive_indices(nucleus_node, attributes = ('inputActive', 'inputActiveStart'))[0]
+    cmds.connectAttr(f'{ncloth_shape}.currentState', f'{nucleus_node}.inputActive[{active_index}]')
+    cmds.connectAttr(f'{ncloth_shape}.startState', f'{nucleus_node}.inputActiveStart[{active_index}]')
+    cmds.connectAttr(f'{nucleus_node}.outputObjects[{active_index}]', f'{ncloth_shape}.nextState', force = True)
+    cmds.connectAttr(f'{nucleus_node}.startFrame', f'{ncloth_shape}.startFrame', force = True)
+
+    for previous_node in set(previous_nodes):
+        if not any(cmds.listConnections(previous_node, source = True, destination = False, type = node_type) for node_type in ('nCloth', 'nRigid')):
+            cmds.delete(previous_node)
+
+
+def create_passive_colliders(meshes: list, nucleus_node: str) -> list:
+    """
+    Create passive colliders for several meshes, allocating all the nucleus indices at once.
+
+    Parameters:
+        meshes (list): The names of the meshes to create the colliders for.
+        nucleus_node (str): The name of the nucleus node to connect the colliders to.
+
+    Returns:
+        list: A (nRigid node, nRigidShape node) tuple per mesh.
+    """
+
+    passive_indices: list = get_free_passive_indices(nucleus_node, count = len(meshes))
+
+    return [
+        create_passive_collider(mesh, nucleus_node, passive_index = passive_index)
+        for mesh, passive_index in zip(meshes, passive_indices)
+    ]
+
+
+@profile_step(meshes = ('mesh',))
+def duplicate_mesh(mesh: str, new_name: str, fast: bool = False, uvs: bool = True) -> str:
     """
     Duplicate a mesh with a new name.
 
     Parameters:
         mesh (str): The name of the mesh to duplicate.
         new_name (str): The new name for the duplicated mesh.
+        fast (bool): Create a single clean shape from the evaluated MFnMesh data instead of
+            duplicating the node with its history and deleting the intermediate shapes.
+        uvs (bool): Copy the current UV set when fast is True.
 
     Returns:
         str: The name of the duplicated mesh.
     """
 
     om.MGlobal.displayInfo(f'Mesh to duplicate : {mesh}')
+    if fast:
+        return create_mesh_from(mesh, new_name, uvs = uvs)
+
     cmds.duplicate(mesh, name = new_name)
+    if cmds.attributeQuery(ROLE_ATTR, node = new_name, exists = True):
+        cmds.deleteAttr(new_name, attribute = ROLE_ATTR)
+
     shapes = cmds.listRelatives(new_name, shapes = True, fullPath = True)
     for shape in shapes:
         if cmds.getAttr(f'{shape}.intermediateObject') == 1:
@@ -93,27 +226,34 @@ def duplicate_mesh(mesh: str, new_name: str) -> str:
     return new_name
 
 
-def ensure_cloth_groups() -> None:
+def ensure_cloth_groups() -> dict:
     """
     Ensure the existence of cloth-related groups in the scene.
-    Creates groups if they do not exist.
-    """
+    Creates groups if they do not exist, the existing ones are found through the scene index even once renamed.
 
-    ALL_GRP: str = "ALL"
-
-    if cmds.objExists(ALL_GRP):
-        return
+    Returns:
+        dict: The names of the groups by role, 'all' and the INIT_MESH_GRP, CLOTH_GRP, HI_GRP and OUTPUT_GRP default names.
+    """
 
-    group_all: str = cmds.group(empty=True, world=True, name=ALL_GRP)
-    group_names = (INIT_MESH_GRP, CLOTH_GRP, HI_GRP, OUTPUT_GRP)
+    scene_index = get_scene_index()
+    groups = {'all': find_role('all', name = ALL_GRP)}
+    created: bool = groups['all'] is None
+    if created:
+        groups['all'] = scene_index.register(cmds.group(empty=True, world=True, name=ALL_GRP), 'all')
+        cmds.sets(empty = True, name = CLOTH_SET)
 
-    for grp_name in group_names:
-        grp = cmds.group(empty=True, world=True, name=grp_name)
-        cmds.parent(grp, group_all)
+    for grp_name in (INIT_MESH_GRP, CLOTH_GRP, HI_GRP, OUTPUT_GRP):
+        grp: str = find_role(grp_name, name = grp_name)
+        if grp is None:
+            grp = cmds.group(empty=True, world=True, name=grp_name)
+            grp = scene_index.register(cmds.parent(grp, groups['all'])[0], grp_name)
+            created = True
+        groups[grp_name] = grp
 
-    cmds.sets(empty = True, name = CLOTH_SET)
+    if created:
+        cmds.select(clear = True)
 
-    cmds.select(clear = True)
+    return groups
 
 
 def ensure_nsystem_group(setup_prefix: str) -> str:
@@ -127,10 +267,11 @@ def ensure_nsystem_group(setup_prefix: str) -> str:
         str: The name of the nucleus system group.
     """
 
-    nsystem_grp: str = f'{setup_prefix}_nsystem_grp'
-    if not cmds.objExists(nsystem_grp):
-        cmds.group(empty = True, name = nsystem_grp, parent = CLOTH_GRP)
+    nsystem_grp: str = find_role('nsystem_grp', setup_prefix, name = f'{setup_prefix}_nsystem_grp')
+    if nsystem_grp is None:
+        nsystem_grp = cmds.group(empty = True, name = f'{setup_prefix}_nsystem_grp', parent = ensure_cloth_groups()[CLOTH_GRP])
         cmds.group(empty = True, name = f'{setup_prefix}_nConstraint_grp', parent = nsystem_grp)
+        get_scene_index().register(nsystem_grp, 'nsystem_grp', setup_prefix)
 
     return nsystem_grp
 
@@ -146,86 +287,222 @@ def ensure_colliders_group(setup_prefix: str) -> str:
         str: The name of the colliders group.
     """
 
-    colliders_grp: str = f'{setup_prefix}_colliders_grp'
+    colliders_grp: str = find_role('colliders_grp', setup_prefix, name = f'{setup_prefix}_colliders_grp')
     nsystem_grp: str = ensure_nsystem_group(setup_prefix)
 
-    if not cmds.objExists(colliders_grp):
-        cmds.group(empty = True, name = colliders_grp, parent = nsystem_grp)
+    if colliders_grp is None:
+        colliders_grp = cmds.group(empty = True, name = f'{setup_prefix}_colliders_grp', parent = nsystem_grp)
+        get_scene_index().register(colliders_grp, 'colliders_grp', setup_prefix)
 
     return colliders_grp
 
 
-def ensure_init_mesh(deformed_mesh: str) -> str:
+@profile_step()
+def ensure_init_mesh(deformed_mesh: str, lean_graph: bool = False) -> str:
     """
     Ensure the existence of an initial mesh for cloth simulation.
 
     Parameters:
         deformed_mesh (str): The name of the deformed mesh.
+        lean_graph (bool): Drive a new initial mesh with a direct connection instead of a blendShape (see link_mesh).
 
     Returns:
         str: The name of the initial mesh.
     """
 
-    ensure_cloth_groups()
+    groups: dict = ensure_cloth_groups()
 
     PFX: str = "initMesh"
-    init_mesh = f"{PFX}_{ignore_namespace(deformed_mesh)}"
+    source: str = ignore_namespace(deformed_mesh)
+    init_mesh = find_role('init_mesh', source, name = f"{PFX}_{source}")
 
-    if cmds.objExists(init_mesh):
+    if init_mesh is not None:
         return init_mesh
 
     om.MGlobal.displayInfo(f'Create initMesh from : {deformed_mesh}')
-    duplicate_mesh(deformed_mesh, new_name=init_mesh)
+    init_mesh = duplicate_mesh(deformed_mesh, new_name=f"{PFX}_{source}")
 
-    blendshape(deformed_mesh, init_mesh)
+    link_mesh(deformed_mesh, init_mesh, lean_graph)
 
-    cmds.parent(init_mesh, INIT_MESH_GRP)
+    init_mesh = cmds.parent(init_mesh, groups[INIT_MESH_GRP])[0]
+    get_scene_index().register(init_mesh, 'init_mesh', source)
 
     return init_mesh
 
 
-def create_cloth(simu_nmesh: str, setup_prefix: str) -> tuple:
+@profile_step(meshes = ('mesh',))
+def validate_cloth_mesh(mesh: str, space_scale: float = SPACE_SCALE, strict: bool = True) -> dict:
     """
-    Create a cloth simulation setup.
+    Check a mesh before any node is created for its nCloth: non-manifold edges and zero-area faces
+    are errors, coincident points and a size not fitting the nucleus space scale are warnings.
+    The points and topology are read once through MFnMesh and checked with NumPy (see core.validation).
+
+    Parameters:
+        mesh (str): The name of the mesh to check.
+        space_scale (float): The space scale of the nucleus the mesh will be simulated in.
+        strict (bool): Raise on errors, only display them otherwise.
+
+    Returns:
+        dict: The report of core.validation.validate_mesh.
+    """
+
+    polygon_counts, polygon_connects = get_topology(mesh)
+    report: dict = validate_mesh(get_points(mesh), polygon_counts, polygon_connects, space_scale = space_scale)
+
+    for warning in report['warnings']:
+        om.MGlobal.displayWarning(f'{mesh} : {warning}.')
+
+    if report['errors']:
+        message: str = f'{mesh} can not be simulated : {", ".join(report["errors"])}.'
+        if strict:
+            raise ValueError(message)
+        om.MGlobal.displayError(message)
+
+    return report
+
+
+@profile_step(meshes = ('simu_nmesh',))
+def create_ncloth_nodes(simu_nmesh: str, setup_prefix: str, nucleus_node: str = None) -> tuple:
+    """
+    Create the nCloth and nucleus nodes for a mesh, without parenting them.
 
     Parameters:
         simu_nmesh (str): The name of the simulated mesh.
         setup_prefix (str): Prefix for the names of created objects.
+        nucleus_node (str, optional): An existing nucleus to join instead of creating one (see join_nucleus).
 
     Returns:
-        tuple: A tuple containing the names of the created ncloth shape and nucleus node.
+        tuple: A tuple containing the names of the created ncloth shape, ncloth transform and nucleus node.
     """
 
-    ensure_cloth_groups()
-    nsystem_grp: str = ensure_nsystem_group(setup_prefix)
-
     cmds.select(simu_nmesh)
 
     mel.eval('createNCloth 0; sets -e -forceElement initialShadingGroup;')
     ncloth_shape: str = cmds.ls(selection = True)[0]
     ncloth_transform: str = cmds.listRelatives(ncloth_shape, parent = True)[0]
+    ncloth_transform = cmds.rename(ncloth_transform, f'{setup_prefix}_ncloth')
+
+    if nucleus_node is not None:
+        join_nucleus(ncloth_shape, nucleus_node)
+        cmds.select(clear = True)
+
+        return ncloth_shape, ncloth_transform, nucleus_node
+
     nucleus_node: str = cmds.listConnections(ncloth_shape, type = 'nucleus')[0]
     nucleus_node = cmds.rename(nucleus_node, f'{setup_prefix}_nucleus')
-
-    ncloth_transform = cmds.rename(ncloth_transform, f'{setup_prefix}_ncloth')
+    get_scene_index().register(nucleus_node, 'nucleus', setup_prefix)
 
     # set nucleus attributes
     start_frame: float = cmds.playbackOptions(query = True, minTime = True)
     cmds.setAttr(f'{nucleus_node}.startFrame', start_frame)
     cmds.setAttr(f'{nucleus_node}.subSteps', 8)
     cmds.setAttr(f'{nucleus_node}.maxCollisionIterations', 12)
-    cmds.setAttr(f'{nucleus_node}.spaceScale', 0.1)
+    cmds.setAttr(f'{nucleus_node}.spaceScale', SPACE_SCALE)
+
+    cmds.select(clear = True)
+
+    return ncloth_shape, ncloth_transform, nucleus_node
+
+
+@profile_step()
+def create_cloth(simu_nmesh: str, setup_prefix: str, nucleus_node: str = None, validate: bool = True) -> tuple:
+    """
+    Create a cloth simulation setup.
+
+    Parameters:
+        simu_nmesh (str): The name of the simulated mesh.
+        setup_prefix (str): Prefix for the names of created objects.
+        nucleus_node (str, optional): An existing nucleus to join instead of creating one, it stays in its own group.
+        validate (bool): Check the simulated mesh before creating anything (see validate_cloth_mesh).
+
+    Returns:
+        tuple: A tuple containing the names of the created ncloth shape and nucleus node.
+    """
+
+    if validate:
+        validate_cloth_mesh(simu_nmesh)
+
+    ensure_cloth_groups()
+    nsystem_grp: str = ensure_nsystem_group(setup_prefix)
+
+    shared: bool = nucleus_node is not None
+    ncloth_shape, ncloth_transform, nucleus_node = create_ncloth_nodes(simu_nmesh, setup_prefix, nucleus_node)
 
     cmds.parent(simu_nmesh, nsystem_grp)
     cmds.parent(ncloth_transform, nsystem_grp)
-    cmds.parent(nucleus_node, nsystem_grp)
+    if not shared:
+        cmds.parent(nucleus_node, nsystem_grp)
 
     cmds.select(clear = True)
 
     return ncloth_shape, nucleus_node
 
 
-def create_collider_mesh(init_mesh: str, nucleus_node: str, setup_prefix: str, collider_suffix: str) -> None:
+@profile_step(meshes = ('init_mesh',))
+def create_collider_proxy(init_mesh: str, new_name: str, target_faces: int = None, max_error: float = None, faces_mask = None) -> str:
+    """
+    Create a decimated or trimmed copy of a mesh that follows it through a clothSetupPointCopy deformer.
+    Every proxy point is an original point, the deformer copies them by index each frame, in object space:
+    the proxy gets the same parent and local transformation as the mesh.
+
+    Parameters:
+        init_mesh (str): The name of the mesh to decimate.
+        new_name (str): The name of the proxy mesh.
+        target_faces (int, optional): The wanted number of triangles.
+        max_error (float, optional): The maximum distance a point can move, used when target_faces is None.
+        faces_mask (array_like, optional): The (P,) boolean mask of the faces to keep, before decimating (see find_collider_faces).
+
+    Returns:
+        str: The name of the proxy mesh.
+    """
+
+    polygon_counts, polygon_connects = get_topology(init_mesh)
+    points: np.ndarray = get_points(init_mesh)
+    point_indices: np.ndarray = np.arange(len(points))
+    face_count: int = len(polygon_counts)
+
+    if faces_mask is not None:
+        polygon_counts, polygon_connects, point_indices = submesh(polygon_counts, polygon_connects, faces_mask)
+        points = points[point_indices]
+
+    if target_faces or max_error:
+        points, triangles, proxy_indices = decimate(
+            points,
+            polygon_counts,
+            polygon_connects,
+            target_faces = target_faces,
+            max_error = max_error
+        )
+        point_indices = point_indices[proxy_indices]
+        polygon_counts, polygon_connects = [3] * len(triangles), triangles.ravel()
+
+    om.MGlobal.displayInfo(f'Collider proxy {new_name} : {face_count} -> {len(polygon_counts)} faces')
+
+    parent = cmds.listRelatives(init_mesh, parent = True, fullPath = True)
+    proxy_mesh: str = create_mesh(new_name, points, polygon_counts, polygon_connects, parent = parent[0] if parent else None)
+    om.MFnTransform(get_dag_path(proxy_mesh)).setTransformation(om.MFnTransform(get_dag_path(init_mesh)).transformation())
+
+    ensure_plugin()
+    point_copy: str = cmds.deformer(proxy_mesh, type = 'clothSetupPointCopy', name = f'pointCopy_{proxy_mesh}')[0]
+    cmds.setAttr(f'{point_copy}.pointIndices', point_indices.tolist(), type = 'Int32Array')
+    init_shape: str = cmds.listRelatives(init_mesh, shapes = True, noIntermediate = True)[0]
+    cmds.connectAttr(f'{init_shape}.outMesh', f'{point_copy}.driverMesh')
+
+    return proxy_mesh
+
+
+@profile_step()
+def create_collider_mesh(
+    init_mesh: str,
+    nucleus_node: str,
+    setup_prefix: str,
+    collider_suffix: str,
+    proxy_faces: int = None,
+    proxy_error: float = None,
+    trim_distance: float = None,
+    trim_frames: list = None,
+    lean_graph: bool = False
+) -> None:
     """
     Create a collider mesh.
 
@@ -234,22 +511,37 @@ def create_collider_mesh(init_mesh: str, nucleus_node: str, setup_prefix: str, c
         nucleus_node (str): The name of the nucleus node to connect the collider to.
         setup_prefix (str): Prefix for the names of created objects.
         collider_suffix (str): Suffix for the name of the collider.
+        proxy_faces (int, optional): Build a decimated proxy collider with this number of triangles.
+        proxy_error (float, optional): Build a decimated proxy collider with this maximum error.
+        trim_distance (float, optional): Only keep the faces within this distance of the cloth rest shape (see find_collider_faces).
+        trim_frames (list, optional): The frames the collider is trimmed on, evenly spaced frames of the playback range if None.
+        lean_graph (bool): Drive a full collider with a direct connection instead of a blendShape (see link_mesh).
     """
 
     ensure_cloth_groups()
     setup_colliders_grp: str = ensure_colliders_group(setup_prefix)
     collider_grp: str = cmds.group(empty = True, name = f'{setup_prefix}_collider_{collider_suffix}_grp', parent = setup_colliders_grp)
 
-    collider_mesh: str = duplicate_mesh(init_mesh, new_name = f'{setup_prefix}_collider_{collider_suffix}')
-    cmds.parent(collider_mesh, collider_grp)
+    faces_mask = None
+    if trim_distance:
+        faces_mask = find_collider_faces(init_mesh, get_nucleus_inputs(nucleus_node, 'nCloth')[1], trim_distance, trim_frames)
+
+    if proxy_faces or proxy_error or faces_mask is not None:
+        collider_mesh: str = create_collider_proxy(init_mesh, f'{setup_prefix}_collider_{collider_suffix}', proxy_faces, proxy_error, faces_mask)
+        cmds.parent(collider_mesh, collider_grp)
+
+    else:
+        collider_mesh: str = duplicate_mesh(init_mesh, new_name = f'{setup_prefix}_collider_{collider_suffix}')
+        cmds.parent(collider_mesh, collider_grp)
 
-    blendshape(init_mesh, collider_mesh)
+        link_mesh(init_mesh, collider_mesh, lean_graph)
 
     nrigid_transform, _ = create_passive_collider(collider_mesh, nucleus_node)
     cmds.parent(nrigid_transform, collider_grp)
     cmds.select(clear = True)
 
 
+@profile_step(meshes = ('high_mesh', 'low_mseh'))
 def wrap(high_mesh: str, low_mseh: str) -> str:
 
     mel_cmd: str = f'''
@@ -270,40 +562,153 @@ def wrap(high_mesh: str, low_mseh: str) -> str:
         return wrap_node[0]
 
 
+@profile_step(meshes = ('high_mesh', 'low_mesh'))
+def np_wrap(high_mesh: str, low_mesh: str, cache_dir: str = None) -> str:
+    """
+    Wrap a mesh on another one with the clothSetupWrap deformer.
+    The binding is computed with NumPy once per pair of topologies and rest points and saved as an npz file.
+
+    Parameters:
+        high_mesh (str): The name of the wrapped mesh.
+        low_mesh (str): The name of the driver mesh.
+        cache_dir (str, optional): The folder of the bindings, WRAP_CACHE_DIR in the workspace data folder if None.
+
+    Returns:
+        str: The name of the clothSetupWrap node.
+    """
+
+    if cache_dir is None:
+        cache_dir = os.path.join(cmds.workspace(query = True, rootDirectory = True), 'data', WRAP_CACHE_DIR)
+
+    _, binding_path = cached_bind(
+        cache_dir,
+        get_points(high_mesh, om.MSpace.kWorld),
+        get_topology(high_mesh),
+        get_points(low_mesh, om.MSpace.kWorld),
+        get_topology(low_mesh)
+    )
+
+    ensure_plugin()
+    wrap_node: str = cmds.deformer(high_mesh, type = 'clothSetupWrap', name = f'npWrap_{ignore_namespace(high_mesh)}')[0]
+    cmds.setAttr(f'{wrap_node}.bindingPath', binding_path, type = 'string')
+
+    low_mesh_shape: str = cmds.listRelatives(low_mesh, shapes = True, noIntermediate = True)[0]
+    cmds.connectAttr(f'{low_mesh_shape}.outMesh', f'{wrap_node}.driverMesh')
+    cmds.connectAttr(f'{low_mesh}.worldMatrix[0]', f'{wrap_node}.driverMatrix')
+
+    return wrap_node
+
+
+@profile_step(meshes = ('high_mesh', 'low_mesh'))
+def apply_wrap(high_mesh: str, low_mesh: str, wrap_node: Literal['wrap', 'cvwrap', 'npwrap'] = 'cvwrap') -> str:
+    """
+    Wrap a mesh on another one with the given wrap deformer.
+
+    Parameters:
+        high_mesh (str): The name of the wrapped mesh.
+        low_mesh (str): The name of the driver mesh.
+        wrap_node (str): 'cvwrap' (cvWrap plugin), 'wrap' (legacy Maya wrap) or 'npwrap' (NumPy binding).
+
+    Returns:
+        str: The name of the wrap node.
+    """
+
+    if wrap_node == 'cvwrap':
+        return cmds.cvWrap(high_mesh, low_mesh, name = f'cvWrap_{high_mesh}', radius = 0.1)
+
+    if wrap_node == 'npwrap':
+        return np_wrap(high_mesh, low_mesh)
+
+    return wrap(high_mesh, low_mesh)
+
+
 def ensure_control_joint_output() -> str:
     jnt: str = f'JNT_OUTPUT'
     ctrl: str = f'CTRL_OUTPUT'
 
-    if cmds.objExists(jnt):
-        return jnt
+    found: str = find_role('output_joint', name = jnt)
+    if found is not None:
+        return found
 
     cmds.select(clear = True)
     cmds.joint(name = jnt)
     cmds.circle(name = ctrl, radius = 7.0, normal = [0, 1, 0], constructionHistory = False)[0]
-    cmds.parent(ctrl, OUTPUT_GRP)
-    cmds.parent(jnt, ctrl)
+    cmds.parent(ctrl, ensure_cloth_groups()[OUTPUT_GRP])
+    jnt = cmds.parent(jnt, ctrl)[0]
     cmds.setAttr(f'{jnt}.v', 0)
     cmds.select(clear = True)
+    get_scene_index().register(jnt, 'output_joint')
 
     return jnt
 
 
-def create_output_setup(high_mesh: str, setup_prefix: str):
+def drive_output_transform(output_mesh: str, jnt: str) -> str:
     """
+    Move an output mesh with the output joint through its offsetParentMatrix: the joint world matrix
+    relative to its current pose, the offset a single influence skinCluster bound now would give, without deforming any point.
+
+    Parameters:
+        output_mesh (str): The name of the output mesh transform.
+        jnt (str): The name of the output joint.
+
+    Returns:
+        str: The name of the multMatrix node.
     """
 
-    ensure_cloth_groups()
+    mult_matrix: str = cmds.createNode('multMatrix', name = f'multMatrix_{ignore_namespace(output_mesh)}', skipSelect = True)
+    cmds.setAttr(f'{mult_matrix}.matrixIn[0]', cmds.getAttr(f'{jnt}.worldInverseMatrix[0]'), type = 'matrix')
+    cmds.connectAttr(f'{jnt}.worldMatrix[0]', f'{mult_matrix}.matrixIn[1]')
+    cmds.connectAttr(f'{mult_matrix}.matrixSum', f'{output_mesh}.offsetParentMatrix', force = True)
+
+    return mult_matrix
+
+
+def drive_output_mesh(high_mesh: str, output_mesh: str, jnt: str, lean_graph: bool = False, output_mode: Literal['skin', 'transform'] = 'skin') -> None:
+    """
+    Make an output mesh follow the high mesh with the offset of the output joint.
+
+    Parameters:
+        high_mesh (str): The name of the high mesh.
+        output_mesh (str): The name of the output mesh.
+        jnt (str): The name of the output joint.
+        lean_graph (bool): Copy the high mesh with a direct connection instead of a blendShape (see link_mesh).
+        output_mode (str): 'skin' to bind the output mesh to the joint with a skinCluster,
+            'transform' to connect the high mesh directly and move the output transform (see drive_output_transform),
+            no deformer evaluating the high resolution points.
+    """
+
+    if output_mode == 'transform':
+        link_mesh(high_mesh, output_mesh, lean_graph = True)
+        drive_output_transform(output_mesh, jnt)
+
+    else:
+        link_mesh(high_mesh, output_mesh, lean_graph)
+        cmds.skinCluster(jnt, output_mesh, maximumInfluences = 1)
+
+
+@profile_step()
+def create_output_setup(high_mesh: str, setup_prefix: str, lean_graph: bool = False, output_mode: Literal['skin', 'transform'] = 'skin'):
+    """
+    """
+
+    groups: dict = ensure_cloth_groups()
 
     output_mesh: str = duplicate_mesh(high_mesh, f'outputMesh_{setup_prefix}')
-    blendshape(high_mesh, output_mesh)
-    cmds.parent(output_mesh, OUTPUT_GRP)
+    cmds.parent(output_mesh, groups[OUTPUT_GRP])
     cmds.sets(output_mesh, add = CLOTH_SET)
 
     jnt: str = ensure_control_joint_output()
-    cmds.skinCluster(jnt, output_mesh, maximumInfluences = 1)
+    drive_output_mesh(high_mesh, output_mesh, jnt, lean_graph, output_mode)
 
 
-def create_hi_setup(simu_nmesh: str, hi_mesh: str, setup_prefix: str, wrap_node: Literal['wrap', 'cvwrap'] = 'cvwrap'):
+@profile_step()
+def create_hi_setup(
+    simu_nmesh: str,
+    hi_mesh: str,
+    setup_prefix: str,
+    wrap_node: Literal['wrap', 'cvwrap', 'npwrap'] = 'cvwrap',
+    lean_graph: bool = False
+):
     """
     Create a high-resolution setup for cloth simulation.
 
@@ -311,23 +716,21 @@ def create_hi_setup(simu_nmesh: str, hi_mesh: str, setup_prefix: str, wrap_node:
         simu_nmesh (str): The name of the simulated mesh.
         hi_mesh (str): The name of the high-resolution mesh.
         setup_prefix (str): Prefix for the names of created objects.
+        wrap_node (str): 'cvwrap' (cvWrap plugin), 'wrap' (legacy Maya wrap) or 'npwrap' (NumPy binding).
+        lean_graph (bool): Drive the wrap driver mesh with a direct connection instead of a blendShape (see link_mesh).
     """
 
-    ensure_cloth_groups()
+    groups: dict = ensure_cloth_groups()
 
-    hi_grp: str = cmds.group(empty = True, name = f'{setup_prefix}_hi_grp', parent = HI_GRP)
+    hi_grp: str = cmds.group(empty = True, name = f'{setup_prefix}_hi_grp', parent = groups[HI_GRP])
     cmds.parent(hi_mesh, hi_grp)
 
     simu_driver_mesh = duplicate_mesh(simu_nmesh, new_name = f'{setup_prefix}_simu_driver')
     cmds.parent(simu_driver_mesh, hi_grp)
 
-    blendshape(simu_nmesh, simu_driver_mesh)
+    link_mesh(simu_nmesh, simu_driver_mesh, lean_graph)
 
-    if wrap_node == 'cvwrap':
-        cmds.cvWrap(hi_mesh, simu_driver_mesh, name=f'cvWrap_{hi_mesh}', radius=0.1)
-
-    else:
-        wrap(hi_mesh, simu_driver_mesh)
+    apply_wrap(hi_mesh, simu_driver_mesh, wrap_node)
 
     # output mesh
     
@@ -335,30 +738,135 @@ def create_hi_setup(simu_nmesh: str, hi_mesh: str, setup_prefix: str, wrap_node:
     cmds.select(clear = True)
 
 
-def create_full_setup(setup_prefix: str, low_mesh: str, high_mesh: str, colliders: dict = None) -> None:
+def full_setup_steps(
+    setup_prefix: str,
+    low_mesh: str,
+    high_mesh: str,
+    colliders: dict = None,
+    proxy_faces: int = None,
+    proxy_error: float = None,
+    trim_distance: float = None,
+    trim_frames: list = None,
+    validate: bool = True,
+    wrap_node: Literal['wrap', 'cvwrap', 'npwrap'] = 'cvwrap',
+    lean_graph: bool = False,
+    output_mode: Literal['skin', 'transform'] = 'skin'
+) -> list:
     """
-    Create a full cloth simulation setup.
+    Split a full cloth simulation setup into steps that can be run one at a time (see job_funcs.StepJob).
+    The steps share the names of the nodes they create and must be run in order.
 
     Parameters:
         setup_prefix (str): Prefix for the names of created objects.
         low_mesh (str): The name of the low-resolution mesh.
         high_mesh (str): The name of the high-resolution mesh.
         colliders (dict, optional): A dictionary containing collider meshes and their suffixes.
+        proxy_faces (int, optional): Build decimated proxy colliders with this number of triangles.
+        proxy_error (float, optional): Build decimated proxy colliders with this maximum error.
+        trim_distance (float, optional): Trim the colliders to the faces within this distance of the cloth.
+        trim_frames (list, optional): The frames the colliders are trimmed on, evenly spaced frames of the playback range if None.
+        validate (bool): Start with a step checking the low mesh (see validate_cloth_mesh).
+        wrap_node (str): The wrap deformer of the high mesh, 'cvwrap', 'wrap' or 'npwrap' (see apply_wrap).
+        lean_graph (bool): Connect the meshes that copy another one directly instead of through blendShapes (see link_mesh).
+        output_mode (str): Offset the output mesh with a 'skin' cluster or its 'transform' (see drive_output_mesh).
+
+    Returns:
+        list: (label, function) tuples, the functions take no argument.
     """
-    
-    ensure_cloth_groups()
-    ensure_nsystem_group(setup_prefix)
 
-    simu_nmesh = duplicate_mesh(low_mesh, new_name = f'{setup_prefix}_simu_nmesh')
-    _, nucleus_node = create_cloth(simu_nmesh, setup_prefix)
+    state = {}
+
+    def validation():
+        validate_cloth_mesh(low_mesh)
+
+    def groups():
+        ensure_cloth_groups()
+        store_setup_spec(ensure_nsystem_group(setup_prefix), {
+            'setup_prefix': setup_prefix,
+            'low_mesh': low_mesh,
+            'high_mesh': high_mesh,
+            'colliders': colliders,
+            'proxy_faces': proxy_faces,
+            'proxy_error': proxy_error,
+            'trim_distance': trim_distance,
+            'trim_frames': trim_frames,
+            'wrap_node': wrap_node,
+            'lean_graph': lean_graph,
+            'output_mode': output_mode
+        })
+
+    def simu_mesh():
+        state['simu_nmesh'] = duplicate_mesh(low_mesh, new_name = f'{setup_prefix}_simu_nmesh')
+
+    def cloth():
+        # the low mesh the simu mesh copies is checked by the first step
+        _, state['nucleus'] = create_cloth(state['simu_nmesh'], setup_prefix, validate = False)
+
+    def hi_mesh():
+        state['hi_mesh'] = duplicate_mesh(high_mesh, new_name = f'{setup_prefix}_hiMesh')
+
+    def hi_setup():
+        create_hi_setup(simu_nmesh = state['simu_nmesh'], hi_mesh = state['hi_mesh'], setup_prefix = setup_prefix, wrap_node = wrap_node, lean_graph = lean_graph)
+
+    def output_setup():
+        create_output_setup(state['hi_mesh'], setup_prefix, lean_graph, output_mode)
+
+    def collider_step(collider: str, collider_suffix: str):
+        def step():
+            init_mesh = ensure_init_mesh(deformed_mesh = collider, lean_graph = lean_graph)
+            create_collider_mesh(init_mesh, state['nucleus'], setup_prefix, collider_suffix, proxy_faces, proxy_error, trim_distance, trim_frames, lean_graph)
+
+        return step
+
+    steps = [('Validate', validation)] if validate else []
+    steps += [
+        ('Groups', groups),
+        ('Simu mesh', simu_mesh),
+        ('nCloth', cloth),
+        ('High mesh', hi_mesh),
+        ('High setup', hi_setup),
+        ('Output setup', output_setup)
+    ]
+    for collider, collider_suffix in (colliders or {}).items():
+        steps.append((f'Collider {collider_suffix}', collider_step(collider, collider_suffix)))
+
+    return steps
+
+
+@profile_step()
+def create_full_setup(
+    setup_prefix: str,
+    low_mesh: str,
+    high_mesh: str,
+    colliders: dict = None,
+    proxy_faces: int = None,
+    proxy_error: float = None,
+    trim_distance: float = None,
+    trim_frames: list = None,
+    validate: bool = True,
+    wrap_node: Literal['wrap', 'cvwrap', 'npwrap'] = 'cvwrap',
+    lean_graph: bool = False,
+    output_mode: Literal['skin', 'transform'] = 'skin'
+) -> None:
+    """
+    Create a full cloth simulation setup.
 
-    himesh = duplicate_mesh(high_mesh, new_name = f'{setup_prefix}_hiMesh')
-    create_hi_setup(simu_nmesh = simu_nmesh, hi_mesh = himesh, setup_prefix = setup_prefix)
-    create_output_setup(himesh, setup_prefix)
+    Parameters:
+        setup_prefix (str): Prefix for the names of created objects.
+        low_mesh (str): The name of the low-resolution mesh.
+        high_mesh (str): The name of the high-resolution mesh.
+        colliders (dict, optional): A dictionary containing collider meshes and their suffixes.
+        proxy_faces (int, optional): Build decimated proxy colliders with this number of triangles.
+        proxy_error (float, optional): Build decimated proxy colliders with this maximum error.
+        trim_distance (float, optional): Trim the colliders to the faces within this distance of the cloth.
+        trim_frames (list, optional): The frames the colliders are trimmed on, evenly spaced frames of the playback range if None.
+        validate (bool): Check the low mesh before creating anything (see validate_cloth_mesh).
+        wrap_node (str): The wrap deformer of the high mesh, 'cvwrap', 'wrap' or 'npwrap' (see apply_wrap).
+        lean_graph (bool): Connect the meshes that copy another one directly instead of through blendShapes (see link_mesh).
+        output_mode (str): Offset the output mesh with a 'skin' cluster or its 'transform' (see drive_output_mesh).
+    """
 
-    if not colliders:
-        return
-    
-    for collider, collider_suffix in colliders.items():
-        init_mesh = ensure_init_mesh(deformed_mesh = collider)
-        create_collider_mesh(init_mesh, nucleus_node, setup_prefix, collider_suffix)
+    for _, step in full_setup_steps(
+        setup_prefix, low_mesh, high_mesh, colliders, proxy_faces, proxy_error, trim_distance, trim_frames, validate, wrap_node, lean_graph, output_mode
+    ):
+        step()
@@ -0,0 +1,260 @@
+# Collider funcs
+
+from maya.api import OpenMaya as om
+from maya import cmds
+from typing import Literal
+import numpy as np
+
+from .index_funcs import read_setup_spec
+from .mesh_funcs import get_points, get_topology
+from .nucleus_funcs import get_nucleus_inputs, get_output_meshes, iter_frames
+from .profile_funcs import profile_step
+from ..core.proximity import UniformGrid, active_intervals, bounding_box, boxes_overlap, near_points
+from ..core.topology import grow_faces_mask, vertex_faces_mask
+
+
+ACTIVATION_ATTRIBUTES = ('isDynamic', 'collide')
+# default reach of the colliders, as a fraction of the cloth bounding box diagonal
+DISTANCE_RATIO = 0.1
+# rings of faces kept around the trimmed collider faces
+TRIM_RINGS = 2
+# frames of the playback range sampled to trim the colliders
+TRIM_SAMPLES = 10
+
+
+def get_low_meshes(ncloth_shapes: list) -> list:
+    """
+    Get the animated low meshes nCloth shapes were built from, read from the spec stored on their setup
+    (see index_funcs.store_setup_spec), or the nCloth input mesh of a setup without stored spec.
+
+    Parameters:
+        ncloth_shapes (list): The names of the nCloth shapes.
+
+    Returns:
+        list: The names of the meshes.
+    """
+
+    meshes = []
+    for shape in ncloth_shapes:
+        transform: str = cmds.listRelatives(shape, parent = True)[0]
+        # the nCloth transform of a setup is parented under its nsystem group, whatever their names
+        parents: list = cmds.listRelatives(transform, parent = True) or []
+        spec: dict = read_setup_spec(parents[0]) if parents else None
+
+        if spec is not None and cmds.objExists(spec['low_mesh']):
+            found = [spec['low_mesh']]
+        else:
+            found = cmds.listConnections(f'{shape}.inputMesh', source = True, destination = False, shapes = True) or []
+
+        meshes += [mesh for mesh in found if mesh not in meshes]
+
+    return meshes
+
+
+def get_collider_systems(nucleus_nodes: list, cloth_source: Literal['low', 'input', 'output'] = 'low') -> dict:
+    """
+    Get the cloth meshes and the nRigid shapes with their input mesh of each nucleus having both.
+
+    Parameters:
+        nucleus_nodes (list): The names of the nucleus nodes.
+        cloth_source (str): Stand for the cloth with the animated 'low' meshes the setups were built from,
+            the nCloth 'input' meshes or the simulated 'output' meshes.
+
+    Returns:
+        dict: Per nucleus, the cloth mesh shapes and a dictionary of the input mesh shape of each nRigid shape.
+    """
+
+    systems = {}
+    for nucleus_node in nucleus_nodes:
+        cloth_shapes, cloth_meshes = get_nucleus_inputs(nucleus_node, 'nCloth')
+        rigid_shapes, _ = get_nucleus_inputs(nucleus_node, 'nRigid')
+        if not cloth_shapes or not rigid_shapes:
+            continue
+
+        if cloth_source == 'low':
+            cloth_meshes = get_low_meshes(cloth_shapes)
+        elif cloth_source == 'output':
+            cloth_meshes = get_output_meshes(cloth_shapes)
+
+        colliders = {}
+        for rigid_shape in rigid_shapes:
+            meshes: list = cmds.listConnections(f'{rigid_shape}.inputMesh', source = True, destination = False, shapes = True) or []
+            if meshes:
+                colliders[rigid_shape] = meshes[0]
+
+        systems[nucleus_node] = (cloth_meshes, colliders)
+
+    return systems
+
+
+def clear_collider_activation(rigid_shape: str) -> None:
+    """
+    Remove the activation keys of an nRigid shape and activate it.
+    """
+
+    for attribute in ACTIVATION_ATTRIBUTES:
+        cmds.cutKey(f'{rigid_shape}.{attribute}', clear = True)
+        cmds.setAttr(f'{rigid_shape}.{attribute}', True)
+
+
+def key_collider_activation(rigid_shape: str, intervals: list, start_frame: float, frame_count: int) -> None:
+    """
+    Key the isDynamic and collide attributes of an nRigid shape with stepped tangents,
+    on inside the intervals and off outside. A collider active on every frame gets no keys.
+
+    Parameters:
+        rigid_shape (str): The name of the nRigid shape.
+        intervals (list): (first index, last index) tuples of the active frames.
+        start_frame (float): The frame of index 0.
+        frame_count (int): The number of frames.
+    """
+
+    clear_collider_activation(rigid_shape)
+    if intervals == [(0, frame_count - 1)]:
+        return
+
+    keys = {start_frame: False}
+    for first, last in intervals:
+        keys[start_frame + first] = True
+        if last < frame_count - 1:
+            keys[start_frame + last + 1] = False
+
+    for attribute in ACTIVATION_ATTRIBUTES:
+        for frame, value in sorted(keys.items()):
+            cmds.setKeyframe(f'{rigid_shape}.{attribute}', time = frame, value = float(value), outTangentType = 'step')
+
+
+@profile_step()
+def set_collider_activation(
+    nucleus_nodes: list = None,
+    start_frame: float = None,
+    end_frame: float = None,
+    distance: float = None,
+    padding: int = 5,
+    cloth_source: Literal['low', 'input', 'output'] = 'low'
+) -> dict:
+    """
+    Turn the nRigid colliders off on the frames they can not reach their cloth, so the nucleus does not pay
+    their collisions on every substep. The cloth and collider meshes of all the nucleus nodes are sampled
+    in one pass over the frame range: the bounding boxes reject far colliders, the others are queried
+    on a uniform grid of the cloth points (see core.proximity).
+    By default the animated low meshes stand for the cloth and the nucleus nodes are disabled while sampling,
+    the 'output' cloth source is exact but its sampling pass simulates the cloth, with every collider active.
+
+    Parameters:
+        nucleus_nodes (list, optional): The nucleus nodes, all of them if None.
+        start_frame (float, optional): The first frame, the playback start if None.
+        end_frame (float, optional): The last frame, the playback end if None.
+        distance (float, optional): The distance under which a collider reaches the cloth,
+            a tenth of the cloth bounding box diagonal at the first frame if None.
+        padding (int): Activate the colliders this number of frames before and after they reach the cloth.
+        cloth_source (str): Sample the animated 'low' meshes the setups were built from, the nCloth 'input' meshes
+            when they are animated, or the simulated 'output' meshes.
+
+    Returns:
+        dict: The (first frame, last frame) active intervals of each nRigid shape.
+    """
+
+    nucleus_nodes = nucleus_nodes or cmds.ls(type = 'nucleus')
+    if start_frame is None:
+        start_frame = cmds.playbackOptions(query = True, minTime = True)
+    if end_frame is None:
+        end_frame = cmds.playbackOptions(query = True, maxTime = True)
+
+    systems: dict = get_collider_systems(nucleus_nodes, cloth_source)
+    frame_count: int = int(round(end_frame - start_frame)) + 1
+
+    meshes = []
+    active = {}
+    for cloth_meshes, colliders in systems.values():
+        meshes += [mesh for mesh in cloth_meshes + list(colliders.values()) if mesh not in meshes]
+        for rigid_shape in colliders:
+            clear_collider_activation(rigid_shape)
+            active[rigid_shape] = np.zeros(frame_count, dtype = bool)
+
+    distances = {}
+    disabled: list = list(systems) if cloth_source != 'output' else None
+    for index, _, points in iter_frames(meshes, start_frame, end_frame, disabled):
+        for nucleus_node, (cloth_meshes, colliders) in systems.items():
+            cloth_points: np.ndarray = np.concatenate([points[mesh] for mesh in cloth_meshes])
+            cloth_box: np.ndarray = bounding_box(cloth_points)
+            if nucleus_node not in distances:
+                distances[nucleus_node] = distance or DISTANCE_RATIO * float(np.linalg.norm(cloth_box[1] - cloth_box[0]))
+
+            grid = None
+            for rigid_shape, mesh in colliders.items():
+                if not boxes_overlap(cloth_box, bounding_box(points[mesh]), distances[nucleus_node]):
+                    continue
+
+                # one grid per frame, only built when a collider passes the bounding box test
+                grid = grid or UniformGrid(cloth_points, distances[nucleus_node])
+                active[rigid_shape][index] = near_points(points[mesh], cloth_points, distances[nucleus_node], grid).any()
+
+    results = {}
+    for rigid_shape, frames in active.items():
+        intervals: list = active_intervals(frames, padding)
+        key_collider_activation(rigid_shape, intervals, start_frame, frame_count)
+        results[rigid_shape] = [(start_frame + first, start_frame + last) for first, last in intervals]
+
+        active_count: int = sum(last - first + 1 for first, last in intervals)
+        om.MGlobal.displayInfo(f'{rigid_shape} : active on {active_count} of {frame_count} frames.')
+
+    return results
+
+
+def sample_trim_frames(samples: int = TRIM_SAMPLES) -> list:
+    """
+    Get evenly spaced whole frames of the playback range, its first and last frames included.
+
+    Parameters:
+        samples (int): The number of frames.
+
+    Returns:
+        list: The frames, without duplicates on a short range.
+    """
+
+    start_frame: float = cmds.playbackOptions(query = True, minTime = True)
+    end_frame: float = cmds.playbackOptions(query = True, maxTime = True)
+
+    return sorted(set(np.round(np.linspace(start_frame, end_frame, samples)).tolist()))
+
+
+@profile_step(meshes = ('init_mesh',))
+def find_collider_faces(init_mesh: str, cloth_meshes: list, distance: float, frames: list = None, rings: int = TRIM_RINGS) -> np.ndarray:
+    """
+    Find the faces of a collider that come within a distance of the cloth at any of the sampled frames,
+    grown by rings of neighbour faces as a safety margin.
+    The cloth is read as is at each frame, its rest shape when given the nCloth input meshes: sample the frames
+    where the collider is in the pose the garment was modelled on, like the preroll bind frame, to trim closer.
+
+    Parameters:
+        init_mesh (str): The name of the collider init mesh.
+        cloth_meshes (list): The names of the meshes standing for the cloth.
+        distance (float): The distance under which a collider face reaches the cloth.
+        frames (list, optional): The frames to sample, evenly spaced frames of the playback range if None (see sample_trim_frames).
+        rings (int): The number of rings of faces added around the faces found.
+
+    Returns:
+        np.ndarray: The (P,) boolean mask of the faces to keep.
+    """
+
+    polygon_counts, polygon_connects = get_topology(init_mesh)
+    near = None
+
+    current_time: float = cmds.currentTime(query = True)
+    try:
+        for frame in frames or sample_trim_frames():
+            cmds.currentTime(frame)
+            cloth_points: np.ndarray = np.concatenate([get_points(mesh, om.MSpace.kWorld) for mesh in cloth_meshes])
+            frame_near: np.ndarray = near_points(get_points(init_mesh, om.MSpace.kWorld), cloth_points, distance, exact = True)
+            near = frame_near if near is None else near | frame_near
+
+    finally:
+        cmds.currentTime(current_time)
+
+    faces_mask: np.ndarray = vertex_faces_mask(polygon_counts, polygon_connects, near)
+    if not faces_mask.any():
+        om.MGlobal.displayWarning(f'No face of {init_mesh} within {distance} of the cloth, the whole collider is kept.')
+        return np.ones(len(polygon_counts), dtype = bool)
+
+    return grow_faces_mask(polygon_counts, polygon_connects, faces_mask, rings)
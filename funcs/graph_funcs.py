@@ -0,0 +1,184 @@
+# Graph funcs
+
+from maya.api import OpenMaya as om
+from maya import cmds
+import numpy as np
+import time
+
+from .cloth_funcs import ignore_namespace
+from .mesh_funcs import get_points, get_topology
+from .profile_funcs import profile_step
+
+
+BLENDSHAPE_PREFIX = 'BShape_'
+
+
+def get_blendshape_link(blendshape_node: str) -> tuple:
+    """
+    Get the driver and deformed meshes of a blendShape made by cloth_funcs.blendshape.
+
+    Parameters:
+        blendshape_node (str): The name of the blendShape node.
+
+    Returns:
+        tuple: The driver mesh shape and the deformed mesh transform, None if the node does not have a single driver.
+    """
+
+    deformed_mesh: str = blendshape_node[len(BLENDSHAPE_PREFIX):]
+    if not blendshape_node.startswith(BLENDSHAPE_PREFIX) or not cmds.objExists(deformed_mesh):
+        return None
+
+    # the Orig shape feeding the blendShape input geometry is an intermediate object
+    drivers = [
+        mesh for mesh in cmds.listConnections(blendshape_node, source = True, destination = False, shapes = True, type = 'mesh') or []
+        if not cmds.getAttr(f'{mesh}.intermediateObject')
+    ]
+    if len(set(drivers)) != 1:
+        return None
+
+    return drivers[0], deformed_mesh
+
+
+def is_collapsible(blendshape_node: str, driver_mesh: str, deformed_mesh: str) -> bool:
+    """
+    Check a blendShape always copies its driver: envelope and weight at 1.0 and not driven, and the same topology on both meshes.
+    """
+
+    driver_transform: str = cmds.listRelatives(driver_mesh, parent = True)[0]
+    for attribute in ('envelope', ignore_namespace(driver_transform)):
+        plug: str = f'{blendshape_node}.{attribute}'
+        if not cmds.objExists(plug) or cmds.getAttr(plug) != 1.0:
+            return False
+        if cmds.listConnections(plug, source = True, destination = False):
+            return False
+
+    driver_topology: tuple = get_topology(driver_mesh)
+    deformed_topology: tuple = get_topology(deformed_mesh)
+
+    return all(np.array_equal(driver, deformed) for driver, deformed in zip(driver_topology, deformed_topology))
+
+
+def find_collapsible_blendshapes() -> dict:
+    """
+    Find the blendShapes of the cloth setups that can be replaced by a direct connection.
+
+    Returns:
+        dict: The (driver mesh, deformed mesh) of each collapsible blendShape node.
+    """
+
+    links = {}
+    for blendshape_node in cmds.ls(f'{BLENDSHAPE_PREFIX}*', type = 'blendShape', recursive = True) or []:
+        link: tuple = get_blendshape_link(blendshape_node)
+        if link is not None and is_collapsible(blendshape_node, *link):
+            links[blendshape_node] = link
+
+    return links
+
+
+def collapse_blendshape(blendshape_node: str, driver_mesh: str) -> None:
+    """
+    Replace a blendShape by a direct connection from its driver outMesh to what the blendShape fed,
+    the next deformer of the deformed mesh or its inMesh. The Orig shape left without output is deleted.
+
+    Parameters:
+        blendshape_node (str): The name of the blendShape node.
+        driver_mesh (str): The name of the driver mesh shape.
+    """
+
+    destinations: list = cmds.listConnections(f'{blendshape_node}.outputGeometry[0]', source = False, destination = True, plugs = True) or []
+    origs = [
+        mesh for mesh in cmds.listConnections(blendshape_node, source = True, destination = False, shapes = True, type = 'mesh') or []
+        if cmds.getAttr(f'{mesh}.intermediateObject')
+    ]
+
+    cmds.delete(blendshape_node)
+    for destination in destinations:
+        cmds.connectAttr(f'{driver_mesh}.outMesh', destination, force = True)
+
+    for orig in set(origs):
+        if cmds.objExists(orig) and not cmds.listConnections(orig, source = False, destination = True):
+            cmds.delete(orig)
+
+
+def measure_evaluation_time(meshes: list, start_frame: float, frame_count: int) -> float:
+    """
+    Time the evaluation of meshes over frames, with every nucleus disabled so only the deformation graph is measured.
+
+    Parameters:
+        meshes (list): The names of the meshes to pull.
+        start_frame (float): The first frame.
+        frame_count (int): The number of frames.
+
+    Returns:
+        float: The mean evaluation time per frame, in milliseconds.
+    """
+
+    nucleus_nodes: list = cmds.ls(type = 'nucleus') or []
+    enable_states: dict = {nucleus_node: cmds.getAttr(f'{nucleus_node}.enable') for nucleus_node in nucleus_nodes}
+    current_time: float = cmds.currentTime(query = True)
+
+    for nucleus_node in nucleus_nodes:
+        cmds.setAttr(f'{nucleus_node}.enable', False)
+
+    try:
+        start: float = time.perf_counter()
+        for index in range(frame_count):
+            cmds.currentTime(start_frame + index)
+            for mesh in meshes:
+                get_points(mesh, om.MSpace.kWorld)
+        elapsed: float = time.perf_counter() - start
+
+    finally:
+        for nucleus_node, state in enable_states.items():
+            cmds.setAttr(f'{nucleus_node}.enable', state)
+        cmds.currentTime(current_time)
+
+    return 1000.0 * elapsed / max(frame_count, 1)
+
+
+@profile_step()
+def migrate_lean_graph(start_frame: float = None, frame_count: int = 10, dry_run: bool = False) -> dict:
+    """
+    Convert the cloth setups of the scene to the lean graph (see cloth_funcs.link_mesh): every full weight
+    blendShape copying a mesh of the same topology is replaced by a direct connection.
+    The meshes they drove are timed over a few frames before and after the conversion.
+
+    Parameters:
+        start_frame (float, optional): The first timed frame, the playback start if None.
+        frame_count (int): The number of timed frames.
+        dry_run (bool): Only report the blendShapes that would be collapsed.
+
+    Returns:
+        dict: The collapsed blendShape nodes with their driver and deformed meshes,
+            and the per frame evaluation time before and after, in milliseconds.
+    """
+
+    if start_frame is None:
+        start_frame = cmds.playbackOptions(query = True, minTime = True)
+
+    links: dict = find_collapsible_blendshapes()
+    meshes: list = list(dict.fromkeys(deformed_mesh for _, deformed_mesh in links.values()))
+    report = {
+        'blendshapes': {node: {'driver': driver, 'deformed': deformed} for node, (driver, deformed) in links.items()},
+        'before_ms': measure_evaluation_time(meshes, start_frame, frame_count) if meshes else 0.0,
+        'after_ms': None
+    }
+
+    if dry_run or not links:
+        om.MGlobal.displayInfo(f'{len(links)} blendShapes can be collapsed.')
+        return report
+
+    cmds.undoInfo(openChunk = True, chunkName = 'clothSetupLeanGraph')
+    try:
+        for blendshape_node, (driver_mesh, _) in links.items():
+            collapse_blendshape(blendshape_node, driver_mesh)
+    finally:
+        cmds.undoInfo(closeChunk = True)
+
+    report['after_ms'] = measure_evaluation_time(meshes, start_frame, frame_count)
+    om.MGlobal.displayInfo(
+        f'{len(links)} blendShapes collapsed, evaluation {report["before_ms"]:.2f} ms -> {report["after_ms"]:.2f} ms per frame '
+        f'({report["before_ms"] - report["after_ms"]:.2f} ms saved).'
+    )
+
+    return report
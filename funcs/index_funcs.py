@@ -0,0 +1,241 @@
+# Scene index funcs
+
+from maya.api import OpenMaya as om
+from maya import cmds
+import json
+
+from .api_funcs import get_mobject
+
+
+ROLE_ATTR = "clothSetupRole"
+SPEC_ATTR = "clothSetupSpec"
+# the optional keys of a setup spec and the build settings, with their default
+SPEC_DEFAULTS = {
+    'colliders': {},
+    'proxy_faces': None,
+    'proxy_error': None,
+    'trim_distance': None,
+    'trim_frames': None,
+    'wrap_node': 'cvwrap',
+    'lean_graph': False,
+    'output_mode': 'skin',
+    'nucleus_lead': None
+}
+
+
+def node_name(node: om.MObject) -> str:
+    """
+    Get the shortest unique name of a node.
+
+    Parameters:
+        node (om.MObject): The node.
+
+    Returns:
+        str: The name of the node.
+    """
+
+    if node.hasFn(om.MFn.kDagNode):
+        return om.MFnDagNode(node).partialPathName()
+
+    return om.MFnDependencyNode(node).name()
+
+
+class SceneIndex:
+    """
+    Map the logical roles of a cloth setup (nucleus, nsystem group, colliders group, init mesh per source...)
+    to MObjectHandles. Nodes are tagged with a clothSetupRole string attribute so lookups survive renames
+    and namespaces. The index is filled once, then kept up to date by node added / removed callbacks
+    and rebuilt lazily after a scene is opened, imported or referenced.
+    """
+
+    def __init__(self):
+        self.handles = {}
+        self.roles = {}
+        self.dirty: bool = True
+        self.callback_ids = []
+
+    def install(self) -> None:
+        if self.callback_ids:
+            return
+
+        self.callback_ids.append(om.MDGMessage.addNodeAddedCallback(self.node_added, 'dependNode'))
+        self.callback_ids.append(om.MDGMessage.addNodeRemovedCallback(self.node_removed, 'dependNode'))
+        for message in (
+            om.MSceneMessage.kAfterNew,
+            om.MSceneMessage.kAfterOpen,
+            om.MSceneMessage.kAfterImport,
+            om.MSceneMessage.kAfterCreateReference,
+            om.MSceneMessage.kAfterLoadReference
+        ):
+            self.callback_ids.append(om.MSceneMessage.addCallback(message, self.invalidate))
+
+    def uninstall(self) -> None:
+        om.MMessage.removeCallbacks(self.callback_ids)
+        self.callback_ids = []
+
+    def invalidate(self, *args) -> None:
+        self.dirty = True
+
+    def node_added(self, node: om.MObject, *args) -> None:
+        # duplicated tagged nodes keep the tag, the original node keeps the role
+        node_fn = om.MFnDependencyNode(node)
+        if not node_fn.hasAttribute(ROLE_ATTR):
+            return
+
+        role_key: str = node_fn.findPlug(ROLE_ATTR, False).asString()
+        if role_key and self.lookup(role_key) is None:
+            self.store(node, role_key)
+
+    def node_removed(self, node: om.MObject, *args) -> None:
+        role_key = self.roles.pop(om.MObjectHandle(node).hashCode(), None)
+        if role_key is not None:
+            self.handles.pop(role_key, None)
+
+    def rescan(self) -> None:
+        self.handles = {}
+        self.roles = {}
+
+        for node in cmds.ls(f'*.{ROLE_ATTR}', recursive = True, objectsOnly = True) or []:
+            role_key: str = cmds.getAttr(f'{node}.{ROLE_ATTR}')
+            if role_key and role_key not in self.handles:
+                self.store(get_mobject(node), role_key)
+
+        self.dirty = False
+
+    def store(self, node: om.MObject, role_key: str) -> None:
+        handle = om.MObjectHandle(node)
+        self.handles[role_key] = handle
+        self.roles[handle.hashCode()] = role_key
+
+    def lookup(self, role_key: str) -> str:
+        handle: om.MObjectHandle = self.handles.get(role_key)
+        if handle is None or not handle.isValid() or not handle.isAlive():
+            return None
+
+        return node_name(handle.object())
+
+    def get(self, role: str, key: str = '') -> str:
+        """
+        Get the node of a role.
+
+        Parameters:
+            role (str): The role, 'nsystem_grp' for instance.
+            key (str): The setup prefix or source mesh the role belongs to, if any.
+
+        Returns:
+            str: The name of the node, None if the role has no node.
+        """
+
+        if self.dirty:
+            self.rescan()
+
+        return self.lookup(f'{role}:{key}')
+
+    def register(self, node: str, role: str, key: str = '') -> str:
+        """
+        Tag a node with a role and index it.
+
+        Parameters:
+            node (str): The name of the node.
+            role (str): The role, 'nsystem_grp' for instance.
+            key (str): The setup prefix or source mesh the role belongs to, if any.
+
+        Returns:
+            str: The name of the node.
+        """
+
+        role_key: str = f'{role}:{key}'
+        if not cmds.attributeQuery(ROLE_ATTR, node = node, exists = True):
+            cmds.addAttr(node, longName = ROLE_ATTR, dataType = 'string')
+        cmds.setAttr(f'{node}.{ROLE_ATTR}', role_key, type = 'string')
+
+        self.store(get_mobject(node), role_key)
+
+        return node
+
+
+SCENE_INDEX = SceneIndex()
+
+
+def get_scene_index() -> SceneIndex:
+    """
+    Get the scene index, installing its callbacks the first time.
+
+    Returns:
+        SceneIndex: The scene index.
+    """
+
+    SCENE_INDEX.install()
+
+    return SCENE_INDEX
+
+
+def find_role(role: str, key: str = '', name: str = None) -> str:
+    """
+    Find the node of a role in the scene index, falling back on its name for setups built
+    before the index existed (the node is then tagged).
+
+    Parameters:
+        role (str): The role, 'nsystem_grp' for instance.
+        key (str): The setup prefix or source mesh the role belongs to, if any.
+        name (str, optional): The default name of the node.
+
+    Returns:
+        str: The name of the node, None if it does not exist.
+    """
+
+    scene_index: SceneIndex = get_scene_index()
+    node: str = scene_index.get(role, key)
+    if node is not None:
+        return node
+
+    if name is not None and cmds.objExists(name):
+        return scene_index.register(name, role, key)
+
+    return None
+
+
+def normalize_setup_spec(spec: dict) -> dict:
+    """
+    Get a setup spec with its required keys and every optional key, missing ones set to their default.
+    """
+
+    normalized: dict = {key: spec[key] for key in ('setup_prefix', 'low_mesh', 'high_mesh')}
+    for key, default in SPEC_DEFAULTS.items():
+        value = spec.get(key)
+        normalized[key] = default if value is None else value
+    normalized['colliders'] = dict(normalized['colliders'])
+    if normalized['trim_frames'] is not None:
+        normalized['trim_frames'] = [float(frame) for frame in normalized['trim_frames']]
+
+    return normalized
+
+
+def store_setup_spec(nsystem_grp: str, spec: dict) -> None:
+    """
+    Store the spec a setup was built from on its nsystem group, as a JSON string attribute.
+
+    Parameters:
+        nsystem_grp (str): The name of the nsystem group of the setup.
+        spec (dict): The setup spec (see build_funcs.SetupBuilder.build).
+    """
+
+    if not cmds.attributeQuery(SPEC_ATTR, node = nsystem_grp, exists = True):
+        cmds.addAttr(nsystem_grp, longName = SPEC_ATTR, dataType = 'string')
+    cmds.setAttr(f'{nsystem_grp}.{SPEC_ATTR}', json.dumps(normalize_setup_spec(spec), sort_keys = True), type = 'string')
+
+
+def read_setup_spec(nsystem_grp: str) -> dict:
+    """
+    Read the spec stored on the nsystem group of a setup.
+
+    Returns:
+        dict: The setup spec, None for setups built before specs were stored.
+    """
+
+    if not cmds.attributeQuery(SPEC_ATTR, node = nsystem_grp, exists = True):
+        return None
+
+    value: str = cmds.getAttr(f'{nsystem_grp}.{SPEC_ATTR}')
+
+    return json.loads(value) if value else None
@@ -0,0 +1,153 @@
+# Job funcs
+
+from maya.api import OpenMaya as om
+from maya import cmds
+import time
+
+from .index_funcs import node_name
+from .profile_funcs import get_profiler
+
+
+class StepJob:
+    """
+    Run a list of steps one per idle event (maya.utils.executeDeferred) so the interface keeps repainting.
+    Each step runs in its own undo chunk, so the edits made in Maya between two steps stay out of the job.
+    Cancelling or a failing step undoes the chunks of the job from the last one, as long as the next undo entry
+    is one of them. The revert functions returned by the steps then restore what the undo queue does not record,
+    and the nodes created by the steps (tracked with a node added callback, only while a step runs) that are still alive are deleted.
+    """
+
+    def __init__(self, name: str, steps: list, on_progress = None, on_finished = None):
+        """
+        Parameters:
+            name (str): The name of the job, used for the profiler span.
+            steps (list): (label, function) tuples. A function may return a function reverting what it did outside the undo queue.
+            on_progress (callable, optional): Called with the step index, step count, label and duration after each step.
+            on_finished (callable, optional): Called with the job status: 'done', 'cancelled' or 'failed'.
+        """
+
+        self.name = name
+        self.steps = steps
+        self.on_progress = on_progress
+        self.on_finished = on_finished
+        self.index: int = 0
+        self.status: str = 'pending'
+        self.error: Exception = None
+        self.durations = []
+        self.created = []
+        self.reverts = []
+        self.chunks = []
+
+    def node_added(self, node: om.MObject, *args) -> None:
+        self.created.append(om.MObjectHandle(node))
+
+    def start(self) -> None:
+        """
+        Schedule the steps on idle events.
+        """
+
+        self.status = 'running'
+        self.schedule()
+
+    def schedule(self) -> None:
+        from maya import utils as maya_utils
+
+        maya_utils.executeDeferred(self.run_next)
+
+    def run(self) -> str:
+        """
+        Run all the steps now.
+
+        Returns:
+            str: The job status.
+        """
+
+        self.status = 'running'
+        while self.status == 'running':
+            self.run_step()
+
+        return self.status
+
+    def run_next(self) -> None:
+        if self.status != 'running':
+            return
+
+        self.run_step()
+        if self.status == 'running':
+            self.schedule()
+
+    def run_step(self) -> None:
+        label, func = self.steps[self.index]
+
+        chunk_name: str = f'{self.name}_step{self.index}'
+        undo_state: bool = cmds.undoInfo(query = True, state = True)
+        cmds.undoInfo(state = True)
+        cmds.undoInfo(openChunk = True, chunkName = chunk_name)
+        self.chunks.append(chunk_name)
+
+        callback_id = om.MDGMessage.addNodeAddedCallback(self.node_added, 'dependNode')
+        start: float = time.perf_counter()
+        try:
+            with get_profiler().span(self.name, step = label):
+                revert = func()
+        except Exception as error:
+            self.error = error
+            om.MGlobal.displayError(f'{self.name} : {label} failed ({error}), rolling back.')
+        finally:
+            om.MMessage.removeCallback(callback_id)
+            cmds.undoInfo(closeChunk = True)
+            cmds.undoInfo(state = undo_state)
+
+        if self.error is not None:
+            self.finish('failed')
+            return
+
+        if revert is not None:
+            self.reverts.append(revert)
+
+        self.durations.append((label, time.perf_counter() - start))
+        self.index += 1
+        if self.on_progress is not None:
+            self.on_progress(self.index, len(self.steps), label, self.durations[-1][1])
+
+        if self.index == len(self.steps):
+            self.finish('done')
+
+    def cancel(self) -> None:
+        if self.status in ('pending', 'running'):
+            self.finish('cancelled')
+
+    def rollback(self) -> None:
+        """
+        Undo the chunks of the steps already run, revert what the undo queue does not record,
+        then delete the nodes the steps created and that still exist.
+        """
+
+        while self.chunks and cmds.undoInfo(query = True, undoName = True) == self.chunks[-1]:
+            cmds.undo()
+            self.chunks.pop()
+
+        if self.chunks:
+            om.MGlobal.displayWarning(
+                f'{self.name} : the undo queue has other edits after {self.chunks[-1]}, '
+                f'its first {len(self.chunks)} steps are only rolled back by deleting their nodes.'
+            )
+
+        for revert in reversed(self.reverts):
+            revert()
+
+        for handle in reversed(self.created):
+            if handle.isValid() and handle.isAlive():
+                cmds.delete(node_name(handle.object()))
+
+        self.reverts = []
+        self.created = []
+        self.chunks = []
+
+    def finish(self, status: str) -> None:
+        if status != 'done':
+            self.rollback()
+
+        self.status = status
+        if self.on_finished is not None:
+            self.on_finished(status)
@@ -0,0 +1,334 @@
+# Manifest funcs
+
+from maya.api import OpenMaya as om
+from maya import cmds
+import json
+import time
+
+from .build_funcs import build_setups
+from .checkpoint_funcs import NUCLEUS_ATTRIBUTES
+from .cloth_funcs import (
+    CLOTH_GRP,
+    create_collider_mesh,
+    create_hi_setup,
+    create_output_setup,
+    duplicate_mesh,
+    ensure_init_mesh,
+    ignore_namespace
+)
+from .index_funcs import find_role, normalize_setup_spec, read_setup_spec, store_setup_spec
+from .profile_funcs import profile_step
+from ..batch.manifest import REQUIRED_SETUP_KEYS, read_manifest_file
+from ..core.setup_diff import diff_setups, group_colliders
+
+
+UNDO_CHUNK = 'clothSetupRebuild'
+
+
+def get_nsystem_group(setup_prefix: str) -> str:
+    """
+    Get the nucleus system group of a setup through the scene index, None if it has none.
+    """
+
+    return find_role('nsystem_grp', setup_prefix, name = f'{setup_prefix}_nsystem_grp')
+
+
+def get_setup_nucleus(setup_prefix: str) -> str:
+    """
+    Get the nucleus node solving the nCloth of a setup, None if it has none.
+    """
+
+    nsystem_grp: str = get_nsystem_group(setup_prefix)
+    if nsystem_grp is None:
+        return None
+
+    # the nCloth of the setup is the only one under its nsystem group, the colliders are nRigid
+    ncloth_shapes: list = cmds.listRelatives(nsystem_grp, allDescendents = True, type = 'nCloth') or []
+    if not ncloth_shapes:
+        return None
+
+    nucleus_nodes: list = cmds.listConnections(ncloth_shapes[0], type = 'nucleus', source = True, destination = False) or []
+
+    return nucleus_nodes[0] if nucleus_nodes else None
+
+
+def get_live_setups() -> list:
+    """
+    Get the specs of the setups of the scene, as stored on their nucleus system group at build time,
+    with the current settings of their nucleus.
+
+    Returns:
+        list: The setup specs (see build_funcs.SetupBuilder.build) with their 'nucleus' settings.
+    """
+
+    cloth_grp: str = find_role(CLOTH_GRP, name = CLOTH_GRP)
+    if cloth_grp is None:
+        return []
+
+    specs = []
+    for nsystem_grp in cmds.listRelatives(cloth_grp, children = True, type = 'transform') or []:
+        spec: dict = read_setup_spec(nsystem_grp)
+        if spec is None:
+            om.MGlobal.displayWarning(f'{nsystem_grp} has no stored spec, it was built before manifests and is skipped.')
+            continue
+
+        nucleus_node: str = get_setup_nucleus(spec['setup_prefix'])
+        if nucleus_node is not None:
+            spec['nucleus'] = {attribute: cmds.getAttr(f'{nucleus_node}.{attribute}') for attribute in NUCLEUS_ATTRIBUTES}
+        specs.append(spec)
+
+    return specs
+
+
+def export_setups(path: str = None) -> dict:
+    """
+    Export the setups of the scene to a manifest, that rebuild_from_manifest can apply back once edited.
+
+    Parameters:
+        path (str, optional): The path of the JSON manifest to write, nothing is written if None.
+
+    Returns:
+        dict: The manifest, the specs of the setups under 'setups'. The setups sharing a nucleus
+            name the setup owning it in 'nucleus_lead', None on the others.
+    """
+
+    manifest = {'setups': get_live_setups()}
+    if path is not None:
+        with open(path, 'w') as manifest_file:
+            json.dump(manifest, manifest_file, indent = 4, sort_keys = True)
+        om.MGlobal.displayInfo(f'Exported {len(manifest["setups"])} setups to {path}')
+
+    return manifest
+
+
+def delete_nodes(*nodes: str) -> None:
+    existing = [node for node in nodes if node and cmds.objExists(node)]
+    if existing:
+        cmds.delete(existing)
+
+
+def delete_unused_init_meshes(sources) -> None:
+    """
+    Delete the init meshes of collider sources no collider follows anymore. The blendShape or connection
+    linking an init mesh to its source goes with it, the source mesh is left as is.
+
+    Parameters:
+        sources (iterable): The names of the collider source meshes.
+    """
+
+    for source in sources:
+        key: str = ignore_namespace(source)
+        init_mesh: str = find_role('init_mesh', key, name = f'initMesh_{key}')
+        if init_mesh is None:
+            continue
+
+        init_shape: str = cmds.listRelatives(init_mesh, shapes = True, noIntermediate = True, fullPath = True)[0]
+        followers = []
+        for attribute in ('outMesh', 'worldMesh[0]'):
+            followers += cmds.listConnections(f'{init_shape}.{attribute}', source = False, destination = True) or []
+        if not followers:
+            delete_nodes(init_mesh)
+
+
+def remove_setup(setup_prefix: str) -> None:
+    """
+    Delete a setup, with the nucleus and colliders under its nucleus system group when it is a lead,
+    and the init meshes of its colliders no other setup uses.
+    """
+
+    nsystem_grp: str = get_nsystem_group(setup_prefix)
+    spec: dict = read_setup_spec(nsystem_grp) if nsystem_grp is not None else None
+
+    delete_nodes(
+        nsystem_grp,
+        f'{setup_prefix}_hi_grp',
+        f'outputMesh_{setup_prefix}',
+        f'multMatrix_outputMesh_{setup_prefix}'
+    )
+    delete_unused_init_meshes((spec or {}).get('colliders') or {})
+
+
+def rebuild_high_part(spec: dict) -> None:
+    """
+    Rebuild the high mesh, wrap and output mesh of a setup, keeping its simulated mesh and colliders.
+    """
+
+    setup_prefix: str = spec['setup_prefix']
+    delete_nodes(f'{setup_prefix}_hi_grp', f'outputMesh_{setup_prefix}', f'multMatrix_outputMesh_{setup_prefix}')
+
+    hi_mesh: str = duplicate_mesh(spec['high_mesh'], new_name = f'{setup_prefix}_hiMesh')
+    create_hi_setup(f'{setup_prefix}_simu_nmesh', hi_mesh, setup_prefix, spec['wrap_node'], spec['lean_graph'])
+    create_output_setup(hi_mesh, setup_prefix, spec['lean_graph'], spec['output_mode'])
+
+
+def get_nucleus_groups(specs: list) -> list:
+    """
+    Get the nucleus groups of setup specs, lead first (see build_funcs.SetupBuilder.build).
+    """
+
+    groups = {}
+    for spec in specs:
+        if spec.get('nucleus_lead'):
+            groups.setdefault(spec['nucleus_lead'], [spec['nucleus_lead']]).append(spec['setup_prefix'])
+
+    return list(groups.values())
+
+
+def add_colliders(spec: dict, colliders: dict) -> None:
+    """
+    Add colliders to the nucleus of a lead setup, built with its proxy and trim settings.
+    """
+
+    nucleus_node: str = get_setup_nucleus(spec['setup_prefix'])
+    for collider, collider_suffix in colliders.items():
+        init_mesh: str = ensure_init_mesh(deformed_mesh = collider, lean_graph = spec['lean_graph'])
+        create_collider_mesh(
+            init_mesh, nucleus_node, spec['setup_prefix'], collider_suffix,
+            spec['proxy_faces'], spec['proxy_error'], spec['trim_distance'], spec['trim_frames'], spec['lean_graph']
+        )
+
+
+def apply_plan(plan: dict) -> None:
+    for setup_prefix in plan['remove']:
+        remove_setup(setup_prefix)
+
+    for spec in plan['high']:
+        rebuild_high_part(spec)
+
+    # the colliders and nucleus of a group belong to its lead
+    specs_by_prefix = {spec['setup_prefix']: spec for spec in plan['specs']}
+    for lead, colliders in plan['colliders'].items():
+        for collider_suffix in colliders['remove'].values():
+            delete_nodes(f'{lead}_collider_{collider_suffix}_grp')
+        delete_unused_init_meshes(colliders['remove'])
+        add_colliders(specs_by_prefix[lead], colliders['add'])
+
+    for lead, settings in plan['nucleus'].items():
+        nucleus_node: str = get_setup_nucleus(lead)
+        for attribute, value in settings.items():
+            cmds.setAttr(f'{nucleus_node}.{attribute}', value)
+
+    for spec in plan['update']:
+        store_setup_spec(get_nsystem_group(spec['setup_prefix']), spec)
+
+    # leads before the setups joining their nucleus, build_setups takes its settings per call
+    nucleus_groups: list = get_nucleus_groups(plan['specs'])
+    for joining in (False, True):
+        by_settings = {}
+        for spec in plan['create']:
+            if bool(spec['nucleus_lead']) == joining:
+                by_settings.setdefault((spec['wrap_node'], spec['lean_graph'], spec['output_mode']), []).append(spec)
+
+        for (wrap_node, lean_graph, output_mode), specs in by_settings.items():
+            build_setups(specs, wrap_node = wrap_node, lean_graph = lean_graph, output_mode = output_mode, nucleus_groups = nucleus_groups)
+
+    # the setups joining a new lead are built without it, the colliders they bring are added to its nucleus
+    target_colliders: dict = group_colliders(plan['specs'])
+    for spec in plan['create']:
+        if spec['nucleus_lead']:
+            continue
+
+        lead: str = spec['setup_prefix']
+        add_colliders(spec, {
+            collider: collider_suffix for collider, collider_suffix in target_colliders.get(lead, {}).items()
+            if collider not in spec['colliders']
+        })
+
+        nucleus_node: str = get_setup_nucleus(lead)
+        for attribute, value in (spec.get('nucleus') or {}).items():
+            cmds.setAttr(f'{nucleus_node}.{attribute}', value)
+
+
+def read_target_specs(manifest: dict) -> list:
+    """
+    Get the normalized specs of a manifest, with their nucleus lead from the manifest 'nucleus_groups' if given
+    (as in batch shot manifests), and check each lead is a setup of the manifest owning its nucleus.
+    """
+
+    leads = {setup_prefix: group[0] for group in manifest.get('nucleus_groups') or [] for setup_prefix in group[1:]}
+
+    target = []
+    for spec in manifest.get('setups', []):
+        missing = [key for key in REQUIRED_SETUP_KEYS if key not in spec]
+        if missing:
+            raise ValueError(f'Setup spec {spec} is missing {", ".join(missing)}.')
+
+        normalized: dict = normalize_setup_spec(spec)
+        if manifest.get('nucleus_groups') is not None:
+            normalized['nucleus_lead'] = leads.get(spec['setup_prefix'])
+        if spec.get('nucleus'):
+            normalized['nucleus'] = dict(spec['nucleus'])
+        target.append(normalized)
+
+    specs_by_prefix = {spec['setup_prefix']: spec for spec in target}
+    for spec in target:
+        lead: str = spec['nucleus_lead']
+        if lead is None:
+            continue
+        if lead not in specs_by_prefix:
+            raise ValueError(f'The nucleus lead {lead} of {spec["setup_prefix"]} is not a setup of the manifest.')
+        if specs_by_prefix[lead]['nucleus_lead'] is not None:
+            raise ValueError(f'The nucleus lead {lead} of {spec["setup_prefix"]} joins the nucleus of another setup.')
+
+    return target
+
+
+@profile_step()
+def rebuild_from_manifest(manifest, dry_run: bool = False) -> dict:
+    """
+    Bring the setups of the scene to a manifest, only touching what differs (see core.setup_diff.diff_setups):
+    setups are created or removed, a changed low mesh or nucleus lead rebuilds its whole setup, a changed high mesh
+    or wrap only its high and output part, colliders are added or removed one at a time and nucleus settings are set in place.
+    The colliders and nucleus settings of setups sharing a nucleus are edited on their lead,
+    removing or rebuilding a lead rebuilds the setups of its nucleus. Setups missing from the manifest are removed.
+    If anything fails, every edit already made by this call is undone.
+
+    Parameters:
+        manifest (str | dict): The manifest or the path of a JSON or YAML manifest, see export_setups.
+        dry_run (bool): Only plan the edits.
+
+    Returns:
+        dict: The plan of the edits (see core.setup_diff.diff_setups).
+    """
+
+    if isinstance(manifest, str):
+        manifest = read_manifest_file(manifest)
+
+    target: list = read_target_specs(manifest)
+    plan: dict = diff_setups(get_live_setups(), target)
+    plan['specs'] = target
+
+    edits: int = len(plan['create']) + len(plan['remove']) + len(plan['high']) + len(plan['colliders']) + len(plan['nucleus']) + len(plan['update'])
+    if dry_run or not edits:
+        om.MGlobal.displayInfo(f'{edits} setup edits planned, {len(plan["unchanged"])} setups unchanged.')
+        return plan
+
+    start: float = time.perf_counter()
+    undo_state: bool = cmds.undoInfo(query = True, state = True)
+    cmds.undoInfo(state = True)
+    cmds.undoInfo(openChunk = True, chunkName = UNDO_CHUNK)
+
+    try:
+        apply_plan(plan)
+
+    except Exception:
+        cmds.undoInfo(closeChunk = True)
+        # only undo the chunk of this call, not an edit made before it
+        if cmds.undoInfo(query = True, undoName = True) == UNDO_CHUNK:
+            cmds.undo()
+        cmds.undoInfo(state = undo_state)
+        cmds.select(clear = True)
+        om.MGlobal.displayError('Rebuild from manifest failed, the scene has been rolled back.')
+        raise
+
+    cmds.undoInfo(closeChunk = True)
+    cmds.undoInfo(state = undo_state)
+    cmds.select(clear = True)
+
+    om.MGlobal.displayInfo(
+        f'Rebuilt from manifest in {time.perf_counter() - start:.2f} s : {len(plan["create"])} created, {len(plan["remove"])} removed, '
+        f'{len(plan["high"])} high parts, {len(plan["colliders"])} collider edits, {len(plan["nucleus"])} nucleus edits, '
+        f'{len(plan["unchanged"])} unchanged.'
+    )
+
+    return plan
@@ -0,0 +1,216 @@
+# Mesh funcs
+
+from maya.api import OpenMaya as om
+from maya import cmds
+import ctypes
+import numpy as np
+
+try:
+    from maya import OpenMaya as om1
+except ImportError:
+    # a stand-in maya without the API 1.0, the points are read through MPointArray
+    om1 = None
+
+from .api_funcs import get_dag_path, get_mobject
+from .plugin_funcs import apply_modifier
+
+
+def get_mesh_fn(mesh: str) -> om.MFnMesh:
+    """
+    Get a function set on the evaluated (non intermediate) shape of a mesh.
+
+    Parameters:
+        mesh (str): The name of the mesh transform or shape.
+
+    Returns:
+        om.MFnMesh: The function set of the mesh shape.
+    """
+
+    dag_path: om.MDagPath = get_dag_path(mesh)
+    if dag_path.hasFn(om.MFn.kTransform):
+        dag_path.extendToShape()
+
+    return om.MFnMesh(dag_path)
+
+
+class MeshCreator:
+    """
+    Create a mesh shape from raw arrays under an existing transform.
+    Applied through apply_modifier so it is undoable like a modifier: undoing deletes the shape, redoing creates it again.
+    """
+
+    def __init__(self, transform: str, points: om.MPointArray, polygon_counts: om.MIntArray, polygon_connects: om.MIntArray, uvs: tuple = None):
+        """
+        Parameters:
+            transform (str): The name of the transform of the new shape, the shape is named after it.
+            points (om.MPointArray): The points.
+            polygon_counts (om.MIntArray): Number of vertices of each polygon.
+            polygon_connects (om.MIntArray): Vertex indices of all the polygons, one after the other.
+            uvs (tuple, optional): The u values, v values, UV counts and UV ids of the UV set.
+        """
+
+        self.transform = om.MObjectHandle(get_mobject(transform))
+        self.points = points
+        self.polygon_counts = polygon_counts
+        self.polygon_connects = polygon_connects
+        self.uvs = uvs
+        self.shape: om.MObject = None
+        self.name: str = None
+
+    def doIt(self):
+        mesh_fn = om.MFnMesh()
+        self.shape = mesh_fn.create(self.points, self.polygon_counts, self.polygon_connects, parent = self.transform.object())
+
+        if self.uvs is not None:
+            u_values, v_values, uv_counts, uv_ids = self.uvs
+            mesh_fn.setUVs(u_values, v_values)
+            mesh_fn.assignUVs(uv_counts, uv_ids)
+
+        self.name = mesh_fn.setName(f'{om.MFnDependencyNode(self.transform.object()).name()}Shape')
+
+    def undoIt(self):
+        modifier = om.MDagModifier()
+        modifier.deleteNode(self.shape)
+        modifier.doIt()
+        self.shape = None
+
+
+def create_mesh_from(mesh: str, new_name: str, uvs: bool = True) -> str:
+    """
+    Create a new mesh from the evaluated data of another one.
+    Only points, topology and optionally the current UV set are copied: no history, no intermediate object.
+    The shape is created by a MeshCreator so undoing and redoing removes and restores it with its transform.
+    The new transform gets the same parent and local transformation as the source.
+
+    Parameters:
+        mesh (str): The name of the source mesh.
+        new_name (str): The name of the new mesh transform.
+        uvs (bool): Copy the current UV set.
+
+    Returns:
+        str: The name of the new mesh transform.
+    """
+
+    source_fn: om.MFnMesh = get_mesh_fn(mesh)
+    points: om.MPointArray = source_fn.getPoints(om.MSpace.kObject)
+    polygon_counts, polygon_connects = source_fn.getVertices()
+
+    parent = cmds.listRelatives(mesh, parent = True, fullPath = True)
+    if parent:
+        new_name = cmds.createNode('transform', name = new_name, parent = parent[0])
+    else:
+        new_name = cmds.createNode('transform', name = new_name)
+
+    transform_path: om.MDagPath = get_dag_path(new_name)
+    transform_fn = om.MFnTransform(transform_path)
+    transform_fn.setTransformation(om.MFnTransform(get_dag_path(mesh)).transformation())
+
+    uv_data: tuple = None
+    if uvs and source_fn.numUVs():
+        uv_set: str = source_fn.currentUVSetName()
+        uv_data = (*source_fn.getUVs(uv_set), *source_fn.getAssignedUVs(uv_set))
+
+    mesh_creator = MeshCreator(new_name, points, polygon_counts, polygon_connects, uv_data)
+    apply_modifier(mesh_creator)
+    cmds.sets(mesh_creator.name, edit = True, forceElement = 'initialShadingGroup')
+
+    return new_name
+
+
+def get_points(mesh: str, space: int = om.MSpace.kObject) -> np.ndarray:
+    """
+    Get the evaluated points of a mesh as an array.
+    The object space points are copied in one block from the float buffer of the API 1.0 MFnMesh.getRawPoints:
+    converting the MPointArray of the API 2.0 creates a Python object per point, seconds on a million vertex mesh
+    (see benchmarks/bench_get_points.py).
+
+    Parameters:
+        mesh (str): The name of the mesh.
+        space (int): The om.MSpace to get the points in.
+
+    Returns:
+        np.ndarray: The (N, 3) points.
+    """
+
+    mesh_fn: om.MFnMesh = get_mesh_fn(mesh)
+    if om1 is None or space not in (om.MSpace.kObject, om.MSpace.kWorld):
+        return get_point_array(mesh_fn, space)
+
+    selection = om1.MSelectionList()
+    selection.add(mesh_fn.fullPathName())
+    dag_path = om1.MDagPath()
+    selection.getDagPath(0, dag_path)
+
+    count: int = mesh_fn.numVertices
+    raw_points = (ctypes.c_float * (3 * count)).from_address(int(om1.MFnMesh(dag_path).getRawPoints()))
+    points: np.ndarray = np.frombuffer(raw_points, dtype = np.float32).reshape(count, 3).astype(np.float64)
+
+    if space == om.MSpace.kWorld:
+        matrix: om.MMatrix = mesh_fn.dagPath().inclusiveMatrix()
+        matrix_array = np.array([matrix.getElement(row, column) for row in range(4) for column in range(4)]).reshape(4, 4)
+        points = points @ matrix_array[:3, :3] + matrix_array[3, :3]
+
+    return points
+
+
+def get_point_array(mesh_fn: om.MFnMesh, space: int = om.MSpace.kObject) -> np.ndarray:
+    """
+    Get the points of a mesh as an array, converted from the MPointArray of the API 2.0 point by point.
+
+    Parameters:
+        mesh_fn (om.MFnMesh): The function set of the mesh shape.
+        space (int): The om.MSpace to get the points in.
+
+    Returns:
+        np.ndarray: The (N, 3) points.
+    """
+
+    return np.array(mesh_fn.getPoints(space), dtype = np.float64)[:, :3]
+
+
+def get_topology(mesh: str) -> tuple:
+    """
+    Get the polygon counts and connects of a mesh as arrays.
+
+    Parameters:
+        mesh (str): The name of the mesh.
+
+    Returns:
+        tuple: The (P,) polygon vertex counts and the polygon vertex indices.
+    """
+
+    polygon_counts, polygon_connects = get_mesh_fn(mesh).getVertices()
+
+    return np.array(polygon_counts, dtype = np.int64), np.array(polygon_connects, dtype = np.int64)
+
+
+def create_mesh(new_name: str, points: np.ndarray, polygon_counts, polygon_connects, parent: str = None) -> str:
+    """
+    Create a mesh from raw arrays, undoable (see MeshCreator).
+
+    Parameters:
+        new_name (str): The name of the new mesh transform.
+        points (np.ndarray): The (N, 3) points.
+        polygon_counts (array_like): Number of vertices of each polygon.
+        polygon_connects (array_like): Vertex indices of all the polygons, one after the other.
+        parent (str, optional): The parent of the new mesh transform.
+
+    Returns:
+        str: The name of the new mesh transform.
+    """
+
+    if parent:
+        new_name = cmds.createNode('transform', name = new_name, parent = parent)
+    else:
+        new_name = cmds.createNode('transform', name = new_name)
+
+    mesh_creator = MeshCreator(
+        new_name,
+        om.MPointArray(np.asarray(points, dtype = np.float64)[:, :3].tolist()),
+        om.MIntArray(np.asarray(polygon_counts, dtype = np.int64).tolist()),
+        om.MIntArray(np.asarray(polygon_connects, dtype = np.int64).tolist())
+    )
+    apply_modifier(mesh_creator)
+    cmds.sets(mesh_creator.name, edit = True, forceElement = 'initialShadingGroup')
+
+    return new_name
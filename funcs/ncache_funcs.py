@@ -0,0 +1,161 @@
+# nCache funcs
+
+from maya.api import OpenMaya as om
+from maya import cmds
+import os
+import tempfile
+
+from ..batch.runner import PACKAGE_NAME, run_jobs
+
+
+NCACHE_WORKER_MODULE = f'{PACKAGE_NAME}.batch.ncache_worker'
+
+
+def find_nucleus_systems() -> list:
+    """
+    Find the independent nucleus systems of the scene from the *_nsystem_grp hierarchy.
+
+    Returns:
+        list: One dict per system with its setup prefix, nucleus node and nCloth shapes.
+    """
+
+    systems = []
+    for nsystem_grp in cmds.ls('*_nsystem_grp', recursive = True, type = 'transform') or []:
+        nucleus_nodes = cmds.listRelatives(nsystem_grp, allDescendents = True, type = 'nucleus') or []
+        for nucleus_node in nucleus_nodes:
+            ncloths = cmds.listConnections(f'{nucleus_node}.outputObjects', type = 'nCloth', shapes = True) or []
+            if not ncloths:
+                continue
+
+            systems.append({
+                'setup_prefix': nsystem_grp.split(':')[-1][:-len('_nsystem_grp')],
+                'nucleus': nucleus_node,
+                'ncloths': sorted(set(ncloths))
+            })
+
+    return systems
+
+
+def find_cache_channel(ncloth_shape: str, channels: list) -> str:
+    """
+    Find the channel of an nCloth shape in a cache of several shapes, named after the shape without namespace separator.
+
+    Returns:
+        str: The channel name, None if the cache has no channel for the shape.
+    """
+
+    name: str = ncloth_shape.replace(':', '_')
+    for channel in channels:
+        if channel == name or channel.startswith(f'{name}_'):
+            return channel
+
+    return None
+
+
+def attach_ncloth_cache(ncloth_shape: str, file_name: str, directory: str) -> str:
+    """
+    Attach an nCache file to an nCloth shape, reading the channel of the shape when the cache holds several of them.
+
+    Parameters:
+        ncloth_shape (str): The name of the nCloth shape.
+        file_name (str): The name of the cache file, without extension.
+        directory (str): The directory of the cache file.
+
+    Returns:
+        str: The name of the cacheFile node.
+    """
+
+    channels: list = cmds.cacheFile(query = True, fileName = os.path.join(directory, f'{file_name}.xml'), channelName = True) or []
+    channel: str = find_cache_channel(ncloth_shape, channels)
+    if channel is None:
+        raise ValueError(f'{file_name} has no channel for {ncloth_shape}.')
+
+    cache_node: str = cmds.cacheFile(
+        attachFile = True,
+        fileName = file_name,
+        directory = directory,
+        channelName = channel,
+        inAttr = f'{ncloth_shape}.positions'
+    )
+    cmds.connectAttr(f'{cache_node}.inRange', f'{ncloth_shape}.playFromCache', force = True)
+
+    return cache_node
+
+
+def create_ncaches_parallel(
+    directory: str,
+    start_frame: float = None,
+    end_frame: float = None,
+    workers: int = None,
+    timeout: float = 4 * 3600.0,
+    retries: int = 1,
+    executable: str = None
+) -> dict:
+    """
+    Cache every nucleus system of the scene in parallel headless workers, one nucleus and one cache file per worker,
+    then attach the caches to the nCloth shapes of the current scene.
+
+    Parameters:
+        directory (str): The directory of the cache files.
+        start_frame (float, optional): The first frame, the playback start if None.
+        end_frame (float, optional): The last frame, the playback end if None.
+        workers (int, optional): The maximum number of workers at once, the number of CPUs if None.
+        timeout (float): The time in seconds after which a worker is killed.
+        retries (int): The number of times a failed system is cached again.
+        executable (str, optional): The python executable of the workers, MAYAPY or mayapy by default.
+
+    Returns:
+        dict: The run_jobs summary.
+    """
+
+    if start_frame is None:
+        start_frame = cmds.playbackOptions(query = True, minTime = True)
+    if end_frame is None:
+        end_frame = cmds.playbackOptions(query = True, maxTime = True)
+
+    systems: list = find_nucleus_systems()
+    if not systems:
+        om.MGlobal.displayWarning('No nucleus system to cache.')
+        return {'counts': {}, 'duration': 0.0, 'jobs': []}
+
+    # the workers open a copy of the scene, the current scene is left untouched
+    os.makedirs(directory, exist_ok = True)
+    scene: str = os.path.join(tempfile.mkdtemp(prefix = 'cloth_setup_ncache_'), 'scene.mb')
+    cmds.file(scene, exportAll = True, type = 'mayaBinary', force = True, preserveReferences = True)
+
+    jobs = [
+        {
+            'name': system['nucleus'],
+            'scene': scene,
+            'nucleus': system['nucleus'],
+            'ncloths': system['ncloths'],
+            'directory': directory,
+            'start_frame': start_frame,
+            'end_frame': end_frame
+        }
+        for system in systems
+    ]
+
+    try:
+        summary: dict = run_jobs(
+            jobs,
+            NCACHE_WORKER_MODULE,
+            workers = workers or os.cpu_count() or 1,
+            timeout = timeout,
+            retries = retries,
+            executable = executable
+        )
+
+    finally:
+        os.remove(scene)
+        os.rmdir(os.path.dirname(scene))
+
+    for job, report in zip(jobs, summary['jobs']):
+        if report['status'] != 'ok':
+            om.MGlobal.displayWarning(f'Caching {job["nucleus"]} failed ({report["status"]}).')
+            continue
+
+        for ncloth_shape in job['ncloths']:
+            attach_ncloth_cache(ncloth_shape, job['nucleus'].replace(':', '_'), directory)
+
+    return summary
@@ -0,0 +1,263 @@
+# Nucleus funcs
+
+from maya.api import OpenMaya as om
+from maya import cmds
+import numpy as np
+
+from .mesh_funcs import get_points, get_topology
+from .profile_funcs import profile_step
+from ..core.grouping import plan_groups
+from ..core.proximity import bounding_box
+from ..core.substeps import edge_lengths, estimate_substeps, frame_ranges, peak_displacement
+
+
+EDGE_PERCENTILE = 10.0
+# default distance under which garments interact, as a fraction of the smallest garment bounding box diagonal
+INTERACTION_RATIO = 0.05
+
+
+def get_nucleus_inputs(nucleus_node: str, node_type: str) -> tuple:
+    """
+    Get the nCloth or nRigid shapes of a nucleus and the meshes feeding them.
+
+    Parameters:
+        nucleus_node (str): The name of the nucleus node.
+        node_type (str): 'nCloth' or 'nRigid'.
+
+    Returns:
+        tuple: The names of the shapes and the names of their input mesh shapes.
+    """
+
+    shapes: list = list(dict.fromkeys(
+        cmds.listConnections(nucleus_node, source = True, destination = False, shapes = True, type = node_type) or []
+    ))
+
+    meshes = []
+    for shape in shapes:
+        for mesh in cmds.listConnections(f'{shape}.inputMesh', source = True, destination = False, shapes = True) or []:
+            if mesh not in meshes:
+                meshes.append(mesh)
+
+    return shapes, meshes
+
+
+def get_output_meshes(ncloth_shapes: list) -> list:
+    """
+    Get the simulated meshes driven by nCloth shapes.
+
+    Parameters:
+        ncloth_shapes (list): The names of the nCloth shapes.
+
+    Returns:
+        list: The names of the output mesh shapes.
+    """
+
+    meshes = []
+    for shape in ncloth_shapes:
+        for mesh in cmds.listConnections(f'{shape}.outputMesh', source = False, destination = True, shapes = True) or []:
+            if mesh not in meshes:
+                meshes.append(mesh)
+
+    return meshes
+
+
+def iter_frames(meshes: list, start_frame: float, end_frame: float, disabled_nucleus_nodes: list = None):
+    """
+    Step time forward over a frame range and yield the world space points of meshes at each frame.
+    The time and the enable state of the disabled nucleus nodes are restored when the iteration ends.
+
+    Parameters:
+        meshes (list): The names of the meshes to sample.
+        start_frame (float): The first frame.
+        end_frame (float): The last frame.
+        disabled_nucleus_nodes (list, optional): Nucleus nodes to disable while sampling, so stepping time does not simulate them.
+
+    Yields:
+        tuple: The frame index, the frame and a dictionary of the (N, 3) points of each mesh.
+    """
+
+    frame_count: int = int(round(end_frame - start_frame)) + 1
+
+    current_time: float = cmds.currentTime(query = True)
+    enable_states: dict = {nucleus_node: cmds.getAttr(f'{nucleus_node}.enable') for nucleus_node in disabled_nucleus_nodes or []}
+    for nucleus_node in enable_states:
+        cmds.setAttr(f'{nucleus_node}.enable', False)
+
+    try:
+        for index in range(frame_count):
+            frame: float = start_frame + index
+            cmds.currentTime(frame)
+            yield index, frame, {mesh: get_points(mesh, om.MSpace.kWorld) for mesh in meshes}
+
+    finally:
+        for nucleus_node, state in enable_states.items():
+            cmds.setAttr(f'{nucleus_node}.enable', state)
+        cmds.currentTime(current_time)
+
+
+@profile_step()
+def sample_peak_displacements(meshes: list, start_frame: float, end_frame: float, nucleus_nodes: list = None) -> dict:
+    """
+    Get the largest vertex displacement of each frame of several meshes, stepping time once for all of them.
+    The nucleus nodes are disabled while sampling so stepping time does not simulate.
+
+    Parameters:
+        meshes (list): The names of the meshes to sample.
+        start_frame (float): The first frame.
+        end_frame (float): The last frame.
+        nucleus_nodes (list, optional): The nucleus nodes to disable while sampling.
+
+    Returns:
+        dict: The (F,) world space displacements from the previous frame of each mesh.
+    """
+
+    frame_count: int = int(round(end_frame - start_frame)) + 1
+    displacements: dict = {mesh: np.zeros(frame_count) for mesh in meshes}
+    previous = {}
+
+    for index, _, points in iter_frames(meshes, start_frame, end_frame, nucleus_nodes):
+        for mesh in meshes:
+            if index:
+                displacements[mesh][index] = peak_displacement(previous[mesh], points[mesh])
+        previous = points
+
+    return displacements
+
+
+def set_nucleus_setting(nucleus_node: str, attribute: str, values: np.ndarray, start_frame: float, keyed: bool, padding: int, min_length: int) -> list:
+    """
+    Set an integer nucleus attribute to the largest value, or key it per frame range with stepped tangents.
+
+    Returns:
+        list: The keyed (start frame, end frame, value) ranges, a single range when not keyed.
+    """
+
+    plug: str = f'{nucleus_node}.{attribute}'
+    cmds.cutKey(plug, clear = True)
+
+    if not keyed:
+        cmds.setAttr(plug, int(values.max()))
+        return [(start_frame, start_frame + len(values) - 1, int(values.max()))]
+
+    ranges = []
+    for first, last, value in frame_ranges(values, padding, min_length):
+        cmds.setKeyframe(plug, time = start_frame + first, value = value, outTangentType = 'step')
+        ranges.append((start_frame + first, start_frame + last, int(value)))
+
+    return ranges
+
+
+@profile_step()
+def estimate_nucleus_substeps(
+    nucleus_nodes: list = None,
+    start_frame: float = None,
+    end_frame: float = None,
+    keyed: bool = False,
+    safety: float = 0.5,
+    padding: int = 2,
+    min_length: int = 10
+) -> dict:
+    """
+    Set the subSteps and maxCollisionIterations of nucleus nodes from how fast their cloth input meshes
+    and colliders move over the shot, compared to the short cloth edges and the collision thickness (see core.substeps).
+    All the meshes of all the nucleus nodes are sampled in a single pass over the frame range.
+
+    Parameters:
+        nucleus_nodes (list, optional): The nucleus nodes, all of them if None.
+        start_frame (float, optional): The first frame, the playback start if None.
+        end_frame (float, optional): The last frame, the playback end if None.
+        keyed (bool): Key the settings per frame range instead of setting the largest value for the whole shot.
+        safety (float): The fraction of the collision reach a vertex may travel in one substep.
+        padding (int): Raise the keyed settings this number of frames before and after fast motions.
+        min_length (int): The minimum number of frames of a keyed range.
+
+    Returns:
+        dict: Per nucleus, the peak displacement, edge length, thickness and the substeps and iterations ranges.
+    """
+
+    nucleus_nodes = nucleus_nodes or cmds.ls(type = 'nucleus')
+    if start_frame is None:
+        start_frame = cmds.playbackOptions(query = True, minTime = True)
+    if end_frame is None:
+        end_frame = cmds.playbackOptions(query = True, maxTime = True)
+
+    inputs = {}
+    for nucleus_node in nucleus_nodes:
+        cloth_shapes, cloth_meshes = get_nucleus_inputs(nucleus_node, 'nCloth')
+        if not cloth_shapes:
+            om.MGlobal.displayWarning(f'{nucleus_node} has no nCloth, skipped.')
+            continue
+        inputs[nucleus_node] = (cloth_shapes, cloth_meshes) + get_nucleus_inputs(nucleus_node, 'nRigid')
+
+    meshes = []
+    for _, cloth_meshes, _, collider_meshes in inputs.values():
+        meshes += [mesh for mesh in cloth_meshes + collider_meshes if mesh not in meshes]
+    displacements: dict = sample_peak_displacements(meshes, start_frame, end_frame, list(inputs))
+
+    results = {}
+    for nucleus_node, (cloth_shapes, cloth_meshes, rigid_shapes, collider_meshes) in inputs.items():
+        frame_displacements: np.ndarray = np.max([displacements[mesh] for mesh in cloth_meshes + collider_meshes], axis = 0)
+
+        lengths: np.ndarray = np.concatenate([
+            edge_lengths(get_points(mesh, om.MSpace.kWorld), *get_topology(mesh)) for mesh in cloth_meshes
+        ])
+        edge_length: float = float(np.percentile(lengths, EDGE_PERCENTILE)) if len(lengths) else 0.0
+        thickness: float = min(cmds.getAttr(f'{shape}.thickness') for shape in cloth_shapes)
+        if rigid_shapes:
+            thickness += min(cmds.getAttr(f'{shape}.thickness') for shape in rigid_shapes)
+
+        substeps, iterations = estimate_substeps(frame_displacements, edge_length, thickness, safety = safety)
+
+        results[nucleus_node] = {
+            'peak_displacement': float(frame_displacements.max()),
+            'edge_length': edge_length,
+            'thickness': thickness,
+            'subSteps': set_nucleus_setting(nucleus_node, 'subSteps', substeps, start_frame, keyed, padding, min_length),
+            'maxCollisionIterations': set_nucleus_setting(
+                nucleus_node, 'maxCollisionIterations', iterations, start_frame, keyed, padding, min_length
+            )
+        }
+        om.MGlobal.displayInfo(
+            f'{nucleus_node} : up to {substeps.max()} substeps and {iterations.max()} collision iterations, '
+            f'peak displacement {frame_displacements.max():.3g} per frame.'
+        )
+
+    return results
+
+
+def plan_nucleus_groups(setup_specs: list, distance: float = None, max_vertices: int = None) -> list:
+    """
+    Group setups into shared nucleus systems (see core.grouping.plan_groups): setups whose low meshes come
+    within a distance of each other are solved together so they collide, setups sharing colliders are
+    merged under a vertex budget so each collider gets one nRigid per nucleus.
+
+    Parameters:
+        setup_specs (list): The setup specs (see build_funcs.SetupBuilder.build).
+        distance (float, optional): The distance under which garments interact,
+            a fraction of the smallest low mesh bounding box diagonal if None.
+        max_vertices (int, optional): The largest number of simulated vertices of a group merged on shared colliders.
+
+    Returns:
+        list: The groups, lists of setup prefixes, the first one leading the group.
+    """
+
+    boxes = []
+    vertex_counts = []
+    for spec in setup_specs:
+        points: np.ndarray = get_points(spec['low_mesh'], om.MSpace.kWorld)
+        boxes.append(bounding_box(points))
+        vertex_counts.append(len(points))
+
+    if distance is None:
+        distance = INTERACTION_RATIO * min(float(np.linalg.norm(box[1] - box[0])) for box in boxes)
+
+    colliders: list = [set(spec.get('colliders') or {}) for spec in setup_specs]
+    groups: list = plan_groups(boxes, vertex_counts, colliders, distance, max_vertices)
+
+    rigid_count: int = sum(len(set().union(*(colliders[index] for index in group))) for group in groups)
+    om.MGlobal.displayInfo(
+        f'{len(setup_specs)} setups in {len(groups)} nucleus systems, '
+        f'{rigid_count} nRigid instead of {sum(len(garment_colliders) for garment_colliders in colliders)}.'
+    )
+
+    return [[setup_specs[index]['setup_prefix'] for index in group] for group in groups]
@@ -0,0 +1,62 @@
+# Plugin funcs
+
+from maya.api import OpenMaya as om
+from maya import cmds
+import os
+import sys
+import types
+
+
+PLUGIN_NAME = "cloth_setup_plugin"
+PLUGIN_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'plugins', f'{PLUGIN_NAME}.py')
+QUEUE_MODULE = "cloth_setup_modifier_queue"
+
+
+def ensure_plugin() -> str:
+    """
+    Ensure the cloth_setup plugin is loaded.
+
+    Returns:
+        str: The name of the plugin.
+    """
+
+    if not cmds.pluginInfo(PLUGIN_NAME, query = True, loaded = True):
+        cmds.loadPlugin(PLUGIN_PATH, quiet = True)
+
+    return PLUGIN_NAME
+
+
+def modifier_queue() -> list:
+    """
+    Return the list of modifiers waiting to be applied by the plugin command.
+
+    Returns:
+        list: The pending OpenMaya modifiers.
+    """
+
+    module = sys.modules.get(QUEUE_MODULE)
+    if module is None:
+        module = types.ModuleType(QUEUE_MODULE)
+        module.pending = []
+        sys.modules[QUEUE_MODULE] = module
+
+    return module.pending
+
+
+def apply_modifier(modifier: om.MDGModifier) -> None:
+    """
+    Apply a modifier through the clothSetupApplyModifier command so it is recorded in the undo queue.
+
+    Parameters:
+        modifier (om.MDGModifier): The modifier (or MDagModifier, or any object with doIt / undoIt methods) to apply.
+    """
+
+    ensure_plugin()
+    queue: list = modifier_queue()
+    queue.append(modifier)
+
+    try:
+        cmds.clothSetupApplyModifier()
+    finally:
+        if modifier in queue:
+            queue.remove(modifier)
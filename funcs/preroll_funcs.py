@@ -1,8 +1,29 @@
 # Pre-roll funcs
 
 
+from maya.api import OpenMaya as om
+from maya.api import OpenMayaAnim as oma
 from maya import cmds
 
+from .api_funcs import get_plug
+from .plugin_funcs import apply_modifier
+from .profile_funcs import profile_step
+from ..core.easing import preroll_curves
+import numpy as np
+
+
+TRS_DEFAULTS = {
+    'translateX': 0.0,
+    'translateY': 0.0,
+    'translateZ': 0.0,
+    'rotateX': 0.0,
+    'rotateY': 0.0,
+    'rotateZ': 0.0,
+    'scaleX': 1.0,
+    'scaleY': 1.0,
+    'scaleZ': 1.0
+}
+
 
 def get_preroll_frames(
     start_anim_frame: float,
@@ -40,17 +61,7 @@ def set_key_frame(controler: str) -> None:
 
 def set_attributes_to_defaults(controler: str) -> None:
 
-    attribute_dict = {
-        'translateX': 0.0,
-        'translateY': 0.0,
-        'translateZ': 0.0,
-        'rotateX': 0.0,
-        'rotateY': 0.0,
-        'rotateZ': 0.0,
-        'scaleX': 1.0,
-        'scaleY': 1.0,
-        'scaleZ': 1.0
-    }
+    attribute_dict = TRS_DEFAULTS
 
     for attribute in cmds.listAttr(controler, keyable = True):
         if not cmds.attributeQuery(attribute, node = controler, keyable = True):
@@ -63,6 +74,7 @@ def set_attributes_to_defaults(controler: str) -> None:
         cmds.setAttr(f'{controler}.{attribute}', default_value)
 
 
+@profile_step()
 def set_preroll_keys(controlers: list, preroll_frames: dict) -> None:
 
     # set start pose
@@ -82,11 +94,232 @@ def set_preroll_keys(controlers: list, preroll_frames: dict) -> None:
         set_key_frame(ctrl)
 
 
-def set_preroll(controlers: list, preroll_values: list, update_nucleus: bool = True) -> None:
+def get_keyable_plugs(controlers: list) -> list:
+    """
+    Get the keyable plugs of controlers that can take anim curve keys:
+    not locked and not driven by something else than an anim curve.
+    """
+
+    plugs = []
+    for ctrl in controlers:
+        for attribute in cmds.listAttr(ctrl, keyable = True) or []:
+            try:
+                plug: om.MPlug = get_plug(ctrl, attribute)
+            except RuntimeError:
+                continue
+
+            if plug.isLocked or plug.isCompound or plug.isArray:
+                continue
+
+            source: om.MPlug = plug.source()
+            if not source.isNull and not source.node().hasFn(om.MFn.kAnimCurve):
+                continue
+
+            plugs.append((ctrl, attribute, plug))
+
+    return plugs
+
+
+class PrerollKeyWriter:
+    """
+    Add keys to the anim curves of plugs, creating the missing curves.
+    Applied through apply_modifier so it is undoable like a modifier.
+    """
+
+    def __init__(self, plugs: list, times: list, values: list, tangent_type: int = oma.MFnAnimCurve.kTangentGlobal):
+        self.plugs = plugs
+        self.times = om.MTimeArray([om.MTime(time, om.MTime.uiUnit()) for time in times])
+        self.values = values
+        self.tangent_type = tangent_type
+        self.modifier = om.MDGModifier()
+        self.change = oma.MAnimCurveChange()
+        self.done = False
+
+    def doIt(self):
+        if self.done:
+            self.modifier.doIt()
+            self.change.redoIt()
+            return
+
+        curves = []
+        for plug in self.plugs:
+            found = oma.MAnimUtil.findAnimation(plug)
+            if found:
+                curves.append(found[0])
+            else:
+                curves.append(oma.MFnAnimCurve().create(plug, modifier = self.modifier))
+
+        self.modifier.doIt()
+
+        curve_fn = oma.MFnAnimCurve()
+        for curve, plug_values in zip(curves, self.values):
+            curve_fn.setObject(curve)
+            curve_fn.addKeys(
+                self.times,
+                list(plug_values),
+                tangentInType = self.tangent_type,
+                tangentOutType = self.tangent_type,
+                keepExistingKeys = True,
+                change = self.change
+            )
+
+        self.done = True
+
+    def undoIt(self):
+        self.change.undoIt()
+        self.modifier.undoIt()
+
+
+@profile_step()
+def set_preroll_keys_bulk(controlers: list, preroll_frames: dict) -> PrerollKeyWriter:
+    """
+    Same keys as set_preroll_keys without moving the current time:
+    values are read in one pass at the start pose frame and the keys are added to the anim curves directly.
+    Returns the applied PrerollKeyWriter, its undoIt removes the keys.
+    """
+
+    plugs: list = get_keyable_plugs(controlers)
+    start_values: np.ndarray = get_plug_values(plugs, preroll_frames['start_pose_frame'])
+
+    values = []
+    for (_, attribute, _), start_value in zip(plugs, start_values):
+        # defaults are values in internal units, angles are 0.0 so no conversion is needed
+        inter_value: float = TRS_DEFAULTS.get(attribute, float(start_value))
+        values.append([float(start_value), inter_value, inter_value])
+
+    times = [preroll_frames['start_pose_frame'], preroll_frames['inter_pose_frame'], preroll_frames['bind_pose_frame']]
+    key_writer = PrerollKeyWriter([plug for _, _, plug in plugs], times, values)
+    apply_modifier(key_writer)
+
+    return key_writer
+
+
+def get_plug_values(plugs: list, frame: float) -> np.ndarray:
+    """
+    Read plugs at a frame without moving the current time, in internal units.
+    """
+
+    context = om.MDGContext(om.MTime(frame, om.MTime.uiUnit()))
+
+    return np.array([plug.asDouble(context) for _, _, plug in plugs], dtype = np.float64)
+
+
+def get_default_values(plugs: list) -> np.ndarray:
+    """
+    Read the attribute defaults (attributeQuery listDefault) of plugs, in internal units.
+    """
+
+    values = []
+    for ctrl, attribute, plug in plugs:
+        default = cmds.attributeQuery(attribute, node = ctrl, listDefault = True)
+        value: float = float(default[0]) if default else 0.0
+
+        attribute_obj: om.MObject = plug.attribute()
+        if attribute_obj.hasFn(om.MFn.kUnitAttribute) and om.MFnUnitAttribute(attribute_obj).unitType() == om.MFnUnitAttribute.kAngle:
+            value = om.MAngle(value, om.MAngle.uiUnit()).asRadians()
+
+        values.append(value)
+
+    return np.array(values, dtype = np.float64)
+
+
+def capture_rest_pose(controlers: list, frame: float = None) -> dict:
+    """
+    Capture the values of the keyable plugs of controlers, by plug name, in internal units.
+    """
+
+    if frame is None:
+        frame = cmds.currentTime(query = True)
+
+    plugs: list = get_keyable_plugs(controlers)
+    values: np.ndarray = get_plug_values(plugs, frame)
+
+    return {f'{ctrl}.{attribute}': value for (ctrl, attribute, _), value in zip(plugs, values)}
+
+
+def get_pose_values(plugs: list, pose, frame: float, rest_pose: dict = None) -> np.ndarray:
+    """
+    Get the values of plugs for a pose: 'anim' (the animation at the pose frame), 'default'
+    (attribute defaults), 'rest' (the captured rest pose) or a dict of values by plug name.
+    """
+
+    if pose == 'anim':
+        return get_plug_values(plugs, frame)
+
+    defaults: np.ndarray = get_default_values(plugs)
+    if pose == 'default':
+        return defaults
+
+    if pose == 'rest':
+        if rest_pose is None:
+            raise ValueError('A rest pose is needed for a "rest" pose.')
+        pose = rest_pose
+
+    return np.array([
+        pose.get(f'{ctrl}.{attribute}', default) for (ctrl, attribute, _), default in zip(plugs, defaults)
+    ], dtype = np.float64)
+
+
+@profile_step()
+def set_preroll_poses(
+    controlers: list,
+    start_anim_frame: float,
+    poses: list,
+    rest_pose: dict = None,
+    sample_step: float = 1.0,
+    update_nucleus: bool = True
+) -> list:
+    """
+    Set a preroll through any number of key poses, with an easing per pose.
+
+    Each pose is a dict with an 'offset' from start_anim_frame, a 'pose' ('anim', 'default', 'rest'
+    or a dict of values by plug name) and the 'easing' (see core.easing.EASINGS) used to go to the next pose.
+    The curves of every controler attribute are computed at once and keyed every sample_step frames.
+
+    Returns:
+        list: The frames of the poses.
+    """
+
+    poses = sorted(poses, key = lambda pose: pose['offset'])
+    pose_frames = [start_anim_frame + pose['offset'] for pose in poses]
+    easings = [pose.get('easing', 'smoothstep') for pose in poses[:-1]]
+
+    plugs: list = get_keyable_plugs(controlers)
+    pose_values = np.stack([
+        get_pose_values(plugs, pose['pose'], frame, rest_pose) for pose, frame in zip(poses, pose_frames)
+    ], axis = 1)
+
+    sample_frames = np.arange(pose_frames[0], pose_frames[-1], sample_step)
+    sample_frames = np.append(sample_frames, pose_frames[-1])
+    values: np.ndarray = preroll_curves(pose_frames, pose_values, easings, sample_frames)
+
+    apply_modifier(PrerollKeyWriter(
+        [plug for _, _, plug in plugs],
+        sample_frames.tolist(),
+        values,
+        tangent_type = oma.MFnAnimCurve.kTangentLinear
+    ))
+
+    end_frame: float = cmds.playbackOptions(query = True, maxTime = True)
+    cmds.playbackOptions(minTime = pose_frames[0], maxTime = end_frame)
+
+    if update_nucleus:
+        for nucleus_node in cmds.ls(type = 'nucleus'):
+            cmds.setAttr(f'{nucleus_node}.startFrame', pose_frames[0])
+
+    return pose_frames
+
+
+@profile_step()
+def set_preroll(controlers: list, preroll_values: list, update_nucleus: bool = True, bulk: bool = True) -> None:
 
     preroll_frames: dict = get_preroll_frames(*preroll_values)
     set_preroll_time_slider(preroll_frames)
-    set_preroll_keys(controlers, preroll_frames)
+
+    if bulk:
+        set_preroll_keys_bulk(controlers, preroll_frames)
+    else:
+        set_preroll_keys(controlers, preroll_frames)
 
     if not update_nucleus:
         return
@@ -95,3 +328,43 @@ def set_preroll(controlers: list, preroll_values: list, update_nucleus: bool = T
 
     for nucleus_node in cmds.ls(type = 'nucleus'):
         cmds.setAttr(f'{nucleus_node}.startFrame', bind_pose_frame)
+
+
+
+def preroll_steps(controlers: list, preroll_values: list, update_nucleus: bool = True, chunk_size: int = 50) -> list:
+    """
+    Split set_preroll (bulk keys) into steps of chunk_size controlers, for job_funcs.StepJob.
+    The keys and nucleus start frames are reverted by undoing the job, the time slider step returns a function restoring its range.
+
+    Returns:
+        list: (label, function) tuples, the functions take no argument.
+    """
+
+    preroll_frames: dict = get_preroll_frames(*preroll_values)
+
+    def time_slider():
+        min_time: float = cmds.playbackOptions(query = True, minTime = True)
+        max_time: float = cmds.playbackOptions(query = True, maxTime = True)
+        set_preroll_time_slider(preroll_frames)
+
+        return lambda: cmds.playbackOptions(minTime = min_time, maxTime = max_time)
+
+    def keys_step(chunk: list):
+        def step():
+            set_preroll_keys_bulk(chunk, preroll_frames)
+
+        return step
+
+    def nucleus_start_frame():
+        for nucleus_node in cmds.ls(type = 'nucleus'):
+            cmds.setAttr(f'{nucleus_node}.startFrame', preroll_frames['bind_pose_frame'])
+
+    steps = [('Time slider', time_slider)]
+    for start in range(0, len(controlers), chunk_size):
+        chunk: list = controlers[start:start + chunk_size]
+        steps.append((f'Keys {start + 1}-{start + len(chunk)}', keys_step(chunk)))
+
+    if update_nucleus:
+        steps.append(('Nucleus start frame', nucleus_start_frame))
+
+    return steps
\ No newline at end of file
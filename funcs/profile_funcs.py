@@ -0,0 +1,101 @@
+# Profile funcs
+
+from maya.api import OpenMaya as om
+import functools
+import inspect
+
+from .mesh_funcs import get_mesh_fn
+from ..core.profiling import PROFILER, Profiler
+
+
+class NodeCounter:
+    """
+    Count the DG nodes created since the callback was installed.
+    A node added callback is much cheaper than listing the scene around each step.
+    """
+
+    def __init__(self):
+        self.count: int = 0
+        self.callback_id = None
+
+    def install(self) -> None:
+        if self.callback_id is None:
+            self.callback_id = om.MDGMessage.addNodeAddedCallback(self.node_added, 'dependNode')
+
+    def uninstall(self) -> None:
+        if self.callback_id is not None:
+            om.MMessage.removeCallback(self.callback_id)
+            self.callback_id = None
+
+    def node_added(self, *args) -> None:
+        self.count += 1
+
+    def __call__(self) -> int:
+        return self.count
+
+
+NODE_COUNTER = NodeCounter()
+
+
+def get_profiler() -> Profiler:
+    """
+    Get the profiler, with the DG node counter installed the first time.
+
+    Returns:
+        Profiler: The profiler.
+    """
+
+    if PROFILER.enabled and NODE_COUNTER.callback_id is None:
+        NODE_COUNTER.install()
+        PROFILER.add_counter('dg_nodes', NODE_COUNTER)
+
+    return PROFILER
+
+
+def get_vertex_count(mesh: str) -> int:
+    """
+    Get the vertex count of a mesh, None if it is not a mesh.
+    """
+
+    try:
+        return get_mesh_fn(mesh).numVertices
+    except (RuntimeError, TypeError, ValueError):
+        return None
+
+
+def profile_step(name: str = None, meshes: tuple = ()):
+    """
+    Decorator recording a pipeline step as a profiler span.
+    The setup_prefix argument, if any, tags the span.
+
+    Parameters:
+        name (str, optional): The name of the span, the function name if None.
+        meshes (tuple): Names of the arguments holding meshes whose vertex count is recorded.
+
+    Returns:
+        function: The decorator.
+    """
+
+    def decorator(func):
+        signature = inspect.signature(func)
+        span_name: str = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not PROFILER.enabled:
+                return func(*args, **kwargs)
+
+            arguments: dict = signature.bind_partial(*args, **kwargs).arguments
+            tags: dict = {'setup_prefix': arguments['setup_prefix']} if 'setup_prefix' in arguments else {}
+
+            with get_profiler().span(span_name, **tags):
+                for mesh_argument in meshes:
+                    mesh = arguments.get(mesh_argument)
+                    if mesh:
+                        PROFILER.record(f'{mesh_argument}_vertices', get_vertex_count(mesh))
+
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
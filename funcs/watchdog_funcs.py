@@ -0,0 +1,120 @@
+# Watchdog funcs
+
+from maya.api import OpenMaya as om
+from maya import cmds
+
+from .mesh_funcs import get_points, get_topology
+from .nucleus_funcs import get_output_meshes
+from ..core.validation import edge_use_counts
+from ..core.watchdog import Watchdog, WatchdogAbort
+
+
+class MeshWatchdog:
+    """
+    A core.watchdog.Watchdog on the simulated mesh of an nCloth, measured against the nCloth input mesh at rest.
+    Once attached, every time change checks the frame and stops the playback when it exceeds the limits.
+    """
+
+    def __init__(self, ncloth_shape: str, max_stretch: float = 3.0, max_displacement: float = None, stop_playback: bool = True):
+        """
+        Parameters:
+            ncloth_shape (str): The name of the nCloth shape.
+            max_stretch (float): The largest accepted edge stretch ratio.
+            max_displacement (float, optional): The largest accepted vertex displacement per frame,
+                a quarter of the rest bounding box diagonal if None.
+            stop_playback (bool): Stop the playback on the first frame over the limits.
+        """
+
+        self.ncloth_shape = ncloth_shape
+        self.mesh: str = get_output_meshes([ncloth_shape])[0]
+        rest_mesh: str = cmds.listConnections(f'{ncloth_shape}.inputMesh', source = True, destination = False, shapes = True)[0]
+
+        edges, _ = edge_use_counts(*get_topology(self.mesh))
+        self.watchdog = Watchdog(get_points(rest_mesh, om.MSpace.kWorld), edges, max_stretch, max_displacement)
+        self.stop_playback = stop_playback
+        self.callback_id: int = None
+
+    def attach(self) -> None:
+        if self.callback_id is None:
+            self.callback_id = om.MDGMessage.addTimeChangeCallback(self.time_changed)
+
+    def detach(self) -> None:
+        if self.callback_id is not None:
+            om.MMessage.removeCallback(self.callback_id)
+            self.callback_id = None
+
+    def time_changed(self, time: om.MTime, *args) -> None:
+        self.check(time.asUnits(om.MTime.uiUnit()))
+
+    def check(self, frame: float = None) -> dict:
+        """
+        Check the simulated mesh at the current time.
+
+        Parameters:
+            frame (float, optional): The current frame, queried if None.
+
+        Returns:
+            dict: The health of the frame (see core.watchdog.frame_health).
+        """
+
+        if frame is None:
+            frame = cmds.currentTime(query = True)
+
+        health: dict = self.watchdog.check(frame, get_points(self.mesh, om.MSpace.kWorld))
+        if health['health'] > 1.0:
+            om.MGlobal.displayWarning(
+                f'{self.mesh} : frame {frame} over the watchdog limits '
+                f'(stretch {health["stretch"]:.3g}, displacement {health["displacement"]:.3g}).'
+            )
+            if self.stop_playback and cmds.play(query = True, state = True):
+                cmds.play(state = False)
+
+        return health
+
+    @property
+    def exceeded(self) -> bool:
+        return self.watchdog.exceeded
+
+    def to_dict(self) -> dict:
+        return {'ncloth': self.ncloth_shape, 'mesh': self.mesh, **self.watchdog.to_dict()}
+
+
+def attach_watchdogs(ncloth_shapes: list = None, **limits) -> list:
+    """
+    Attach a watchdog to nCloth shapes.
+
+    Parameters:
+        ncloth_shapes (list, optional): The names of the nCloth shapes, all of them if None.
+        **limits: The MeshWatchdog limits, max_stretch, max_displacement and stop_playback.
+
+    Returns:
+        list: The attached MeshWatchdog, detach them when done.
+    """
+
+    watchdogs = []
+    for ncloth_shape in ncloth_shapes or cmds.ls(type = 'nCloth'):
+        watchdog = MeshWatchdog(ncloth_shape, **limits)
+        watchdog.attach()
+        watchdogs.append(watchdog)
+
+    return watchdogs
+
+
+def check_watchdogs(watchdogs: list, frame: float) -> None:
+    """
+    Check watchdogs at the current time, to abort long runs on the first frame over the limits.
+    Attached watchdogs already checked the frame on the time change.
+    Raises a core.watchdog.WatchdogAbort on a frame over the limits.
+
+    Parameters:
+        watchdogs (list): The MeshWatchdog to check.
+        frame (float): The current frame.
+    """
+
+    for watchdog in watchdogs:
+        health: dict = watchdog.watchdog.frames.get(frame)
+        if health is None:
+            health = watchdog.check(frame)
+
+        if health['health'] > 1.0:
+            raise WatchdogAbort(f'The simulation of {watchdog.mesh} exceeds the watchdog limits at frame {frame}.')
@@ -0,0 +1,252 @@
+# Cloth setup plugin
+
+import importlib.util
+import os
+import sys
+import types
+
+import numpy as np
+from maya.api import OpenMaya as om
+from maya.api import OpenMayaAnim as oma
+
+
+QUEUE_MODULE = "cloth_setup_modifier_queue"
+CORE_MODULE = "cloth_setup_core"
+# first node type id of the plugin, in the 0x00000 - 0x7ffff range Autodesk leaves to plugins used in-house.
+# Binary scenes store the ids of their nodes: take a block registered with Autodesk before sharing the plugin,
+# and never change the id of a node type afterwards.
+TYPE_ID_BASE = 0x0007A8C0
+
+
+def maya_useNewAPI():
+    """
+    Tell Maya this plugin uses the Python API 2.0.
+    """
+
+    pass
+
+
+def modifier_queue() -> list:
+    """
+    Return the list of modifiers waiting to be applied.
+    The list lives in a shared module so the plugin and the cloth_setup package see the same one.
+
+    Returns:
+        list: The pending OpenMaya modifiers.
+    """
+
+    module = sys.modules.get(QUEUE_MODULE)
+    if module is None:
+        module = types.ModuleType(QUEUE_MODULE)
+        module.pending = []
+        sys.modules[QUEUE_MODULE] = module
+
+    return module.pending
+
+
+def load_core() -> types.ModuleType:
+    """
+    Load the cloth_setup core package by path, without importing cloth_setup itself (which opens the UI).
+
+    Returns:
+        types.ModuleType: The core package.
+    """
+
+    module = sys.modules.get(CORE_MODULE)
+    if module is not None:
+        return module
+
+    core_dir: str = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'core')
+    spec = importlib.util.spec_from_file_location(
+        CORE_MODULE,
+        os.path.join(core_dir, '__init__.py'),
+        submodule_search_locations = [core_dir]
+    )
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[CORE_MODULE] = module
+    spec.loader.exec_module(module)
+
+    return module
+
+
+def matrix_to_array(matrix: om.MMatrix) -> np.ndarray:
+    return np.array([matrix.getElement(row, column) for row in range(4) for column in range(4)]).reshape(4, 4)
+
+
+class ApplyModifierCommand(om.MPxCommand):
+    """
+    Undoable command applying the next pending MDGModifier / MDagModifier.
+    """
+
+    NAME = "clothSetupApplyModifier"
+
+    def __init__(self):
+        super(ApplyModifierCommand, self).__init__()
+        self.modifier = None
+
+    @staticmethod
+    def creator():
+        return ApplyModifierCommand()
+
+    def doIt(self, args):
+        queue: list = modifier_queue()
+        if not queue:
+            raise RuntimeError('No pending modifier to apply.')
+
+        self.modifier = queue.pop(0)
+        self.modifier.doIt()
+
+    def redoIt(self):
+        self.modifier.doIt()
+
+    def undoIt(self):
+        self.modifier.undoIt()
+
+    def isUndoable(self):
+        return True
+
+
+class PointCopyDeformer(oma.MPxDeformerNode):
+    """
+    Deformer setting each point to the point of a driver mesh given by an index mapping.
+    """
+
+    NAME = "clothSetupPointCopy"
+    TYPE_ID = om.MTypeId(TYPE_ID_BASE)
+
+    driver_mesh = None
+    point_indices = None
+
+    @staticmethod
+    def creator():
+        return PointCopyDeformer()
+
+    @staticmethod
+    def initialize():
+        typed_fn = om.MFnTypedAttribute()
+
+        PointCopyDeformer.driver_mesh = typed_fn.create('driverMesh', 'drm', om.MFnData.kMesh)
+        typed_fn.storable = False
+
+        PointCopyDeformer.point_indices = typed_fn.create('pointIndices', 'pti', om.MFnData.kIntArray, om.MFnIntArrayData().create())
+
+        output_geom = oma.MPxGeometryFilter.outputGeom
+        for attribute in (PointCopyDeformer.driver_mesh, PointCopyDeformer.point_indices):
+            PointCopyDeformer.addAttribute(attribute)
+            PointCopyDeformer.attributeAffects(attribute, output_geom)
+
+    def deform(self, data_block, geom_iter, matrix, multi_index):
+        envelope: float = data_block.inputValue(oma.MPxGeometryFilter.envelope).asFloat()
+        driver_handle = data_block.inputValue(PointCopyDeformer.driver_mesh)
+        if envelope == 0.0 or driver_handle.data().isNull():
+            return
+
+        driver_points = np.array(om.MFnMesh(driver_handle.asMesh()).getPoints())[:, :3]
+        indices = np.array(om.MFnIntArrayData(data_block.inputValue(PointCopyDeformer.point_indices).data()).array(), dtype = np.int64)
+
+        points = np.array(geom_iter.allPositions())[:, :3]
+        if len(indices) != len(points) or (len(indices) and indices.max() >= len(driver_points)):
+            return
+
+        points += (driver_points[indices] - points) * envelope
+        geom_iter.setAllPositions(om.MPointArray(points.tolist()))
+
+
+class WrapDeformer(oma.MPxDeformerNode):
+    """
+    Deformer applying a NumPy wrap binding (see core.wrap) from a driver mesh.
+    The Python API 2.0 gives no buffer access to point arrays: the driver points are read and the wrapped points
+    written through Python lists, a copy linear in the vertex count on top of the NumPy apply.
+    The deformed points are only read when the envelope is not 1. Compare it to cvWrap with benchmarks/bench_wrap_deformer.py.
+    """
+
+    NAME = "clothSetupWrap"
+    TYPE_ID = om.MTypeId(TYPE_ID_BASE + 1)
+
+    driver_mesh = None
+    driver_matrix = None
+    binding_path = None
+
+    @staticmethod
+    def creator():
+        return WrapDeformer()
+
+    @staticmethod
+    def initialize():
+        typed_fn = om.MFnTypedAttribute()
+        matrix_fn = om.MFnMatrixAttribute()
+
+        WrapDeformer.driver_mesh = typed_fn.create('driverMesh', 'drm', om.MFnData.kMesh)
+        typed_fn.storable = False
+
+        WrapDeformer.driver_matrix = matrix_fn.create('driverMatrix', 'dmx', om.MFnMatrixAttribute.kDouble)
+        matrix_fn.storable = False
+
+        WrapDeformer.binding_path = typed_fn.create('bindingPath', 'bdp', om.MFnData.kString)
+
+        output_geom = oma.MPxGeometryFilter.outputGeom
+        for attribute in (WrapDeformer.driver_mesh, WrapDeformer.driver_matrix, WrapDeformer.binding_path):
+            WrapDeformer.addAttribute(attribute)
+            WrapDeformer.attributeAffects(attribute, output_geom)
+
+    def __init__(self):
+        super(WrapDeformer, self).__init__()
+        self.binding = None
+        self.binding_file = None
+
+    def get_binding(self, path: str) -> dict:
+        if path != self.binding_file:
+            self.binding = load_core().wrap.load_binding(path) if os.path.exists(path) else None
+            self.binding_file = path
+
+        return self.binding
+
+    def deform(self, data_block, geom_iter, matrix, multi_index):
+        envelope: float = data_block.inputValue(oma.MPxGeometryFilter.envelope).asFloat()
+        driver_handle = data_block.inputValue(WrapDeformer.driver_mesh)
+        binding: dict = self.get_binding(data_block.inputValue(WrapDeformer.binding_path).asString())
+        if envelope == 0.0 or binding is None or driver_handle.data().isNull():
+            return
+
+        if geom_iter.exactCount() != len(binding['triangles']):
+            return
+
+        driver_matrix = matrix_to_array(data_block.inputValue(WrapDeformer.driver_matrix).asMatrix())
+        driver_points = np.array(om.MFnMesh(driver_handle.asMesh()).getPoints())[:, :3]
+        driver_points = driver_points @ driver_matrix[:3, :3] + driver_matrix[3, :3]
+
+        inverse_matrix = matrix_to_array(matrix.inverse())
+        wrapped = load_core().wrap.apply(driver_points, binding)
+        wrapped = wrapped @ inverse_matrix[:3, :3] + inverse_matrix[3, :3]
+
+        if envelope != 1.0:
+            points = np.array(geom_iter.allPositions())[:, :3]
+            wrapped = points + (wrapped - points) * envelope
+
+        geom_iter.setAllPositions(om.MPointArray(wrapped.tolist()))
+
+
+def initializePlugin(plugin):
+    plugin_fn = om.MFnPlugin(plugin, "cloth_setup", "1.0")
+    plugin_fn.registerCommand(ApplyModifierCommand.NAME, ApplyModifierCommand.creator)
+    plugin_fn.registerNode(
+        PointCopyDeformer.NAME,
+        PointCopyDeformer.TYPE_ID,
+        PointCopyDeformer.creator,
+        PointCopyDeformer.initialize,
+        om.MPxNode.kDeformerNode
+    )
+    plugin_fn.registerNode(
+        WrapDeformer.NAME,
+        WrapDeformer.TYPE_ID,
+        WrapDeformer.creator,
+        WrapDeformer.initialize,
+        om.MPxNode.kDeformerNode
+    )
+
+
+def uninitializePlugin(plugin):
+    plugin_fn = om.MFnPlugin(plugin)
+    plugin_fn.deregisterNode(WrapDeformer.TYPE_ID)
+    plugin_fn.deregisterNode(PointCopyDeformer.TYPE_ID)
+    plugin_fn.deregisterCommand(ApplyModifierCommand.NAME)
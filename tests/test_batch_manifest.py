@@ -0,0 +1,58 @@
+import json
+
+import pytest
+
+from ..batch.manifest import load_shots, read_manifest_file, validate_shot
+
+
+def shot(name: str, **values) -> dict:
+    shot_spec = {
+        'name': name,
+        'scene': f'/shots/{name}/anim.ma',
+        'setups': [{'setup_prefix': 'shirt', 'low_mesh': 'shirt_low', 'high_mesh': 'shirt_hi'}]
+    }
+    shot_spec.update(values)
+
+    return shot_spec
+
+
+def write_json(path, content) -> str:
+    path.write_text(json.dumps(content))
+
+    return str(path)
+
+
+def test_load_shots_reads_single_and_multi_shot_manifests(tmp_path):
+    single: str = write_json(tmp_path / 'sh010.json', shot('sh010'))
+    several: str = write_json(tmp_path / 'seq.json', {'shots': [shot('sh020'), shot('sh030', lean_graph = True)]})
+
+    shots = load_shots([single, several])
+
+    assert [loaded['name'] for loaded in shots] == ['sh010', 'sh020', 'sh030']
+    assert shots[2]['lean_graph'] is True
+
+
+def test_read_manifest_file_reads_yaml(tmp_path):
+    yaml = pytest.importorskip('yaml')
+    path = tmp_path / 'sh010.yaml'
+    path.write_text(yaml.safe_dump(shot('sh010')))
+
+    assert read_manifest_file(str(path)) == shot('sh010')
+
+
+def test_validate_shot_rejects_missing_keys():
+    incomplete: dict = shot('sh010')
+    del incomplete['scene']
+    with pytest.raises(ValueError, match = 'scene'):
+        validate_shot(incomplete)
+
+    with pytest.raises(ValueError, match = 'high_mesh'):
+        validate_shot(shot('sh010', setups = [{'setup_prefix': 'shirt', 'low_mesh': 'shirt_low'}]))
+
+
+def test_load_shots_rejects_duplicate_names(tmp_path):
+    first: str = write_json(tmp_path / 'a.json', shot('sh010'))
+    second: str = write_json(tmp_path / 'b.json', {'shots': [shot('sh020'), shot('sh010')]})
+
+    with pytest.raises(ValueError, match = 'sh010'):
+        load_shots([first, second])
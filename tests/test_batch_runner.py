@@ -0,0 +1,78 @@
+import os
+import sys
+
+from ..batch.runner import EXIT_ABORTED, EXIT_DIFFERS, format_summary, run_jobs, worker_environment
+
+
+# a worker exiting with the code of its job, once per attempt listed in its 'codes', sleeping 'sleep' seconds first
+STUB_WORKER = '''
+import json
+import os
+import sys
+import time
+
+with open(sys.argv[1]) as job_file:
+    job = json.load(job_file)
+
+attempt = len(os.listdir(job['attempts']))
+open(os.path.join(job['attempts'], str(attempt)), 'w').close()
+print(f'attempt {attempt}')
+time.sleep(job.get('sleep', 0.0))
+sys.exit(job['codes'][min(attempt, len(job['codes']) - 1)])
+'''
+
+
+def run_stub_jobs(tmp_path, jobs: dict, **kwargs) -> dict:
+    (tmp_path / 'stub_worker.py').write_text(STUB_WORKER)
+    job_list = []
+    for name, job in jobs.items():
+        attempts = tmp_path / name
+        attempts.mkdir()
+        job_list.append({'name': name, 'attempts': str(attempts), **job})
+
+    summary: dict = run_jobs(job_list, 'stub_worker', executable = sys.executable, python_path = [str(tmp_path)], **kwargs)
+
+    return {report['name']: report for report in summary['jobs']}, summary
+
+
+def test_exit_codes_give_the_job_status(tmp_path):
+    reports, summary = run_stub_jobs(tmp_path, {
+        'ok': {'codes': [0]},
+        'aborted': {'codes': [EXIT_ABORTED]},
+        'differs': {'codes': [EXIT_DIFFERS]},
+        'failed': {'codes': [1]}
+    }, retries = 0)
+
+    assert {name: report['status'] for name, report in reports.items()} == {
+        'ok': 'ok', 'aborted': 'aborted', 'differs': 'differs', 'failed': 'failed'
+    }
+    assert summary['counts'] == {'ok': 1, 'aborted': 1, 'differs': 1, 'failed': 1}
+    assert reports['ok']['log'] == 'attempt 0'
+
+
+def test_failed_jobs_are_retried_and_aborted_ones_are_not(tmp_path):
+    reports, _ = run_stub_jobs(tmp_path, {
+        'flaky': {'codes': [1, 0]},
+        'broken': {'codes': [1]},
+        'aborted': {'codes': [EXIT_ABORTED, 0]}
+    }, retries = 2)
+
+    assert (reports['flaky']['status'], reports['flaky']['attempts']) == ('ok', 2)
+    assert (reports['broken']['status'], reports['broken']['attempts']) == ('failed', 3)
+    assert (reports['aborted']['status'], reports['aborted']['attempts']) == ('aborted', 1)
+
+
+def test_timed_out_attempts_are_killed_and_retried(tmp_path):
+    reports, summary = run_stub_jobs(tmp_path, {'slow': {'codes': [0], 'sleep': 30.0}}, retries = 1, timeout = 0.5)
+
+    assert (reports['slow']['status'], reports['slow']['attempts']) == ('timeout', 2)
+    assert summary['duration'] < 30.0
+    assert 'timeout' in format_summary(summary)
+
+
+def test_worker_environment_puts_the_extra_paths_first(monkeypatch):
+    monkeypatch.setenv('PYTHONPATH', '/site')
+    paths = worker_environment(['/stand_in'])['PYTHONPATH'].split(os.pathsep)
+
+    assert paths[0] == '/stand_in'
+    assert paths[-1] == '/site'
@@ -0,0 +1,80 @@
+import json
+import os
+import sys
+
+import pytest
+
+from ..batch import worker
+from ..batch.runner import EXIT_ABORTED, EXIT_DIFFERS, run_shots
+from ..benchmarks import fake_maya
+from ..core.watchdog import WatchdogAbort
+
+
+STAND_IN = os.path.join(os.path.dirname(fake_maya.__file__), 'stand_in')
+
+
+@pytest.fixture
+def fake_scene(monkeypatch):
+    """
+    The fake maya, opening a scene of two garments (garment0 and garment1) and a collider.
+    """
+
+    fake_maya.install()
+    from ..benchmarks.fake_maya import cmds
+    from ..benchmarks.fake_maya.generators import create_setup_scene
+
+    file = cmds.file
+
+    def open_file(*args, open: bool = False, **kwargs):
+        result = file(*args, open = open, **kwargs)
+        if open:
+            create_setup_scene(2, 1, 6, 12)
+        return result
+
+    monkeypatch.setattr(cmds, 'file', open_file)
+    fake_maya.new_scene()
+
+
+def write_shot(tmp_path, shot: dict) -> str:
+    path = tmp_path / 'shot.json'
+    path.write_text(json.dumps(shot))
+
+    return str(path)
+
+
+def test_run_shot_builds_the_setups_of_the_opened_scene(fake_scene, tmp_path):
+    shot = {'name': 'sh010', 'scene': 'anim.ma', 'output': str(tmp_path / 'cloth.ma'), 'lean_graph': True}
+    shot['setups'] = [{'setup_prefix': f'garment{i}', 'low_mesh': f'garment{i}_low', 'high_mesh': f'garment{i}_hi'} for i in range(2)]
+
+    result: dict = worker.run_shot(shot)
+
+    assert result['shot'] == 'sh010'
+    assert [setup['setup_prefix'] for setup in result['setups']] == ['garment0', 'garment1']
+
+
+def test_main_exit_codes(monkeypatch, tmp_path, capsys):
+    path: str = write_shot(tmp_path, {'name': 'sh010', 'scene': 'anim.ma', 'setups': []})
+    monkeypatch.setattr(worker, 'initialize_maya', lambda: None)
+
+    monkeypatch.setattr(worker, 'run_shot', lambda shot: {'shot': shot['name'], 'setups': []})
+    assert worker.main([path]) == 0
+    assert json.loads(capsys.readouterr().out) == {'shot': 'sh010', 'setups': []}
+
+    monkeypatch.setattr(worker, 'run_shot', lambda shot: {'shot': shot['name'], 'setups': [], 'differs': True})
+    assert worker.main([path]) == EXIT_DIFFERS
+
+    def abort(shot: dict):
+        raise WatchdogAbort('frame 12 over the limits')
+
+    monkeypatch.setattr(worker, 'run_shot', abort)
+    assert worker.main([path]) == EXIT_ABORTED
+    assert 'frame 12' in capsys.readouterr().out
+
+
+def test_worker_process_runs_on_the_stand_in_maya():
+    summary: dict = run_shots(
+        [{'name': 'sh010', 'scene': 'anim.ma', 'setups': []}], retries = 0, executable = sys.executable, python_path = [STAND_IN]
+    )
+
+    assert summary['counts'] == {'ok': 1}
+    assert json.loads(summary['jobs'][0]['log']) == {'shot': 'sh010', 'setups': []}
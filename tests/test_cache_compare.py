@@ -0,0 +1,104 @@
+import numpy as np
+import pytest
+
+from ..core.cache_compare import (
+    compare_blocks,
+    compare_caches,
+    deviation_regions,
+    point_deviations,
+    summarize_comparison,
+    threshold_ranges
+)
+from ..core.point_cache import PointCacheWriter
+
+
+def write_cache(path: str, meshes: dict, start_frame: float = 1.0) -> str:
+    frame_count: int = len(next(iter(meshes.values())))
+    with PointCacheWriter(path, {name: block.shape[1] for name, block in meshes.items()}, start_frame, frame_count) as writer:
+        for index in range(frame_count):
+            writer.write_frame(start_frame + index, {name: block[index] for name, block in meshes.items()})
+
+    return path
+
+
+def test_point_deviations_of_non_finite_points():
+    reference = np.zeros((1, 2, 3))
+    candidate = np.array([[[0.0, 3.0, 4.0], [np.nan, 0.0, 0.0]]])
+
+    assert point_deviations(reference, candidate).tolist() == [[5.0, np.inf]]
+
+
+def test_threshold_ranges():
+    assert threshold_ranges([0.0, 2.0, 2.0, 0.0, 3.0], 1.0) == [(1, 2), (4, 4)]
+    assert threshold_ranges([0.0, 0.5], 1.0) == []
+
+
+def test_deviation_regions_split_distant_vertices():
+    points = np.array([[0.0, 0.0, 0.0], [0.1, 0.0, 0.0], [5.0, 0.0, 0.0], [9.0, 0.0, 0.0]])
+    regions = deviation_regions(points, [0.5, 0.2, 0.9, 0.0], threshold = 0.1, size = 0.5)
+
+    assert [region['vertices'].tolist() for region in regions] == [[2], [0, 1]]
+    assert regions[1]['max'] == 0.5
+
+
+def test_compare_blocks_does_not_depend_on_the_chunks():
+    rng = np.random.default_rng(4)
+    reference = rng.random((23, 50, 3))
+    candidate = reference + rng.normal(0.0, 0.01, reference.shape)
+    candidate[7:9, 10] += [1.0, 0.0, 0.0]
+
+    whole = compare_blocks(reference, candidate, threshold = 0.5, chunk_frames = 64)
+    chunked = compare_blocks(reference, candidate, threshold = 0.5, chunk_frames = 4)
+
+    for key in ('frame_max', 'frame_rms', 'frame_percentiles', 'vertex_max', 'vertex_rms', 'vertex_max_frame'):
+        assert np.allclose(whole[key], chunked[key])
+    assert chunked['frame_ranges'] == [(7, 8)]
+    assert chunked['vertex_max_frame'][10] in (7, 8)
+    assert chunked['differs']
+    with pytest.raises(ValueError):
+        compare_blocks(reference, candidate[:, :10])
+
+
+def test_compare_caches_reports_missing_meshes(tmp_path):
+    shirt = np.zeros((5, 4, 3))
+    reference = write_cache(str(tmp_path / 'reference.cspc'), {'shirt': shirt, 'pants': np.zeros((5, 2, 3))})
+    candidate = write_cache(str(tmp_path / 'candidate.cspc'), {'shirt': shirt + 0.001})
+
+    comparison = compare_caches(reference, candidate, threshold = 0.01)
+
+    assert comparison['missing'] == ['pants']
+    assert not comparison['meshes']['shirt']['differs']
+    assert comparison['differs']
+
+
+def test_compare_caches_frame_range_mismatch_differs(tmp_path):
+    reference = write_cache(str(tmp_path / 'reference.cspc'), {'shirt': np.zeros((10, 4, 3))}, start_frame = 1001.0)
+    candidate = write_cache(str(tmp_path / 'candidate.cspc'), {'shirt': np.zeros((6, 4, 3))}, start_frame = 1003.0)
+
+    comparison = compare_caches(reference, candidate)
+    report = summarize_comparison(comparison)
+
+    # the shared frames match, the missing ones still make the caches differ
+    assert comparison['frames'].tolist() == [1003.0, 1004.0, 1005.0, 1006.0, 1007.0, 1008.0]
+    assert not comparison['meshes']['shirt']['differs']
+    assert comparison['frame_mismatch'] and comparison['differs']
+    assert report['reference_frames'] == [1001.0, 1010.0]
+    assert report['candidate_frames'] == [1003.0, 1008.0]
+
+
+def test_summarize_comparison_gives_frames_and_regions(tmp_path):
+    reference_points = np.zeros((4, 3, 3))
+    reference_points[:, :, 0] = [0.0, 1.0, 2.0]
+    candidate_points = reference_points.copy()
+    candidate_points[2, 1, 1] = 0.5
+    reference = write_cache(str(tmp_path / 'reference.cspc'), {'shirt': reference_points}, start_frame = 101.0)
+    candidate = write_cache(str(tmp_path / 'candidate.cspc'), {'shirt': candidate_points}, start_frame = 101.0)
+
+    report = summarize_comparison(compare_caches(reference, candidate, threshold = 0.1, region_size = 0.5))
+
+    assert report['frames'] == [101.0, 104.0]
+    assert report['differs'] and not report['frame_mismatch']
+    shirt = report['meshes']['shirt']
+    assert shirt['frame_ranges'] == [{'first': 103.0, 'last': 103.0, 'max': 0.5}]
+    assert [region['vertices'] for region in shirt['regions']] == [[1]]
+    assert set(shirt['percentiles']) == {'p50', 'p95', 'p99'}
@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+
+from ..benchmarks import fake_maya
+from ..core.checkpoint import CheckpointStore
+
+
+def cloth_states(frame: float) -> dict:
+    return {
+        'shirt': {'positions': np.full((4, 3), frame), 'velocities': np.ones((4, 3))},
+        'pants': {'positions': np.zeros((2, 3)), 'velocities': np.full((2, 3), -frame)}
+    }
+
+
+def test_save_then_load_states_and_settings(tmp_path):
+    store = CheckpointStore(str(tmp_path / 'checkpoints'))
+    store.save(1050.0, cloth_states(1050.0), {'substeps': 12})
+
+    states, settings = store.load(1050.0)
+
+    assert list(states) == ['shirt', 'pants']
+    assert np.array_equal(states['shirt']['positions'], np.full((4, 3), 1050.0))
+    assert np.array_equal(states['pants']['velocities'], np.full((2, 3), -1050.0))
+    assert settings == {'substeps': 12}
+
+
+def test_nearest_checkpoint_at_or_before_a_frame(tmp_path):
+    store = CheckpointStore(str(tmp_path))
+    for frame in (1001.0, 1050.0, 1100.0):
+        store.save(frame, cloth_states(frame))
+
+    assert store.frames() == [1001.0, 1050.0, 1100.0]
+    assert store.nearest(1075.0) == 1050.0
+    assert store.nearest(1100.0) == 1100.0
+    assert store.nearest(1000.0) is None
+
+
+def test_budget_thins_out_the_closest_checkpoints(tmp_path):
+    store = CheckpointStore(str(tmp_path), max_count = 3)
+    for frame in (1.0, 2.0, 3.0, 10.0):
+        store.save(frame, cloth_states(frame))
+    store.save(20.0, cloth_states(20.0))
+
+    # the first and last checkpoints are always kept
+    assert store.frames() == [1.0, 10.0, 20.0]
+
+
+def test_budget_on_disk_size(tmp_path):
+    store = CheckpointStore(str(tmp_path))
+    for frame in (1.0, 2.0, 3.0, 4.0):
+        store.save(frame, cloth_states(frame))
+    store.max_bytes = store.size() // 2
+
+    # down to the first and last checkpoints, never dropped even over the budget
+    assert store.enforce_budget() == [2.0, 3.0]
+    assert store.frames() == [1.0, 4.0]
+
+    store.clear()
+    assert store.frames() == []
+
+
+def test_resume_checks_the_nucleus_nodes_before_changing_the_scene(tmp_path):
+    fake_maya.install()
+    fake_maya.new_scene()
+    from maya import cmds
+    from ..funcs.checkpoint_funcs import resume_from_checkpoint
+
+    nucleus_node: str = cmds.createNode('nucleus')
+    ncloth_shape: str = cmds.createNode('nCloth')
+    cmds.setAttr(f'{nucleus_node}.startFrame', 1001.0)
+
+    store = CheckpointStore(str(tmp_path))
+    states = {ncloth_shape: {'positions': np.zeros((4, 3)), 'velocities': np.zeros((4, 3))}}
+    store.save(1050.0, states, {nucleus_node: {'startFrame': 1001.0}, 'missing_nucleus': {'startFrame': 1001.0}})
+
+    with pytest.raises(ValueError, match = 'missing_nucleus'):
+        resume_from_checkpoint(str(tmp_path), 1060.0)
+
+    assert cmds.getAttr(f'{nucleus_node}.startFrame') == 1001.0
@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+from ..core.decimate import cluster_vertices, decimate
+
+
+def grid_mesh(size: int) -> tuple:
+    # size x size quads on the unit square
+    x, y = np.meshgrid(np.linspace(0.0, 1.0, size + 1), np.linspace(0.0, 1.0, size + 1))
+    points = np.stack([x.ravel(), y.ravel(), np.zeros(x.size)], axis = 1)
+
+    corners = np.arange((size + 1) * (size + 1)).reshape(size + 1, size + 1)[:-1, :-1].ravel()
+    quads = np.stack([corners, corners + 1, corners + size + 2, corners + size + 1], axis = 1)
+
+    return points, [4] * len(quads), quads.ravel()
+
+
+def test_cluster_vertices_picks_the_point_closest_to_the_cell_mean():
+    points = np.array([[0.1, 0.1, 0.0], [0.5, 0.5, 0.0], [0.8, 0.8, 0.0], [5.0, 5.0, 5.0]])
+    clusters, representatives = cluster_vertices(points, 1.0)
+
+    assert clusters[0] == clusters[1] == clusters[2] != clusters[3]
+    assert sorted(representatives.tolist()) == [1, 3]
+
+
+def test_decimate_needs_a_target():
+    with pytest.raises(ValueError):
+        decimate(*grid_mesh(4))
+
+
+def test_decimate_keeps_small_meshes():
+    points, polygon_counts, polygon_connects = grid_mesh(4)
+    proxy_points, triangles, indices = decimate(points, polygon_counts, polygon_connects, target_faces = 100)
+
+    assert len(triangles) == 32
+    assert np.array_equal(indices, np.arange(len(points)))
+
+
+def test_decimate_to_target_faces():
+    points, polygon_counts, polygon_connects = grid_mesh(40)
+    proxy_points, triangles, indices = decimate(points, polygon_counts, polygon_connects, target_faces = 500)
+
+    assert 0 < len(triangles) <= 500
+    assert triangles.max() < len(proxy_points)
+    # every proxy point is an original point
+    assert np.array_equal(proxy_points, points[indices])
+
+
+def test_decimate_to_max_error():
+    points, polygon_counts, polygon_connects = grid_mesh(40)
+    max_error = 0.1
+    proxy_points, triangles, indices = decimate(points, polygon_counts, polygon_connects, max_error = max_error)
+
+    assert len(triangles) < 2 * 40 * 40
+    # every point stays within max_error of the proxy point of its cluster
+    clusters, representatives = cluster_vertices(points, max_error / np.sqrt(3.0))
+    distances = np.linalg.norm(points - points[representatives][clusters], axis = 1)
+    assert distances.max() <= max_error
+    assert np.isin(indices, representatives).all()
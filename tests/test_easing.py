@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+from ..core.easing import EASINGS, ease, preroll_curves
+
+
+@pytest.mark.parametrize('name', sorted(EASINGS))
+def test_easings_go_from_0_to_1_without_going_back(name):
+    t = np.linspace(0.0, 1.0, 201)
+    eased = EASINGS[name](t)
+
+    assert eased[0] == pytest.approx(0.0)
+    assert eased[-1] == pytest.approx(1.0)
+    assert np.all(np.diff(eased) >= -1e-12)
+    assert np.all((eased >= -1e-12) & (eased <= 1.0 + 1e-12))
+
+
+def test_ease_applies_the_easing_of_each_time():
+    t = np.array([0.5, 0.5, 0.5])
+
+    eased = ease(t, np.array([0, 1, 0]), ['linear', 'ease_in'])
+
+    assert np.allclose(eased, [0.5, 0.25, 0.5])
+
+
+def test_preroll_curves_go_through_the_poses():
+    pose_frames = [0.0, 10.0, 30.0]
+    pose_values = [[0.0, 2.0, -2.0], [1.0, 1.0, 5.0]]
+    sample_frames = [-5.0, 0.0, 5.0, 10.0, 20.0, 30.0, 40.0]
+
+    values = preroll_curves(pose_frames, pose_values, ['linear', 'smoothstep'], sample_frames)
+
+    assert values.shape == (2, 7)
+    assert np.allclose(values[0], [0.0, 0.0, 1.0, 2.0, 0.0, -2.0, -2.0])
+    assert np.allclose(values[1], [1.0, 1.0, 1.0, 1.0, 3.0, 5.0, 5.0])
+
+
+def test_preroll_curves_reject_bad_poses():
+    with pytest.raises(ValueError):
+        preroll_curves([0.0, 0.0], [[0.0, 1.0]], ['linear'], [0.0])
+    with pytest.raises(ValueError):
+        preroll_curves([0.0, 1.0], [[0.0, 1.0]], [], [0.0])
+    with pytest.raises(ValueError):
+        preroll_curves([0.0, 1.0], [[0.0, 1.0]], ['bounce'], [0.0])
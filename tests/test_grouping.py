@@ -0,0 +1,38 @@
+import numpy as np
+
+from ..core.grouping import find_root, interacting_pairs, plan_groups
+
+
+def box(x: float) -> list:
+    # a unit box starting at x
+    return [[x, 0.0, 0.0], [x + 1.0, 1.0, 1.0]]
+
+
+def test_interacting_pairs_within_distance():
+    boxes = [box(0.0), box(1.5), box(10.0)]
+
+    assert interacting_pairs(boxes, 0.1).tolist() == []
+    assert interacting_pairs(boxes, 0.5).tolist() == [[0, 1]]
+
+
+def test_find_root_compresses_paths():
+    parents = np.array([0, 0, 1, 2])
+
+    assert find_root(parents, 3) == 0
+    assert parents[3] != 2
+
+
+def test_interacting_garments_are_always_grouped():
+    boxes = [box(0.0), box(1.05), box(2.1), box(10.0)]
+    groups = plan_groups(boxes, [100, 100, 100, 100], [set(), set(), set(), set()], distance = 0.1, max_vertices = 50)
+
+    assert groups == [[0, 1, 2], [3]]
+
+
+def test_garments_sharing_colliders_are_merged_under_the_budget():
+    boxes = [box(0.0), box(10.0), box(20.0), box(30.0)]
+    colliders = [{'body', 'hair'}, {'body', 'hair'}, {'body'}, {'car'}]
+
+    assert plan_groups(boxes, [100] * 4, colliders, 0.1) == [[0, 1, 2], [3]]
+    # the pair sharing the most colliders is merged first, the third garment no longer fits
+    assert plan_groups(boxes, [100] * 4, colliders, 0.1, max_vertices = 200) == [[0, 1], [2], [3]]
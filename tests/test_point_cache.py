@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+from ..core.point_cache import PointCacheReader, PointCacheWriter
+
+
+def mesh_points(frame: float, vertex_count: int) -> np.ndarray:
+    return np.arange(vertex_count * 3, dtype = np.float64).reshape(vertex_count, 3) + frame
+
+
+def test_write_then_read_every_mesh_and_frame(tmp_path):
+    path = str(tmp_path / 'cache.cspc')
+    with PointCacheWriter(path, {'shirt': 5, 'pants': 3}, start_frame = 1001, frame_count = 4, frame_step = 0.5) as writer:
+        for frame in (1001.0, 1001.5, 1002.0, 1002.5):
+            writer.write_frame(frame, {'shirt': mesh_points(frame, 5), 'pants': mesh_points(frame, 3)})
+
+    reader = PointCacheReader(path)
+
+    assert reader.meshes == ['shirt', 'pants']
+    assert reader.frames.tolist() == [1001.0, 1001.5, 1002.0, 1002.5]
+    assert np.array_equal(reader.points('pants', 1002.0), mesh_points(1002.0, 3))
+    assert reader.frames_block('shirt', 1, 3).shape == (2, 5, 3)
+    assert np.array_equal(reader.frames_block('shirt')[3], mesh_points(1002.5, 5))
+    with pytest.raises(IndexError):
+        reader.points('shirt', 1003.0)
+
+
+def test_aborted_cache_is_cut_after_its_written_frames(tmp_path):
+    path = str(tmp_path / 'aborted.cspc')
+    with pytest.raises(RuntimeError):
+        with PointCacheWriter(path, {'shirt': 4}, start_frame = 1, frame_count = 10) as writer:
+            for frame in (1, 2, 3):
+                writer.write_frame(frame, {'shirt': mesh_points(frame, 4)})
+            raise RuntimeError('aborted')
+
+    reader = PointCacheReader(path)
+
+    # the seven frames never written are not read back as zeros
+    assert reader.frame_count == 3
+    assert reader.frames.tolist() == [1.0, 2.0, 3.0]
+    assert np.array_equal(reader.points('shirt', 3), mesh_points(3, 4))
+
+
+def test_incomplete_close_keeps_the_frames_written_in_a_row(tmp_path):
+    path = str(tmp_path / 'gap.cspc')
+    writer = PointCacheWriter(path, {'shirt': 2}, start_frame = 1, frame_count = 5)
+    for frame in (1, 2, 4):
+        writer.write_frame(frame, {'shirt': mesh_points(frame, 2)})
+
+    assert writer.written_count == 2
+    writer.close(complete = False)
+
+    assert PointCacheReader(path).frame_count == 2
+
+
+def test_complete_close_keeps_every_frame(tmp_path):
+    path = str(tmp_path / 'complete.cspc')
+    writer = PointCacheWriter(path, {'shirt': 2}, start_frame = 1, frame_count = 5)
+    writer.write_frame(1, {'shirt': mesh_points(1, 2)})
+    writer.close()
+
+    assert PointCacheReader(path).frame_count == 5
+
+
+def test_reader_rejects_other_files(tmp_path):
+    path = tmp_path / 'other.bin'
+    path.write_bytes(b'not a cache' * 10)
+
+    with pytest.raises(ValueError):
+        PointCacheReader(str(path))
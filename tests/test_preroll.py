@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+from ..benchmarks import fake_maya
+
+
+@pytest.fixture
+def controler():
+    """
+    The fake maya, with one controler keyed on frames 1001 and 1100.
+    """
+
+    fake_maya.install()
+    fake_maya.new_scene()
+    from ..benchmarks.fake_maya.generators import create_rig_scene
+
+    return create_rig_scene(1, extra_attributes = 0)[0]
+
+
+def curve_frames(plug: str) -> list:
+    node, attribute = plug.split('.')
+    curve = fake_maya.SCENE.sources[(fake_maya.SCENE.get(node), attribute)][0]
+
+    return sorted(curve.keys)
+
+
+def test_set_preroll_poses_keys_every_sample_step(controler):
+    from maya import cmds
+    from ..funcs.preroll_funcs import set_preroll_poses
+
+    poses = [
+        {'offset': -20.0, 'pose': 'default', 'easing': 'linear'},
+        {'offset': -10.0, 'pose': 'default', 'easing': 'smoothstep'},
+        {'offset': 0.0, 'pose': 'anim'}
+    ]
+    anim_value: float = cmds.getAttr(f'{controler}.translateX', time = 1001.0)
+
+    pose_frames = set_preroll_poses([controler], 1001.0, poses, sample_step = 3.0, update_nucleus = False)
+
+    assert pose_frames == [981.0, 991.0, 1001.0]
+    # every sample_step frames from the first pose, the last pose keyed on its frame, the animation keys kept
+    assert curve_frames(f'{controler}.translateX') == list(np.arange(981.0, 1001.0, 3.0)) + [1001.0, 1100.0]
+    assert cmds.getAttr(f'{controler}.translateX', time = 984.0) == pytest.approx(0.0)
+    assert cmds.getAttr(f'{controler}.translateX', time = 1001.0) == pytest.approx(anim_value)
+    assert cmds.playbackOptions(query = True, minTime = True) == 981.0
@@ -0,0 +1,82 @@
+import json
+import threading
+
+from ..core.profiling import ENV_VAR, Profiler, profiling_enabled
+
+
+def test_spans_nest_and_sum_per_step():
+    profiler = Profiler()
+    calls = iter(range(100))
+    profiler.add_counter('nodes', lambda: next(calls))
+
+    with profiler.span('build', setup = 'shirt'):
+        for index in range(3):
+            with profiler.span('cloth'):
+                profiler.record('vertices', index)
+
+    summary: dict = profiler.summary()
+    root = profiler.spans[0]
+
+    assert [span.name for span, _ in profiler.walk()] == ['build', 'cloth', 'cloth', 'cloth']
+    assert [depth for _, depth in profiler.walk()] == [0, 1, 1, 1]
+    assert summary['cloth']['calls'] == 3 and summary['build']['calls'] == 1
+    assert summary['cloth']['total'] <= summary['build']['total']
+    assert root.tags == {'setup': 'shirt'}
+    assert [child.values['vertices'] for child in root.children] == [0, 1, 2]
+    # the counter is sampled at each start and end, every child spans one sample
+    assert [child.counters['nodes'] for child in root.children] == [1, 1, 1]
+    assert root.counters['nodes'] == 7
+
+
+def test_root_spans_are_capped():
+    profiler = Profiler(max_root_spans = 2)
+    for name in ('a', 'b', 'c'):
+        with profiler.span(name):
+            pass
+
+    assert [span.name for span in profiler.spans] == ['b', 'c']
+
+
+def test_disabled_profiler_records_nothing():
+    profiler = Profiler(enabled = False)
+    with profiler.span('build') as span:
+        profiler.record('vertices', 10)
+
+    assert span is None
+    assert profiler.spans == [] and profiler.summary() == {}
+
+
+def test_environment_variable_switch(monkeypatch):
+    monkeypatch.delenv(ENV_VAR, raising = False)
+    assert profiling_enabled()
+
+    monkeypatch.setenv(ENV_VAR, '0')
+    assert not profiling_enabled()
+
+    monkeypatch.setenv(ENV_VAR, '1')
+    assert profiling_enabled()
+
+
+def test_chrome_trace_export(tmp_path):
+    profiler = Profiler()
+    with profiler.span('build', setup = 'shirt'):
+        profiler.record('vertices', 10)
+
+    # a span recorded on another thread keeps its own thread id
+    def work():
+        with profiler.span('worker'):
+            pass
+    thread = threading.Thread(target = work)
+    thread.start()
+    thread.join()
+
+    path: str = profiler.export_chrome_trace(str(tmp_path / 'trace.json'))
+    with open(path) as json_file:
+        trace: dict = json.load(json_file)
+
+    build, worker = trace['traceEvents']
+    assert build['name'] == 'build' and build['ph'] == 'X'
+    assert build['args'] == {'setup': 'shirt', 'vertices': 10}
+    assert build['tid'] == threading.get_ident()
+    assert worker['tid'] == thread.ident != build['tid']
+    assert build['dur'] >= 0.0
@@ -0,0 +1,63 @@
+import numpy as np
+
+from ..core.proximity import UniformGrid, active_intervals, bounding_box, boxes_overlap, near_points
+
+
+def brute_force_near(points, targets, distance: float) -> np.ndarray:
+    distances = np.linalg.norm(np.asarray(points)[:, None] - np.asarray(targets)[None], axis = 2)
+
+    return (distances <= distance).any(axis = 1)
+
+
+def test_near_points_exact_matches_brute_force():
+    rng = np.random.default_rng(1)
+    targets = rng.random((500, 3))
+    points = rng.random((800, 3)) * 1.4 - 0.2
+
+    mask = near_points(points, targets, 0.05, exact = True)
+
+    assert np.array_equal(mask, brute_force_near(points, targets, 0.05))
+
+
+def test_near_points_plain_query_is_conservative():
+    rng = np.random.default_rng(2)
+    targets = rng.random((300, 3))
+    points = rng.random((600, 3))
+
+    mask = near_points(points, targets, 0.05)
+    expected = brute_force_near(points, targets, 0.05)
+
+    # every near point is found, some farther ones may be
+    assert mask[expected].all()
+
+
+def test_near_points_rejects_points_outside_the_grown_box():
+    targets = [[0.0, 0.0, 0.0], [1.0, 1.0, 1.0]]
+
+    assert near_points([[5.0, 5.0, 5.0], [1.05, 1.0, 1.0]], targets, 0.1).tolist() == [False, True]
+    assert not near_points(np.zeros((0, 3)), targets, 0.1).size
+
+
+def test_uniform_grid_pairs_across_negative_cells():
+    points = [[-0.01, 0.0, 0.0], [0.01, 0.0, 0.0], [-3.0, -3.0, -3.0]]
+
+    assert UniformGrid(points, 0.1).pairs().tolist() == [[0, 1]]
+
+
+def test_bounding_boxes_overlap_within_distance():
+    box = bounding_box([[0.0, 0.0, 0.0], [1.0, 1.0, 1.0]])
+    other = bounding_box([[1.5, 0.0, 0.0], [2.0, 1.0, 1.0]])
+
+    assert box.tolist() == [[0.0, 0.0, 0.0], [1.0, 1.0, 1.0]]
+    assert not boxes_overlap(box, other)
+    assert boxes_overlap(box, other, 0.5)
+
+
+def test_active_intervals_with_padding():
+    active = [False, False, True, False, False, False, False, True, True, False]
+
+    assert active_intervals(active) == [(2, 2), (7, 8)]
+    assert active_intervals(active, 1) == [(1, 3), (6, 9)]
+    # grown runs merge, and stay in the frame range
+    assert active_intervals(active, 2) == [(0, 9)]
+    assert active_intervals([False] * 4, 3) == []
@@ -0,0 +1,98 @@
+from ..core.setup_diff import diff_colliders, diff_setups, group_colliders
+
+
+def spec(setup_prefix: str, **values) -> dict:
+    setup_spec = {
+        'setup_prefix': setup_prefix,
+        'low_mesh': f'{setup_prefix}_low',
+        'high_mesh': f'{setup_prefix}_hi',
+        'colliders': {},
+        'proxy_faces': None,
+        'proxy_error': None,
+        'trim_distance': None,
+        'trim_frames': None,
+        'wrap_node': 'cvwrap',
+        'lean_graph': False,
+        'output_mode': 'skin',
+        'nucleus_lead': None
+    }
+    setup_spec.update(values)
+
+    return setup_spec
+
+
+def test_same_setups_are_unchanged():
+    specs = [spec('shirt', colliders = {'body': 'body'}), spec('pants')]
+    plan = diff_setups(specs, [dict(setup_spec) for setup_spec in specs])
+
+    assert plan['unchanged'] == ['shirt', 'pants']
+    assert not plan['create'] and not plan['remove'] and not plan['high'] and not plan['colliders'] and not plan['update']
+
+
+def test_new_removed_and_rebuilt_setups():
+    plan = diff_setups([spec('shirt'), spec('pants')], [spec('shirt', low_mesh = 'shirt_low_v2'), spec('coat')])
+
+    assert plan['remove'] == ['pants', 'shirt']
+    assert [setup_spec['setup_prefix'] for setup_spec in plan['create']] == ['shirt', 'coat']
+
+
+def test_high_mesh_change_only_rebuilds_the_high_part():
+    plan = diff_setups([spec('shirt')], [spec('shirt', high_mesh = 'shirt_hi_v2')])
+
+    assert [setup_spec['high_mesh'] for setup_spec in plan['high']] == ['shirt_hi_v2']
+    assert [setup_spec['setup_prefix'] for setup_spec in plan['update']] == ['shirt']
+    assert not plan['create'] and not plan['remove']
+
+
+def test_collider_edits_and_nucleus_settings():
+    current = [spec('shirt', colliders = {'body': 'body', 'chair': 'chair'}, nucleus = {'substeps': 4})]
+    target = [spec('shirt', colliders = {'body': 'torso'}, nucleus = {'substeps': 8})]
+
+    plan = diff_setups(current, target)
+
+    # a collider given a new suffix is removed then added
+    assert plan['colliders'] == {'shirt': {'add': {'body': 'torso'}, 'remove': {'body': 'body', 'chair': 'chair'}}}
+    assert plan['nucleus'] == {'shirt': {'substeps': 8}}
+
+
+def test_collider_settings_rebuild_every_collider_of_the_lead():
+    current = [spec('shirt', colliders = {'body': 'body'})]
+    plan = diff_setups(current, [spec('shirt', colliders = {'body': 'body'}, proxy_faces = 500)])
+
+    assert plan['colliders'] == {'shirt': {'add': {'body': 'body'}, 'remove': {'body': 'body'}}}
+
+
+def test_follower_collider_edit_goes_through_its_lead():
+    current = [spec('shirt', colliders = {'body': 'body'}), spec('pants', nucleus_lead = 'shirt')]
+    target = [spec('shirt', colliders = {'body': 'body'}), spec('pants', nucleus_lead = 'shirt', colliders = {'chair': 'chair'})]
+
+    plan = diff_setups(current, target)
+
+    assert plan['colliders'] == {'shirt': {'add': {'chair': 'chair'}, 'remove': {}}}
+    assert 'pants' not in plan['colliders']
+    assert [setup_spec['setup_prefix'] for setup_spec in plan['update']] == ['pants']
+
+
+def test_removing_a_lead_rebuilds_its_followers():
+    current = [spec('shirt'), spec('pants', nucleus_lead = 'shirt'), spec('coat')]
+    target = [spec('pants'), spec('coat')]
+
+    plan = diff_setups(current, target)
+
+    assert sorted(plan['remove']) == ['pants', 'shirt']
+    assert [setup_spec['setup_prefix'] for setup_spec in plan['create']] == ['pants']
+    assert plan['unchanged'] == ['coat']
+
+
+def test_group_colliders_keep_the_lead_suffixes():
+    specs = [spec('pants', nucleus_lead = 'shirt', colliders = {'body': 'legs', 'chair': 'chair'}), spec('shirt', colliders = {'body': 'body'})]
+
+    assert group_colliders(specs) == {'shirt': {'body': 'body', 'chair': 'chair'}}
+
+
+def test_diff_colliders():
+    added, removed = diff_colliders({'body': 'body', 'hair': 'hair'}, {'body': 'body', 'hat': 'hat'})
+
+    assert added == {'hat': 'hat'}
+    assert removed == {'hair': 'hair'}
+    assert diff_colliders(None, None) == ({}, {})
@@ -0,0 +1,46 @@
+import numpy as np
+
+from ..core.substeps import edge_lengths, estimate_substeps, frame_displacements, frame_ranges, peak_displacement
+
+
+def test_edge_lengths_of_a_quad_and_a_triangle():
+    points = [[0, 0, 0], [2, 0, 0], [2, 1, 0], [0, 1, 0]]
+
+    assert sorted(edge_lengths(points, [4, 3], [0, 1, 2, 3, 0, 1, 2]).round(6).tolist()) == [1, 1, 1, 2, 2, 2, round(np.sqrt(5), 6)]
+
+
+def test_displacements_keep_the_fastest_vertex():
+    positions = np.zeros((3, 2, 3))
+    positions[1, 0] = [0.0, 3.0, 4.0]
+    positions[2, 1] = [1.0, 0.0, 0.0]
+
+    assert frame_displacements(positions).tolist() == [0.0, 5.0, 5.0]
+    assert peak_displacement(positions[0], positions[1]) == 5.0
+    assert peak_displacement(np.zeros((0, 3)), np.zeros((0, 3))) == 0.0
+
+
+def test_estimate_substeps_from_the_collision_reach():
+    # reach of 0.1 + 0.5 * 1.0, a vertex may travel 0.3 per substep
+    substeps, iterations = estimate_substeps([0.0, 3.0, 1000.0], edge_length = 1.0, thickness = 0.1)
+
+    assert substeps.tolist() == [2, 10, 64]
+    assert iterations.tolist() == [4, 16, 40]
+
+
+def test_frame_ranges_merge_short_ranges_into_the_larger_value():
+    values = [1] * 20 + [5] * 3 + [1] * 20
+
+    assert frame_ranges(values, padding = 2, min_length = 10) == [(0, 24, 5), (25, 42, 1)]
+    assert frame_ranges(values, padding = 0, min_length = 1) == [(0, 19, 1), (20, 22, 5), (23, 42, 1)]
+    assert frame_ranges([]) == []
+
+
+def test_frame_ranges_cover_every_frame():
+    values = np.random.default_rng(3).integers(2, 20, 200)
+    ranges = frame_ranges(values, padding = 1, min_length = 8)
+
+    assert ranges[0][0] == 0 and ranges[-1][1] == 199
+    assert all(previous[1] + 1 == current[0] for previous, current in zip(ranges, ranges[1:]))
+    # no frame gets less than its own value
+    for first, last, value in ranges:
+        assert value >= values[first:last + 1].max()
@@ -0,0 +1,57 @@
+import numpy as np
+
+from ..core.validation import coincident_points, edge_use_counts, face_areas, validate_mesh
+
+
+def brute_force_pairs(points, tolerance: float) -> np.ndarray:
+    points = np.asarray(points, dtype = np.float64)
+    distances = np.linalg.norm(points[:, None] - points[None], axis = 2)
+
+    return np.argwhere(np.triu(distances <= tolerance, k = 1))
+
+
+def test_coincident_points_across_cell_borders():
+    # on both sides of a cell border along x and y, 0.03 apart
+    pairs = coincident_points([[0.99, 0.49, 0.2], [1.01, 0.51, 0.2]], 1.0)
+
+    assert pairs.tolist() == [[0, 1]]
+
+
+def test_coincident_points_every_pair_of_a_cell():
+    pairs = coincident_points([[0.0, 0.0, 0.0], [0.5, 0.0, 0.0], [0.9, 0.0, 0.0], [5.0, 5.0, 5.0]], 1.0)
+
+    assert pairs.tolist() == [[0, 1], [0, 2], [1, 2]]
+
+
+def test_coincident_points_match_brute_force():
+    points = np.random.default_rng(0).random((2000, 3)) * 2.0 - 1.0
+
+    for tolerance in (0.02, 0.08):
+        assert np.array_equal(coincident_points(points, tolerance), brute_force_pairs(points, tolerance))
+
+
+def test_coincident_points_far_from_origin():
+    points = np.array([[1e6, 1e6, 1e6], [1e6 + 1e-5, 1e6, 1e6], [1e6 + 1.0, 1e6, 1e6]])
+
+    assert coincident_points(points, 1e-4).tolist() == [[0, 1]]
+
+
+def test_edge_use_counts_finds_non_manifold_edge():
+    # three triangles sharing the edge 0-1
+    edges, use_counts = edge_use_counts([3, 3, 3], [0, 1, 2, 1, 0, 3, 0, 1, 4])
+
+    assert use_counts[(edges == [0, 1]).all(axis = 1)].tolist() == [3]
+
+
+def test_face_areas_of_unit_quad_and_triangle():
+    points = [[0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0]]
+
+    assert np.allclose(face_areas(points, [4, 3], [0, 1, 2, 3, 0, 1, 2]), [1.0, 0.5])
+
+
+def test_validate_mesh_reports_errors():
+    points = [[0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0], [0, 0, 0]]
+    report = validate_mesh(points, [4, 3], [0, 1, 2, 3, 0, 1, 4], space_scale = 1.0)
+
+    assert report['coincident_points'].tolist() == [[0, 4]]
+    assert report['zero_area_faces'].tolist() == [1]
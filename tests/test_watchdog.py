@@ -0,0 +1,58 @@
+import numpy as np
+
+from ..core.watchdog import Watchdog, edge_stretch, frame_health
+
+
+EDGES = np.array([[0, 1], [1, 2]])
+REST_POINTS = np.array([[0.0, 0.0, 0.0], [1.0, 0.0, 0.0], [2.0, 0.0, 0.0]])
+
+
+def test_edge_stretch_against_rest_lengths():
+    points = [[0.0, 0.0, 0.0], [2.0, 0.0, 0.0], [2.0, 0.5, 0.0]]
+
+    assert edge_stretch(points, EDGES, np.array([1.0, 1.0])).tolist() == [2.0, 0.5]
+
+
+def test_frame_health_reports_the_limit_ratio():
+    points = REST_POINTS * [1.5, 1.0, 1.0]
+    health = frame_health(points, REST_POINTS, EDGES, np.array([1.0, 1.0]), max_stretch = 3.0, max_displacement = 0.5)
+
+    assert health['finite']
+    assert np.isclose(health['stretch'], 1.5)
+    assert np.isclose(health['displacement'], 1.0)
+    assert np.isclose(health['health'], 2.0)
+
+
+def test_frame_health_of_non_finite_points():
+    points = REST_POINTS.copy()
+    points[1, 2] = np.nan
+    health = frame_health(points, None, EDGES, np.array([1.0, 1.0]), 3.0, 1.0)
+
+    assert not health['finite']
+    assert health['health'] == float('inf')
+
+
+def test_watchdog_finds_the_first_exceeded_frame():
+    # a rest diagonal of 2.0, the default displacement limit is 0.5
+    watchdog = Watchdog(REST_POINTS, EDGES)
+
+    assert watchdog.max_displacement == 0.5
+    watchdog.check(1.0, REST_POINTS)
+    watchdog.check(2.0, REST_POINTS + [0.4, 0.0, 0.0])
+    watchdog.check(3.0, REST_POINTS + [1.4, 0.0, 0.0])
+
+    assert watchdog.exceeded
+    assert watchdog.first_exceeded() == 3.0
+    assert watchdog.to_dict()['first_exceeded'] == 3.0
+
+
+def test_watchdog_skips_the_displacement_over_a_frame_gap():
+    watchdog = Watchdog(REST_POINTS, EDGES)
+    watchdog.check(1.0, REST_POINTS)
+    health = watchdog.check(5.0, REST_POINTS + [10.0, 0.0, 0.0])
+
+    assert health['displacement'] == 0.0
+    assert not watchdog.exceeded
+
+    watchdog.reset()
+    assert watchdog.frames == {} and watchdog.first_exceeded() is None
@@ -0,0 +1,70 @@
+import numpy as np
+
+from ..core.wrap import apply, bind, cached_bind, closest_barycentric, points_hash, topology_hash
+
+
+def test_closest_barycentric_regions():
+    a, b, c = np.array([[0.0, 0.0, 0.0]]), np.array([[1.0, 0.0, 0.0]]), np.array([[0.0, 1.0, 0.0]])
+    points = np.array([
+        [0.25, 0.25, 1.0],   # inside, above the plane
+        [-1.0, -1.0, 0.0],   # vertex a
+        [2.0, -0.5, 0.0],    # vertex b
+        [0.5, -1.0, 0.0],    # edge ab
+        [1.0, 1.0, 0.0]      # edge bc
+    ])
+    corners = [np.repeat(corner, len(points), axis = 0) for corner in (a, b, c)]
+
+    weights = closest_barycentric(points, *corners)
+
+    assert np.allclose(weights, [[0.5, 0.25, 0.25], [1, 0, 0], [0, 1, 0], [0.5, 0.5, 0], [0, 0.5, 0.5]])
+
+
+def test_bind_then_apply_rest_pose_gives_the_driven_points():
+    rng = np.random.default_rng(0)
+    # a bumpy 5 x 5 grid of triangles
+    x, y = np.meshgrid(np.arange(6.0), np.arange(6.0))
+    driver_points = np.stack([x.ravel(), y.ravel(), rng.random(36) * 0.5], axis = 1)
+    corners = np.arange(36).reshape(6, 6)[:-1, :-1].ravel()
+    driver_triangles = np.concatenate([
+        np.stack([corners, corners + 1, corners + 7], axis = 1),
+        np.stack([corners, corners + 7, corners + 6], axis = 1)
+    ])
+    driven_points = rng.random((200, 3)) * [5.0, 5.0, 2.0] - [0.0, 0.0, 1.0]
+
+    binding = bind(driven_points, driver_points, driver_triangles, candidates = 4)
+
+    assert np.allclose(apply(driver_points, binding), driven_points)
+
+
+def test_apply_follows_a_rigid_motion():
+    driver_points = np.array([[0.0, 0.0, 0.0], [1.0, 0.0, 0.0], [0.0, 1.0, 0.0], [1.0, 1.0, 0.0]])
+    driver_triangles = np.array([[0, 1, 2], [1, 3, 2]])
+    driven_points = np.array([[0.2, 0.3, 0.1], [0.9, 0.8, -0.2]])
+    binding = bind(driven_points, driver_points, driver_triangles)
+
+    angle = 0.7
+    rotation = np.array([[np.cos(angle), -np.sin(angle), 0.0], [np.sin(angle), np.cos(angle), 0.0], [0.0, 0.0, 1.0]])
+    offset = np.array([3.0, -2.0, 5.0])
+
+    wrapped = apply(driver_points @ rotation.T + offset, binding)
+
+    assert np.allclose(wrapped, driven_points @ rotation.T + offset)
+
+
+def test_cached_bind_reuses_the_saved_binding(tmp_path):
+    driver_points = np.array([[0.0, 0.0, 0.0], [1.0, 0.0, 0.0], [1.0, 1.0, 0.0], [0.0, 1.0, 0.0]])
+    driver_topology = ([4], [0, 1, 2, 3])
+    driven_points = np.array([[0.5, 0.5, 0.1]])
+    driven_topology = ([], [])
+
+    binding, path = cached_bind(str(tmp_path), driven_points, driven_topology, driver_points, driver_topology)
+    # the same rest points, up to float noise, read the first binding back
+    cached, cached_path = cached_bind(str(tmp_path), driven_points + 1e-9, driven_topology, driver_points, driver_topology)
+    # another rest pose of the same topologies is bound again
+    _, moved_path = cached_bind(str(tmp_path), driven_points + [0.0, 0.0, 0.2], driven_topology, driver_points, driver_topology)
+
+    assert cached_path == path
+    assert np.array_equal(cached['offsets'], binding['offsets'])
+    assert moved_path != path
+    assert points_hash(driver_points) != points_hash(driver_points[::-1])
+    assert topology_hash((4, [4], [0, 1, 2, 3])) != topology_hash((4, [3, 3], [0, 1, 2, 0, 2, 3]))
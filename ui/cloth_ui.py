@@ -12,25 +12,29 @@ from PySide2.QtGui import (
 )
 
 def reload_modules():
-    from . import preroll_widget, setup_widget, utils
+    """Reload the ui modules, for development. ClothUi must be imported again afterwards."""
+
+    from . import job_widget, preroll_widget, setup_widget, utils
     from importlib import reload
+    reload(utils)
+    reload(job_widget)
     reload(preroll_widget)
     reload(setup_widget)
-    reload(utils)
 
-reload_modules()
 
-from .preroll_widget import PrerollWidget
-from .setup_widget import SetupWidget
 from .utils import maya_main_window, ICON_PATH
 
 
 class ClothUi(QDialog):
 
 
-    def __init__(self, parent = maya_main_window()):
+    def __init__(self, parent = None):
+        if parent is None:
+            parent = maya_main_window()
         super(ClothUi, self).__init__(parent)
 
+        self.tab_builders = {}
+
         self.init_ui()
         self.create_widgets()
         self.create_layout()
@@ -44,7 +48,6 @@ class ClothUi(QDialog):
 
     def create_widgets(self):
         self.add_setup_btn = QPushButton('Add Setup')
-        self.pre_roll_widget = PrerollWidget(self)
 
 
     def create_layout(self):
@@ -67,15 +70,31 @@ class ClothUi(QDialog):
         self.setup_layout = QHBoxLayout(self.setup_widget)
         self.cloth_layout.addWidget(self.setup_widget)
 
-        # preroll layout
-        self.preroll_layout.addWidget(self.pre_roll_widget)
+        # preroll layout, built the first time its tab is shown
+        self.tab_builders[self.tab_widget.indexOf(self.preroll_widget)] = self.build_preroll_tab
 
 
     def create_connections(self):
         self.add_setup_btn.clicked.connect(self.add_setup_widget)
+        self.tab_widget.currentChanged.connect(self.build_tab)
+
+
+    def build_tab(self, index: int):
+        builder = self.tab_builders.pop(index, None)
+        if builder is not None:
+            builder()
+
+
+    def build_preroll_tab(self):
+        from .preroll_widget import PrerollWidget
+
+        self.pre_roll_widget = PrerollWidget(self)
+        self.preroll_layout.addWidget(self.pre_roll_widget)
 
 
     def add_setup_widget(self):
+        from .setup_widget import SetupWidget
+
         setup_widget = SetupWidget(self)
         self.setup_layout.addWidget(setup_widget)
         setup_widget.show()
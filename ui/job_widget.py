@@ -0,0 +1,100 @@
+from PySide2.QtWidgets import (
+    QWidget,
+    QLabel,
+    QListWidget,
+    QProgressBar,
+    QPushButton,
+    QVBoxLayout,
+    QHBoxLayout
+)
+
+from ..funcs.job_funcs import StepJob
+
+
+class JobWidget(QWidget):
+    """
+    Progress bar, per step timing and cancel button of a StepJob.
+    """
+
+    def __init__(self, parent=None):
+        super(JobWidget, self).__init__(parent)
+
+        self.job = None
+        self.on_finished = None
+
+        self.create_widgets()
+        self.create_layout()
+        self.create_connections()
+        self.setVisible(False)
+
+    def create_widgets(self):
+        self.progress_bar = QProgressBar()
+        self.step_label = QLabel()
+        self.cancel_button = QPushButton('Cancel')
+        self.timing_list = QListWidget()
+        self.timing_list.setMaximumHeight(120)
+
+    def create_layout(self):
+        self.main_layout = QVBoxLayout(self)
+        self.main_layout.setContentsMargins(0, 0, 0, 0)
+
+        progress_layout = QHBoxLayout()
+        progress_layout.addWidget(self.progress_bar)
+        progress_layout.addWidget(self.cancel_button)
+
+        self.main_layout.addLayout(progress_layout)
+        self.main_layout.addWidget(self.step_label)
+        self.main_layout.addWidget(self.timing_list)
+
+    def create_connections(self):
+        self.cancel_button.clicked.connect(self.cancel)
+
+    def run(self, name: str, steps: list, on_finished = None) -> StepJob:
+        """
+        Start a job, one step per idle event.
+
+        Parameters:
+            name (str): The name of the job.
+            steps (list): (label, function) tuples (see StepJob).
+            on_finished (callable, optional): Called with the job status when it ends.
+
+        Returns:
+            StepJob: The started job.
+        """
+
+        self.on_finished = on_finished
+        self.progress_bar.setRange(0, len(steps))
+        self.progress_bar.setValue(0)
+        self.step_label.setText(f'{steps[0][0]}...' if steps else '')
+        self.timing_list.clear()
+        self.cancel_button.setEnabled(True)
+        self.setVisible(True)
+
+        self.job = StepJob(name, steps, on_progress = self.update_progress, on_finished = self.finished)
+        self.job.start()
+
+        return self.job
+
+    def update_progress(self, index: int, count: int, label: str, duration: float):
+        self.progress_bar.setValue(index)
+        self.timing_list.addItem(f'{label} : {duration:.2f} s')
+        self.timing_list.scrollToBottom()
+        if index < count:
+            self.step_label.setText(f'{self.job.steps[index][0]}...')
+
+    def cancel(self):
+        if self.job is not None:
+            self.job.cancel()
+
+    def finished(self, status: str):
+        total: float = sum(duration for _, duration in self.job.durations)
+        messages = {
+            'done': f'Done in {total:.2f} s',
+            'cancelled': 'Cancelled, the scene has been rolled back.',
+            'failed': f'Failed : {self.job.error}, the scene has been rolled back.'
+        }
+        self.step_label.setText(messages[status])
+        self.cancel_button.setEnabled(False)
+
+        if self.on_finished is not None:
+            self.on_finished(status)
@@ -7,7 +7,8 @@ from PySide2.QtWidgets import (
     QGridLayout
 )
 from maya import cmds
-from ..funcs import set_preroll
+from ..funcs import preroll_steps
+from .job_widget import JobWidget
 
 
 class PrerollWidget(QWidget):
@@ -29,6 +30,7 @@ class PrerollWidget(QWidget):
     def create_widgets(self):
         self.info_label = QLabel('Select controlers')
         self.run_button = QPushButton('Preroll')
+        self.job_widget = JobWidget(self)
 
         self.start_frame_label = QLabel(f'Start frame')
         self.start_frame_lineedit = QLineEdit(f'{cmds.playbackOptions(query = True, minTime = True)}')
@@ -67,6 +69,7 @@ class PrerollWidget(QWidget):
         self.main_layout.addWidget(self.info_label)
         self.main_layout.addWidget(self.grid_widget)
         self.main_layout.addWidget(self.run_button)
+        self.main_layout.addWidget(self.job_widget)
 
 
     def create_connections(self):
@@ -82,4 +85,9 @@ class PrerollWidget(QWidget):
         preroll_values = [start_frame, start_pose_offset, inter_pose_offset, bind_pose_offset]
 
         controlers: list = cmds.ls(selection = True)
-        set_preroll(controlers, preroll_values)
+        self.run_button.setEnabled(False)
+        self.job_widget.run(
+            'preroll',
+            preroll_steps(controlers, preroll_values),
+            on_finished = lambda status: self.run_button.setEnabled(True)
+        )
@@ -1,5 +1,6 @@
 from PySide2.QtWidgets import (
     QWidget,
+    QComboBox,
     QLabel,
     QLineEdit,
     QPushButton,
@@ -15,7 +16,8 @@ from PySide2.QtCore import (
 from maya import cmds
 import maya.api.OpenMaya as om
 
-from ..funcs import create_full_setup
+from ..funcs import full_setup_steps
+from .job_widget import JobWidget
 
 
 class SetupWidget(QWidget):
@@ -44,12 +46,17 @@ class SetupWidget(QWidget):
         self.himesh_button = QPushButton('High Mesh')
         self.himesh_lineedit = QLineEdit()
 
+        self.wrap_label = QLabel('Wrap')
+        self.wrap_combobox = QComboBox()
+        self.wrap_combobox.addItems(['cvwrap', 'wrap', 'npwrap'])
+
         self.add_collider_button = QPushButton('Add collider')
 
         self.collider_mesh_label = QLabel('Collider mesh')
         self.collider_name_label = QLabel('Collider name')
 
         self.create_setup_button = QPushButton('Create setup')
+        self.job_widget = JobWidget(self)
 
     def create_layout(self):
         self.main_layout = QVBoxLayout(self)
@@ -64,6 +71,8 @@ class SetupWidget(QWidget):
         self.grid_layout.addWidget(self.simu_nmesh_lineedit, 1, 1)
         self.grid_layout.addWidget(self.himesh_button, 2, 0)
         self.grid_layout.addWidget(self.himesh_lineedit, 2, 1)
+        self.grid_layout.addWidget(self.wrap_label, 3, 0)
+        self.grid_layout.addWidget(self.wrap_combobox, 3, 1)
 
         # Ajouter le label et le bouton dans un QHBoxLayout
         collider_button_layout = QHBoxLayout()
@@ -78,6 +87,7 @@ class SetupWidget(QWidget):
         self.collider_layout.addWidget(self.collider_name_label, 0, 1, Qt.AlignTop)
 
         self.main_layout.addWidget(self.create_setup_button)
+        self.main_layout.addWidget(self.job_widget)
 
 
     def create_connections(self):
@@ -135,9 +145,15 @@ class SetupWidget(QWidget):
         setup_prefix = self.setup_name_lineedit.text()
         low_mesh = self.simu_nmesh_lineedit.text()
         high_mesh = self.himesh_lineedit.text()
+        wrap_node = self.wrap_combobox.currentText()
 
         collider_dict = {}
         for key, value in self.collider_dict.items():
             collider_dict[key.text()] = value.text()
 
-        create_full_setup(setup_prefix, low_mesh, high_mesh, colliders=collider_dict)
+        self.create_setup_button.setEnabled(False)
+        self.job_widget.run(
+            f'setup_{setup_prefix}',
+            full_setup_steps(setup_prefix, low_mesh, high_mesh, colliders=collider_dict, wrap_node=wrap_node),
+            on_finished = lambda status: self.create_setup_button.setEnabled(True)
+        )